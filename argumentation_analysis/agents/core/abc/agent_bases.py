@@ -308,6 +308,22 @@ class BaseLogicAgent(BaseAgent, ABC):
         """
         pass
 
+    def execute_queries(self, belief_set: 'BeliefSet', queries: List[str]) -> List[Tuple[Optional[bool], str]]:
+        """
+        Exécute plusieurs requêtes logiques sur un même ensemble de croyances.
+
+        L'implémentation par défaut exécute les requêtes une à une ; les sous-classes
+        peuvent la redéfinir pour n'analyser l'ensemble de croyances qu'une seule fois.
+
+        :param belief_set: L'ensemble de croyances sur lequel exécuter les requêtes.
+        :type belief_set: BeliefSet
+        :param queries: Les requêtes à exécuter.
+        :type queries: List[str]
+        :return: Le résultat de `execute_query` pour chaque requête, dans l'ordre.
+        :rtype: List[Tuple[Optional[bool], str]]
+        """
+        return [self.execute_query(belief_set, query) for query in queries]
+
     @abstractmethod
     def interpret_results(self, text: str, belief_set: 'BeliefSet', queries: List[str], results: List[Tuple[Optional[bool], str]], context: Optional[Dict[str, Any]] = None) -> str:
         """
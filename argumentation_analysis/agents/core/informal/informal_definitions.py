@@ -47,7 +47,10 @@ from semantic_kernel.functions.kernel_parameter_metadata import KernelParameterM
 
 # Importer load_csv_file depuis project_core
 from argumentation_analysis.utils.core_utils.file_loaders import load_csv_file
+from argumentation_analysis.utils.taxonomy_snapshot import compute_taxonomy_fingerprint, load_taxonomy_dataframe
 from argumentation_analysis.paths import DATA_DIR # Assurer que DATA_DIR est importé si nécessaire ailleurs
+from .taxonomy_text_index import TaxonomyTextIndex, get_taxonomy_text_index
+from .taxonomy_store import TaxonomyStore, get_registered_taxonomy_store, register_taxonomy_store
 
 # Configuration du logging
 logging.basicConfig(
@@ -81,7 +84,10 @@ class InformalAnalysisPlugin:
         FALLACY_CSV_URL (str): URL distante du fichier CSV de la taxonomie (fallback).
         DATA_DIR (Path): Chemin vers le répertoire de données local.
         FALLACY_CSV_LOCAL_PATH (Path): Chemin local attendu pour le fichier CSV de la taxonomie.
-        _taxonomy_df_cache (Optional[pd.DataFrame]): Cache pour le DataFrame de la taxonomie.
+        _taxonomy_df_cache (Optional[pd.DataFrame]): Copie propre à l'instance du DataFrame de la
+            taxonomie, issue du `TaxonomyStore` partagé du processus.
+        _taxonomy_fingerprint (Optional[str]): Empreinte SHA-256 du fichier de taxonomie chargé.
+        _text_index (Optional[TaxonomyTextIndex]): Index textuel partagé sur les colonnes de la taxonomie.
     """
     
     def __init__(self, taxonomy_file_path: Optional[str] = None):
@@ -111,6 +117,13 @@ class InformalAnalysisPlugin:
             
         # Cache pour le DataFrame de taxonomie
         self._taxonomy_df_cache = None
+        # Empreinte du fichier chargé, utilisée pour partager les index compilés entre instances
+        self._taxonomy_fingerprint: Optional[str] = None
+        self._text_index: Optional[TaxonomyTextIndex] = None
+        # Store partagé dont provient `_taxonomy_df_cache`, s'il a été chargé depuis le fichier
+        self._shared_store: Optional[TaxonomyStore] = None
+        # Store construit pour un DataFrame non partagé (ex: DataFrame fourni par un test)
+        self._private_store: Optional[TaxonomyStore] = None
     
     def _internal_load_and_prepare_dataframe(self) -> pd.DataFrame:
         """
@@ -118,86 +131,38 @@ class InformalAnalysisPlugin:
 
         Utilise le chemin `self._current_taxonomy_path` déterminé lors de l'initialisation.
         L'index du DataFrame est défini sur la colonne 'PK' et converti en entier si possible.
+        Si le même fichier (même empreinte) a déjà été chargé dans le processus, une
+        vue du DataFrame du `TaxonomyStore` partagé est retournée sans relecture.
 
-        :return: Un DataFrame pandas contenant la taxonomie des sophismes.
+        :return: Une vue en lecture seule (voir `TaxonomyStore.frame`), propre à l'instance
+                 mais partageant les données du store, du DataFrame de la taxonomie.
         :rtype: pd.DataFrame
         :raises Exception: Si une erreur survient pendant le chargement ou la préparation.
         """
         self._logger.info(f"Chargement et préparation du DataFrame de taxonomie depuis: {self._current_taxonomy_path}...")
         
         try:
-            # Charger le fichier CSV en utilisant load_csv_file de project_core
-            df = load_csv_file(self._current_taxonomy_path)
+            fingerprint = compute_taxonomy_fingerprint(self._current_taxonomy_path)
+            shared_store = get_registered_taxonomy_store(fingerprint)
+            if shared_store is not None:
+                self._logger.info(f"Taxonomie déjà chargée dans le processus (empreinte {fingerprint[:12]}), réutilisation du store partagé.")
+                self._taxonomy_fingerprint = fingerprint
+                self._shared_store = shared_store
+                return shared_store.frame
+
+            # Instantané binaire s'il est à jour, sinon lecture du CSV (via load_csv_file) et préparation
+            # de l'index PK ; l'instantané est alors régénéré pour les démarrages suivants.
+            df, fingerprint = load_taxonomy_dataframe(self._current_taxonomy_path, fingerprint=fingerprint)
             
             if df is None:
                 self._logger.error(f"Échec du chargement du fichier CSV depuis {self._current_taxonomy_path}. load_csv_file a retourné None.")
                 raise Exception(f"Impossible de charger la taxonomie depuis {self._current_taxonomy_path}")
             
             self._logger.info(f"Taxonomie chargée avec succès depuis {self._current_taxonomy_path}: {len(df)} entrées.")
+            self._taxonomy_fingerprint = fingerprint
             
-            # Préparation du DataFrame
-            if 'PK' in df.columns:
-                self._logger.info("Colonne 'PK' trouvée. Tentative de la définir comme index.")
-                # Assurer que la colonne PK est numérique avant de la définir comme index
-                try:
-                    if not pd.api.types.is_string_dtype(df['PK']) and pd.api.types.is_object_dtype(df['PK']):
-                        df['PK'] = df['PK'].astype(str)
-                        self._logger.debug("Colonne 'PK' convertie en str pour la normalisation.")
-                    
-                    df['PK'] = pd.to_numeric(df['PK'], errors='coerce')
-                    df['PK'] = df['PK'].fillna(0) # Remplir NaN avant conversion en int
-                    # Tenter la conversion en int64, si échec, logguer et potentiellement laisser en float pour set_index
-                    try:
-                        df['PK'] = df['PK'].astype("int64")
-                        self._logger.info(f"Colonne 'PK' convertie en type {df['PK'].dtype}. Valeurs: {df['PK'].to_list()}")
-                    except Exception as e_astype_int:
-                        self._logger.warning(f"Échec de la conversion de 'PK' en int64 ({e_astype_int}), conservée en {df['PK'].dtype}. Valeurs: {df['PK'].to_list()}")
-
-                except Exception as e_convert:
-                    self._logger.error(f"Erreur majeure lors de la préparation de la colonne 'PK': {e_convert}")
-                    self._logger.error(f"Erreur majeure lors de la préparation de la colonne 'PK': {e_convert}")
-                    self._logger.info(f"État de la colonne 'PK' avant l'échec: {df['PK'].to_dict() if 'PK' in df else 'Non présente'}")
-
-                self._logger.debug(f"Valeurs de la colonne 'PK' avant set_index: {df['PK'].to_list()}, dtype: {df['PK'].dtype}")
-                
-                # Inspection de toutes les colonnes avant set_index
-                self._logger.debug("Inspection du DataFrame avant set_index:")
-                for col in df.columns:
-                    self._logger.debug(f"  Colonne '{col}', dtype: {df[col].dtype}")
-                    try:
-                        # Tenter de détecter des valeurs inhabituelles comme _NoValueType
-                        # Ceci est une heuristique car _NoValueType n'est pas directement comparable facilement
-                        problematic_values = df[col][df[col].apply(lambda x: hasattr(x, '__class__') and x.__class__.__name__ == '_NoValueType')]
-                        if not problematic_values.empty:
-                            self._logger.warning(f"    Colonne '{col}' contient des valeurs potentiellement problématiques (_NoValueType): {problematic_values.to_dict()}")
-                    except Exception as e_inspect:
-                        self._logger.debug(f"    Impossible d'inspecter finement la colonne '{col}': {e_inspect}")
-                
-                try:
-                    df.set_index('PK', inplace=True)
-                    self._logger.info(f"Colonne 'PK' définie comme index. Type de l'index: {df.index.dtype}, Valeurs de l'index: {df.index.to_list()}")
-                    
-                    # Assurer que l'index est de type entier après set_index
-                    if not pd.api.types.is_integer_dtype(df.index):
-                        self._logger.warning(f"L'index PK n'est pas de type entier après set_index (actuel: {df.index.dtype}). Tentative de reconversion explicite.")
-                        try:
-                            df.index = df.index.astype("int64")
-                            self._logger.info(f"Index PK reconverti en type {df.index.dtype}. Valeurs: {df.index.to_list()}")
-                        except Exception as e_reconvert_index:
-                            self._logger.error(f"Erreur lors de la reconversion de l'index PK en int64: {e_reconvert_index}")
-                    else:
-                        self._logger.info(f"L'index PK est déjà de type entier ({df.index.dtype}).")
-
-                except Exception as e_set_index:
-                    self._logger.error(f"Erreur lors de la définition de 'PK' comme index: {e_set_index}")
-                    if 'PK' in df.columns:
-                         self._logger.info(f"État de la colonne 'PK' avant l'échec de set_index: {df['PK'].to_dict()}, dtype: {df['PK'].dtype}")
-                    else:
-                         self._logger.info("Colonne 'PK' non présente dans df.columns avant l'échec de set_index.")
-            else:
-                self._logger.warning("Colonne 'PK' non trouvée dans le fichier de taxonomie. L'index ne sera pas défini.")
-            
-            return df
+            self._shared_store = register_taxonomy_store(df, self._taxonomy_fingerprint)
+            return self._shared_store.frame
         except Exception as e:
             self._logger.error(f"Erreur lors du chargement ou de la préparation de la taxonomie depuis {self._current_taxonomy_path}: {e}")
             raise
@@ -208,20 +173,59 @@ class InformalAnalysisPlugin:
 
         Si le DataFrame n'est pas déjà en cache (`self._taxonomy_df_cache`),
         il est chargé et préparé via `_internal_load_and_prepare_dataframe`.
+        Le DataFrame retourné est une vue propre à l'instance des données partagées
+        du `TaxonomyStore` : il n'est pas recopié, et le modifier n'altère pas le store.
 
         :return: Le DataFrame pandas de la taxonomie des sophismes.
         :rtype: pd.DataFrame
         """
         if self._taxonomy_df_cache is None:
             self._taxonomy_df_cache = self._internal_load_and_prepare_dataframe()
-        return self._taxonomy_df_cache.copy() # Retourner une copie pour éviter les modifications accidentelles du cache
+        return self._taxonomy_df_cache
+
+    def _get_taxonomy_store(self, df: Optional[pd.DataFrame] = None) -> TaxonomyStore:
+        """
+        Récupère le `TaxonomyStore` (colonnes et listes d'adjacence) correspondant à un DataFrame.
+
+        Le store partagé du processus est utilisé lorsque `df` est le DataFrame chargé
+        par l'instance depuis le fichier ; sinon un store propre à l'instance est
+        construit pour `df`.
+
+        :param df: DataFrame de taxonomie ; par défaut celui du plugin.
+        :type df: Optional[pd.DataFrame]
+        :return: Le store en lecture seule associé au DataFrame.
+        :rtype: TaxonomyStore
+        """
+        if df is None:
+            df = self._get_taxonomy_dataframe()
+        if self._shared_store is not None and df is self._taxonomy_df_cache:
+            return self._shared_store
+        if self._private_store is None or not self._private_store.is_built_from(df):
+            self._private_store = TaxonomyStore(df)
+        return self._private_store
+
+    def _get_text_index(self) -> TaxonomyTextIndex:
+        """
+        Récupère l'index textuel de la taxonomie (insensible à la casse et aux accents).
+
+        L'index est partagé entre toutes les instances ayant chargé le même fichier
+        de taxonomie (même empreinte), et propre à l'instance sinon.
+
+        :return: L'index textuel immuable sur 'Name', 'nom_vulgarisé', 'text_fr', 'Famille' et 'Latin'.
+        :rtype: TaxonomyTextIndex
+        """
+        if self._text_index is None:
+            df = self._get_taxonomy_dataframe()
+            self._text_index = get_taxonomy_text_index(df, self._taxonomy_fingerprint)
+        return self._text_index
     
     def _internal_explore_hierarchy(self, current_pk: int, df: pd.DataFrame, max_children: int = 15) -> Dict[str, Any]:
         """
         Explore la hiérarchie des sophismes à partir d'un nœud parent donné (par sa PK).
 
         Construit un dictionnaire représentant le nœud courant et ses enfants directs,
-        en se basant sur les colonnes 'FK_Parent', 'parent_pk', ou 'path' du DataFrame.
+        lus dans les listes d'adjacence du `TaxonomyStore` (construites à partir des
+        colonnes 'FK_Parent', 'parent_pk', ou 'path' du DataFrame).
 
         :param current_pk: La clé primaire (PK) du nœud parent à partir duquel explorer.
         :type current_pk: int
@@ -243,106 +247,49 @@ class InformalAnalysisPlugin:
             result["error"] = "Taxonomie sophismes non disponible."
             return result
         
-        # Convertir les colonnes numériques
-        if 'depth' in df.columns:
-            df['depth'] = pd.to_numeric(df['depth'], errors='coerce')
+        store = self._get_taxonomy_store(df)
         
         # Trouver le nœud courant
-        current_node_df = df.loc[[current_pk]] if current_pk in df.index else pd.DataFrame()
-        if len(current_node_df) == 0:
+        position = store.position_of(current_pk)
+        if position is None:
             result["error"] = f"PK {current_pk} non trouvée dans la taxonomie."
             return result
         
-        # Extraire les informations du nœud courant
-        current_row = current_node_df.iloc[0]
-        # Utiliser une valeur par défaut pour path si elle n'existe pas
-        current_path = current_row.get('path', '') # .get est disponible sur les Series pandas
-        
+        depth = store.depths[position]
         result["current_node"] = {
-            "pk": int(current_row.name), # PK est l'index
-            "path": current_path,
-            "depth": int(current_row['depth']) if pd.notna(current_row.get('depth')) else 0,
-            "Name": current_row.get('Name', ''), # Utiliser la colonne 'Name' du CSV
-            "nom_vulgarisé": current_row.get('nom_vulgarisé', ''), # nom_vulgarisé (peut être redondant ou un alias)
-            "famille": current_row.get('Famille', ''),             # Famille
-            "description_courte": current_row.get('text_fr', '')   # text_fr comme description courte
+            "pk": int(store.pks[position]), # PK est l'index
+            "path": store.value(position, 'path'),
+            "depth": depth if depth is not None else 0,
+            "Name": store.value(position, 'Name'), # Utiliser la colonne 'Name' du CSV
+            "nom_vulgarisé": store.value(position, 'nom_vulgarisé'), # nom_vulgarisé (peut être redondant ou un alias)
+            "famille": store.value(position, 'Famille'),             # Famille
+            "description_courte": store.value(position, 'text_fr')   # text_fr comme description courte
         }
         
-        # Trouver les enfants
-        children_df = pd.DataFrame() # Initialiser à un DataFrame vide
-        if 'FK_Parent' in df.columns:
-            # Si FK_Parent existe, l'utiliser pour trouver les enfants
-            children_df = df[df['FK_Parent'] == current_pk]
-        elif 'parent_pk' in df.columns:
-            # Si parent_pk existe, l'utiliser pour trouver les enfants
-            children_df = df[df['parent_pk'] == current_pk]
-        elif 'path' in df.columns and current_path:
-            # Si path existe, l'utiliser pour trouver les enfants
-            # S'assurer que current_path se termine par un point pour éviter les correspondances partielles incorrectes
-            # Exemple: si current_path est "1", on ne veut pas matcher "10.x"
-            # On cherche les enfants directs, donc le path de l'enfant doit être current_path + ".quelquechose"
-            # et ne pas contenir d'autres points après "quelquechose".
-            # Exemple: si current_path = "1", on cherche "1.X" mais pas "1.X.Y"
-            # Si current_path = "1.2", on cherche "1.2.X" mais pas "1.2.X.Y"
-            
-            # Construire le préfixe attendu pour les enfants directs
-            child_path_prefix = str(current_path) + "."
-            
-            # Filtrer les enfants qui commencent par ce préfixe
-            potential_children = df[df['path'].astype(str).str.startswith(child_path_prefix, na=False)]
-            
-            # Filtrer pour ne garder que les enfants directs (pas les petits-enfants, etc.)
-            # Un enfant direct aura un path qui, une fois le préfixe retiré, ne contient plus de "."
-            children_df = potential_children[~potential_children['path'].astype(str).str.slice(start=len(child_path_prefix)).str.contains('.', na=False, regex=False)]
-
-        elif 'depth' in df.columns and pd.notna(current_row.get('depth')):
-             # Si depth existe et que le nœud courant a une profondeur,
-             # les enfants directs auront une profondeur de current_depth + 1
-             # et leur path commencera par le path du parent.
-            current_depth = int(current_row['depth'])
-            # S'assurer que current_path est une chaîne pour la comparaison str.startswith
-            current_path_str = str(current_path) if pd.notna(current_path) else ""
-
-            # Filtrer par profondeur et par le début du path
-            # (pour éviter de prendre des nœuds d'une autre branche ayant la même profondeur)
-            children_df = df[
-                (df['depth'] == current_depth + 1) &
-                (df['path'].astype(str).str.startswith(current_path_str + ('.' if current_path_str else ''), na=False))
-            ]
-        
-        children_count = len(children_df)
+        # Enfants directs depuis la liste d'adjacence (ordre de la taxonomie)
+        children_positions = store.children_of(current_pk)
+        children_count = len(children_positions)
         
         if children_count > 0:
             # Limiter le nombre d'enfants si nécessaire
             if max_children > 0 and children_count > max_children:
-                children_df = children_df.head(max_children)
+                children_positions = children_positions[:max_children]
                 result["children_truncated"] = True
                 result["total_children"] = children_count
             
-            # Extraire les informations des enfants
-            for _, child_row in children_df.iterrows():
-                # Vérifier si l'enfant a lui-même des enfants
-                # (simplifié, une vérification plus robuste serait nécessaire pour une UI complexe)
-                # Pour cette fonction, on peut se baser sur la présence d'enfants dans le dataframe
-                # en utilisant une logique similaire à celle ci-dessus.
-                # Pour l'instant, on met False, car le but est de lister les enfants directs.
+            for child_position in children_positions:
+                child_pk = store.pks[child_position]
                 child_info = {
-                    "pk": int(child_row.name), # .name est l'index (PK)
-                    "nom_vulgarisé": child_row.get('nom_vulgarisé', ''), # nom_vulgarisé
-                    "description_courte": child_row.get('text_fr', ''),   # text_fr
-                    "famille": child_row.get('Famille', ''),             # Famille
-                    "has_children": False # Simplifié. Pourrait être calculé si besoin.
+                    "pk": int(child_pk),
+                    "nom_vulgarisé": store.value(child_position, 'nom_vulgarisé'), # nom_vulgarisé
+                    "description_courte": store.value(child_position, 'text_fr'),   # text_fr
+                    "famille": store.value(child_position, 'Famille'),             # Famille
+                    "has_children": bool(store.children_of(child_pk))
                 }
                 result["children"].append(child_info)
         
         return result
     
-    # La méthode _internal_get_children_details n'est plus explicitement appelée,
-    # sa logique est intégrée dans _internal_get_node_details et _internal_explore_hierarchy.
-    # Si elle devait être réactivée, elle nécessiterait une mise à jour similaire des noms de colonnes.
-    # Pour l'instant, nous la laissons telle quelle ou la commentons si elle n'est plus du tout utilisée.
-    # Par souci de propreté, si elle n'est pas utilisée, il vaut mieux la supprimer ou la commenter clairement.
-    # Pour cette passe, je vais la laisser mais noter qu'elle n'est pas au centre des modifications actuelles.
     def _internal_get_children_details(self, pk: int, df: pd.DataFrame, max_children: int = 10) -> List[Dict[str, Any]]:
         """
         Obtient les détails (PK, nom, description, exemple) des enfants directs d'un nœud spécifique.
@@ -363,33 +310,21 @@ class InformalAnalysisPlugin:
         if df is None:
             return children_details_list
         
-        # Convertir les colonnes numériques si elles existent et ne sont pas déjà numériques
-        if 'PK' in df.columns and not pd.api.types.is_numeric_dtype(df['PK']):
-            df['PK'] = pd.to_numeric(df['PK'], errors='coerce')
-        if 'FK_Parent' in df.columns and not pd.api.types.is_numeric_dtype(df['FK_Parent']):
-            df['FK_Parent'] = pd.to_numeric(df['FK_Parent'], errors='coerce')
-        
-        # Trouver les enfants (nœuds dont le parent est le nœud courant)
-        child_nodes_df = pd.DataFrame() # Initialiser
-        if 'FK_Parent' in df.columns:
-            child_nodes_df = df[df['FK_Parent'] == pk]
-        elif 'parent_pk' in df.columns: # Fallback si FK_Parent n'existe pas
-            child_nodes_df = df[df['parent_pk'] == pk]
-        # Ajouter une logique basée sur 'path' et 'depth' si nécessaire, comme dans _internal_explore_hierarchy
+        store = self._get_taxonomy_store(df)
+        children_positions = store.children_of(pk)
         
         # Limiter le nombre d'enfants si nécessaire
-        if max_children > 0 and len(child_nodes_df) > max_children:
-            child_nodes_df = child_nodes_df.head(max_children)
+        if max_children > 0:
+            children_positions = children_positions[:max_children]
         
-        # Extraire les informations des enfants
-        for _, child_row in child_nodes_df.iterrows():
+        for child_position in children_positions:
             child_info = {
-                "pk": int(child_row.name), # .name est l'index (PK)
-                "nom_vulgarisé": child_row.get('nom_vulgarisé', ''), # nom_vulgarisé
-                "description_courte": child_row.get('text_fr', ''),   # text_fr
-                "description_longue": child_row.get('desc_fr', ''), # desc_fr
-                "exemple": child_row.get('example_fr', ''), # example_fr
-                "famille": child_row.get('Famille', ''),         # Famille
+                "pk": int(store.pks[child_position]),
+                "nom_vulgarisé": store.value(child_position, 'nom_vulgarisé'), # nom_vulgarisé
+                "description_courte": store.value(child_position, 'text_fr'),   # text_fr
+                "description_longue": store.value(child_position, 'desc_fr'), # desc_fr
+                "exemple": store.value(child_position, 'example_fr'), # example_fr
+                "famille": store.value(child_position, 'Famille'),         # Famille
                 "error": None
             }
             children_details_list.append(child_info)
@@ -419,90 +354,36 @@ class InformalAnalysisPlugin:
             result["error"] = "Taxonomie sophismes non disponible."
             return result
         
-        # Convertir les colonnes numériques si elles existent et ne sont pas déjà numériques
-        if 'PK' in df.columns and not pd.api.types.is_numeric_dtype(df['PK']):
-            df['PK'] = pd.to_numeric(df['PK'], errors='coerce')
-        if 'depth' in df.columns and not pd.api.types.is_numeric_dtype(df['depth']):
-            df['depth'] = pd.to_numeric(df['depth'], errors='coerce')
+        store = self._get_taxonomy_store(df)
         
         # Trouver le nœud
-        node_df = df.loc[[pk]] if pk in df.index else pd.DataFrame()
-        if len(node_df) == 0:
+        position = store.position_of(pk)
+        if position is None:
             result["error"] = f"PK {pk} non trouvée dans la taxonomie."
             return result
-        # Extraire les informations du nœud
-        row = node_df.iloc[0]
-        # Suppression des logs de débogage
-        for col in row.index: # Utiliser row.index qui contient les noms des colonnes
-            if pd.notna(row[col]):
-                # Gérer la conversion pour numpy types si nécessaire pour la sérialisation JSON
-                if hasattr(row[col], 'item'): # Typique pour les types numpy (int64, float64, etc.)
-                    result[col] = row[col].item()
-                else:
-                    result[col] = row[col]
+        # Attributs renseignés du nœud, en types Python natifs pour la sérialisation JSON
+        result.update(store.row_dict(position))
         
         # Trouver le parent
-        parent_df = pd.DataFrame() # Initialiser
-        parent_pk_val = None
-        if 'FK_Parent' in df.columns and pd.notna(row.get('FK_Parent')):
-            parent_pk_val = row.get('FK_Parent')
-        elif 'parent_pk' in df.columns and pd.notna(row.get('parent_pk')): # Fallback
-            parent_pk_val = row.get('parent_pk')
-        
-        if parent_pk_val is not None:
-            try:
-                parent_pk_int = int(parent_pk_val)
-                parent_df = df.loc[[parent_pk_int]] if parent_pk_int in df.index else pd.DataFrame()
-            except ValueError:
-                self._logger.warning(f"Valeur FK_Parent/parent_pk non entière pour le nœud {pk}: {parent_pk_val}")
-
-        elif 'path' in df.columns:
-            # Sinon, essayer d'utiliser path
-            path_val = row.get('path', '')
-            if path_val and '.' in str(path_val): # S'assurer que path_val est une chaîne
-                parent_path = str(path_val).rsplit('.', 1)[0]
-                parent_df = df[df['path'] == parent_path]
-        
-        if len(parent_df) > 0:
-            parent_row = parent_df.iloc[0]
+        parent_position = store.parent_of(pk)
+        if parent_position is not None:
             result["parent"] = {
-                "pk": int(parent_row.name), # .name est l'index (PK)
-                "nom_vulgarisé": parent_row.get('nom_vulgarisé', ''), # nom_vulgarisé
-                "description_courte": parent_row.get('text_fr', ''),   # text_fr
-                "famille": parent_row.get('Famille', '')              # Famille
+                "pk": int(store.pks[parent_position]),
+                "nom_vulgarisé": store.value(parent_position, 'nom_vulgarisé'), # nom_vulgarisé
+                "description_courte": store.value(parent_position, 'text_fr'),   # text_fr
+                "famille": store.value(parent_position, 'Famille')              # Famille
             }
         
-        # Trouver les enfants (logique similaire à _internal_explore_hierarchy)
-        # children_list = [] # Renommé pour éviter conflit
-        # Pour être plus précis, on reprend la logique de _internal_explore_hierarchy pour les enfants directs
-        
-        child_nodes_for_details = pd.DataFrame()
-        current_path_for_children = row.get('path', '')
-        current_depth_for_children = row.get('depth', None)
-        
-        if 'FK_Parent' in df.columns:
-            child_nodes_for_details = df[df['FK_Parent'] == pk]
-        elif 'parent_pk' in df.columns:
-            child_nodes_for_details = df[df['parent_pk'] == pk]
-        elif 'path' in df.columns and current_path_for_children:
-            child_path_prefix = str(current_path_for_children) + "."
-            potential_children = df[df['path'].astype(str).str.startswith(child_path_prefix, na=False)]
-            child_nodes_for_details = potential_children[~potential_children['path'].astype(str).str.slice(start=len(child_path_prefix)).str.contains('.', na=False, regex=False)]
-        elif 'depth' in df.columns and pd.notna(current_depth_for_children):
-            current_path_str_for_children = str(current_path_for_children) if pd.notna(current_path_for_children) else ""
-            child_nodes_for_details = df[
-                (df['depth'] == int(current_depth_for_children) + 1) &
-                (df['path'].astype(str).str.startswith(current_path_str_for_children + ('.' if current_path_str_for_children else ''), na=False))
-            ]
-
-        if len(child_nodes_for_details) > 0:
+        # Trouver les enfants directs (mêmes listes d'adjacence que _internal_explore_hierarchy)
+        children_positions = store.children_of(pk)
+        if children_positions:
             result["children"] = []
-            for _, child_row_detail in child_nodes_for_details.iterrows():
+            for child_position in children_positions:
                 child_info_detail = {
-                    "pk": int(child_row_detail.name),
-                    "nom_vulgarisé": child_row_detail.get('nom_vulgarisé', ''), # nom_vulgarisé
-                    "description_courte": child_row_detail.get('text_fr', ''),   # text_fr
-                    "famille": child_row_detail.get('Famille', '')              # Famille
+                    "pk": int(store.pks[child_position]),
+                    "nom_vulgarisé": store.value(child_position, 'nom_vulgarisé'), # nom_vulgarisé
+                    "description_courte": store.value(child_position, 'text_fr'),   # text_fr
+                    "famille": store.value(child_position, 'Famille')              # Famille
                 }
                 result["children"].append(child_info_detail)
         
@@ -619,23 +500,10 @@ class InformalAnalysisPlugin:
         if df is None:
             return json.dumps({"error": "Taxonomie non disponible."})
 
-        # Recherche cas insensible dans 'nom_vulgarisé' et 'text_fr' (pour la taxonomie réelle)
-        # 'fallacy_type' n'est pas une colonne standard de la taxonomie réelle pour le nom principal.
-        
-        condition_nom_vulgarise = pd.Series(False, index=df.index)
-        if 'nom_vulgarisé' in df.columns:
-            condition_nom_vulgarise = df['nom_vulgarisé'].fillna('').astype(str).str.contains(fallacy_name, case=False, na=False)
-        
-        condition_text_fr = pd.Series(False, index=df.index)
-        if 'text_fr' in df.columns: # text_fr peut aussi contenir des noms/labels
-            condition_text_fr = df['text_fr'].fillna('').astype(str).str.contains(fallacy_name, case=False, na=False)
-            
-        # On peut aussi chercher dans 'Latin' si pertinent
-        condition_latin = pd.Series(False, index=df.index)
-        if 'Latin' in df.columns:
-            condition_latin = df['Latin'].fillna('').astype(str).str.contains(fallacy_name, case=False, na=False)
-
-        found_fallacy = df[condition_nom_vulgarise | condition_text_fr | condition_latin]
+        # Recherche insensible à la casse et aux accents dans 'nom_vulgarisé', 'text_fr' et 'Latin'
+        # via l'index textuel partagé ; la première occurrence dans l'ordre de la taxonomie est retenue.
+        position = self._get_text_index().first_match(fallacy_name, ('nom_vulgarisé', 'text_fr', 'Latin'))
+        found_fallacy = df.iloc[[position]] if position is not None else df.iloc[0:0]
 
         if not found_fallacy.empty:
             # Prendre la première occurrence si plusieurs
@@ -670,7 +538,7 @@ class InformalAnalysisPlugin:
             return json.dumps({"error": "Taxonomie non disponible."})
 
         if 'Famille' in df.columns:
-            categories = df['Famille'].dropna().unique().tolist()
+            categories = list(self._get_taxonomy_store(df).positions_by_famille)
             if categories:
                 self._logger.info(f"{len(categories)} catégories trouvées.")
                 return json.dumps({"categories": categories}, default=str)
@@ -706,18 +574,18 @@ class InformalAnalysisPlugin:
             self._logger.warning("Colonne 'Famille' non trouvée pour lister les sophismes par catégorie.")
             return json.dumps({"category": category_name, "fallacies": [], "error": "Colonne 'Famille' pour les catégories non trouvée."})
 
-        # Filtrer par catégorie (cas sensible pour correspondre aux valeurs exactes de 'Famille')
-        fallacies_in_cat_df = df[df['Famille'] == category_name]
+        # Positions indexées par catégorie (cas sensible pour correspondre aux valeurs exactes de 'Famille')
+        store = self._get_taxonomy_store(df)
+        positions = store.positions_by_famille.get(category_name, ())
 
-        if not fallacies_in_cat_df.empty:
+        if positions:
+            # Utiliser nom_vulgarisé, sinon text_fr
+            name_column = next((col for col in ('nom_vulgarisé', 'text_fr') if col in store.column_names), None)
             result_list = []
-            for index, row in fallacies_in_cat_df.iterrows():
-                pk_val = index # PK est l'index
-                # Utiliser nom_vulgarisé, sinon text_fr
-                name_val = row.get('nom_vulgarisé', row.get('text_fr', 'Nom non disponible'))
+            for position in positions:
                 result_list.append({
-                    "pk": int(pk_val), # Assurer que PK est un entier
-                    "nom_vulgarisé": name_val # Utiliser la clé "nom_vulgarisé" pour la cohérence
+                    "pk": int(store.pks[position]), # PK est l'index
+                    "nom_vulgarisé": store.value(position, name_column) if name_column else 'Nom non disponible'
                 })
             self._logger.info(f"{len(result_list)} sophismes trouvés dans la catégorie '{category_name}'.")
             return json.dumps({"category": category_name, "fallacies": result_list}, default=str)
@@ -743,20 +611,9 @@ class InformalAnalysisPlugin:
         if df is None:
             return json.dumps({"error": "Taxonomie non disponible."})
 
-        # Recherche cas insensible dans 'nom_vulgarisé' et 'text_fr' (pour la taxonomie réelle)
-        condition_nom_vulgarise = pd.Series(False, index=df.index)
-        if 'nom_vulgarisé' in df.columns:
-            condition_nom_vulgarise = df['nom_vulgarisé'].fillna('').astype(str).str.contains(fallacy_name, case=False, na=False)
-        
-        condition_text_fr = pd.Series(False, index=df.index)
-        if 'text_fr' in df.columns:
-            condition_text_fr = df['text_fr'].fillna('').astype(str).str.contains(fallacy_name, case=False, na=False)
-
-        condition_latin = pd.Series(False, index=df.index)
-        if 'Latin' in df.columns:
-            condition_latin = df['Latin'].fillna('').astype(str).str.contains(fallacy_name, case=False, na=False)
-
-        found_fallacy = df[condition_nom_vulgarise | condition_text_fr | condition_latin]
+        # Recherche insensible à la casse et aux accents via l'index textuel partagé
+        position = self._get_text_index().first_match(fallacy_name, ('nom_vulgarisé', 'text_fr', 'Latin'))
+        found_fallacy = df.iloc[[position]] if position is not None else df.iloc[0:0]
 
         if not found_fallacy.empty:
             # Utiliser 'example_fr' pour l'exemple
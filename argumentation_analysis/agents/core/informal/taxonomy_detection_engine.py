@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Moteur de détection lexicale compilé pour la taxonomie des sophismes.
+
+Ce module précompile, une seule fois par fichier de taxonomie (identifié par
+le hash de son contenu), les structures nécessaires à la détection lexicale
+réalisée par `TaxonomySophismDetector` :
+- un index inversé des motifs normalisés (noms, noms vulgarisés, mots-clés
+  des descriptions) vers les lignes de la taxonomie ;
+- les caractéristiques de score de chaque ligne, dans l'ordre exact utilisé
+  par l'ancienne implémentation (`iterrows`) pour garantir des scores identiques ;
+- une table des descendants par préfixe de `path`, utilisée pour retrouver
+  les sophismes apparentés (frères/sœurs) sans filtrer le DataFrame.
+
+Un texte est analysé en un seul passage par l'automate d'Aho-Corasick construit
+sur l'ensemble des motifs (voir `taxonomy_text_index`), puis seules les lignes
+candidates sont évaluées.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# Réexporté pour les appelants historiques du moteur
+from argumentation_analysis.utils.taxonomy_snapshot import compute_taxonomy_fingerprint
+
+from .taxonomy_text_index import AhoCorasickAutomaton
+
+logger = logging.getLogger("TaxonomyDetectionEngine")
+
+# Poids historiques de l'analyse lexicale (voir TaxonomySophismDetector)
+NOM_VULGARISE_WEIGHT = 0.7
+NAME_WEIGHT = 0.5
+KEYWORD_WEIGHT = 0.1
+CONFIDENCE_THRESHOLD = 0.3
+MAX_KEYWORDS_PER_ENTRY = 5
+MIN_KEYWORD_LENGTH = 5
+MAX_RELATED_SOPHISMS = 5
+
+_FEATURE_NOM_VULGARISE = 0
+_FEATURE_NAME = 1
+_FEATURE_KEYWORD = 2
+
+
+class CompiledTaxonomyEngine:
+    """
+    Index immuable de détection lexicale construit à partir du DataFrame de taxonomie.
+
+    Les résultats de `score_text` sont identiques à ceux de l'ancienne boucle
+    `iterrows` : mêmes motifs, même ordre d'addition des poids, même seuil et
+    même ordre de tri (stable, par ordre des lignes du DataFrame).
+    """
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Optional[str] = None):
+        """
+        Compile l'index à partir du DataFrame de taxonomie (indexé par PK).
+
+        :param df: DataFrame de taxonomie tel que retourné par `InformalAnalysisPlugin`
+        :param fingerprint: Empreinte du fichier source (hash du contenu), si connue
+        """
+        self.fingerprint = fingerprint
+        self.size = len(df)
+
+        self._pks: List[Any] = list(df.index)
+        self._names = self._column_values(df, 'Name')
+        self._noms_vulgarises = self._column_values(df, 'nom_vulgarisé')
+        self._familles = self._column_values(df, 'Famille')
+        self._descriptions = self._column_values(df, 'text_fr')
+        self._depths = self._column_values(df, 'depth', default=0)
+        self._paths = self._column_values(df, 'path')
+        self._position_by_pk: Dict[Any, int] = {}
+        for position, pk in enumerate(self._pks):
+            self._position_by_pk.setdefault(pk, position)
+
+        # Caractéristiques de score par ligne : (type, motif, libellé de correspondance)
+        self._features: List[List[Tuple[int, str, str]]] = []
+        # Index inversé : motif -> positions des lignes qui l'utilisent
+        self._pattern_rows: Dict[str, List[int]] = {}
+
+        for position in range(self.size):
+            self._features.append(self._compile_row_features(position))
+
+        self._automaton = AhoCorasickAutomaton(self._pattern_rows)
+
+        self._descendants_by_prefix = self._build_descendants_table()
+        self._branch_context_cache: Dict[Any, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+
+        logger.info(
+            f"Moteur de détection compilé: {self.size} entrées, {len(self._pattern_rows)} motifs "
+            f"(empreinte: {fingerprint})."
+        )
+
+    @staticmethod
+    def _column_values(df: pd.DataFrame, column: str, default: Any = '') -> List[Any]:
+        """Retourne les valeurs brutes d'une colonne, ou `default` si elle est absente."""
+        if column in df.columns:
+            return df[column].tolist()
+        return [default] * len(df)
+
+    def _compile_row_features(self, position: int) -> List[Tuple[int, str, str]]:
+        """Précalcule les motifs d'une ligne dans l'ordre d'évaluation historique."""
+        features: List[Tuple[int, str, str]] = []
+
+        nom_vulgarise = str(self._noms_vulgarises[position]).lower()
+        name = str(self._names[position]).lower()
+        description = str(self._descriptions[position]).lower()
+
+        if nom_vulgarise:
+            features.append((_FEATURE_NOM_VULGARISE, nom_vulgarise, f"Nom vulgarisé: '{nom_vulgarise}'"))
+        if name:
+            features.append((_FEATURE_NAME, name, f"Nom officiel: '{name}'"))
+        if description:
+            desc_words = [w for w in description.split() if len(w) >= MIN_KEYWORD_LENGTH]
+            for word in desc_words[:MAX_KEYWORDS_PER_ENTRY]:
+                features.append((_FEATURE_KEYWORD, word, f"Mot-clé: '{word}'"))
+
+        for _, pattern, _ in features:
+            self._register_pattern(pattern, position)
+        return features
+
+    def _register_pattern(self, pattern: str, position: int) -> None:
+        """Ajoute une ligne à l'index inversé d'un motif."""
+        rows = self._pattern_rows.setdefault(pattern, [])
+        if not rows or rows[-1] != position:
+            rows.append(position)
+
+    def _build_descendants_table(self) -> Dict[str, List[int]]:
+        """
+        Construit la table préfixe de `path` -> positions des descendants.
+
+        Équivaut au filtre `path.startswith(parent_path + '.')` de l'ancienne
+        implémentation. Seules les premières entrées sont conservées, car au plus
+        `MAX_RELATED_SOPHISMS` apparentés (hors soi-même) sont retournés.
+        """
+        table: Dict[str, List[int]] = {}
+        keep = MAX_RELATED_SOPHISMS + 1
+        for position, path in enumerate(self._paths):
+            parts = str(path).split('.')
+            for length in range(1, len(parts)):
+                bucket = table.setdefault('.'.join(parts[:length]), [])
+                if len(bucket) < keep:
+                    bucket.append(position)
+        return table
+
+    def _matched_patterns(self, text_lower: str) -> set:
+        """Retourne l'ensemble des motifs présents dans le texte, en un seul passage."""
+        patterns = self._automaton.patterns
+        return {patterns[pattern_id] for pattern_id in self._automaton.find_patterns(text_lower)}
+
+    def score_text(self, text: str, max_results: int = 10) -> List[Tuple[int, float, List[str]]]:
+        """
+        Évalue un texte et retourne les meilleures lignes détectées.
+
+        :param text: Texte à analyser
+        :param max_results: Nombre maximum de résultats
+        :return: Liste de tuples (position, confiance, correspondances), triée par confiance
+        """
+        text_lower = text.lower()
+        matched = self._matched_patterns(text_lower)
+
+        candidates = set()
+        for pattern in matched:
+            candidates.update(self._pattern_rows[pattern])
+
+        scored: List[Tuple[int, float, List[str]]] = []
+        for position in sorted(candidates):
+            confidence = 0.0
+            matches = []
+            for feature_type, pattern, label in self._features[position]:
+                if pattern in matched:
+                    if feature_type == _FEATURE_NOM_VULGARISE:
+                        confidence += NOM_VULGARISE_WEIGHT
+                    elif feature_type == _FEATURE_NAME:
+                        confidence += NAME_WEIGHT
+                    else:
+                        confidence += KEYWORD_WEIGHT
+                    matches.append(label)
+            if confidence >= CONFIDENCE_THRESHOLD:
+                scored.append((position, confidence, matches))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:max_results]
+
+    def build_sophism(self, position: int, confidence: float, matches: List[str]) -> Dict[str, Any]:
+        """Construit le dictionnaire de résultat d'une détection (format historique)."""
+        return {
+            'taxonomy_key': int(self._pks[position]),
+            'name': self._names[position],
+            'nom_vulgarise': self._noms_vulgarises[position],
+            'famille': self._familles[position],
+            'description': self._descriptions[position],
+            'confidence': min(confidence, 1.0),
+            'matches': matches,
+            'depth': int(self._depths[position]),
+            'path': self._paths[position],
+            'detection_method': 'taxonomy_lexical'
+        }
+
+    def get_related_sophisms(self, taxonomy_key: int) -> Dict[str, Any]:
+        """
+        Retourne le contexte parent (frères/sœurs) d'un sophisme depuis la table précalculée.
+
+        :param taxonomy_key: Clé taxonomique du sophisme
+        :return: Contexte parent avec les sophismes apparentés
+        """
+        position = self._position_by_pk.get(taxonomy_key)
+        if position is None:
+            return {'siblings': []}
+
+        current_path = self._paths[position]
+        if not current_path:
+            return {'siblings': []}
+
+        path_parts = str(current_path).split('.')
+        if len(path_parts) <= 1:
+            return {'siblings': []}
+
+        parent_path = '.'.join(path_parts[:-1])
+        siblings_list = []
+        for sibling_position in self._descendants_by_prefix.get(parent_path, []):
+            if self._pks[sibling_position] == taxonomy_key:
+                continue
+            siblings_list.append({
+                'taxonomy_key': int(self._pks[sibling_position]),
+                'name': self._names[sibling_position],
+                'nom_vulgarise': self._noms_vulgarises[sibling_position],
+                'description_courte': self._descriptions[sibling_position]
+            })
+
+        return {
+            'parent_path': parent_path,
+            'siblings': siblings_list[:MAX_RELATED_SOPHISMS]
+        }
+
+    def get_branch_context(self, taxonomy_key: int, compute: Callable[[int], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Retourne le contexte de branche d'un sophisme, calculé une seule fois par clé.
+
+        Seuls les contextes calculés avec succès sont mémorisés : un contexte contenant
+        une clé `error` est renvoyé sans être mis en cache, pour être recalculé ensuite.
+
+        :param taxonomy_key: Clé taxonomique du sophisme
+        :param compute: Fonction de calcul du contexte (ex: `TaxonomySophismDetector.explore_branch`)
+        :return: Contexte de branche (structure partagée, à copier avant modification)
+        """
+        context = self._branch_context_cache.get(taxonomy_key)
+        if context is None:
+            context = compute(taxonomy_key)
+            if context.get('error'):
+                return context
+            with self._cache_lock:
+                context = self._branch_context_cache.setdefault(taxonomy_key, context)
+        return context
+
+
+_ENGINE_CACHE: Dict[str, CompiledTaxonomyEngine] = {}
+_ENGINE_CACHE_LOCK = threading.Lock()
+
+
+def get_compiled_engine(df: pd.DataFrame, fingerprint: Optional[str] = None) -> CompiledTaxonomyEngine:
+    """
+    Retourne le moteur compilé pour une taxonomie, en le partageant par empreinte de fichier.
+
+    Sans empreinte (DataFrame ne provenant pas d'un fichier), un moteur non partagé est construit.
+
+    :param df: DataFrame de taxonomie indexé par PK
+    :param fingerprint: Empreinte du fichier source (voir `compute_taxonomy_fingerprint`)
+    :return: Moteur de détection compilé
+    """
+    if fingerprint is None:
+        return CompiledTaxonomyEngine(df)
+
+    engine = _ENGINE_CACHE.get(fingerprint)
+    if engine is not None:
+        return engine
+    with _ENGINE_CACHE_LOCK:
+        engine = _ENGINE_CACHE.get(fingerprint)
+        if engine is None:
+            engine = CompiledTaxonomyEngine(df, fingerprint=fingerprint)
+            _ENGINE_CACHE[fingerprint] = engine
+    return engine
+
+
+def clear_engine_cache() -> None:
+    """Vide le cache global des moteurs compilés (utile pour les tests)."""
+    with _ENGINE_CACHE_LOCK:
+        _ENGINE_CACHE.clear()
@@ -11,6 +11,7 @@ Ce module implémente un mécanisme unifié de détection de sophismes qui :
 - Remplace les mécanismes éparpillés et les mocks
 """
 
+import copy
 import logging
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
@@ -18,6 +19,7 @@ from pathlib import Path
 
 # Import de l'InformalAnalysisPlugin pour accéder à la taxonomie
 from .informal_definitions import InformalAnalysisPlugin
+from .taxonomy_detection_engine import CompiledTaxonomyEngine, get_compiled_engine
 
 logger = logging.getLogger("TaxonomySophismDetector")
 
@@ -39,6 +41,7 @@ class TaxonomySophismDetector:
         self.logger = logging.getLogger("TaxonomySophismDetector")
         self.plugin = InformalAnalysisPlugin(taxonomy_file_path=taxonomy_file_path)
         self._taxonomy_cache = None
+        self._engine: Optional[CompiledTaxonomyEngine] = None
         
     def _get_taxonomy_df(self) -> pd.DataFrame:
         """Récupère le DataFrame de taxonomie avec cache."""
@@ -46,6 +49,18 @@ class TaxonomySophismDetector:
             self._taxonomy_cache = self.plugin._get_taxonomy_dataframe()
         return self._taxonomy_cache
     
+    def _get_engine(self) -> CompiledTaxonomyEngine:
+        """
+        Récupère le moteur de détection compilé, partagé par hash du fichier de taxonomie.
+        
+        :return: Moteur compilé (index inversé et tables parent/frères précalculées)
+        """
+        if self._engine is None:
+            df = self._get_taxonomy_df()
+            # L'empreinte n'est connue que si la taxonomie a réellement été chargée depuis un fichier
+            self._engine = get_compiled_engine(df, self.plugin._taxonomy_fingerprint)
+        return self._engine
+    
     def get_main_branches(self) -> List[Dict[str, Any]]:
         """
         Récupère les branches principales de la taxonomie (niveau 0/1).
@@ -126,70 +141,28 @@ class TaxonomySophismDetector:
         :param max_sophisms: Nombre maximum de sophismes à détecter
         :return: Liste des sophismes détectés avec leurs clés taxonomiques
         """
-        detected_sophisms = []
-        
         try:
-            df = self._get_taxonomy_df()
-            text_lower = text.lower()
+            engine = self._get_engine()
             
-            # 1. Analyse lexicale basée sur les noms et descriptions
-            for pk, row in df.iterrows():
-                confidence = 0.0
-                matches = []
-                
-                # Vérifier les correspondances avec les noms
-                name = str(row.get('Name', '')).lower()
-                nom_vulgarise = str(row.get('nom_vulgarisé', '')).lower()
-                description = str(row.get('text_fr', '')).lower()
-                
-                # Correspondance avec le nom vulgarisé (plus probable)
-                if nom_vulgarise and nom_vulgarise in text_lower:
-                    confidence += 0.7
-                    matches.append(f"Nom vulgarisé: '{nom_vulgarise}'")
-                
-                # Correspondance avec le nom officiel
-                if name and name in text_lower:
-                    confidence += 0.5
-                    matches.append(f"Nom officiel: '{name}'")
-                
-                # Correspondance avec des mots-clés de la description
-                if description:
-                    desc_words = [w for w in description.split() if len(w) > 4]
-                    for word in desc_words[:5]:  # Limiter aux 5 premiers mots significatifs
-                        if word in text_lower:
-                            confidence += 0.1
-                            matches.append(f"Mot-clé: '{word}'")
-                
-                # Si on a des correspondances significatives
-                if confidence >= 0.3:
-                    sophism = {
-                        'taxonomy_key': int(pk),
-                        'name': row.get('Name', ''),
-                        'nom_vulgarise': row.get('nom_vulgarisé', ''),
-                        'famille': row.get('Famille', ''),
-                        'description': row.get('text_fr', ''),
-                        'confidence': min(confidence, 1.0),
-                        'matches': matches,
-                        'depth': int(row.get('depth', 0)),
-                        'path': row.get('path', ''),
-                        'detection_method': 'taxonomy_lexical'
-                    }
-                    detected_sophisms.append(sophism)
-            
-            # 2. Trier par confiance et limiter
-            detected_sophisms.sort(key=lambda x: x['confidence'], reverse=True)
-            detected_sophisms = detected_sophisms[:max_sophisms]
+            # 1. Analyse lexicale en un seul passage via l'index inversé compilé
+            scored = engine.score_text(text, max_results=max_sophisms)
+            detected_sophisms = [
+                engine.build_sophism(position, confidence, matches)
+                for position, confidence, matches in scored
+            ]
             
-            # 3. Enrichir avec le contexte taxonomique
+            # 2. Enrichir avec le contexte taxonomique (mémorisé par clé dans le moteur)
             for sophism in detected_sophisms:
                 taxonomy_key = sophism['taxonomy_key']
                 
                 # Ajouter les détails de la branche
-                branch_details = self.explore_branch(taxonomy_key, max_depth=2)
-                sophism['branch_context'] = branch_details
+                branch_details = engine.get_branch_context(
+                    taxonomy_key, lambda key: self.explore_branch(key, max_depth=2)
+                )
+                sophism['branch_context'] = copy.deepcopy(branch_details)
                 
                 # Ajouter les sophismes apparentés (frères/sœurs)
-                parent_context = self._get_parent_context(taxonomy_key)
+                parent_context = engine.get_related_sophisms(taxonomy_key)
                 sophism['related_sophisms'] = parent_context.get('siblings', [])
             
             self.logger.info(f"Détection terminée: {len(detected_sophisms)} sophismes trouvés")
@@ -199,6 +172,26 @@ class TaxonomySophismDetector:
             self.logger.error(f"Erreur lors de la détection de sophismes: {e}")
             return []
     
+    def detect_batch(self, texts: List[str], max_sophisms: int = 10) -> List[List[Dict[str, Any]]]:
+        """
+        Détecte les sophismes dans une série de textes avec le même moteur compilé.
+        
+        Les textes identiques ne sont analysés qu'une fois.
+        
+        :param texts: Textes à analyser
+        :param max_sophisms: Nombre maximum de sophismes à détecter par texte
+        :return: Une liste de détections par texte, dans l'ordre des entrées
+        """
+        results_by_text: Dict[str, List[Dict[str, Any]]] = {}
+        batch_results = []
+        for text in texts:
+            if text not in results_by_text:
+                results_by_text[text] = self.detect_sophisms_from_taxonomy(text, max_sophisms=max_sophisms)
+                batch_results.append(results_by_text[text])
+            else:
+                batch_results.append(copy.deepcopy(results_by_text[text]))
+        return batch_results
+    
     def _get_parent_context(self, taxonomy_key: int) -> Dict[str, Any]:
         """
         Récupère le contexte parent d'un sophisme (frères/sœurs).
@@ -207,42 +200,8 @@ class TaxonomySophismDetector:
         :return: Contexte parent avec les sophismes apparentés
         """
         try:
-            df = self._get_taxonomy_df()
-            
-            if taxonomy_key not in df.index:
-                return {'siblings': []}
-            
-            current_row = df.loc[taxonomy_key]
-            current_path = current_row.get('path', '')
-            
-            if not current_path:
-                return {'siblings': []}
-            
-            # Trouver le path parent
-            path_parts = str(current_path).split('.')
-            if len(path_parts) <= 1:
-                return {'siblings': []}
-            
-            parent_path = '.'.join(path_parts[:-1])
-            
-            # Trouver les frères/sœurs (même parent)
-            siblings = df[df['path'].astype(str).str.startswith(parent_path + '.', na=False)]
-            siblings = siblings[siblings.index != taxonomy_key]  # Exclure soi-même
-            
-            siblings_list = []
-            for _, sibling in siblings.iterrows():
-                sibling_info = {
-                    'taxonomy_key': int(sibling.name),
-                    'name': sibling.get('Name', ''),
-                    'nom_vulgarise': sibling.get('nom_vulgarisé', ''),
-                    'description_courte': sibling.get('text_fr', '')
-                }
-                siblings_list.append(sibling_info)
-            
-            return {
-                'parent_path': parent_path,
-                'siblings': siblings_list[:5]  # Limiter à 5 frères/sœurs
-            }
+            # Table des descendants par préfixe de path précalculée dans le moteur
+            return self._get_engine().get_related_sophisms(taxonomy_key)
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la récupération du contexte parent: {e}")
@@ -270,46 +229,47 @@ class TaxonomySophismDetector:
         """
         Recherche des sophismes par motif dans les noms et descriptions.
         
+        La recherche est insensible à la casse et aux accents et passe par l'index
+        textuel partagé avec `InformalAnalysisPlugin` : son coût dépend du motif et
+        du nombre de résultats, pas de la taille de la taxonomie.
+        
         :param pattern: Motif à rechercher
         :param max_results: Nombre maximum de résultats
         :return: Liste des sophismes correspondants
         """
         try:
             df = self._get_taxonomy_df()
-            pattern_lower = pattern.lower()
+            index = self.plugin._get_text_index()
             
-            matching_sophisms = []
+            # Poids par champ, additionnés dans cet ordre
+            weighted_columns = (
+                ('nom_vulgarisé', 0.8),
+                ('Name', 0.6),
+                ('text_fr', 0.4),
+                ('Famille', 0.3),
+            )
+            hits = index.search_columns(pattern, [column for column, _ in weighted_columns])
+            candidates = set().union(*hits.values())
             
-            for pk, row in df.iterrows():
+            matching_sophisms = []
+            for position in sorted(candidates):
                 score = 0.0
+                for column, weight in weighted_columns:
+                    if position in hits[column]:
+                        score += weight
                 
-                # Recherche dans les différents champs
-                name = str(row.get('Name', '')).lower()
-                nom_vulgarise = str(row.get('nom_vulgarisé', '')).lower()
-                description = str(row.get('text_fr', '')).lower()
-                famille = str(row.get('Famille', '')).lower()
-                
-                if pattern_lower in nom_vulgarise:
-                    score += 0.8
-                if pattern_lower in name:
-                    score += 0.6
-                if pattern_lower in description:
-                    score += 0.4
-                if pattern_lower in famille:
-                    score += 0.3
-                
-                if score > 0:
-                    sophism = {
-                        'taxonomy_key': int(pk),
-                        'name': row.get('Name', ''),
-                        'nom_vulgarise': row.get('nom_vulgarisé', ''),
-                        'famille': row.get('Famille', ''),
-                        'description': row.get('text_fr', ''),
-                        'match_score': score,
-                        'depth': int(row.get('depth', 0)),
-                        'path': row.get('path', '')
-                    }
-                    matching_sophisms.append(sophism)
+                row = df.iloc[position]
+                sophism = {
+                    'taxonomy_key': int(row.name),
+                    'name': row.get('Name', ''),
+                    'nom_vulgarise': row.get('nom_vulgarisé', ''),
+                    'famille': row.get('Famille', ''),
+                    'description': row.get('text_fr', ''),
+                    'match_score': score,
+                    'depth': int(row.get('depth', 0)),
+                    'path': row.get('path', '')
+                }
+                matching_sophisms.append(sophism)
             
             # Trier par score et limiter
             matching_sophisms.sort(key=lambda x: x['match_score'], reverse=True)
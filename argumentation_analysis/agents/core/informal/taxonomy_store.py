@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Stockage en lecture seule et partagé de la taxonomie des sophismes.
+
+Ce module fournit `TaxonomyStore`, une vue immuable de la taxonomie construite
+une seule fois par fichier (identifié par l'empreinte de son contenu) et
+partagée par toutes les instances de `InformalAnalysisPlugin` et de
+`TaxonomySophismDetector` du processus. Le store expose :
+- des vues du DataFrame source partageant ses données : grâce au Copy-on-Write
+  de pandas, une vue modifiée est copiée à la première écriture et le DataFrame
+  partagé reste intact (sans Copy-on-Write, une copie complète est retournée) ;
+- des tableaux de colonnes numpy en lecture seule ;
+- des listes d'adjacence parent -> enfants indexées par PK, calculées selon
+  les mêmes règles que l'ancienne exploration par filtrage (`FK_Parent`,
+  puis `parent_pk`, puis `path`) ;
+- un index des entrées par `Famille`.
+
+Les explorations de hiérarchie deviennent ainsi des lectures de tuples plutôt
+que des filtrages du DataFrame complet.
+"""
+
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("TaxonomyStore")
+
+
+def _copy_on_write_enabled() -> bool:
+    """Indique si pandas copie les données d'une vue à la première écriture."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True  # Copy-on-Write toujours actif à partir de pandas 3
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        return False
+
+
+class TaxonomyStore:
+    """
+    Vue immuable de la taxonomie des sophismes (colonnes et adjacence par PK).
+
+    Les positions manipulées sont les positions des lignes dans `frame`,
+    dans l'ordre de la taxonomie.
+    """
+
+    def __init__(self, frame: pd.DataFrame, fingerprint: Optional[str] = None):
+        """
+        Construit les tables d'accès à partir d'un DataFrame indexé par PK.
+
+        Le DataFrame n'est pas modifié ; il ne doit plus l'être une fois partagé.
+
+        :param frame: DataFrame de taxonomie (index = PK)
+        :param fingerprint: Empreinte du fichier source, si connue
+        """
+        self._frame = frame
+        self.fingerprint = fingerprint
+        self.size = len(frame)
+        self.column_names: Tuple[str, ...] = tuple(frame.columns)
+        self.pks: Tuple[Any, ...] = tuple(frame.index.tolist())
+        self._columns: Dict[str, np.ndarray] = {}
+        self._columns_lock = threading.Lock()
+
+        position_by_pk: Dict[Any, int] = {}
+        for position, pk in enumerate(self.pks):
+            position_by_pk.setdefault(pk, position)
+        self.position_by_pk: Mapping[Any, int] = MappingProxyType(position_by_pk)
+
+        depths = pd.to_numeric(frame['depth'], errors='coerce') if 'depth' in frame.columns else None
+        self.depths: Tuple[Optional[int], ...] = tuple(
+            int(depth) if pd.notna(depth) else None for depth in depths
+        ) if depths is not None else (None,) * self.size
+
+        self._first_position_by_path: Dict[Any, int] = {}
+        if 'path' in frame.columns:
+            for position, path in enumerate(self.column('path')):
+                if pd.notna(path):
+                    self._first_position_by_path.setdefault(path, position)
+
+        self._parent_column = next((col for col in ('FK_Parent', 'parent_pk') if col in frame.columns), None)
+        self.children_by_pk: Mapping[Any, Tuple[int, ...]] = MappingProxyType(self._build_children())
+
+        familles: Dict[Any, List[int]] = {}
+        if 'Famille' in frame.columns:
+            for position, famille in enumerate(self.column('Famille')):
+                if pd.notna(famille):
+                    familles.setdefault(famille, []).append(position)
+        self.positions_by_famille: Mapping[Any, Tuple[int, ...]] = MappingProxyType(
+            {famille: tuple(positions) for famille, positions in familles.items()}
+        )
+
+        logger.info(
+            f"Store de taxonomie construit: {self.size} entrées, "
+            f"{sum(1 for children in self.children_by_pk.values() if children)} nœuds avec enfants "
+            f"(empreinte: {fingerprint})."
+        )
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        Retourne une vue en lecture seule du DataFrame source.
+
+        La vue partage les données du DataFrame du store, sans les copier. Avec le
+        Copy-on-Write de pandas, une écriture dans la vue copie uniquement les données
+        modifiées : le store des autres instances n'est jamais altéré. Sans
+        Copy-on-Write (pandas < 3 sans `mode.copy_on_write`), une copie complète est
+        retournée.
+        """
+        if _copy_on_write_enabled():
+            return self._frame.copy(deep=False)
+        return self._frame.copy()
+
+    def is_built_from(self, frame: pd.DataFrame) -> bool:
+        """Indique si le store a été construit à partir de ce DataFrame (même objet)."""
+        return frame is self._frame
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Retourne les valeurs d'une colonne sous forme de tableau numpy en lecture seule.
+
+        :param name: Nom de la colonne
+        :return: Tableau non modifiable (construit à la première demande ; il partage
+            les données du DataFrame lorsque le type de la colonne le permet)
+        :raises KeyError: Si la colonne n'existe pas
+        """
+        values = self._columns.get(name)
+        if values is None:
+            with self._columns_lock:
+                values = self._columns.get(name)
+                if values is None:
+                    values = np.asarray(self._frame[name].to_numpy()).view()
+                    values.flags.writeable = False
+                    self._columns[name] = values
+        return values
+
+    def value(self, position: int, name: str, default: Any = '') -> Any:
+        """Retourne la valeur brute d'une cellule, ou `default` si la colonne est absente."""
+        if name not in self.column_names:
+            return default
+        return self.column(name)[position]
+
+    def _build_children(self) -> Dict[Any, Tuple[int, ...]]:
+        """
+        Calcule les enfants directs de chaque PK.
+
+        Règles (identiques à l'ancien filtrage du DataFrame) : colonne `FK_Parent`
+        ou `parent_pk` si présente, sinon enfants directs par `path`
+        (`<path du parent>.<segment sans point>`). Un nœud sans `path` renseigné
+        mais de profondeur connue a pour enfants les entrées de profondeur
+        `depth + 1`.
+        """
+        children: Dict[Any, List[int]] = {}
+        if self._parent_column is not None:
+            for position, parent in enumerate(self.column(self._parent_column)):
+                if pd.notna(parent):
+                    children.setdefault(parent, []).append(position)
+            return {pk: tuple(children.get(pk, ())) for pk in self.position_by_pk}
+
+        if 'path' in self.column_names:
+            raw_paths = self.column('path')
+        else:
+            raw_paths = (None,) * self.size
+        has_path = [pd.notna(path) and path != '' for path in raw_paths]
+        paths = [str(path) if present else '' for path, present in zip(raw_paths, has_path)]
+        for position, path in enumerate(paths):
+            if '.' in path:
+                children.setdefault(path.rsplit('.', 1)[0], []).append(position)
+
+        positions_by_depth: Dict[int, List[int]] = {}
+        for position, depth in enumerate(self.depths):
+            if depth is not None:
+                positions_by_depth.setdefault(depth, []).append(position)
+
+        result: Dict[Any, Tuple[int, ...]] = {}
+        for pk, position in self.position_by_pk.items():
+            if has_path[position]:
+                result[pk] = tuple(children.get(paths[position], ()))
+            elif self.depths[position] is not None:
+                result[pk] = tuple(positions_by_depth.get(self.depths[position] + 1, ()))
+            else:
+                result[pk] = ()
+        return result
+
+    def position_of(self, pk: Any) -> Optional[int]:
+        """Retourne la position de la première ligne de PK donnée, ou None."""
+        return self.position_by_pk.get(pk)
+
+    def children_of(self, pk: Any) -> Tuple[int, ...]:
+        """Retourne les positions des enfants directs d'une PK (ordre de la taxonomie)."""
+        return self.children_by_pk.get(pk, ())
+
+    def parent_of(self, pk: Any) -> Optional[int]:
+        """
+        Retourne la position du parent d'une PK.
+
+        Utilise `FK_Parent`/`parent_pk` lorsqu'une valeur est renseignée, sinon le
+        nœud dont le `path` est le préfixe direct de celui de l'entrée.
+
+        :param pk: Clé primaire de l'entrée
+        :return: Position du parent, ou None s'il n'y en a pas
+        """
+        position = self.position_of(pk)
+        if position is None:
+            return None
+
+        for column in ('FK_Parent', 'parent_pk'):
+            if column in self.column_names:
+                parent_value = self.column(column)[position]
+                if pd.notna(parent_value):
+                    try:
+                        return self.position_of(int(parent_value))
+                    except (TypeError, ValueError):
+                        logger.warning(f"Valeur {column} non entière pour le nœud {pk}: {parent_value}")
+                        return None
+
+        if 'path' in self.column_names:
+            path_value = self.column('path')[position]
+            if pd.notna(path_value) and '.' in str(path_value):
+                parent_path = str(path_value).rsplit('.', 1)[0]
+                return self._first_position_by_path.get(parent_path)
+        return None
+
+    def row_dict(self, position: int) -> Dict[str, Any]:
+        """
+        Retourne les valeurs renseignées d'une ligne, converties en types Python natifs.
+
+        :param position: Position de la ligne
+        :return: Dictionnaire colonne -> valeur (les valeurs manquantes sont omises)
+        """
+        row: Dict[str, Any] = {}
+        for name in self.column_names:
+            value = self.column(name)[position]
+            if pd.notna(value):
+                row[name] = value.item() if hasattr(value, 'item') else value
+        return row
+
+
+_STORE_REGISTRY: Dict[str, TaxonomyStore] = {}
+_STORE_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registered_taxonomy_store(fingerprint: Optional[str]) -> Optional[TaxonomyStore]:
+    """
+    Retourne le store partagé d'une taxonomie déjà chargée dans le processus.
+
+    :param fingerprint: Empreinte du fichier de taxonomie
+    :return: Le store partagé, ou None s'il n'a pas encore été enregistré
+    """
+    if fingerprint is None:
+        return None
+    return _STORE_REGISTRY.get(fingerprint)
+
+
+def register_taxonomy_store(frame: pd.DataFrame, fingerprint: Optional[str]) -> TaxonomyStore:
+    """
+    Enregistre un DataFrame fraîchement chargé comme store partagé du processus.
+
+    Si un store existe déjà pour cette empreinte (chargement concurrent), il est
+    retourné et le DataFrame fourni est abandonné. Sans empreinte, le store n'est
+    pas partagé.
+
+    :param frame: DataFrame de taxonomie préparé (index = PK)
+    :param fingerprint: Empreinte du fichier source
+    :return: Le store partagé pour cette empreinte
+    """
+    if fingerprint is None:
+        return TaxonomyStore(frame)
+    with _STORE_REGISTRY_LOCK:
+        store = _STORE_REGISTRY.get(fingerprint)
+        if store is None:
+            store = TaxonomyStore(frame, fingerprint=fingerprint)
+            _STORE_REGISTRY[fingerprint] = store
+    return store
+
+
+def clear_taxonomy_store_registry() -> None:
+    """Vide le registre des stores partagés (utile pour les tests)."""
+    with _STORE_REGISTRY_LOCK:
+        _STORE_REGISTRY.clear()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Index textuel partagé et immuable sur les colonnes de la taxonomie des sophismes.
+
+Ce module fournit :
+- `fold_text` : normalisation insensible à la casse et aux accents pour le français
+  (« Généralisation hâtive » et « generalisation HATIVE » sont équivalents) ;
+- `AhoCorasickAutomaton` : automate multi-motifs permettant de trouver en un seul
+  passage tous les motifs présents dans un document ;
+- `TaxonomyTextIndex` : index de suffixes par colonne (`Name`, `nom_vulgarisé`,
+  `text_fr`, `Famille`, `Latin`) dont le coût d'une requête dépend de la longueur
+  de la requête et du nombre de résultats, et non de la taille de la taxonomie.
+
+L'index est construit une fois par fichier de taxonomie (voir
+`get_taxonomy_text_index`) et partagé entre `InformalAnalysisPlugin` et
+`TaxonomySophismDetector`.
+"""
+
+import bisect
+import logging
+import math
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger("TaxonomyTextIndex")
+
+SEARCH_COLUMNS: Tuple[str, ...] = ('Name', 'nom_vulgarisé', 'text_fr', 'Famille', 'Latin')
+
+# Longueur des clés de suffixe conservées ; les requêtes plus longues sont vérifiées sur la valeur
+SUFFIX_KEY_LENGTH = 48
+
+_TYPOGRAPHIC_EQUIVALENTS = str.maketrans({
+    '’': "'", '‘': "'", 'ʼ': "'", '´': "'",
+    '“': '"', '”': '"', '«': '"', '»': '"',
+    '–': '-', '—': '-', '\u00a0': ' ', '\u202f': ' ',
+    'œ': 'oe', 'Œ': 'oe', 'æ': 'ae', 'Æ': 'ae',
+})
+
+
+def fold_text(value: Any) -> str:
+    """
+    Normalise un texte pour une comparaison insensible à la casse et aux accents.
+
+    Les valeurs manquantes (None, NaN) sont normalisées en chaîne vide.
+
+    :param value: Valeur à normaliser
+    :return: Texte sans accents, en minuscules, avec apostrophes et ligatures unifiées
+    """
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ''
+    decomposed = unicodedata.normalize('NFKD', str(value).translate(_TYPOGRAPHIC_EQUIVALENTS))
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+class AhoCorasickAutomaton:
+    """
+    Automate d'Aho-Corasick immuable pour la recherche simultanée de plusieurs motifs.
+
+    Les motifs sont utilisés tels quels : la normalisation (ex: `fold_text`) est
+    à la charge de l'appelant, qui doit appliquer la même au document analysé.
+    """
+
+    __slots__ = ('patterns', '_goto', '_fail', '_outputs')
+
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Construit l'automate.
+
+        :param patterns: Motifs à rechercher ; leur identifiant est leur position
+                         dans `self.patterns` (les motifs vides sont ignorés à la recherche)
+        """
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        self._goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+
+        # Liens d'échec calculés en largeur ; les sorties héritent de celles du lien d'échec
+        self._fail: List[int] = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                outputs[child].extend(outputs[self._fail[child]])
+
+        self._outputs: List[Tuple[int, ...]] = [tuple(out) for out in outputs]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Parcourt le texte une fois et produit chaque occurrence de motif.
+
+        :param text: Document (déjà normalisé comme les motifs)
+        :return: Itérateur de tuples (position de fin exclusive, identifiant du motif)
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern_id in outputs[state]:
+                yield position + 1, pattern_id
+
+    def find_patterns(self, text: str) -> Set[int]:
+        """
+        Retourne les identifiants des motifs présents au moins une fois dans le texte.
+
+        :param text: Document (déjà normalisé comme les motifs)
+        :return: Ensemble des identifiants de motifs trouvés
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class TaxonomyTextIndex:
+    """
+    Index de recherche textuelle immuable sur les colonnes de la taxonomie.
+
+    Chaque colonne indexée dispose d'un tableau trié de suffixes (tronqués à
+    `SUFFIX_KEY_LENGTH` caractères) de ses valeurs normalisées : la recherche
+    d'une sous-chaîne est une recherche dichotomique suivie du parcours des
+    seuls suffixes correspondants. Les résultats sont des positions de lignes
+    du DataFrame source, triées dans l'ordre de la taxonomie.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str] = SEARCH_COLUMNS,
+                 fingerprint: Optional[str] = None):
+        """
+        Construit l'index pour les colonnes présentes dans le DataFrame.
+
+        :param df: DataFrame de taxonomie
+        :param columns: Colonnes à indexer (les colonnes absentes sont ignorées)
+        :param fingerprint: Empreinte du fichier source, si connue
+        """
+        self.fingerprint = fingerprint
+        self.size = len(df)
+        self.columns: Tuple[str, ...] = tuple(col for col in columns if col in df.columns)
+        self._folded: Dict[str, Tuple[str, ...]] = {}
+        self._suffix_keys: Dict[str, List[str]] = {}
+        self._suffix_rows: Dict[str, List[int]] = {}
+        self._automata: Dict[str, AhoCorasickAutomaton] = {}
+        self._automata_lock = threading.Lock()
+
+        for column in self.columns:
+            folded = tuple(fold_text(value) for value in df[column].tolist())
+            suffixes = sorted(
+                (value[start:start + SUFFIX_KEY_LENGTH], position)
+                for position, value in enumerate(folded)
+                for start in range(len(value))
+            )
+            self._folded[column] = folded
+            self._suffix_keys[column] = [key for key, _ in suffixes]
+            self._suffix_rows[column] = [position for _, position in suffixes]
+
+        logger.info(
+            f"Index textuel de taxonomie construit: {self.size} entrées, colonnes {list(self.columns)} "
+            f"(empreinte: {fingerprint})."
+        )
+
+    def folded_value(self, column: str, position: int) -> str:
+        """Retourne la valeur normalisée d'une cellule (chaîne vide si colonne non indexée)."""
+        values = self._folded.get(column)
+        return values[position] if values is not None else ''
+
+    def search(self, query: str, column: str) -> List[int]:
+        """
+        Retourne les lignes dont la colonne contient la requête (insensible casse/accents).
+
+        :param query: Sous-chaîne recherchée
+        :param column: Colonne à interroger
+        :return: Positions des lignes correspondantes, triées
+        """
+        if column not in self._suffix_keys:
+            return []
+        folded_query = fold_text(query)
+        if not folded_query:
+            return list(range(self.size))
+
+        keys = self._suffix_keys[column]
+        rows = self._suffix_rows[column]
+        key = folded_query[:SUFFIX_KEY_LENGTH]
+        hits = set()
+        index = bisect.bisect_left(keys, key)
+        while index < len(keys) and keys[index].startswith(key):
+            hits.add(rows[index])
+            index += 1
+
+        if len(folded_query) > SUFFIX_KEY_LENGTH:
+            values = self._folded[column]
+            hits = {position for position in hits if folded_query in values[position]}
+        return sorted(hits)
+
+    def search_columns(self, query: str, columns: Sequence[str]) -> Dict[str, Set[int]]:
+        """
+        Interroge plusieurs colonnes pour une même requête.
+
+        :param query: Sous-chaîne recherchée
+        :param columns: Colonnes à interroger
+        :return: Dictionnaire colonne -> ensemble des positions correspondantes
+        """
+        return {column: set(self.search(query, column)) for column in columns}
+
+    def first_match(self, query: str, columns: Sequence[str]) -> Optional[int]:
+        """
+        Retourne la première ligne (ordre de la taxonomie) dont l'une des colonnes contient la requête.
+
+        :param query: Sous-chaîne recherchée
+        :param columns: Colonnes à interroger
+        :return: Position de la ligne, ou None si aucune correspondance
+        """
+        first = None
+        for column in columns:
+            positions = self.search(query, column)
+            if positions and (first is None or positions[0] < first):
+                first = positions[0]
+        return first
+
+    def automaton(self, column: str) -> AhoCorasickAutomaton:
+        """
+        Retourne l'automate multi-motifs des valeurs d'une colonne (construit à la première demande).
+
+        :param column: Colonne dont les valeurs normalisées servent de motifs
+        :return: Automate dont l'identifiant de motif est la position de la ligne
+        """
+        automaton = self._automata.get(column)
+        if automaton is None:
+            with self._automata_lock:
+                automaton = self._automata.get(column)
+                if automaton is None:
+                    automaton = AhoCorasickAutomaton(self._folded.get(column, ()))
+                    self._automata[column] = automaton
+        return automaton
+
+    def scan_document(self, text: str, columns: Sequence[str] = ('nom_vulgarisé', 'text_fr')) -> Dict[str, List[int]]:
+        """
+        Trouve en un passage par colonne toutes les lignes dont la valeur apparaît dans un document.
+
+        :param text: Document à analyser
+        :param columns: Colonnes dont les valeurs sont recherchées
+        :return: Dictionnaire colonne -> positions des lignes trouvées, triées
+        """
+        folded_text = fold_text(text)
+        return {
+            column: sorted(self.automaton(column).find_patterns(folded_text))
+            for column in columns if column in self._folded
+        }
+
+
+_INDEX_CACHE: Dict[str, TaxonomyTextIndex] = {}
+_INDEX_CACHE_LOCK = threading.Lock()
+
+
+def get_taxonomy_text_index(df: pd.DataFrame, fingerprint: Optional[str] = None) -> TaxonomyTextIndex:
+    """
+    Retourne l'index textuel d'une taxonomie, partagé par empreinte de fichier.
+
+    Sans empreinte (DataFrame ne provenant pas d'un fichier), un index non partagé est construit.
+
+    :param df: DataFrame de taxonomie
+    :param fingerprint: Empreinte du fichier source
+    :return: Index textuel immuable
+    """
+    if fingerprint is None:
+        return TaxonomyTextIndex(df)
+
+    index = _INDEX_CACHE.get(fingerprint)
+    if index is not None:
+        return index
+    with _INDEX_CACHE_LOCK:
+        index = _INDEX_CACHE.get(fingerprint)
+        if index is None:
+            index = TaxonomyTextIndex(df, fingerprint=fingerprint)
+            _INDEX_CACHE[fingerprint] = index
+    return index
+
+
+def clear_text_index_cache() -> None:
+    """Vide le cache global des index textuels (utile pour les tests)."""
+    with _INDEX_CACHE_LOCK:
+        _INDEX_CACHE.clear()
@@ -1,7 +1,10 @@
+import hashlib
 import jpype
 from jpype.types import JString
 import logging
-from typing import Optional, List
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, List, Tuple
 # La configuration du logging (appel à setup_logging()) est supposée être faite globalement,
 # par exemple au point d'entrée de l'application ou dans conftest.py pour les tests.
 from argumentation_analysis.utils.core_utils.logging_utils import setup_logging
@@ -11,13 +14,34 @@ from .tweety_initializer import TweetyInitializer
 setup_logging() # Appel de la configuration globale du logging
 logger = logging.getLogger(__name__) # Obtient le logger pour ce module
 
+# Maximum number of parsed knowledge bases kept by a PLHandler
+DEFAULT_KB_CACHE_SIZE = 64
+
+
+class CompiledPLKnowledgeBase:
+    """A knowledge base parsed once into a Java PlBeliefSet, reused across queries."""
+    __slots__ = ("belief_set", "signature", "formula_count", "consistent")
+
+    def __init__(self, belief_set: Any, signature: Any, formula_count: int):
+        self.belief_set = belief_set
+        # PlSignature built from the constants (None when no constants were given)
+        self.signature = signature
+        self.formula_count = formula_count
+        # Consistency result, computed on first request
+        self.consistent: Optional[bool] = None
+
+
 class PLHandler:
     """
     Handles Propositional Logic (PL) operations using TweetyProject.
     Relies on TweetyInitializer for JVM and PL component setup.
+
+    Knowledge bases are parsed once and kept in a bounded LRU cache keyed by the
+    hash of their text and the constants, so that repeated queries and consistency
+    checks against the same belief set skip splitting, normalization and parsing.
     """
 
-    def __init__(self, initializer_instance: TweetyInitializer):
+    def __init__(self, initializer_instance: TweetyInitializer, kb_cache_size: int = DEFAULT_KB_CACHE_SIZE):
         self._initializer_instance = initializer_instance
         self._pl_parser = self._initializer_instance.get_pl_parser()
         self._pl_reasoner = self._initializer_instance.get_pl_reasoner()
@@ -26,6 +50,17 @@ class PLHandler:
             logger.error("PL components not initialized. Ensure TweetyBridge calls TweetyInitializer first.")
             raise RuntimeError("PLHandler initialized before TweetyInitializer completed PL setup.")
 
+        # Java classes are resolved once instead of on every call
+        self._PlBeliefSet = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlBeliefSet")
+        self._PlSignature = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlSignature")
+        self._Proposition = jpype.JClass("org.tweetyproject.logics.pl.syntax.Proposition")
+        self._Contradiction = jpype.JClass("org.tweetyproject.logics.pl.syntax.Contradiction")
+
+        self._kb_cache_size = kb_cache_size
+        self._kb_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], CompiledPLKnowledgeBase]" = OrderedDict()
+        self._kb_cache_lock = threading.Lock()
+        self._kb_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
     def _normalize_formula(self, formula_str: str) -> str:
         """
         Normalizes a formula string to be compatible with Tweety's parser.
@@ -103,8 +138,22 @@ class PLHandler:
         logger.debug(f"Normalized formula to: '{formula_str}'")
         return formula_str
 
-    def parse_pl_formula(self, formula_str: str, constants: Optional[List[str]] = None):
-        """Parses a PL formula string into a TweetyProject PlFormula object."""
+    def _build_signature(self, constants: List[str]):
+        """Builds a PlSignature containing the given constants as propositions."""
+        signature = self._PlSignature()
+        for const_name in constants:
+            proposition = self._Proposition(JString(const_name))
+            if not signature.contains(proposition):
+                signature.add(proposition)
+        return signature
+
+    def parse_pl_formula(self, formula_str: str, constants: Optional[List[str]] = None, signature: Any = None):
+        """
+        Parses a PL formula string into a TweetyProject PlFormula object.
+
+        `signature` is a PlSignature to parse against (e.g. the one of a compiled
+        knowledge base); when omitted, one is built from `constants`.
+        """
         # Enhanced filtering for markdown artifacts and invalid formulas
         if not isinstance(formula_str, str):
             return None
@@ -131,20 +180,15 @@ class PLHandler:
         logger.debug(f"Attempting to parse normalized PL formula: {normalized_formula}")
 
         try:
-            if constants:
-                PlSignature = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlSignature")
-                signature = PlSignature()
-                Proposition = jpype.JClass("org.tweetyproject.logics.pl.syntax.Proposition")
-                for const_name in constants:
-                    proposition = Proposition(JString(const_name))
-                    if not signature.contains(proposition):
-                        signature.add(proposition)
+            if signature is None and constants:
+                signature = self._build_signature(constants)
+            if signature is not None:
                 pl_formula = self._pl_parser.parseFormula(JString(normalized_formula), signature)
             else:
                 java_formula_str = JString(normalized_formula)
                 pl_formula = self._pl_parser.parseFormula(java_formula_str)
 
-            logger.info(f"Successfully parsed PL formula: '{formula_str}' as '{normalized_formula}' -> {pl_formula}")
+            logger.debug(f"Successfully parsed PL formula: '{formula_str}' as '{normalized_formula}' -> {pl_formula}")
             return pl_formula
         except jpype.JException as e:
             logger.error(f"JPype JException parsing PL formula '{formula_str}' (normalized to '{normalized_formula}'): {e.getMessage()}", exc_info=True)
@@ -153,48 +197,81 @@ class PLHandler:
             logger.error(f"Unexpected error parsing PL formula '{formula_str}' (normalized to '{normalized_formula}'): {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _kb_cache_key(knowledge_base_str: str, constants: Optional[List[str]]) -> Tuple[str, Tuple[str, ...]]:
+        kb_hash = hashlib.sha256(knowledge_base_str.encode("utf-8")).hexdigest()
+        return kb_hash, tuple(constants or ())
+
+    def _compile_knowledge_base(self, knowledge_base_str: str, constants: Optional[List[str]] = None) -> CompiledPLKnowledgeBase:
+        """
+        Returns the parsed PlBeliefSet of a knowledge base (newline-separated formulas),
+        parsing it only if it is not already in the cache.
+        """
+        key = self._kb_cache_key(knowledge_base_str, constants)
+        with self._kb_cache_lock:
+            compiled = self._kb_cache.get(key)
+            if compiled is not None:
+                self._kb_cache.move_to_end(key)
+                self._kb_cache_stats["hits"] += 1
+                return compiled
+            self._kb_cache_stats["misses"] += 1
+
+        signature = self._build_signature(constants) if constants else None
+        kb = self._PlBeliefSet()
+        formula_count = 0
+        # Handle potential empty strings or formulas correctly
+        formula_strings = [f.strip() for f in knowledge_base_str.split('\n') if f.strip() and f.strip() != '```']
+        for f_str in formula_strings:
+            # Remove trailing '%' if present, as it was a previous workaround
+            cleaned_f_str = f_str.rstrip('%').strip()
+            if cleaned_f_str:
+                parsed_formula = self.parse_pl_formula(cleaned_f_str, constants, signature=signature)
+                if parsed_formula:
+                    kb.add(parsed_formula)
+                    formula_count += 1
+
+        compiled = CompiledPLKnowledgeBase(kb, signature, formula_count)
+        logger.debug(f"Compiled PL knowledge base with {formula_count} formula(s) (cache key {key[0][:12]}).")
+        with self._kb_cache_lock:
+            self._kb_cache[key] = compiled
+            self._kb_cache.move_to_end(key)
+            while len(self._kb_cache) > self._kb_cache_size:
+                self._kb_cache.popitem(last=False)
+                self._kb_cache_stats["evictions"] += 1
+        return compiled
+
+    def get_kb_cache_stats(self) -> Dict[str, Any]:
+        """Returns the knowledge-base cache counters (hits, misses, evictions, size)."""
+        with self._kb_cache_lock:
+            return dict(self._kb_cache_stats, size=len(self._kb_cache), max_size=self._kb_cache_size)
+
+    def clear_kb_cache(self) -> None:
+        """Drops all parsed knowledge bases."""
+        with self._kb_cache_lock:
+            self._kb_cache.clear()
+
     def pl_check_consistency(self, knowledge_base_str: str, constants: Optional[List[str]] = None) -> bool:
         """
-        Checks if a PL knowledge base (string of formulas, semicolon-separated) is consistent.
+        Checks if a PL knowledge base (string of formulas, newline-separated) is consistent.
         """
         logger.debug(f"Checking PL consistency for: {knowledge_base_str}")
         try:
-            # Parse the knowledge base string into a PlBeliefSet
-            # Tweety's PlParser can parse a belief set directly if formulas are separated by ';'
-            # However, it's often safer to parse individual formulas and add them to a knowledge base.
-            # For simplicity here, assuming parseBeliefSet handles it or we adapt.
-            
-            # Let's refine this: parse individual formulas and add to a PlBeliefSet
-            formulas = []
-            # Handle potential empty strings or formulas correctly
-            formula_strings = [f.strip() for f in knowledge_base_str.split('\n') if f.strip() and f.strip() != '```']
-            
-            if not formula_strings:
+            compiled = self._compile_knowledge_base(knowledge_base_str, constants)
+            if compiled.formula_count == 0:
                 logger.info("Empty knowledge base is considered consistent.")
                 return True
+            if compiled.consistent is not None:
+                logger.debug(f"PL Knowledge base consistency (cached): {compiled.consistent}")
+                return compiled.consistent
 
-            PlBeliefSet = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlBeliefSet")
-            kb = PlBeliefSet()
-
-            for f_str in formula_strings:
-                # Remove trailing '%' if present, as it was a previous workaround
-                cleaned_f_str = f_str.rstrip('%').strip()
-                if cleaned_f_str:
-                    parsed_formula = self.parse_pl_formula(cleaned_f_str, constants)
-                    if parsed_formula:
-                        kb.add(parsed_formula)
-            
-            logger.info(f"DEBUG: Méthodes disponibles pour _pl_reasoner: {dir(self._pl_reasoner)}")
-            
             # Contournement pour le bug JPype avec isConsistent.
             # Une KB est cohérente si elle n'entraîne pas de contradiction (false).
             # On vérifie donc si la KB entraîne la formule "false".
             try:
-                Contradiction = jpype.JClass("org.tweetyproject.logics.pl.syntax.Contradiction")
-                parsed_false = Contradiction()
+                parsed_false = self._Contradiction()
                 
                 # self._pl_reasoner.query(kb, formula) retourne true si kb |= formula
-                entails_contradiction = self._pl_reasoner.query(kb, parsed_false)
+                entails_contradiction = self._pl_reasoner.query(compiled.belief_set, parsed_false)
                 is_consistent = not entails_contradiction
                 logger.info(f"Vérification de cohérence via query(kb, false). Entraîne contradiction: {entails_contradiction}. Cohérent: {is_consistent}")
 
@@ -203,8 +280,9 @@ class PLHandler:
                 # Fallback ou lever une exception ? Pour l'instant, on lève.
                 raise RuntimeError("Échec de la vérification de cohérence alternative.") from query_exc
 
+            compiled.consistent = bool(is_consistent)
             logger.info(f"PL Knowledge base consistency for '{knowledge_base_str}': {is_consistent}")
-            return bool(is_consistent)
+            return compiled.consistent
         except ValueError as e: # Catch parsing errors from parse_pl_formula
             logger.error(f"Error parsing formula in knowledge base for consistency check: {e}", exc_info=True)
             raise
@@ -215,39 +293,33 @@ class PLHandler:
             logger.error(f"Unexpected error during PL consistency check for '{knowledge_base_str}': {e}", exc_info=True)
             raise
 
+    def _query_compiled(self, compiled: CompiledPLKnowledgeBase, query_formula_str: str,
+                        constants: Optional[List[str]]) -> bool:
+        # Nettoyer également la chaîne de la requête
+        cleaned_query_str = query_formula_str.rstrip('%').strip()
+        if not cleaned_query_str or cleaned_query_str == '```':
+            logger.warning(f"Query string is invalid or empty after cleaning: '{query_formula_str}'")
+            return False # Ou une autre gestion d'erreur appropriée
+
+        query_formula = self.parse_pl_formula(cleaned_query_str, constants, signature=compiled.signature)
+        if not query_formula:
+            logger.warning(f"Skipping empty or invalid query after parsing: '{cleaned_query_str}'")
+            return False
+
+        entails = self._pl_reasoner.query(compiled.belief_set, query_formula)
+        logger.info(f"PL Query: KB entails '{query_formula_str}'? {entails}")
+        return bool(entails)
+
     def pl_query(self, knowledge_base_str: str, query_formula_str: str, constants: Optional[List[str]] = None) -> bool:
         """
         Checks if a query formula is entailed by a PL knowledge base.
-        Knowledge base: string of formulas, semicolon-separated.
+        Knowledge base: string of formulas, newline-separated.
         Query: single formula string.
         """
         logger.debug(f"Performing PL query. KB: '{knowledge_base_str}', Query: '{query_formula_str}'")
         try:
-            PlBeliefSet = jpype.JClass("org.tweetyproject.logics.pl.syntax.PlBeliefSet")
-            kb = PlBeliefSet()
-
-            formula_strings = [f.strip() for f in knowledge_base_str.split('\n') if f.strip() and f.strip() != '```']
-            for f_str in formula_strings:
-                cleaned_f_str = f_str.rstrip('%').strip()
-                if cleaned_f_str:
-                    parsed_formula = self.parse_pl_formula(cleaned_f_str, constants)
-                    if parsed_formula:
-                        kb.add(parsed_formula)
-            
-            # Nettoyer également la chaîne de la requête
-            cleaned_query_str = query_formula_str.rstrip('%').strip()
-            if not cleaned_query_str or cleaned_query_str == '```':
-                logger.warning(f"Query string is invalid or empty after cleaning: '{query_formula_str}'")
-                return False # Ou une autre gestion d'erreur appropriée
-
-            query_formula = self.parse_pl_formula(cleaned_query_str, constants)
-            if not query_formula:
-                logger.warning(f"Skipping empty or invalid query after parsing: '{cleaned_query_str}'")
-                return False
-            
-            entails = self._pl_reasoner.query(kb, query_formula)
-            logger.info(f"PL Query: KB entails '{query_formula_str}'? {entails}")
-            return bool(entails)
+            compiled = self._compile_knowledge_base(knowledge_base_str, constants)
+            return self._query_compiled(compiled, query_formula_str, constants)
         except ValueError as e: # Catch parsing errors
             logger.error(f"Error parsing formula for PL query: {e}", exc_info=True)
             raise
@@ -258,4 +330,27 @@ class PLHandler:
             logger.error(f"Unexpected error during PL query: {e}", exc_info=True)
             raise
 
+    def pl_query_batch(self, knowledge_base_str: str, query_formula_strs: List[str],
+                       constants: Optional[List[str]] = None) -> List[bool]:
+        """
+        Checks several query formulas against the same PL knowledge base, parsed once.
+
+        Returns:
+            One entailment result per query, in order (False for empty or invalid queries,
+            as with pl_query).
+        """
+        logger.debug(f"Performing {len(query_formula_strs)} PL queries. KB: '{knowledge_base_str}'")
+        try:
+            compiled = self._compile_knowledge_base(knowledge_base_str, constants)
+            return [self._query_compiled(compiled, query, constants) for query in query_formula_strs]
+        except ValueError as e: # Catch parsing errors
+            logger.error(f"Error parsing formula for PL query batch: {e}", exc_info=True)
+            raise
+        except jpype.JException as e:
+            logger.error(f"JPype JException during PL query batch (KB: '{knowledge_base_str}'): {e.getMessage()}", exc_info=True)
+            raise RuntimeError(f"PL query batch failed: {e.getMessage()}") from e
+        except Exception as e:
+            logger.error(f"Unexpected error during PL query batch: {e}", exc_info=True)
+            raise
+
     # Add other PL-specific methods as needed, e.g., model finding, transformations, etc.
\ No newline at end of file
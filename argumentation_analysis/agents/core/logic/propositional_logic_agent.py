@@ -296,6 +296,48 @@ class PropositionalLogicAgent(BaseLogicAgent):
             self.logger.error(error_msg, exc_info=True) 
             return None, f"FUNC_ERROR: {error_msg}"
     
+    def execute_queries(self, belief_set: BeliefSet, queries: List[str]) -> List[Tuple[Optional[bool], str]]:
+        """
+        Exécute plusieurs requêtes PL sur un même ensemble de croyances.
+
+        Les requêtes valides sont exécutées en un seul lot par `TweetyBridge`, qui
+        n'analyse l'ensemble de croyances qu'une fois ; les requêtes invalides
+        reçoivent le même résultat qu'avec `execute_query`.
+
+        :param belief_set: L'ensemble de croyances PL sur lequel exécuter les requêtes.
+        :type belief_set: BeliefSet
+        :param queries: Les requêtes PL à exécuter.
+        :type queries: List[str]
+        :return: Un tuple (résultat booléen, sortie brute) par requête, dans l'ordre.
+        :rtype: List[Tuple[Optional[bool], str]]
+        """
+        self.logger.info(f"Exécution de {len(queries)} requête(s) PL sur le BeliefSet.")
+
+        results: List[Optional[Tuple[Optional[bool], str]]] = [None] * len(queries)
+        valid_indices = []
+        for index, query in enumerate(queries):
+            is_valid, validation_message = self._tweety_bridge.validate_formula(formula_string=query)
+            if is_valid:
+                valid_indices.append(index)
+            else:
+                msg = f"Requête invalide: {query}. Raison: {validation_message}"
+                self.logger.error(msg)
+                results[index] = (False, f"FUNC_ERROR: {msg}")
+
+        if valid_indices:
+            try:
+                batch_results = self._tweety_bridge.perform_pl_queries(
+                    belief_set.content, [queries[index] for index in valid_indices]
+                )
+            except Exception as e:
+                error_msg = f"Erreur lors de l'exécution du lot de requêtes PL: {str(e)}"
+                self.logger.error(error_msg, exc_info=True)
+                batch_results = [(None, f"FUNC_ERROR: {error_msg}")] * len(valid_indices)
+            for index, result in zip(valid_indices, batch_results):
+                results[index] = result
+
+        return results
+
     async def interpret_results(self, text: str, belief_set: BeliefSet,
                                 queries: List[str], results: List[Tuple[Optional[bool], str]],
                                 context: Optional[Dict[str, Any]] = None) -> str: 
@@ -260,6 +260,29 @@ class TweetyBridge:
         # La méthode perform_pl_query est maintenant la méthode publique principale
         return self.perform_pl_query(belief_set_content, query_string, constants)
 
+    def perform_pl_queries(self, belief_set_content: str, query_strings: List[str], constants: Optional[List[str]] = None) -> List[Tuple[Optional[bool], str]]:
+        """
+        Exécute plusieurs requêtes PL sur un même belief set, analysé une seule fois.
+        Retourne un tuple (résultat_bool, chaîne_formatée) par requête, dans l'ordre.
+        """
+        self._logger.info(f"TweetyBridge.perform_pl_queries: {len(query_strings)} requête(s) sur BS: ('{belief_set_content[:60]}...')")
+        if not self.is_jvm_ready() or not hasattr(self, '_pl_handler'):
+            self._logger.error("TweetyBridge.perform_pl_queries: TweetyBridge ou PLHandler non prêt.")
+            return [(None, "Erreur: TweetyBridge ou PLHandler non prêt.")] * len(query_strings)
+
+        try:
+            results_bool = self._pl_handler.pl_query_batch(belief_set_content, query_strings, constants)
+        except Exception as e_batch:
+            # Une formule invalide fait échouer le lot : chaque requête est alors exécutée séparément
+            self._logger.warning(f"Échec du lot de requêtes PL ({e_batch}), exécution requête par requête.")
+            return [self.perform_pl_query(belief_set_content, query_string, constants) for query_string in query_strings]
+
+        results = []
+        for query_string, result_bool in zip(query_strings, results_bool):
+            result_label = "ACCEPTED (True)" if result_bool else "REJECTED (False)"
+            results.append((result_bool, f"Tweety Result: Query '{query_string}' is {result_label}."))
+        return results
+
     def is_pl_kb_consistent(self, belief_set_content: str) -> Tuple[bool, str]:
         """Vérifie la cohérence d'une base de connaissances propositionnelle."""
         self._logger.info(f"TweetyBridge.is_pl_kb_consistent sur BS: ('{belief_set_content[:60]}...')")
@@ -5,7 +5,7 @@ Ce module gère les données du jeu Cluedo et les interactions avec l'Oracle.
 """
 
 import logging
-from typing import Dict, List, Any, Optional, Set
+from typing import Callable, Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -146,6 +146,7 @@ class CluedoDataset:
         self.revelations_history: List[RevelationRecord] = []
         self.total_queries = 0
         self.reveal_policy = RevealPolicy.BALANCED
+        self._state_listeners: List[Callable[[Optional[str]], None]] = []
         
         # Solution secrète (cartes que Moriarty ne détient PAS)
         self._all_suspects = set(self._elements_jeu["suspects"])
@@ -199,6 +200,28 @@ class CluedoDataset:
             "Cette méthode a été désactivée pour préserver l'intégrité du jeu."
         )
     
+    def add_state_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """
+        Enregistre une fonction appelée à chaque changement de l'état du jeu.
+        
+        Args:
+            listener: Fonction recevant le nom de l'agent concerné par le changement,
+                ou None si tout l'état a changé (remise à zéro)
+        """
+        self._state_listeners.append(listener)
+    
+    def remove_state_listener(self, listener: Callable[[Optional[str]], None]) -> None:
+        """Retire une fonction enregistrée par add_state_listener."""
+        if listener in self._state_listeners:
+            self._state_listeners.remove(listener)
+    
+    def _notify_state_change(self, agent_name: Optional[str]) -> None:
+        for listener in list(self._state_listeners):
+            try:
+                listener(agent_name)
+            except Exception as e:
+                self._logger.error(f"Erreur dans un listener de changement d'état: {e}")
+    
     def get_revealed_cards_to_agent(self, agent_name: str) -> List[str]:
         """Retourne les cartes révélées à un agent spécifique."""
         revelations = self.get_revelations_for_agent(agent_name)
@@ -233,6 +256,7 @@ class CluedoDataset:
         
         self.revelations_history.append(revelation)
         self._logger.info(f"Carte révélée: {card} à {to_agent} (Raison: {reason})")
+        self._notify_state_change(to_agent)
         
         return revelation
     
@@ -541,6 +565,7 @@ class CluedoDataset:
         self.revelations_history.clear()
         self.total_queries = 0
         self._logger.info("Dataset CluedoDataset remis à zéro")
+        self._notify_state_change(None)
     
     @property
     def elements_jeu(self) -> Dict[str, List[str]]:
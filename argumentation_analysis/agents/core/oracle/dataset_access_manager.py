@@ -6,8 +6,13 @@ Ce module implémente la logique de contrôle d'accès pour les agents Oracle,
 gérant les permissions, la validation des requêtes, et la mise en cache.
 """
 
+import heapq
+import itertools
 import logging
-from typing import Dict, List, Any, Optional, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from functools import lru_cache
 
@@ -19,40 +24,80 @@ from .permissions import (
 from .cluedo_dataset import CluedoDataset
 
 
+QueryCacheKey = Tuple[str, QueryType, Hashable]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convertit récursivement des paramètres de requête en une structure hashable."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def make_query_key(agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> QueryCacheKey:
+    """
+    Construit la clé de cache structurelle d'une requête.
+
+    Les dictionnaires deviennent des frozensets et les listes des tuples : deux
+    requêtes de paramètres égaux ont la même clé, sans sérialisation ni hachage
+    cryptographique.
+    """
+    return (agent_name, query_type, _freeze(query_params))
+
+
 class QueryCache:
-    """Cache intelligent pour les requêtes fréquentes."""
+    """
+    Cache LRU des requêtes fréquentes, avec durée de validité.
+
+    Les entrées sont conservées dans un OrderedDict dans l'ordre des accès : une
+    lecture, une écriture et une éviction LRU coûtent O(1). Les expirations sont
+    ordonnées dans un tas par échéance (fixée à l'insertion) et purgées
+    paresseusement lors des accès. Un index par agent permet d'invalider les
+    entrées d'un agent lorsque l'état du jeu change pour lui.
+    """
     
     def __init__(self, max_size: int = 1000, ttl_seconds: int = 300):
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self._access_times: Dict[str, datetime] = {}
+        self._cache: "OrderedDict[QueryCacheKey, Dict[str, Any]]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, QueryCacheKey]] = []
+        self._keys_by_agent: Dict[str, Set[QueryCacheKey]] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
         self._logger = logging.getLogger(self.__class__.__name__)
     
-    def _generate_key(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> str:
+    def _generate_key(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> QueryCacheKey:
         """Génère une clé unique pour la requête."""
-        import hashlib
-        import json
-        
-        content = f"{agent_name}:{query_type.value}:{json.dumps(query_params, sort_keys=True)}"
-        return hashlib.md5(content.encode()).hexdigest()
+        return make_query_key(agent_name, query_type, query_params)
     
     def get(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> Optional[QueryResult]:
         """Récupère un résultat depuis le cache."""
         key = self._generate_key(agent_name, query_type, query_params)
         
-        if key not in self._cache:
-            return None
-        
-        # Vérification TTL
-        if datetime.now() - self._access_times[key] > timedelta(seconds=self.ttl_seconds):
-            self._remove_entry(key)
-            return None
-        
-        # Mise à jour du temps d'accès
-        self._access_times[key] = datetime.now()
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            cached_data = self._cache.get(key)
+            if cached_data is None:
+                self.misses += 1
+                return None
+            
+            self._cache.move_to_end(key)
+            self.hits += 1
         
-        cached_data = self._cache[key]
         self._logger.debug(f"Cache HIT pour {agent_name}:{query_type.value}")
         
         return QueryResult(
@@ -66,58 +111,125 @@ class QueryCache:
     
     def put(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any], result: QueryResult) -> None:
         """Stocke un résultat dans le cache."""
+        if self.max_size <= 0:
+            return
         key = self._generate_key(agent_name, query_type, query_params)
+        now = time.monotonic()
         
-        # Nettoyage si cache plein
-        if len(self._cache) >= self.max_size:
-            self._evict_oldest()
-        
-        self._cache[key] = {
-            "success": result.success,
-            "data": result.data,
-            "message": result.message,
-            "timestamp": result.timestamp,
-            "metadata": result.metadata
-        }
-        self._access_times[key] = datetime.now()
+        with self._lock:
+            self._purge_expired(now)
+            if key in self._cache:
+                self._remove_entry(key)
+            
+            # Nettoyage si cache plein
+            while len(self._cache) >= self.max_size:
+                self._evict_oldest()
+            
+            sequence = next(self._sequence)
+            self._cache[key] = {
+                "success": result.success,
+                "data": result.data,
+                "message": result.message,
+                "timestamp": result.timestamp,
+                "metadata": result.metadata,
+                "sequence": sequence
+            }
+            self._keys_by_agent.setdefault(agent_name, set()).add(key)
+            heapq.heappush(self._expiry_heap, (now + self.ttl_seconds, sequence, key))
         
         self._logger.debug(f"Cache STORE pour {agent_name}:{query_type.value}")
     
-    def _remove_entry(self, key: str) -> None:
-        """Supprime une entrée du cache."""
-        self._cache.pop(key, None)
-        self._access_times.pop(key, None)
+    def invalidate(self, agent_name: Optional[str] = None, query_type: Optional[QueryType] = None) -> int:
+        """
+        Invalide les entrées d'un agent et/ou d'un type de requête.
+        
+        Args:
+            agent_name: Agent dont les entrées sont invalidées (tous si None)
+            query_type: Type de requête dont les entrées sont invalidées (tous si None)
+            
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        with self._lock:
+            if agent_name is None and query_type is None:
+                count = len(self._cache)
+                self._cache.clear()
+                self._expiry_heap.clear()
+                self._keys_by_agent.clear()
+            else:
+                candidates = self._keys_by_agent.get(agent_name, ()) if agent_name is not None else self._cache.keys()
+                keys = [key for key in candidates if query_type is None or key[1] == query_type]
+                for key in keys:
+                    self._remove_entry(key)
+                count = len(keys)
+            self.invalidations += count
+        
+        if count:
+            self._logger.debug(f"Cache INVALIDATION: {count} entrée(s) (agent={agent_name}, type={query_type})")
+        return count
+    
+    def _remove_entry(self, key: QueryCacheKey) -> None:
+        """Supprime une entrée du cache (son échéance reste dans le tas jusqu'à sa sortie)."""
+        if self._cache.pop(key, None) is None:
+            return
+        agent_keys = self._keys_by_agent.get(key[0])
+        if agent_keys is not None:
+            agent_keys.discard(key)
+            if not agent_keys:
+                del self._keys_by_agent[key[0]]
+        if len(self._expiry_heap) > 64 and len(self._expiry_heap) > 2 * len(self._cache):
+            self._expiry_heap = [item for item in self._expiry_heap if self._is_current(item)]
+            heapq.heapify(self._expiry_heap)
+    
+    def _is_current(self, item: Tuple[float, int, QueryCacheKey]) -> bool:
+        entry = self._cache.get(item[2])
+        return entry is not None and entry["sequence"] == item[1]
+    
+    def _purge_expired(self, now: float) -> None:
+        """Supprime les entrées dont l'échéance est dépassée."""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            item = heapq.heappop(self._expiry_heap)
+            if self._is_current(item):
+                self._remove_entry(item[2])
+                self.expirations += 1
     
     def _evict_oldest(self) -> None:
-        """Supprime l'entrée la plus ancienne."""
-        if not self._access_times:
+        """Supprime l'entrée la moins récemment utilisée."""
+        if not self._cache:
             return
         
-        oldest_key = min(self._access_times.keys(), key=lambda k: self._access_times[k])
+        oldest_key = next(iter(self._cache))
         self._remove_entry(oldest_key)
-        self._logger.debug(f"Cache EVICTION: {oldest_key}")
+        self.evictions += 1
+        self._logger.debug(f"Cache EVICTION: {oldest_key[0]}:{oldest_key[1].value}")
     
     def clear(self) -> None:
         """Vide le cache."""
-        self._cache.clear()
-        self._access_times.clear()
+        with self._lock:
+            self._cache.clear()
+            self._expiry_heap.clear()
+            self._keys_by_agent.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
         self._logger.info("Cache vidé")
     
     def get_stats(self) -> Dict[str, Any]:
         """Retourne les statistiques du cache."""
-        now = datetime.now()
-        expired_count = sum(
-            1 for access_time in self._access_times.values()
-            if now - access_time > timedelta(seconds=self.ttl_seconds)
-        )
-        
-        return {
-            "total_entries": len(self._cache),
-            "expired_entries": expired_count,
-            "cache_size_limit": self.max_size,
-            "ttl_seconds": self.ttl_seconds,
-            "utilization": len(self._cache) / self.max_size if self.max_size > 0 else 0.0
-        }
+        with self._lock:
+            self._purge_expired(time.monotonic())
+            lookups = self.hits + self.misses
+            
+            return {
+                "total_entries": len(self._cache),
+                "expired_entries": self.expirations,
+                "cache_size_limit": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "utilization": len(self._cache) / self.max_size if self.max_size > 0 else 0.0,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
 
 
 class DatasetAccessManager:
@@ -141,6 +253,11 @@ class DatasetAccessManager:
         self.query_cache = QueryCache()
         self._logger = logging.getLogger(self.__class__.__name__)
         
+        # Invalidation du cache lorsque l'état du dataset change (révélations, remise à zéro)
+        add_state_listener = getattr(dataset, "add_state_listener", None)
+        if callable(add_state_listener):
+            add_state_listener(self._on_dataset_state_change)
+        
         # Métriques et monitoring
         self.total_queries = 0
         self.successful_queries = 0
@@ -268,7 +385,7 @@ class DatasetAccessManager:
             return "Les paramètres doivent être un dictionnaire"
         
         return None
-    def _generate_cache_key(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> str:
+    def _generate_cache_key(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> QueryCacheKey:
         """
         Génère une clé de cache unique pour une requête.
         
@@ -278,17 +395,9 @@ class DatasetAccessManager:
             query_params: Paramètres de la requête
             
         Returns:
-            Clé de cache unique
+            Clé de cache unique (identique à celle du QueryCache)
         """
-        import hashlib
-        import json
-        
-        # Créer une représentation sérialisable des paramètres
-        params_str = json.dumps(query_params, sort_keys=True)
-        cache_data = f"{agent_name}:{query_type.value}:{params_str}"
-        
-        # Générer un hash pour éviter les clés trop longues
-        return hashlib.md5(cache_data.encode()).hexdigest()
+        return make_query_key(agent_name, query_type, query_params)
     
     def _execute_dataset_query(self, agent_name: str, query_type: QueryType, query_params: Dict[str, Any]) -> QueryResult:
         """Exécute la requête sur le dataset approprié."""
@@ -392,6 +501,10 @@ class DatasetAccessManager:
         
         return revealed_info
     
+    def _on_dataset_state_change(self, agent_name: Optional[str]) -> None:
+        """Invalide les résultats en cache rendus obsolètes par un changement d'état du dataset."""
+        self.query_cache.invalidate(agent_name)
+    
     def get_agent_permissions(self, agent_name: str) -> Optional[PermissionRule]:
         """Récupère les permissions d'un agent."""
         return self.permission_manager.get_permission_rule(agent_name)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Similarité vectorisée entre arguments.
+
+Chaque argument est découpé une seule fois en mots, puis représenté par une ligne
+d'une matrice creuse (sac de mots). Les matrices de similarité de toutes les paires
+d'arguments (Jaccard sur les ensembles de mots, cosinus TF-IDF ou cosinus de
+plongements fournis par l'appelant) sont obtenues par produits matriciels, au lieu
+de comparer les textes paire par paire.
+
+SciPy est utilisé pour les matrices creuses s'il est installé ; à défaut, les calculs
+se font sur des tableaux NumPy denses.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    HAS_SCIPY = True
+except ImportError:
+    sparse = None
+    HAS_SCIPY = False
+
+logger = logging.getLogger("ArgumentSimilarity")
+
+
+def tokenize(text: str) -> List[str]:
+    """Découpe un texte en mots (minuscules, séparateurs blancs)."""
+    return text.lower().split()
+
+
+def threshold_clusters(similarity_matrix: np.ndarray, threshold: float) -> List[List[int]]:
+    """
+    Regroupe les éléments dont la similarité avec le premier élément du groupe dépasse un seuil.
+
+    Chaque élément non encore affecté ouvre un groupe, dans l'ordre des indices, et
+    y entraîne tous les éléments restants dont la similarité avec lui est strictement
+    supérieure au seuil.
+
+    Args:
+        similarity_matrix: Matrice de similarité carrée
+        threshold: Seuil de similarité
+
+    Returns:
+        Liste des groupes (indices des éléments)
+    """
+    count = similarity_matrix.shape[0]
+    unassigned = np.ones(count, dtype=bool)
+    clusters = []
+    for i in range(count):
+        if not unassigned[i]:
+            continue
+        unassigned[i] = False
+        members = np.flatnonzero(unassigned & (similarity_matrix[i] > threshold))
+        unassigned[members] = False
+        clusters.append([i] + members.tolist())
+    return clusters
+
+
+class ArgumentSimilarityEngine:
+    """
+    Calcule les similarités entre tous les arguments d'un ensemble.
+
+    Les matrices sont calculées à la première demande puis conservées.
+    """
+
+    def __init__(self, arguments: Sequence[str]):
+        """
+        Args:
+            arguments: Arguments à comparer
+        """
+        self.arguments = list(arguments)
+        self.lowered = [argument.lower() for argument in self.arguments]
+        self.tokens = [tokenize(argument) for argument in self.arguments]
+
+        vocabulary: Dict[str, int] = {}
+        rows, columns, counts = [], [], []
+        for row, tokens in enumerate(self.tokens):
+            term_counts: Dict[int, int] = {}
+            for token in tokens:
+                column = vocabulary.setdefault(token, len(vocabulary))
+                term_counts[column] = term_counts.get(column, 0) + 1
+            rows.extend([row] * len(term_counts))
+            columns.extend(term_counts)
+            counts.extend(term_counts.values())
+
+        self.vocabulary = vocabulary
+        self._counts = self._matrix(rows, columns, counts, (len(self.arguments), len(vocabulary)))
+        self._jaccard: Optional[np.ndarray] = None
+        self._tfidf: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.arguments)
+
+    @staticmethod
+    def _matrix(rows: List[int], columns: List[int], values: List[float], shape):
+        if HAS_SCIPY:
+            return sparse.csr_matrix((np.asarray(values, dtype=np.float64), (rows, columns)), shape=shape)
+        matrix = np.zeros(shape, dtype=np.float64)
+        matrix[rows, columns] = values
+        return matrix
+
+    @staticmethod
+    def _gram(matrix) -> np.ndarray:
+        product = matrix @ matrix.T
+        return product.toarray() if HAS_SCIPY else product
+
+    def jaccard_matrix(self) -> np.ndarray:
+        """
+        Retourne la matrice des coefficients de Jaccard entre les ensembles de mots.
+
+        Returns:
+            Matrice n x n (0.0 pour deux arguments sans aucun mot)
+        """
+        if self._jaccard is None:
+            presence = self._counts.copy()
+            if HAS_SCIPY:
+                presence.data[:] = 1.0
+            else:
+                presence = (presence > 0).astype(np.float64)
+            intersection = self._gram(presence)
+            sizes = np.diag(intersection)
+            union = sizes[:, None] + sizes[None, :] - intersection
+            self._jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        return self._jaccard
+
+    def tfidf_cosine_matrix(self) -> np.ndarray:
+        """
+        Retourne la matrice des similarités cosinus entre les vecteurs TF-IDF des arguments.
+
+        Returns:
+            Matrice n x n
+        """
+        if self._tfidf is None:
+            count = len(self.arguments)
+            presence = self._counts > 0
+            document_frequency = np.asarray(presence.sum(axis=0)).ravel()
+            idf = np.log((1 + count) / (1 + document_frequency)) + 1.0
+            weighted = self._counts.multiply(idf).tocsr() if HAS_SCIPY else self._counts * idf
+            self._tfidf = self._normalized_gram(weighted)
+        return self._tfidf
+
+    def embedding_cosine_matrix(self, embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        """
+        Retourne la matrice des similarités cosinus entre des plongements d'arguments.
+
+        Args:
+            embeddings: Un vecteur par argument (ex: plongements de phrases)
+
+        Returns:
+            Matrice n x n
+        """
+        vectors = np.asarray(embeddings, dtype=np.float64)
+        if vectors.shape[0] != len(self.arguments):
+            raise ValueError(f"{vectors.shape[0]} plongements fournis pour {len(self.arguments)} arguments")
+        return self._normalized_gram(vectors)
+
+    def _normalized_gram(self, vectors) -> np.ndarray:
+        gram = vectors @ vectors.T
+        gram = gram.toarray() if hasattr(gram, "toarray") else np.asarray(gram)
+        norms = np.sqrt(np.diag(gram))
+        scale = np.outer(norms, norms)
+        return np.divide(gram, scale, out=np.zeros_like(gram), where=scale > 0)
+
+    def match_keywords(self, keywords_by_category: Dict[str, List[str]]) -> List[Dict[str, List[str]]]:
+        """
+        Recherche des mots-clés dans chaque argument, une seule fois par argument.
+
+        Args:
+            keywords_by_category: Mots-clés (en minuscules) par catégorie
+
+        Returns:
+            Pour chaque argument, les mots-clés trouvés par catégorie (catégories sans
+            correspondance omises, ordre des catégories et des mots-clés conservé)
+        """
+        matches = []
+        for text in self.lowered:
+            found = {}
+            for category, keywords in keywords_by_category.items():
+                matched = [keyword for keyword in keywords if keyword in text]
+                if matched:
+                    found[category] = matched
+            matches.append(found)
+        return matches
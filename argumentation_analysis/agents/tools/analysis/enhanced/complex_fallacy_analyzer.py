@@ -27,6 +27,9 @@ if str(parent_dir) not in sys.path:
 
 # Importer l'analyseur de sophismes complexes de base
 from argumentation_analysis.agents.tools.analysis.complex_fallacy_analyzer import ComplexFallacyAnalyzer as BaseAnalyzer
+from argumentation_analysis.agents.tools.analysis.enhanced.argument_similarity import (
+    ArgumentSimilarityEngine, threshold_clusters
+)
 
 # Fonction d'importation paresseuse pour éviter les importations circulaires
 def _lazy_imports():
@@ -78,6 +81,9 @@ class EnhancedComplexFallacyAnalyzer(BaseAnalyzer):
         # Historique des analyses pour l'apprentissage continu
         self.analysis_history = []
         
+        # Moteur de similarité du dernier ensemble d'arguments analysé
+        self._similarity_engine: Optional[ArgumentSimilarityEngine] = None
+        
         self.logger.info("Analyseur de sophismes complexes amélioré initialisé.")
     
     def _define_argument_structure_patterns(self) -> Dict[str, Dict[str, Any]]:
@@ -322,33 +328,53 @@ class EnhancedComplexFallacyAnalyzer(BaseAnalyzer):
             "example": ["par exemple", "comme", "tel que", "notamment", "en particulier", "pour illustrer"]
         }
         
-        # Pour chaque paire d'arguments
+        # Rechercher les mots-clés une seule fois par argument
+        engine = self._get_similarity_engine(arguments)
+        keyword_matches = engine.match_keywords(relation_keywords)
+        targets = [(j, matches) for j, matches in enumerate(keyword_matches) if matches]
+        if not targets:
+            return relations
+        
+        # Calculer un score de similarité sémantique (simplifié) pour toutes les paires à la fois
+        # Dans une implémentation réelle, on utiliserait des embeddings de phrases
+        similarity_matrix = engine.jaccard_matrix()
+        
+        # Pour chaque paire d'arguments dont l'argument 2 contient des mots-clés de relation
         for i in range(len(arguments)):
-            for j in range(len(arguments)):
+            for j, matches in targets:
                 if i == j:
                     continue
                 
-                arg1 = arguments[i].lower()
-                arg2 = arguments[j].lower()
-                
-                # Vérifier chaque type de relation
-                for relation_type, keywords in relation_keywords.items():
-                    # Vérifier si l'argument 2 contient des mots-clés indiquant une relation avec l'argument 1
-                    if any(keyword in arg2 for keyword in keywords):
-                        # Calculer un score de similarité sémantique (simplifié)
-                        # Dans une implémentation réelle, on utiliserait des embeddings de phrases
-                        similarity_score = self._calculate_simple_similarity(arg1, arg2)
-                        
-                        relations.append({
-                            "relation_type": relation_type,
-                            "source_argument_index": i,
-                            "target_argument_index": j,
-                            "confidence": min(0.9, 0.5 + similarity_score * 0.4),
-                            "keywords_matched": [keyword for keyword in keywords if keyword in arg2]
-                        })
+                confidence = min(0.9, 0.5 + float(similarity_matrix[i, j]) * 0.4)
+                for relation_type, keywords_matched in matches.items():
+                    relations.append({
+                        "relation_type": relation_type,
+                        "source_argument_index": i,
+                        "target_argument_index": j,
+                        "confidence": confidence,
+                        "keywords_matched": keywords_matched
+                    })
         
         return relations
     
+    def _get_similarity_engine(self, arguments: List[str]) -> ArgumentSimilarityEngine:
+        """
+        Retourne le moteur de similarité d'un ensemble d'arguments.
+        
+        Le moteur du dernier ensemble analysé est réutilisé, de sorte que l'analyse de
+        structure et l'analyse de cohérence d'un même ensemble ne découpent les
+        arguments qu'une seule fois.
+        
+        Args:
+            arguments: Liste d'arguments
+            
+        Returns:
+            Le moteur de similarité
+        """
+        if self._similarity_engine is None or self._similarity_engine.arguments != list(arguments):
+            self._similarity_engine = ArgumentSimilarityEngine(arguments)
+        return self._similarity_engine
+    
     def _calculate_simple_similarity(self, text1: str, text2: str) -> float:
         """
         Calcule un score de similarité simple entre deux textes.
@@ -1041,47 +1067,25 @@ class EnhancedComplexFallacyAnalyzer(BaseAnalyzer):
             }
         
         # Calculer la similarité entre chaque paire d'arguments
-        # Utiliser une liste de listes au lieu de numpy pour éviter les problèmes d'interface
-        similarity_matrix = []
-        for i in range(len(arguments)):
-            row = []
-            for j in range(len(arguments)):
-                row.append(self._calculate_simple_similarity(arguments[i], arguments[j]))
-            similarity_matrix.append(row)
+        similarity_matrix = self._get_similarity_engine(arguments).jaccard_matrix()
         
         # Identifier les clusters thématiques (implémentation simplifiée)
         # Dans une implémentation réelle, on utiliserait un algorithme de clustering comme K-means
-        thematic_clusters = []
-        visited = set()
-        
-        for i in range(len(arguments)):
-            if i in visited:
-                continue
-            
-            # Créer un nouveau cluster
-            cluster = {"cluster_id": len(thematic_clusters), "arguments": [i]}
-            visited.add(i)
-            
-            # Ajouter les arguments similaires au cluster
-            for j in range(len(arguments)):
-                if j in visited:
-                    continue
-                
-                if similarity_matrix[i][j] > 0.5:  # Seuil arbitraire
-                    cluster["arguments"].append(j)
-                    visited.add(j)
-            
-            thematic_clusters.append(cluster)
+        thematic_clusters = [
+            {"cluster_id": cluster_id, "arguments": members}
+            for cluster_id, members in enumerate(threshold_clusters(similarity_matrix, 0.5))  # Seuil arbitraire
+        ]
         
         # Identifier les changements thématiques
         thematic_shifts = []
         for i in range(len(arguments) - 1):
-            if similarity_matrix[i][i + 1] < 0.3:  # Seuil arbitraire
+            similarity = float(similarity_matrix[i, i + 1])
+            if similarity < 0.3:  # Seuil arbitraire
                 thematic_shifts.append({
                     "position": i,
                     "from_argument": i,
                     "to_argument": i + 1,
-                    "shift_magnitude": 1.0 - similarity_matrix[i][i + 1]
+                    "shift_magnitude": 1.0 - similarity
                 })
         
         # Calculer le score de cohérence thématique
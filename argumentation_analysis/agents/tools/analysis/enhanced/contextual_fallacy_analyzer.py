@@ -29,6 +29,9 @@ from argumentation_analysis.agents.tools.analysis.contextual_fallacy_analyzer im
 
 # Importations pour les modèles de langage avancés
 from argumentation_analysis.paths import DATA_DIR
+from argumentation_analysis.agents.tools.analysis.enhanced.nlp_inference import (
+    BatchedInference, LazyModel, lazy_pipeline, split_sentences
+)
 
 # Définir HAS_TRANSFORMERS comme variable globale
 HAS_TRANSFORMERS = False
@@ -82,13 +85,16 @@ class EnhancedContextualFallacyAnalyzer(BaseAnalyzer):
     la précision de l'analyse des sophismes dans leur contexte.
     """
     
-    def __init__(self, taxonomy_path: Optional[str] = None, model_name: str = "distilbert-base-uncased"):
+    def __init__(self, taxonomy_path: Optional[str] = None, model_name: str = "distilbert-base-uncased",
+                 batch_size: Optional[int] = None, num_threads: Optional[int] = None):
         """
         Initialise l'analyseur contextuel de sophismes amélioré.
         
         Args:
             taxonomy_path: Chemin vers le fichier de taxonomie des sophismes (optionnel)
             model_name: Nom du modèle de langage à utiliser (optionnel)
+            batch_size: Taille des lots d'inférence NLP (optionnel, NLP_BATCH_SIZE par défaut)
+            num_threads: Nombre de threads d'inférence CPU (optionnel, NLP_NUM_THREADS par défaut)
         """
         # Appeler la fonction d'importation paresseuse
         _lazy_imports()
@@ -99,6 +105,7 @@ class EnhancedContextualFallacyAnalyzer(BaseAnalyzer):
         self.feedback_history = []
         self.context_embeddings_cache = {}
         self.last_analysis_fallacies = {}
+        self.batched_inference = BatchedInference(batch_size=batch_size, num_threads=num_threads)
         
         # Initialiser les modèles de langage si disponibles
         self.nlp_models = self._initialize_nlp_models()
@@ -112,6 +119,9 @@ class EnhancedContextualFallacyAnalyzer(BaseAnalyzer):
         """
         Initialise les modèles de langage avancés.
         
+        Les modèles sont partagés par tous les analyseurs du processus et ne sont
+        chargés que lors de leur première utilisation.
+        
         Returns:
             Dictionnaire contenant les modèles de langage initialisés
         """
@@ -121,17 +131,22 @@ class EnhancedContextualFallacyAnalyzer(BaseAnalyzer):
             try:
                 # Modèle pour la classification de texte
                 self.logger.info(f"Initialisation du modèle de langage {self.model_name}")
-                models["tokenizer"] = AutoTokenizer.from_pretrained(self.model_name)
-                models["model"] = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+                models["tokenizer"] = LazyModel(
+                    ("tokenizer", self.model_name), lambda: AutoTokenizer.from_pretrained(self.model_name)
+                )
+                models["model"] = LazyModel(
+                    ("sequence-classification", self.model_name),
+                    lambda: AutoModelForSequenceClassification.from_pretrained(self.model_name)
+                )
                 
                 # Pipeline pour l'analyse de sentiment (utile pour détecter les appels à l'émotion)
-                models["sentiment"] = pipeline("sentiment-analysis")
+                models["sentiment"] = lazy_pipeline(pipeline, "sentiment-analysis")
                 
                 # Pipeline pour la génération de texte (utile pour l'explication des sophismes)
-                models["text_generation"] = pipeline("text-generation", model="gpt2")
+                models["text_generation"] = lazy_pipeline(pipeline, "text-generation", model="gpt2")
                 
                 # Pipeline pour l'extraction d'entités nommées (utile pour identifier les autorités)
-                models["ner"] = pipeline("ner")
+                models["ner"] = lazy_pipeline(pipeline, "ner")
                 
                 self.logger.info("Modèles de langage initialisés avec succès.")
             except Exception as e:
@@ -326,16 +341,25 @@ class EnhancedContextualFallacyAnalyzer(BaseAnalyzer):
         if HAS_TRANSFORMERS and self.nlp_models:
             try:
                 # Diviser le texte en phrases pour une analyse plus précise
-                sentences = text.split(". ")
+                sentences = split_sentences(text)
                 
-                for i, sentence in enumerate(sentences):
-                    if not sentence.strip():
-                        continue
-                    
-                    # Analyser le sentiment pour détecter les appels à l'émotion
-                    sentiment_result = self.nlp_models["sentiment"](sentence)
-                    sentiment = sentiment_result[0]["label"]
-                    sentiment_score = sentiment_result[0]["score"]
+                # Analyser le sentiment de toutes les phrases par lots pour détecter les appels à l'émotion
+                sentiment_results = self.batched_inference.run(self.nlp_models["sentiment"], sentences)
+                
+                # Extraire les entités nommées des seules phrases évoquant une autorité
+                authority_sentences = [
+                    sentence for sentence in sentences
+                    if "expert" in sentence.lower() or "autorité" in sentence.lower() or "scientifique" in sentence.lower()
+                ]
+                ner_by_sentence = dict(zip(
+                    authority_sentences,
+                    self.batched_inference.run(self.nlp_models["ner"], authority_sentences)
+                ))
+                
+                for sentence, sentiment_result in zip(sentences, sentiment_results):
+                    if isinstance(sentiment_result, list):
+                        sentiment_result = sentiment_result[0]
+                    sentiment_score = sentiment_result["score"]
                     
                     # Si le sentiment est très positif ou très négatif, vérifier s'il s'agit d'un appel à l'émotion
                     if sentiment_score > 0.8:
@@ -349,11 +373,12 @@ class EnhancedContextualFallacyAnalyzer(BaseAnalyzer):
                                 "detection_method": "sentiment_analysis"
                             })
                     
-                    # Extraire les entités nommées pour détecter les appels à l'autorité
-                    ner_results = self.nlp_models["ner"](sentence)
-                    person_entities = [entity for entity in ner_results if entity["entity"] in ["B-PER", "I-PER"]]
+                    # Détecter les appels à l'autorité à partir des entités nommées
+                    if sentence not in ner_by_sentence:
+                        continue
+                    person_entities = [entity for entity in ner_by_sentence[sentence] if entity["entity"] in ["B-PER", "I-PER"]]
                     
-                    if person_entities and ("expert" in sentence.lower() or "autorité" in sentence.lower() or "scientifique" in sentence.lower()):
+                    if person_entities:
                         # Vérifier si ce n'est pas déjà identifié comme un appel à l'autorité
                         if not any(fallacy["fallacy_type"] == "Appel à l'autorité" and sentence in fallacy["context_text"] for fallacy in potential_fallacies):
                             potential_fallacies.append({
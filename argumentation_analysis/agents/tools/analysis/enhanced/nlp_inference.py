@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Inférence NLP par lots pour les outils d'analyse améliorés.
+
+Ce module fournit :
+- un registre de modèles partagé par tout le processus : un pipeline transformers
+  n'est chargé qu'une fois, quel que soit le nombre d'analyseurs créés ;
+- des modèles paresseux, chargés uniquement lors de leur première utilisation ;
+- l'exécution d'un pipeline sur tous les segments d'un document en lots triés par
+  longueur, ce qui limite le remplissage (padding) et le nombre de passes.
+
+La taille des lots et le nombre de threads d'inférence CPU sont configurables par
+paramètre ou par les variables d'environnement NLP_BATCH_SIZE et NLP_NUM_THREADS.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger("NLPInference")
+
+DEFAULT_BATCH_SIZE = 16
+
+_shared_models: Dict[Hashable, Any] = {}
+_shared_models_lock = threading.Lock()
+_loading_locks: Dict[Hashable, threading.Lock] = {}
+_configured_threads: Optional[int] = None
+
+
+def get_shared_model(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    Retourne le modèle associé à une clé, en le chargeant une seule fois par processus.
+
+    Args:
+        key: Clé du modèle (ex: ("pipeline", "sentiment-analysis", None))
+        loader: Fonction chargeant le modèle
+
+    Returns:
+        Le modèle chargé
+    """
+    with _shared_models_lock:
+        if key in _shared_models:
+            return _shared_models[key]
+        loading_lock = _loading_locks.setdefault(key, threading.Lock())
+
+    # Un verrou par clé : deux modèles différents peuvent se charger en parallèle
+    with loading_lock:
+        with _shared_models_lock:
+            if key in _shared_models:
+                return _shared_models[key]
+        logger.info(f"Chargement du modèle partagé {key}")
+        model = loader()
+        with _shared_models_lock:
+            _shared_models[key] = model
+        return model
+
+
+def clear_shared_models() -> None:
+    """Oublie les modèles partagés chargés (ils seront rechargés à la demande)."""
+    with _shared_models_lock:
+        _shared_models.clear()
+        _loading_locks.clear()
+
+
+def get_shared_model_keys() -> List[Hashable]:
+    """Retourne les clés des modèles partagés déjà chargés."""
+    with _shared_models_lock:
+        return list(_shared_models)
+
+
+def configure_inference_threads(num_threads: Optional[int] = None) -> Optional[int]:
+    """
+    Fixe le nombre de threads utilisés par torch pour l'inférence CPU.
+
+    Le réglage est global au processus ; il n'est appliqué que s'il change.
+
+    Args:
+        num_threads: Nombre de threads (NLP_NUM_THREADS si None ; inchangé si absent)
+
+    Returns:
+        Le nombre de threads configuré, ou None si aucun réglage n'a été appliqué
+    """
+    global _configured_threads
+    if num_threads is None:
+        env_value = os.getenv("NLP_NUM_THREADS")
+        num_threads = int(env_value) if env_value else None
+    if not num_threads or num_threads == _configured_threads:
+        return _configured_threads
+
+    try:
+        import torch
+        torch.set_num_threads(num_threads)
+        _configured_threads = num_threads
+        logger.info(f"Inférence CPU configurée sur {num_threads} thread(s)")
+    except Exception as e:
+        logger.warning(f"Impossible de configurer le nombre de threads d'inférence: {e}")
+    return _configured_threads
+
+
+class LazyModel:
+    """
+    Modèle partagé chargé lors de sa première utilisation.
+
+    L'objet est appelable comme le pipeline qu'il représente ; les modèles jamais
+    utilisés ne sont jamais chargés.
+    """
+
+    def __init__(self, key: Hashable, loader: Callable[[], Any]):
+        self.key = key
+        self._loader = loader
+        self._model = None
+
+    @property
+    def loaded(self) -> bool:
+        """Indique si le modèle a déjà été chargé par ce handle."""
+        return self._model is not None
+
+    def get(self) -> Any:
+        """Retourne le modèle, en le chargeant si nécessaire."""
+        if self._model is None:
+            self._model = get_shared_model(self.key, self._loader)
+        return self._model
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.get()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyModel({self.key!r}, loaded={self.loaded})"
+
+
+def lazy_pipeline(pipeline_factory: Callable[..., Any], task: str, model: Optional[str] = None) -> LazyModel:
+    """
+    Crée le handle paresseux et partagé d'un pipeline transformers.
+
+    Args:
+        pipeline_factory: Fonction `transformers.pipeline`
+        task: Tâche du pipeline (ex: "sentiment-analysis")
+        model: Modèle du pipeline (celui par défaut de la tâche si None)
+
+    Returns:
+        Le handle du pipeline
+    """
+    if model is None:
+        return LazyModel(("pipeline", task, None), lambda: pipeline_factory(task))
+    return LazyModel(("pipeline", task, model), lambda: pipeline_factory(task, model=model))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Découpe un texte en phrases non vides (séparateur ". ")."""
+    return [sentence for sentence in text.split(". ") if sentence.strip()]
+
+
+class BatchedInference:
+    """
+    Exécute des pipelines sur des listes de textes par lots.
+
+    Les textes identiques ne sont traités qu'une fois et les textes sont triés par
+    longueur avant d'être regroupés, de sorte que chaque lot soit complété (padding)
+    au plus près de la longueur de ses textes.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, num_threads: Optional[int] = None):
+        """
+        Args:
+            batch_size: Taille des lots (NLP_BATCH_SIZE, sinon DEFAULT_BATCH_SIZE)
+            num_threads: Nombre de threads d'inférence CPU (NLP_NUM_THREADS si None)
+        """
+        if batch_size is None:
+            env_value = os.getenv("NLP_BATCH_SIZE")
+            batch_size = int(env_value) if env_value else DEFAULT_BATCH_SIZE
+        self.batch_size = max(1, batch_size)
+        self.num_threads = configure_inference_threads(num_threads)
+        self.stats = {"texts": 0, "inferences": 0, "batches": 0}
+
+    def run(self, model: Callable[..., Any], texts: List[str]) -> List[Any]:
+        """
+        Applique un pipeline à une liste de textes.
+
+        Args:
+            model: Pipeline (ou LazyModel) à appliquer
+            texts: Textes à analyser
+
+        Returns:
+            Le résultat du pipeline pour chaque texte, dans l'ordre des textes
+        """
+        if not texts:
+            return []
+        unique_texts = sorted(set(texts), key=len)
+        self.stats["texts"] += len(texts)
+        self.stats["inferences"] += len(unique_texts)
+
+        results: Dict[str, Any] = {}
+        for start in range(0, len(unique_texts), self.batch_size):
+            batch = unique_texts[start:start + self.batch_size]
+            self.stats["batches"] += 1
+            try:
+                outputs = model(batch, batch_size=len(batch))
+            except TypeError:
+                outputs = None
+            if not isinstance(outputs, list) or len(outputs) != len(batch):
+                # Pipeline ne gérant pas les listes : repli texte par texte
+                outputs = [model(text) for text in batch]
+            results.update(zip(batch, outputs))
+        return [results[text] for text in texts]
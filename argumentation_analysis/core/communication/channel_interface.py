@@ -32,12 +32,50 @@ class Channel(abc.ABC):
     Interface abstraite pour tous les canaux de communication.
     """
     
+    # Les canaux qui appellent _notify_delivery après chaque mise en file passent ce drapeau à True :
+    # le middleware peut alors attendre leurs messages sans les interroger périodiquement.
+    notifies_deliveries = False
+    
     def __init__(self, channel_id: str, channel_type: ChannelType, config: Optional[Dict[str, Any]] = None):
         self.id = channel_id
         self.type = channel_type
         self.config = config or {}
         self.subscribers: Dict[str, Dict[str, Any]] = {} # subscriber_id -> {"callback": callback, "filter": filter}
         self._message_queue: List[Message] = [] # Simple file d'attente en mémoire pour LocalChannel
+        self._delivery_listeners: List[Callable[[str], None]] = []
+    
+    def add_delivery_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Enregistre une fonction appelée avec l'identifiant du destinataire à chaque message mis en file.
+        
+        Args:
+            listener: La fonction à appeler
+        """
+        if listener not in self._delivery_listeners:
+            self._delivery_listeners.append(listener)
+    
+    def remove_delivery_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Retire une fonction enregistrée par add_delivery_listener.
+        
+        Args:
+            listener: La fonction à retirer
+        """
+        if listener in self._delivery_listeners:
+            self._delivery_listeners.remove(listener)
+    
+    def _notify_delivery(self, recipient_id: str) -> None:
+        """
+        Signale qu'un message est disponible pour un destinataire.
+        
+        Args:
+            recipient_id: Identifiant du destinataire
+        """
+        for listener in list(self._delivery_listeners):
+            try:
+                listener(recipient_id)
+            except Exception as e:
+                logger_channel.error(f"Canal '{self.id}': Erreur dans un écouteur de livraison: {e}")
     
     @abc.abstractmethod
     def send_message(self, message: Message) -> bool:
@@ -97,6 +135,8 @@ class LocalChannel(Channel):
     """
     Un canal de communication simple en mémoire pour les tests ou la communication locale.
     """
+    notifies_deliveries = True
+    
     def __init__(self, channel_id: str, middleware: Optional[Any] = None, config: Optional[Dict[str, Any]] = None):
         # Le middleware n'est pas directement utilisé par ce canal simple, mais l'API est conservée.
         # Le type est défini comme LOCAL.
@@ -111,6 +151,7 @@ class LocalChannel(Channel):
         
         # Version simple: ajouter à une file et notifier les abonnés qui correspondent au filtre
         self._message_queue.append(message) # Pour receive_message
+        self._notify_delivery(message.recipient)
         
         for sub_id, sub_info in list(self.subscribers.items()): # list() pour permettre la désinscription pendant l'itération
             callback = sub_info.get("callback")
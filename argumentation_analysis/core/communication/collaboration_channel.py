@@ -11,10 +11,10 @@ import threading
 import logging
 from typing import Dict, Any, Optional, List, Callable, Set
 from datetime import datetime
-from collections import defaultdict
 
 from .channel_interface import Channel, ChannelType, ChannelException
 from .message import Message, MessageType, MessagePriority, AgentLevel
+from .mailbox import MailboxRegistry
 
 
 class CollaborationGroup:
@@ -145,6 +145,8 @@ class CollaborationChannel(Channel):
     de collaboration et le partage de contexte entre agents.
     """
     
+    notifies_deliveries = True
+    
     def __init__(self, channel_id: str, config: Optional[Dict[str, Any]] = None):
         """
         Initialise un nouveau canal de collaboration.
@@ -158,8 +160,8 @@ class CollaborationChannel(Channel):
         # Groupes de collaboration
         self.groups = {}
         
-        # Messages directs entre agents
-        self.direct_messages = defaultdict(list)
+        # Messages directs entre agents, une boîte aux lettres par destinataire
+        self.direct_messages = MailboxRegistry(self.config.get("message_ttl"))
         
         # Verrou pour les opérations concurrentes
         self.lock = threading.RLock()
@@ -233,6 +235,9 @@ class CollaborationChannel(Channel):
             
             # Ajouter le message à l'historique du groupe
             group.add_message(message)
+            for member_id in group.members:
+                if member_id != message.sender:
+                    self._notify_delivery(member_id)
             
             # Mettre à jour les statistiques
             self.stats["messages_sent"] += 1
@@ -260,14 +265,11 @@ class CollaborationChannel(Channel):
             self.logger.error(f"Message {message.id} has no recipient")
             return False
         
+        # Ajouter le message à la boîte du destinataire
+        self.direct_messages.get(message.recipient).put(message)
+        self._notify_delivery(message.recipient)
+        
         with self.lock:
-            # Ajouter le message à la liste des messages du destinataire
-            self.direct_messages[message.recipient].append({
-                "message": message,
-                "timestamp": datetime.now(),
-                "read": False
-            })
-            
             # Mettre à jour les statistiques
             self.stats["messages_sent"] += 1
             self.stats["direct_messages"] += 1
@@ -293,19 +295,17 @@ class CollaborationChannel(Channel):
         # Note: Cette implémentation ne gère pas réellement le timeout
         # Une implémentation complète utiliserait des files d'attente avec blocage
         
+        # Vérifier s'il y a des messages directs non lus
+        mailbox = self.direct_messages.get(recipient_id, create=False)
+        message = mailbox.pop() if mailbox is not None else None
+        
         with self.lock:
-            # Vérifier s'il y a des messages directs non lus
-            if recipient_id in self.direct_messages and self.direct_messages[recipient_id]:
-                for i, entry in enumerate(self.direct_messages[recipient_id]):
-                    if not entry["read"]:
-                        # Marquer le message comme lu
-                        self.direct_messages[recipient_id][i]["read"] = True
-                        
-                        # Mettre à jour les statistiques
-                        self.stats["messages_received"] += 1
-                        
-                        self.logger.info(f"Direct message {entry['message'].id} received by {recipient_id}")
-                        return entry["message"]
+            if message is not None:
+                # Mettre à jour les statistiques
+                self.stats["messages_received"] += 1
+                
+                self.logger.info(f"Direct message {message.id} received by {recipient_id}")
+                return message
             
             # Vérifier s'il y a des messages de groupe non lus
             for group_id, group in self.groups.items():
@@ -380,15 +380,11 @@ class CollaborationChannel(Channel):
         Returns:
             Liste des messages en attente
         """
-        messages = []
+        # Récupérer les messages directs non lus, sans les retirer de la boîte
+        mailbox = self.direct_messages.get(recipient_id, create=False)
+        messages = mailbox.snapshot(max_count) if mailbox is not None else []
         
         with self.lock:
-            # Récupérer les messages directs non lus
-            if recipient_id in self.direct_messages:
-                for entry in self.direct_messages[recipient_id]:
-                    if not entry["read"]:
-                        messages.append(entry["message"])
-            
             # Récupérer les messages de groupe
             for group_id, group in self.groups.items():
                 if recipient_id in group.members:
@@ -403,6 +399,18 @@ class CollaborationChannel(Channel):
         
         return messages
     
+    def expire_messages(self) -> int:
+        """
+        Supprime les messages directs dont la durée de vie (métadonnée "ttl") est écoulée.
+        
+        Returns:
+            Le nombre de messages expirés
+        """
+        count = self.direct_messages.expire()
+        if count:
+            self.logger.info(f"Expired {count} direct messages")
+        return count
+    
     def get_channel_info(self) -> Dict[str, Any]:
         """
         Récupère des informations sur ce canal.
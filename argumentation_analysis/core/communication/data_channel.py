@@ -10,25 +10,88 @@ import uuid
 import threading
 import logging
 import json
-import gzip
-import base64
+import zlib
+import mmap
+import os
+import shutil
+import hashlib
+import tempfile
+import time
+import weakref
 from typing import Dict, Any, Optional, List, Callable, Set, Tuple
 from datetime import datetime
 from collections import defaultdict
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
 from .channel_interface import Channel, ChannelType, ChannelException
 from .message import Message, MessageType, MessagePriority, AgentLevel
+from .mailbox import MailboxRegistry
 
 from argumentation_analysis.paths import DATA_DIR
 
 
 
+def _zstd_compress(payload: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=3).compress(payload)
+
+
+def _zstd_decompress(payload) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(payload)
+
+
+# Codecs de compression disponibles, par ordre de préférence
+COMPRESSION_CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[Any], bytes]]] = {}
+if zstandard is not None:
+    COMPRESSION_CODECS["zstd"] = (_zstd_compress, _zstd_decompress)
+if lz4_frame is not None:
+    COMPRESSION_CODECS["lz4"] = (lz4_frame.compress, lz4_frame.decompress)
+COMPRESSION_CODECS["zlib"] = (lambda payload: zlib.compress(payload, 6), zlib.decompress)
+
+
+class _Blob:
+    """Contenu sérialisé (éventuellement compressé) partagé par les versions identiques."""
+    
+    __slots__ = ("content_hash", "codec", "payload", "path", "size", "stored_size", "refcount")
+    
+    def __init__(self, content_hash: str, codec: Optional[str], payload, path: Optional[str],
+                 size: int, stored_size: int):
+        self.content_hash = content_hash
+        self.codec = codec
+        self.payload = payload
+        self.path = path
+        self.size = size
+        self.stored_size = stored_size
+        self.refcount = 0
+
+
 class DataStore:
     """
     Stockage de données pour le canal de données.
     
     Cette classe gère le stockage et la récupération des données volumineuses,
     avec support pour la compression, le versionnement et le streaming.
+    
+    Les données sont sérialisées en JSON une seule fois puis conservées sous forme
+    d'octets bruts, compressés avec zstd ou lz4 lorsque ces bibliothèques sont
+    installées (zlib sinon). Les contenus identiques sont dédupliqués par empreinte
+    SHA-256 et partagés entre versions ; au-delà de spill_threshold octets, ils sont
+    déportés dans des fichiers projetés en mémoire (mmap). La configuration accepte :
+    
+    - compression_threshold: taille minimale compressée (1024 octets par défaut)
+    - compression_codec: "zstd", "lz4" ou "zlib" (le plus rapide disponible par défaut)
+    - spill_threshold: taille stockée à partir de laquelle le contenu est écrit sur disque (1 Mio par défaut, None pour désactiver)
+    - spill_dir: répertoire des fichiers déportés (répertoire temporaire par défaut)
+    - max_versions: nombre de versions conservées par élément (None pour toutes)
+    - max_version_age: âge maximum des versions en secondes, la dernière version étant toujours conservée (None pour illimité)
     """
     
     def __init__(self, store_id: str, config: Optional[Dict[str, Any]] = None):
@@ -43,8 +106,25 @@ class DataStore:
         self.config = config or {}
         self.data_items = {}  # Dictionnaire des éléments de données par ID
         self.versions = defaultdict(list)  # Historique des versions par ID de données
+        self.blobs: Dict[str, _Blob] = {}  # Contenus dédupliqués par empreinte
         self.lock = threading.RLock()
         self.logger = logging.getLogger(f"DataStore.{store_id}")
+        
+        self.compression_threshold = self.config.get("compression_threshold", 1024)
+        self.codec = self.config.get("compression_codec") or next(iter(COMPRESSION_CODECS))
+        if self.codec not in COMPRESSION_CODECS:
+            raise ValueError(f"Compression codec not available: {self.codec}")
+        self.spill_threshold = self.config.get("spill_threshold", 1024 * 1024)
+        self.spill_dir = self.config.get("spill_dir")
+        self._owns_spill_dir = False
+        self.max_versions = self.config.get("max_versions")
+        self.max_version_age = self.config.get("max_version_age")
+        
+        self.stats = {
+            "deduplicated_versions": 0,
+            "spilled_blobs": 0,
+            "pruned_versions": 0
+        }
     
     def store_data(self, data_id: str, data: Any, metadata: Optional[Dict[str, Any]] = None,
                  compress: bool = True) -> str:
@@ -62,29 +142,42 @@ class DataStore:
         """
         version_id = f"v-{uuid.uuid4().hex[:8]}"
         
+        # Sérialisation, empreinte et compression se font hors verrou
+        serialized_data = self._serialize_data(data)
+        content_hash = hashlib.sha256(serialized_data).hexdigest()
+        
         with self.lock:
-            # Sérialiser les données
-            serialized_data = self._serialize_data(data)
-            
-            # Compresser les données si nécessaire
-            if compress and len(serialized_data) > 1024:  # Seuil de compression
-                compressed_data = gzip.compress(serialized_data.encode('utf-8'))
-                data_content = base64.b64encode(compressed_data).decode('utf-8')
-                is_compressed = True
+            blob = self.blobs.get(content_hash)
+        
+        if blob is None:
+            blob = self._create_blob(content_hash, serialized_data, compress)
+        
+        with self.lock:
+            # Un contenu identique a pu être stocké entre-temps par un autre thread
+            existing = self.blobs.get(content_hash)
+            if existing is not None:
+                if existing is not blob:
+                    self._discard_blob_file(blob)
+                    blob = existing
+                if blob.refcount:
+                    self.stats["deduplicated_versions"] += 1
             else:
-                data_content = serialized_data
-                is_compressed = False
+                self.blobs[content_hash] = blob
+            blob.refcount += 1
             
             # Créer l'élément de données
             data_item = {
                 "id": data_id,
                 "version_id": version_id,
-                "content": data_content,
                 "metadata": metadata or {},
-                "is_compressed": is_compressed,
-                "size": len(serialized_data),
-                "compressed_size": len(data_content) if is_compressed else None,
-                "created_at": datetime.now().isoformat()
+                "is_compressed": blob.codec is not None,
+                "codec": blob.codec,
+                "content_hash": content_hash,
+                "spilled": blob.path is not None,
+                "size": blob.size,
+                "compressed_size": blob.stored_size if blob.codec is not None else None,
+                "created_at": datetime.now().isoformat(),
+                "stored_at": time.time()
             }
             
             # Stocker l'élément de données
@@ -92,6 +185,7 @@ class DataStore:
             
             # Ajouter la version à l'historique
             self.versions[data_id].append(version_id)
+            self._apply_retention_locked(data_id)
             
             self.logger.info(f"Data item {data_id} stored with version {version_id}")
             return version_id
@@ -110,34 +204,34 @@ class DataStore:
         Raises:
             KeyError: Si l'élément de données n'existe pas
         """
-        with self.lock:
-            # Déterminer la version à récupérer
-            if version_id is None:
-                if data_id not in self.versions or not self.versions[data_id]:
-                    raise KeyError(f"Data item {data_id} not found")
-                
-                version_id = self.versions[data_id][-1]  # Dernière version
-            
-            # Récupérer l'élément de données
-            item_key = f"{data_id}:{version_id}"
-            if item_key not in self.data_items:
-                raise KeyError(f"Data item {data_id} with version {version_id} not found")
-            
-            data_item = self.data_items[item_key]
-            
-            # Décompresser les données si nécessaire
-            if data_item["is_compressed"]:
-                compressed_data = base64.b64decode(data_item["content"])
-                decompressed_data = gzip.decompress(compressed_data).decode('utf-8')
-                data_content = decompressed_data
-            else:
-                data_content = data_item["content"]
+        buffer, data_item = self._get_buffer(data_id, version_id)
+        
+        # Désérialiser les données
+        data = self._deserialize_data(buffer)
+        
+        self.logger.info(f"Data item {data_id} with version {data_item['version_id']} retrieved")
+        return data, data_item["metadata"]
+    
+    def get_data_buffer(self, data_id: str, version_id: Optional[str] = None, raw: bool = False) -> memoryview:
+        """
+        Récupère le contenu sérialisé (JSON UTF-8) d'un élément sous forme de memoryview.
+        
+        Pour un contenu non compressé, la vue porte directement sur les octets stockés ou
+        sur le fichier projeté en mémoire, sans copie.
+        
+        Args:
+            data_id: Identifiant de l'élément de données
+            version_id: Identifiant de version (None pour la dernière version)
+            raw: Retourner les octets stockés tels quels, compressés avec le codec indiqué par get_data_info
             
-            # Désérialiser les données
-            data = self._deserialize_data(data_content)
+        Returns:
+            Une vue en lecture seule sur le contenu
             
-            self.logger.info(f"Data item {data_id} with version {version_id} retrieved")
-            return data, data_item["metadata"]
+        Raises:
+            KeyError: Si l'élément de données n'existe pas
+        """
+        buffer, _ = self._get_buffer(data_id, version_id, raw)
+        return buffer
     
     def delete_data(self, data_id: str, version_id: Optional[str] = None) -> bool:
         """
@@ -157,26 +251,18 @@ class DataStore:
             
             if version_id is None:
                 # Supprimer toutes les versions
-                for v_id in self.versions[data_id]:
-                    item_key = f"{data_id}:{v_id}"
-                    if item_key in self.data_items:
-                        del self.data_items[item_key]
+                for v_id in list(self.versions[data_id]):
+                    self._remove_version_locked(data_id, v_id)
                 
-                del self.versions[data_id]
                 self.logger.info(f"All versions of data item {data_id} deleted")
                 return True
             else:
                 # Supprimer une version spécifique
-                item_key = f"{data_id}:{version_id}"
-                if item_key not in self.data_items:
+                if f"{data_id}:{version_id}" not in self.data_items:
                     self.logger.warning(f"Data item {data_id} with version {version_id} not found")
                     return False
                 
-                del self.data_items[item_key]
-                self.versions[data_id].remove(version_id)
-                
-                if not self.versions[data_id]:
-                    del self.versions[data_id]
+                self._remove_version_locked(data_id, version_id)
                 
                 self.logger.info(f"Data item {data_id} with version {version_id} deleted")
                 return True
@@ -218,16 +304,161 @@ class DataStore:
             if item_key not in self.data_items:
                 return None
             
-            data_item = self.data_items[item_key].copy()
+            return self.data_items[item_key].copy()
+    
+    def apply_retention(self) -> int:
+        """
+        Applique la politique de rétention des versions à tous les éléments.
+        
+        Returns:
+            Le nombre de versions supprimées
+        """
+        with self.lock:
+            before = self.stats["pruned_versions"]
+            for data_id in list(self.versions):
+                self._apply_retention_locked(data_id)
+            return self.stats["pruned_versions"] - before
+    
+    def get_storage_info(self) -> Dict[str, Any]:
+        """
+        Récupère des informations sur l'occupation du stockage.
+        
+        Returns:
+            Un dictionnaire d'informations sur le stockage
+        """
+        with self.lock:
+            return {
+                "codec": self.codec,
+                "item_count": len(self.data_items),
+                "blob_count": len(self.blobs),
+                "memory_bytes": sum(blob.stored_size for blob in self.blobs.values() if blob.path is None),
+                "spilled_bytes": sum(blob.stored_size for blob in self.blobs.values() if blob.path is not None),
+                **self.stats
+            }
+    
+    def close(self) -> None:
+        """Supprime toutes les données et les fichiers déportés."""
+        with self.lock:
+            for blob in self.blobs.values():
+                self._discard_blob_file(blob)
+            self.blobs.clear()
+            self.data_items.clear()
+            self.versions.clear()
+            
+            if self._owns_spill_dir and self.spill_dir:
+                shutil.rmtree(self.spill_dir, ignore_errors=True)
+                self.spill_dir = None
+                self._owns_spill_dir = False
+    
+    def _get_buffer(self, data_id: str, version_id: Optional[str], raw: bool = False) -> Tuple[memoryview, Dict[str, Any]]:
+        with self.lock:
+            # Déterminer la version à récupérer
+            if version_id is None:
+                if data_id not in self.versions or not self.versions[data_id]:
+                    raise KeyError(f"Data item {data_id} not found")
+                
+                version_id = self.versions[data_id][-1]  # Dernière version
             
-            # Supprimer le contenu pour alléger l'information
-            data_item.pop("content", None)
+            # Récupérer l'élément de données
+            item_key = f"{data_id}:{version_id}"
+            if item_key not in self.data_items:
+                raise KeyError(f"Data item {data_id} with version {version_id} not found")
             
-            return data_item
+            data_item = self.data_items[item_key]
+            blob = self.blobs[data_item["content_hash"]]
+            payload = blob.payload
+        
+        # La décompression se fait hors verrou
+        view = memoryview(payload).toreadonly()
+        if blob.codec is not None and not raw:
+            view = memoryview(COMPRESSION_CODECS[blob.codec][1](view))
+        return view, data_item
+    
+    def _create_blob(self, content_hash: str, serialized_data: bytes, compress: bool) -> _Blob:
+        codec = None
+        payload = serialized_data
+        if compress and len(serialized_data) > self.compression_threshold:
+            compressed = COMPRESSION_CODECS[self.codec][0](serialized_data)
+            # Ne garder la version compressée que si elle est effectivement plus petite
+            if len(compressed) < len(serialized_data):
+                codec = self.codec
+                payload = compressed
+        
+        path = None
+        if self.spill_threshold is not None and len(payload) >= self.spill_threshold:
+            path, payload = self._spill(content_hash, payload)
+        
+        return _Blob(content_hash, codec, payload, path, len(serialized_data), len(payload))
     
-    def _serialize_data(self, data: Any) -> str:
+    def _spill(self, content_hash: str, payload: bytes) -> Tuple[str, mmap.mmap]:
+        with self.lock:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix=f"datastore-{self.id}-")
+                self._owns_spill_dir = True
+                # Le répertoire temporaire est supprimé même si close() n'est jamais appelé
+                weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+            os.makedirs(self.spill_dir, exist_ok=True)
+        
+        path = os.path.join(self.spill_dir, f"{content_hash}-{uuid.uuid4().hex[:8]}.bin")
+        with open(path, "wb") as spill_file:
+            spill_file.write(payload)
+        with open(path, "rb") as spill_file:
+            mapped = mmap.mmap(spill_file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        with self.lock:
+            self.stats["spilled_blobs"] += 1
+        self.logger.info(f"Data blob {content_hash[:12]} spilled to {path} ({len(payload)} bytes)")
+        return path, mapped
+    
+    def _discard_blob_file(self, blob: _Blob) -> None:
+        if blob.path is None:
+            return
+        # Le mmap est libéré par le ramasse-miettes une fois les vues en cours relâchées
+        try:
+            os.remove(blob.path)
+        except OSError as e:
+            self.logger.debug(f"Could not remove spill file {blob.path}: {e}")
+    
+    def _remove_version_locked(self, data_id: str, version_id: str) -> None:
+        data_item = self.data_items.pop(f"{data_id}:{version_id}", None)
+        if version_id in self.versions.get(data_id, []):
+            self.versions[data_id].remove(version_id)
+            if not self.versions[data_id]:
+                del self.versions[data_id]
+        
+        if data_item is not None:
+            blob = self.blobs.get(data_item["content_hash"])
+            if blob is not None:
+                blob.refcount -= 1
+                if blob.refcount <= 0:
+                    del self.blobs[blob.content_hash]
+                    self._discard_blob_file(blob)
+    
+    def _apply_retention_locked(self, data_id: str) -> None:
+        version_ids = self.versions.get(data_id)
+        if not version_ids:
+            return
+        
+        # La dernière version n'est jamais supprimée par la politique de rétention
+        candidates = version_ids[:-1]
+        pruned = []
+        if self.max_versions is not None and len(version_ids) > self.max_versions:
+            pruned = candidates[:len(version_ids) - max(self.max_versions, 1)]
+        if self.max_version_age is not None:
+            limit = time.time() - self.max_version_age
+            for v_id in candidates:
+                if v_id not in pruned and self.data_items[f"{data_id}:{v_id}"]["stored_at"] < limit:
+                    pruned.append(v_id)
+        
+        for v_id in pruned:
+            self._remove_version_locked(data_id, v_id)
+        if pruned:
+            self.stats["pruned_versions"] += len(pruned)
+            self.logger.info(f"Pruned {len(pruned)} old versions of data item {data_id}")
+    
+    def _serialize_data(self, data: Any) -> bytes:
         """
-        Sérialise des données en chaîne JSON.
+        Sérialise des données en JSON encodé en UTF-8.
         
         Args:
             data: Les données à sérialiser
@@ -235,18 +466,20 @@ class DataStore:
         Returns:
             Les données sérialisées
         """
-        return json.dumps(data)
+        return json.dumps(data, ensure_ascii=False).encode("utf-8")
     
-    def _deserialize_data(self, serialized_data: str) -> Any:
+    def _deserialize_data(self, serialized_data) -> Any:
         """
         Désérialise des données JSON.
         
         Args:
-            serialized_data: Les données sérialisées
+            serialized_data: Les données sérialisées (chaîne, octets ou memoryview)
             
         Returns:
             Les données désérialisées
         """
+        if isinstance(serialized_data, memoryview):
+            serialized_data = serialized_data.tobytes()
         return json.loads(serialized_data)
 
 
@@ -258,6 +491,8 @@ class DataChannel(Channel):
     entre agents, avec support pour la compression, le streaming et le versionnement.
     """
     
+    notifies_deliveries = True
+    
     def __init__(self, channel_id: str, config: Optional[Dict[str, Any]] = None):
         """
         Initialise un nouveau canal de données.
@@ -271,10 +506,10 @@ class DataChannel(Channel):
         # Stockage de données
         self.data_store = DataStore(f"{channel_id}-store", config)
         
-        # Files d'attente de messages par destinataire
-        self.message_queues = defaultdict(list)
+        # Files d'attente de messages par destinataire, chacune avec son propre verrou
+        self.mailboxes = MailboxRegistry((config or {}).get("message_ttl"))
         
-        # Verrou pour les opérations concurrentes
+        # Verrou pour les statistiques et les abonnements
         self.lock = threading.RLock()
         
         # Configuration du logger
@@ -314,7 +549,8 @@ class DataChannel(Channel):
             
             # Vérifier si le message contient des données volumineuses
             data = message.content.get("data")
-            if data and isinstance(data, dict) and len(str(data)) > self.max_inline_data_size:
+            data_size = len(str(data)) if data and isinstance(data, dict) else 0
+            if data_size > self.max_inline_data_size:
                 # Stocker les données séparément
                 data_id = f"data-{uuid.uuid4().hex[:8]}"
                 version_id = self.data_store.store_data(
@@ -334,27 +570,23 @@ class DataChannel(Channel):
                 message.content["data_reference"] = {
                     "data_id": data_id,
                     "version_id": version_id,
-                    "size": len(str(data))
+                    "size": data_size
                 }
                 
                 # Mettre à jour les statistiques
-                with self.lock:
-                    self.stats["data_items_stored"] += 1
-                    self.stats["total_data_size"] += len(str(data))
+                self._record_stored_data(data_id, version_id, data_size)
                 
                 self.logger.info(f"Large data from message {message.id} stored separately with ID {data_id}")
             
             # Ajouter le message à la file d'attente du destinataire
+            self.mailboxes.get(message.recipient).put(message)
+            
+            # Mettre à jour les statistiques
             with self.lock:
-                self.message_queues[message.recipient].append({
-                    "message": message,
-                    "timestamp": datetime.now(),
-                    "read": False
-                })
-                
-                # Mettre à jour les statistiques
                 self.stats["messages_sent"] += 1
             
+            self._notify_delivery(message.recipient)
+            
             # Notifier les abonnés
             self._notify_subscribers(message)
             
@@ -377,46 +609,40 @@ class DataChannel(Channel):
             Le message reçu ou None si timeout
         """
         try:
+            mailbox = self.mailboxes.get(recipient_id, create=False)
+            message = mailbox.pop() if mailbox is not None else None
+            if message is None:
+                return None
+            
+            # Vérifier si le message contient une référence à des données
+            data_reference = message.content.get("data_reference")
+            if data_reference:
+                try:
+                    # Récupérer les données
+                    data, _ = self.data_store.get_data(
+                        data_reference["data_id"],
+                        data_reference.get("version_id")
+                    )
+                    
+                    # Remplacer la référence par les données
+                    message.content["data"] = data
+                    message.content.pop("data_reference", None)
+                    
+                    # Mettre à jour les statistiques
+                    with self.lock:
+                        self.stats["data_items_retrieved"] += 1
+                    
+                    self.logger.info(f"Data for message {message.id} retrieved from storage")
+                    
+                except Exception as e:
+                    self.logger.error(f"Error retrieving data for message {message.id}: {str(e)}")
+            
+            # Mettre à jour les statistiques
             with self.lock:
-                # Vérifier s'il y a des messages non lus
-                if recipient_id in self.message_queues:
-                    for i, entry in enumerate(self.message_queues[recipient_id]):
-                        if not entry["read"]:
-                            # Récupérer le message
-                            message = entry["message"]
-                            
-                            # Vérifier si le message contient une référence à des données
-                            data_reference = message.content.get("data_reference")
-                            if data_reference:
-                                try:
-                                    # Récupérer les données
-                                    data, _ = self.data_store.get_data(
-                                        data_reference["data_id"],
-                                        data_reference.get("version_id")
-                                    )
-                                    
-                                    # Remplacer la référence par les données
-                                    message.content["data"] = data
-                                    message.content.pop("data_reference", None)
-                                    
-                                    # Mettre à jour les statistiques
-                                    self.stats["data_items_retrieved"] += 1
-                                    
-                                    self.logger.info(f"Data for message {message.id} retrieved from storage")
-                                    
-                                except Exception as e:
-                                    self.logger.error(f"Error retrieving data for message {message.id}: {str(e)}")
-                            
-                            # Marquer le message comme lu
-                            self.message_queues[recipient_id][i]["read"] = True
-                            
-                            # Mettre à jour les statistiques
-                            self.stats["messages_received"] += 1
-                            
-                            self.logger.info(f"Message {message.id} received by {recipient_id}")
-                            return message
+                self.stats["messages_received"] += 1
             
-            return None
+            self.logger.info(f"Message {message.id} received by {recipient_id}")
+            return message
             
         except Exception as e:
             self.logger.error(f"Error receiving message: {str(e)}")
@@ -479,53 +705,59 @@ class DataChannel(Channel):
         Returns:
             Liste des messages en attente
         """
+        mailbox = self.mailboxes.get(recipient_id, create=False)
+        if mailbox is None:
+            return []
+        
         messages = []
         
-        with self.lock:
-            # Vérifier s'il y a des messages non lus
-            if recipient_id in self.message_queues:
-                for entry in self.message_queues[recipient_id]:
-                    if not entry["read"]:
-                        message = entry["message"]
-                        
-                        # Vérifier si le message contient une référence à des données
-                        data_reference = message.content.get("data_reference")
-                        if data_reference:
-                            try:
-                                # Récupérer les données
-                                data, _ = self.data_store.get_data(
-                                    data_reference["data_id"],
-                                    data_reference.get("version_id")
-                                )
-                                
-                                # Créer une copie du message avec les données
-                                message_copy = Message(
-                                    message_type=message.type,
-                                    sender=message.sender,
-                                    sender_level=message.sender_level,
-                                    content={**message.content, "data": data, "data_reference": None},
-                                    recipient=message.recipient,
-                                    channel=message.channel,
-                                    priority=message.priority,
-                                    metadata=message.metadata,
-                                    message_id=message.id,
-                                    timestamp=message.timestamp
-                                )
-                                
-                                messages.append(message_copy)
-                                
-                            except Exception as e:
-                                self.logger.error(f"Error retrieving data for message {message.id}: {str(e)}")
-                                messages.append(message)
-                        else:
-                            messages.append(message)
-                        
-                        # Limiter le nombre de messages
-                        if max_count is not None and len(messages) >= max_count:
-                            break
+        for message in mailbox.snapshot(max_count):
+            # Vérifier si le message contient une référence à des données
+            data_reference = message.content.get("data_reference")
+            if data_reference:
+                try:
+                    # Récupérer les données
+                    data, _ = self.data_store.get_data(
+                        data_reference["data_id"],
+                        data_reference.get("version_id")
+                    )
+                    
+                    # Créer une copie du message avec les données
+                    message_copy = Message(
+                        message_type=message.type,
+                        sender=message.sender,
+                        sender_level=message.sender_level,
+                        content={**message.content, "data": data, "data_reference": None},
+                        recipient=message.recipient,
+                        channel=message.channel,
+                        priority=message.priority,
+                        metadata=message.metadata,
+                        message_id=message.id,
+                        timestamp=message.timestamp
+                    )
+                    
+                    messages.append(message_copy)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error retrieving data for message {message.id}: {str(e)}")
+                    messages.append(message)
+            else:
+                messages.append(message)
         
         return messages
     
+    def expire_messages(self) -> int:
+        """
+        Supprime les messages dont la durée de vie (métadonnée "ttl") est écoulée.
+        
+        Returns:
+            Le nombre de messages expirés
+        """
+        count = self.mailboxes.expire()
+        if count:
+            self.logger.info(f"Expired {count} messages")
+        return count
+    
     def get_channel_info(self) -> Dict[str, Any]:
         """
         Récupère des informations sur ce canal.
@@ -539,6 +771,8 @@ class DataChannel(Channel):
                 "type": self.type.value,
                 "stats": self.stats,
                 "subscriber_count": len(self.subscribers),
+                "queue_sizes": self.mailboxes.sizes(),
+                "storage": self.data_store.get_storage_info(),
                 "compression_threshold": self.compression_threshold,
                 "max_inline_data_size": self.max_inline_data_size
             }
@@ -578,12 +812,45 @@ class DataChannel(Channel):
         version_id = self.data_store.store_data(data_id, data, metadata, compress)
         
         # Mettre à jour les statistiques
-        with self.lock:
-            self.stats["data_items_stored"] += 1
-            self.stats["total_data_size"] += len(str(data))
+        self._record_stored_data(data_id, version_id, len(str(data)))
         
         return version_id
     
+    def get_data_buffer(self, data_id: str, version_id: Optional[str] = None, raw: bool = False) -> memoryview:
+        """
+        Récupère le contenu sérialisé de données sous forme de memoryview, pour une lecture en flux.
+        
+        Args:
+            data_id: Identifiant des données
+            version_id: Identifiant de version (None pour la dernière version)
+            raw: Retourner les octets stockés tels quels (éventuellement compressés)
+            
+        Returns:
+            Une vue en lecture seule sur le contenu
+        """
+        buffer = self.data_store.get_data_buffer(data_id, version_id, raw)
+        
+        # Mettre à jour les statistiques
+        with self.lock:
+            self.stats["data_items_retrieved"] += 1
+        
+        return buffer
+    
+    def _record_stored_data(self, data_id: str, version_id: str, data_size: int) -> None:
+        """
+        Met à jour les statistiques après le stockage de données.
+        
+        Args:
+            data_id: Identifiant des données
+            version_id: Identifiant de version
+            data_size: Taille des données
+        """
+        info = self.data_store.get_data_info(data_id, version_id) or {}
+        with self.lock:
+            self.stats["data_items_stored"] += 1
+            self.stats["total_data_size"] += data_size
+            self.stats["compressed_data_size"] += info.get("compressed_size") or info.get("size", 0)
+    
     def get_data(self, data_id: str, version_id: Optional[str] = None) -> Tuple[Any, Dict[str, Any]]:
         """
         Récupère des données du canal.
@@ -0,0 +1,137 @@
+"""
+Ordonnanceur d'échéances pour les protocoles de communication.
+
+Les échéances sont conservées dans un tas binaire ordonné par instant d'expiration
+(horloge monotone). Un thread unique dort jusqu'à la prochaine échéance au lieu de
+parcourir périodiquement toutes les entrées : le coût d'une expiration est
+O(log n), quel que soit le nombre d'échéances en attente, et une annulation est O(1).
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class DeadlineScheduler:
+    """
+    Exécute des fonctions à échéance, avec annulation et replanification par clé.
+
+    Chaque clé possède au plus une échéance : replanifier une clé remplace l'échéance
+    précédente. Les entrées annulées ou remplacées restent dans le tas jusqu'à leur
+    sortie (suppression paresseuse) et le tas est reconstruit lorsqu'elles dominent.
+    Les fonctions sont appelées depuis le thread de l'ordonnanceur, hors de tout verrou.
+    """
+
+    def __init__(self, name: str = "DeadlineScheduler"):
+        """
+        Initialise l'ordonnanceur et démarre son thread.
+
+        Args:
+            name: Nom du thread et du logger
+        """
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[float, int, Callable[[], Any]]] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._running = True
+
+        self.logger = logging.getLogger(name)
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._condition:
+            return key in self._entries
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[[], Any]) -> None:
+        """
+        Planifie l'appel d'une fonction après un délai.
+
+        Args:
+            key: Clé de l'échéance (remplace toute échéance existante pour cette clé)
+            delay: Délai en secondes
+            callback: Fonction sans argument à appeler à l'échéance
+        """
+        deadline = time.monotonic() + max(delay, 0.0)
+
+        with self._condition:
+            sequence = next(self._sequence)
+            self._entries[key] = (deadline, sequence, callback)
+            heapq.heappush(self._heap, (deadline, sequence, key))
+
+            # Réveiller le thread uniquement si cette échéance devient la plus proche
+            if self._heap[0][1] == sequence:
+                self._condition.notify()
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Annule l'échéance associée à une clé.
+
+        Args:
+            key: Clé de l'échéance
+
+        Returns:
+            True si une échéance était planifiée, False sinon
+        """
+        with self._condition:
+            if self._entries.pop(key, None) is None:
+                return False
+            if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+                self._heap = [item for item in self._heap if self._is_current(item)]
+                heapq.heapify(self._heap)
+            return True
+
+    def shutdown(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        Arrête le thread de l'ordonnanceur sans exécuter les échéances restantes.
+
+        Args:
+            timeout: Délai d'attente maximum de l'arrêt du thread en secondes
+        """
+        with self._condition:
+            self._running = False
+            self._entries.clear()
+            self._heap.clear()
+            self._condition.notify()
+
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _is_current(self, item: Tuple[float, int, Hashable]) -> bool:
+        entry = self._entries.get(item[2])
+        return entry is not None and entry[1] == item[1]
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                due = self._wait_for_due_locked()
+                if due is None:
+                    return
+
+            for key, callback in due:
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"Error in deadline callback for {key}: {e}")
+
+    def _wait_for_due_locked(self) -> Optional[List[Tuple[Hashable, Callable[[], Any]]]]:
+        while self._running:
+            now = time.monotonic()
+            due = []
+            while self._heap and self._heap[0][0] <= now:
+                item = heapq.heappop(self._heap)
+                if self._is_current(item):
+                    due.append((item[2], self._entries.pop(item[2])[2]))
+            if due:
+                return due
+
+            self._condition.wait(self._heap[0][0] - now if self._heap else None)
+        return None
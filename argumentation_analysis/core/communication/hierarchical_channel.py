@@ -8,13 +8,13 @@ les communications verticales et suit un modèle de communication structuré.
 
 import uuid
 import threading
-import queue
 import logging
 from typing import Dict, Any, Optional, List, Callable, Set
 from datetime import datetime
 
 from .channel_interface import Channel, ChannelType, ChannelException, ChannelTimeoutException
 from .message import Message, MessageType, MessagePriority, AgentLevel
+from .mailbox import MailboxRegistry
 
 
 class HierarchicalChannel(Channel):
@@ -26,6 +26,8 @@ class HierarchicalChannel(Channel):
     ordonnancement des messages.
     """
     
+    notifies_deliveries = True
+    
     def __init__(self, channel_id: str, config: Optional[Dict[str, Any]] = None):
         """
         Initialise un nouveau canal hiérarchique.
@@ -36,10 +38,10 @@ class HierarchicalChannel(Channel):
         """
         super().__init__(channel_id, ChannelType.HIERARCHICAL, config)
         
-        # Files d'attente de messages par destinataire
-        self.message_queues = {}
+        # Files d'attente de messages par destinataire, chacune avec son propre verrou
+        self.mailboxes = MailboxRegistry(self.config.get("message_ttl"))
         
-        # Verrou pour les opérations concurrentes
+        # Verrou pour les statistiques et les abonnements
         self.lock = threading.RLock()
         
         # Configuration du logger
@@ -89,11 +91,6 @@ class HierarchicalChannel(Channel):
             if message.type not in valid_types:
                 self.logger.warning(f"Message type {message.type} not ideal for hierarchical channel")
             
-            # Créer la file d'attente du destinataire si elle n'existe pas
-            with self.lock:
-                if message.recipient not in self.message_queues:
-                    self.message_queues[message.recipient] = queue.PriorityQueue()
-            
             # Déterminer la priorité numérique (plus petit = plus prioritaire)
             priority_values = {
                 MessagePriority.CRITICAL: 0,
@@ -104,7 +101,8 @@ class HierarchicalChannel(Channel):
             priority_value = priority_values.get(message.priority, 2)
             
             # Ajouter le message à la file d'attente du destinataire
-            self.message_queues[message.recipient].put((priority_value, datetime.now(), message))
+            self.mailboxes.get(message.recipient).put(message, priority_value)
+            self._notify_delivery(message.recipient)
             
             # Mettre à jour les statistiques
             with self.lock:
@@ -145,30 +143,30 @@ class HierarchicalChannel(Channel):
             Le message reçu ou None si timeout
         """
         try:
-            # Vérifier si le destinataire a une file d'attente
-            with self.lock:
-                if recipient_id not in self.message_queues:
-                    self.message_queues[recipient_id] = queue.PriorityQueue()
+            mailbox = self.mailboxes.get(recipient_id)
             
-            q_size = self.message_queues[recipient_id].qsize()
-            self.logger.info(f"Attempting to get message for {recipient_id}. Queue size: {q_size}. Timeout: {timeout}")
+            # Un timeout nul est une simple consultation : le middleware l'utilise pour parcourir
+            # les canaux avant d'attendre une notification de livraison, sans journaliser chaque essai.
+            non_blocking = timeout is not None and timeout <= 0
+            if not non_blocking:
+                self.logger.info(f"Attempting to get message for {recipient_id}. Queue size: {len(mailbox)}. Timeout: {timeout}")
             
             # Récupérer un message de la file d'attente
-            try:
-                priority, timestamp, message_obj = self.message_queues[recipient_id].get(block=True, timeout=timeout)
-                self.logger.info(f"Successfully got message {message_obj.id} for {recipient_id} from queue.")
-                
-                # Mettre à jour les statistiques
-                with self.lock:
-                    self.stats["messages_received"] += 1
-                
-                self.logger.info(f"Message {message_obj.id} received by {recipient_id}")
-                return message_obj
-                
-            except queue.Empty:
-                self.logger.warning(f"Queue empty for {recipient_id} after timeout {timeout}s.")
+            message_obj = mailbox.pop(0 if non_blocking else timeout)
+            if message_obj is None:
+                if not non_blocking:
+                    self.logger.warning(f"Queue empty for {recipient_id} after timeout {timeout}s.")
                 return None
             
+            self.logger.info(f"Successfully got message {message_obj.id} for {recipient_id} from queue.")
+            
+            # Mettre à jour les statistiques
+            with self.lock:
+                self.stats["messages_received"] += 1
+            
+            self.logger.info(f"Message {message_obj.id} received by {recipient_id}")
+            return message_obj
+            
         except Exception as e:
             self.logger.error(f"Error receiving message: {str(e)}")
             return None
@@ -230,41 +228,14 @@ class HierarchicalChannel(Channel):
         Returns:
             Liste des messages en attente
         """
-        messages = []
+        mailbox = self.mailboxes.get(recipient_id, create=False)
+        if mailbox is None:
+            return []
         
-        with self.lock:
-            # Vérifier si le destinataire a une file d'attente
-            if recipient_id not in self.message_queues:
-                return []
-            
-            # Créer une nouvelle file d'attente pour stocker les messages
-            new_queue = queue.PriorityQueue()
-            original_queue = self.message_queues[recipient_id]
-            
-            # Récupérer tous les messages tout en les préservant
-            count = 0
-            items = []
-            
-            # Extraire tous les éléments de la file d'origine
-            while not original_queue.empty():
-                item = original_queue.get()
-                items.append(item)
-            
-            # Traiter les éléments extraits
-            for item in items:
-                # Ajouter le message à la liste de résultats si la limite n'est pas atteinte
-                if max_count is None or count < max_count:
-                    messages.append(item[2])  # Le message est le 3ème élément du tuple
-                    count += 1
-                
-                # Remettre l'élément dans la nouvelle file d'attente
-                new_queue.put(item)
-            
-            # Remplacer la file d'origine par la nouvelle
-            self.message_queues[recipient_id] = new_queue
-            
-            self.logger.info(f"Retrieved {len(messages)} pending messages for {recipient_id}")
+        # Consultation non destructive : la file n'est ni vidée ni reconstruite
+        messages = mailbox.snapshot(max_count)
         
+        self.logger.info(f"Retrieved {len(messages)} pending messages for {recipient_id}")
         return messages
     
     def get_channel_info(self) -> Dict[str, Any]:
@@ -274,12 +245,9 @@ class HierarchicalChannel(Channel):
         Returns:
             Un dictionnaire d'informations sur le canal
         """
+        queue_sizes = self.mailboxes.sizes()
+        
         with self.lock:
-            queue_sizes = {
-                recipient: queue_obj.qsize()
-                for recipient, queue_obj in self.message_queues.items()
-            }
-            
             return {
                 "id": self.id,
                 "type": self.type.value,
@@ -316,15 +284,23 @@ class HierarchicalChannel(Channel):
         Returns:
             Le nombre de messages supprimés
         """
-        with self.lock:
-            if recipient_id not in self.message_queues:
-                return 0
-            
-            # Compter le nombre de messages
-            count = self.message_queues[recipient_id].qsize()
-            
-            # Créer une nouvelle file vide
-            self.message_queues[recipient_id] = queue.PriorityQueue()
-            
-            self.logger.info(f"Cleared {count} messages from queue of {recipient_id}")
-            return count
\ No newline at end of file
+        mailbox = self.mailboxes.get(recipient_id, create=False)
+        if mailbox is None:
+            return 0
+        
+        count = mailbox.clear()
+        
+        self.logger.info(f"Cleared {count} messages from queue of {recipient_id}")
+        return count
+    
+    def expire_messages(self) -> int:
+        """
+        Supprime les messages dont la durée de vie (métadonnée "ttl") est écoulée.
+        
+        Returns:
+            Le nombre de messages expirés
+        """
+        count = self.mailboxes.expire()
+        if count:
+            self.logger.info(f"Expired {count} messages")
+        return count
@@ -0,0 +1,291 @@
+"""
+Boîtes aux lettres indexées partagées par les canaux de communication.
+
+Chaque destinataire dispose d'une file de priorité (tas binaire) doublée d'un index
+par identifiant de message et protégée par son propre verrou : les envois et
+réceptions de destinataires différents ne se bloquent pas mutuellement, et la
+consultation des messages en attente ne modifie pas la file.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .message import Message
+
+
+class _MailboxEntry:
+    """Entrée d'une boîte aux lettres, retirée paresseusement du tas."""
+
+    __slots__ = ("priority", "sequence", "message", "expires_at", "removed")
+
+    def __init__(self, priority: int, sequence: int, message: Message, expires_at: Optional[float]):
+        self.priority = priority
+        self.sequence = sequence
+        self.message = message
+        self.expires_at = expires_at
+        self.removed = False
+
+    def __lt__(self, other: "_MailboxEntry") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class Mailbox:
+    """
+    File de messages prioritaire d'un destinataire.
+
+    Les messages sortent par priorité croissante (valeur numérique, 0 en premier) puis
+    par ordre d'arrivée. La taille est maintenue en O(1) ; un retrait par identifiant
+    marque l'entrée comme supprimée et le tas est compacté lorsque les entrées mortes
+    deviennent majoritaires. Les messages dont la durée de vie (métadonnée "ttl", en
+    secondes) est écoulée sont expirés en bloc via un second tas ordonné par échéance.
+    """
+
+    def __init__(self, default_ttl: Optional[float] = None):
+        """
+        Initialise une boîte aux lettres vide.
+
+        Args:
+            default_ttl: Durée de vie par défaut des messages en secondes (None pour illimitée)
+        """
+        self.default_ttl = default_ttl
+        self._heap: List[_MailboxEntry] = []
+        self._expirations: List[tuple] = []
+        self._index: Dict[str, _MailboxEntry] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self.expired_count = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire_locked(time.monotonic())
+            return len(self._index)
+
+    def __contains__(self, message_id: str) -> bool:
+        with self._lock:
+            return message_id in self._index
+
+    def put(self, message: Message, priority: int = 0) -> None:
+        """
+        Ajoute un message à la boîte.
+
+        Args:
+            message: Le message à ajouter
+            priority: Priorité numérique (plus petit = plus prioritaire)
+        """
+        ttl = message.metadata.get("ttl", self.default_ttl)
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire_locked(now)
+
+            previous = self._index.get(message.id)
+            if previous is not None:
+                previous.removed = True
+
+            entry = _MailboxEntry(priority, next(self._sequence), message, now + ttl if ttl else None)
+            heapq.heappush(self._heap, entry)
+            self._index[message.id] = entry
+            if entry.expires_at is not None:
+                heapq.heappush(self._expirations, (entry.expires_at, entry.sequence, entry))
+
+            self._not_empty.notify()
+
+    def pop(self, timeout: Optional[float] = 0) -> Optional[Message]:
+        """
+        Retire et retourne le message le plus prioritaire.
+
+        Args:
+            timeout: Délai d'attente maximum en secondes (0 pour ne pas attendre, None pour attente indéfinie)
+
+        Returns:
+            Le message retiré ou None si la boîte est restée vide
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            while True:
+                self._expire_locked(time.monotonic())
+                entry = self._pop_live_locked()
+                if entry is not None:
+                    return entry.message
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._not_empty.wait(remaining)
+
+    def get(self, message_id: str) -> Optional[Message]:
+        """
+        Retourne un message en attente par son identifiant, sans le retirer.
+
+        Args:
+            message_id: Identifiant du message
+
+        Returns:
+            Le message ou None s'il n'est pas en attente
+        """
+        with self._lock:
+            entry = self._index.get(message_id)
+            return entry.message if entry is not None else None
+
+    def remove(self, message_id: str) -> bool:
+        """
+        Retire un message en attente par son identifiant.
+
+        Args:
+            message_id: Identifiant du message
+
+        Returns:
+            True si le message était en attente, False sinon
+        """
+        with self._lock:
+            entry = self._index.pop(message_id, None)
+            if entry is None:
+                return False
+            entry.removed = True
+            self._compact_locked()
+            return True
+
+    def snapshot(self, max_count: Optional[int] = None) -> List[Message]:
+        """
+        Retourne les messages en attente par ordre de sortie, sans modifier la boîte.
+
+        Args:
+            max_count: Nombre maximum de messages à retourner (None pour tous)
+
+        Returns:
+            Liste des messages en attente
+        """
+        with self._lock:
+            self._expire_locked(time.monotonic())
+            entries = list(self._index.values())
+
+        # Le tri se fait hors verrou : les envois ne sont pas bloqués pendant la consultation
+        if max_count is None:
+            entries.sort()
+        else:
+            entries = heapq.nsmallest(max_count, entries)
+        return [entry.message for entry in entries]
+
+    def clear(self) -> int:
+        """
+        Vide la boîte.
+
+        Returns:
+            Le nombre de messages supprimés
+        """
+        with self._lock:
+            count = len(self._index)
+            self._heap = []
+            self._expirations = []
+            self._index = {}
+            return count
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        Supprime en bloc les messages dont la durée de vie est écoulée.
+
+        Args:
+            now: Instant de référence sur l'horloge monotone (maintenant par défaut)
+
+        Returns:
+            Le nombre de messages expirés
+        """
+        with self._lock:
+            return self._expire_locked(time.monotonic() if now is None else now)
+
+    def _pop_live_locked(self) -> Optional[_MailboxEntry]:
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if not entry.removed:
+                entry.removed = True
+                del self._index[entry.message.id]
+                return entry
+        return None
+
+    def _expire_locked(self, now: float) -> int:
+        expired = 0
+        while self._expirations and self._expirations[0][0] <= now:
+            _, _, entry = heapq.heappop(self._expirations)
+            if not entry.removed:
+                entry.removed = True
+                del self._index[entry.message.id]
+                expired += 1
+
+        if expired:
+            self.expired_count += expired
+            self._compact_locked()
+        return expired
+
+    def _compact_locked(self) -> None:
+        # Reconstruire le tas lorsque les entrées mortes dominent, pour borner la mémoire
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._index):
+            self._heap = [entry for entry in self._heap if not entry.removed]
+            heapq.heapify(self._heap)
+            self._expirations = [item for item in self._expirations if not item[2].removed]
+            heapq.heapify(self._expirations)
+
+
+class MailboxRegistry:
+    """
+    Ensemble des boîtes aux lettres d'un canal, indexées par destinataire.
+
+    Le verrou du registre ne protège que la création des boîtes : toutes les
+    opérations sur les messages se font sous le verrou de la boîte concernée.
+    """
+
+    def __init__(self, default_ttl: Optional[float] = None):
+        """
+        Initialise un registre vide.
+
+        Args:
+            default_ttl: Durée de vie par défaut des messages en secondes (None pour illimitée)
+        """
+        self.default_ttl = default_ttl
+        self._mailboxes: Dict[str, Mailbox] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, recipient_id: str) -> bool:
+        return recipient_id in self._mailboxes
+
+    def get(self, recipient_id: str, create: bool = True) -> Optional[Mailbox]:
+        """
+        Retourne la boîte d'un destinataire.
+
+        Args:
+            recipient_id: Identifiant du destinataire
+            create: Créer la boîte si elle n'existe pas
+
+        Returns:
+            La boîte, ou None si elle n'existe pas et que create vaut False
+        """
+        mailbox = self._mailboxes.get(recipient_id)
+        if mailbox is None and create:
+            with self._lock:
+                mailbox = self._mailboxes.get(recipient_id)
+                if mailbox is None:
+                    mailbox = self._mailboxes[recipient_id] = Mailbox(self.default_ttl)
+        return mailbox
+
+    def sizes(self) -> Dict[str, int]:
+        """
+        Retourne le nombre de messages en attente par destinataire.
+
+        Returns:
+            Un dictionnaire destinataire -> nombre de messages
+        """
+        return {recipient_id: len(mailbox) for recipient_id, mailbox in list(self._mailboxes.items())}
+
+    def expire(self) -> int:
+        """
+        Expire en bloc les messages périmés de toutes les boîtes.
+
+        Returns:
+            Le nombre total de messages expirés
+        """
+        now = time.monotonic()
+        return sum(mailbox.expire(now) for mailbox in list(self._mailboxes.values()))
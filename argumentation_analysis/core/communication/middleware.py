@@ -9,13 +9,139 @@ import uuid
 import threading
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List, Callable, Union, Set
+import time
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from datetime import datetime
 
 from .message import Message, MessageType, MessagePriority, AgentLevel
 from .channel_interface import Channel, ChannelType, ChannelException
 
 
+class DeliveryNotifier:
+    """
+    Réveille les destinataires en attente lorsqu'un message leur est livré.
+    
+    Chaque destinataire dispose d'un compteur de livraisons. Un récepteur relève le
+    compteur avant de consulter les canaux puis attend qu'il change : une livraison
+    survenue entre la consultation et l'attente n'est donc jamais perdue. Les attentes
+    synchrones utilisent une condition par destinataire, les attentes asynchrones des
+    futures résolues dans la boucle d'événements de l'appelant.
+    """
+    
+    WILDCARD = "*"
+    
+    def __init__(self):
+        """Initialise le notificateur."""
+        self._lock = threading.Lock()
+        self._versions: Dict[str, int] = {}
+        self._conditions: Dict[str, threading.Condition] = {}
+        self._async_waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+    
+    def version(self, recipient_id: str) -> int:
+        """
+        Retourne le compteur de livraisons d'un destinataire.
+        
+        Args:
+            recipient_id: Identifiant du destinataire
+            
+        Returns:
+            Le nombre de notifications reçues par ce destinataire
+        """
+        with self._lock:
+            return self._versions.get(recipient_id, 0)
+    
+    def notify(self, recipient_id: Optional[str]) -> None:
+        """
+        Signale qu'un message est disponible pour un destinataire.
+        
+        Les récepteurs en écoute sur le destinataire générique "*" sont également réveillés.
+        
+        Args:
+            recipient_id: Identifiant du destinataire
+        """
+        targets = [self.WILDCARD] if recipient_id in (None, self.WILDCARD) else [recipient_id, self.WILDCARD]
+        conditions = []
+        waiters = []
+        
+        with self._lock:
+            for target in targets:
+                self._versions[target] = self._versions.get(target, 0) + 1
+                condition = self._conditions.get(target)
+                if condition is not None:
+                    conditions.append(condition)
+                waiters.extend(self._async_waiters.pop(target, ()))
+        
+        for condition in conditions:
+            with condition:
+                condition.notify_all()
+        
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(self._resolve, future)
+            except RuntimeError:
+                # La boucle de l'attente a été fermée entre-temps
+                pass
+    
+    def wait(self, recipient_id: str, version: int, timeout: Optional[float] = None) -> bool:
+        """
+        Bloque jusqu'à ce que le compteur du destinataire diffère de version.
+        
+        Args:
+            recipient_id: Identifiant du destinataire
+            version: Valeur du compteur relevée avant la dernière consultation des canaux
+            timeout: Délai d'attente maximum en secondes (None pour attente indéfinie)
+            
+        Returns:
+            True si une livraison a eu lieu, False si le délai a expiré
+        """
+        with self._lock:
+            condition = self._conditions.get(recipient_id)
+            if condition is None:
+                condition = self._conditions[recipient_id] = threading.Condition()
+        
+        with condition:
+            return condition.wait_for(lambda: self.version(recipient_id) != version, timeout)
+    
+    async def wait_async(self, recipient_id: str, version: int, timeout: Optional[float] = None) -> bool:
+        """
+        Version asynchrone de wait, qui n'occupe aucun thread pendant l'attente.
+        
+        Args:
+            recipient_id: Identifiant du destinataire
+            version: Valeur du compteur relevée avant la dernière consultation des canaux
+            timeout: Délai d'attente maximum en secondes (None pour attente indéfinie)
+            
+        Returns:
+            True si une livraison a eu lieu, False si le délai a expiré
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        
+        with self._lock:
+            if self._versions.get(recipient_id, 0) != version:
+                return True
+            self._async_waiters.setdefault(recipient_id, []).append(waiter)
+        
+        try:
+            await asyncio.wait_for(future, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                waiters = self._async_waiters.get(recipient_id)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._async_waiters[recipient_id]
+    
+    @staticmethod
+    def _resolve(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(True)
+
+
 class MessageMiddleware:
     """
     Middleware de messagerie central pour le système de communication multi-canal.
@@ -38,6 +164,11 @@ class MessageMiddleware:
         self.global_handlers = []  # Gestionnaires globaux pour tous les messages
         self.lock = threading.RLock()  # Verrou pour les opérations concurrentes
         
+        # Réveil des destinataires en attente de réception
+        self.notifier = DeliveryNotifier()
+        # Les canaux qui ne signalent pas leurs livraisons sont reconsultés à cet intervalle
+        self.poll_interval = self.config.get("receive_poll_interval", 0.05)
+        
         # Configuration du logger
         self.logger = logging.getLogger("MessageMiddleware")
         self.logger.setLevel(logging.INFO)
@@ -65,6 +196,7 @@ class MessageMiddleware:
         """
         with self.lock:
             self.channels[channel.type] = channel
+            channel.add_delivery_listener(self.notifier.notify)
             self.stats["by_channel"][channel.type.value] = {
                 "sent": 0,
                 "received": 0,
@@ -180,6 +312,10 @@ class MessageMiddleware:
             # Envoyer le message via le canal
             success = channel.send_message(message)
             
+            # Réveiller le destinataire si le canal ne le fait pas lui-même
+            if success and not channel.notifies_deliveries:
+                self.notifier.notify(message.recipient)
+            
             # Mettre à jour les statistiques
             with self.lock:
                 self.stats["messages_sent"] += 1
@@ -214,6 +350,9 @@ class MessageMiddleware:
         """
         Reçoit un message pour un destinataire spécifique.
         
+        Sans canal spécifié, l'appel bloque jusqu'à ce qu'un message soit livré au
+        destinataire sur l'un des canaux, ou jusqu'à l'expiration du délai.
+        
         Args:
             recipient_id: Identifiant du destinataire
             channel_type: Type de canal à écouter (optionnel)
@@ -233,64 +372,27 @@ class MessageMiddleware:
                 message = channel.receive_message(recipient_id, timeout)
                 
                 if message:
-                    # Mettre à jour les statistiques
-                    with self.lock:
-                        self.stats["messages_received"] += 1
-                        self.stats["by_channel"][channel_type.value]["received"] += 1
-                    
-                    # Vérifier si c'est une réponse à une requête en attente
-                    if message.type == MessageType.RESPONSE and self.request_response:
-                        request_id = message.metadata.get("reply_to")
-                        if request_id:
-                            self.logger.info(f"Received response {message.id} for request {request_id}")
-                            result = self.request_response.handle_response(message)
-                            self.logger.info(f"Response handler result: {result}")
-                    
-                    # Appeler les gestionnaires de messages
-                    self._handle_message(message)
+                    self._on_message_received(channel, message)
                 
                 return message
             
             # Sinon, écouter tous les canaux
-            # Créer une liste de tous les canaux
-            channels = list(self.channels.values())
-            
-            # Attendre un message sur n'importe quel canal
-            # Implémentation simple: vérifier chaque canal séquentiellement
-            # Une implémentation plus avancée utiliserait des files d'attente et des threads
-            
-            if timeout is not None:
-                end_time = datetime.now().timestamp() + timeout
+            deadline = None if timeout is None else time.monotonic() + timeout
             
             while True:
-                for channel in channels:
-                    message = channel.receive_message(recipient_id, 0)  # Pas d'attente
-                    
-                    if message:
-                        # Mettre à jour les statistiques
-                        with self.lock:
-                            self.stats["messages_received"] += 1
-                            self.stats["by_channel"][channel.type.value]["received"] += 1
-                        
-                        # Vérifier si c'est une réponse à une requête en attente
-                        if message.type == MessageType.RESPONSE and self.request_response:
-                            request_id = message.metadata.get("reply_to")
-                            if request_id:
-                                self.logger.info(f"Received response {message.id} for request {request_id}")
-                                result = self.request_response.handle_response(message)
-                                self.logger.info(f"Response handler result: {result}")
-                        
-                        # Appeler les gestionnaires de messages
-                        self._handle_message(message)
-                        
-                        return message
+                # Relever le compteur avant la consultation pour ne manquer aucune livraison
+                version = self.notifier.version(recipient_id)
+                channel, message = self._poll_channels(recipient_id)
+                
+                if message:
+                    self._on_message_received(channel, message)
+                    return message
                 
-                # Vérifier si le timeout est atteint
-                if timeout is not None and datetime.now().timestamp() > end_time:
+                wait_time = self._next_wait_time(deadline)
+                if wait_time is not None and wait_time <= 0:
                     return None
                 
-                # Petite pause pour éviter de surcharger le CPU
-                threading.Event().wait(0.01)
+                self.notifier.wait(recipient_id, version, wait_time)
             
         except Exception as e:
             # Mettre à jour les statistiques d'erreur
@@ -306,6 +408,9 @@ class MessageMiddleware:
         """
         Version asynchrone de receive_message.
         
+        L'attente se fait sur une future de la boucle d'événements courante, résolue à
+        la livraison d'un message : aucun thread n'est bloqué pendant l'attente.
+        
         Args:
             recipient_id: Identifiant du destinataire
             channel_type: Type de canal à écouter (optionnel)
@@ -314,13 +419,110 @@ class MessageMiddleware:
         Returns:
             Le message reçu ou None si timeout
         """
-        # Cette implémentation est simplifiée et utilise la version synchrone
-        # Une implémentation complète utiliserait des primitives asyncio
+        try:
+            if channel_type and not self.get_channel(channel_type):
+                self.logger.error(f"Channel not found: {channel_type.value}")
+                return None
+            
+            deadline = None if timeout is None else time.monotonic() + timeout
+            
+            while True:
+                version = self.notifier.version(recipient_id)
+                channel, message = self._poll_channels(recipient_id, channel_type)
+                
+                if message:
+                    self._on_message_received(channel, message)
+                    return message
+                
+                wait_time = self._next_wait_time(deadline, channel_type)
+                if wait_time is not None and wait_time <= 0:
+                    return None
+                
+                await self.notifier.wait_async(recipient_id, version, wait_time)
+            
+        except Exception as e:
+            with self.lock:
+                self.stats["errors"] += 1
+            
+            self.logger.error(f"Error receiving message: {str(e)}")
+            return None
+    
+    def _poll_channels(self, recipient_id: str, channel_type: Optional[ChannelType] = None
+                       ) -> Tuple[Optional[Channel], Optional[Message]]:
+        """
+        Consulte les canaux sans attendre et retourne le premier message disponible.
+        
+        Args:
+            recipient_id: Identifiant du destinataire
+            channel_type: Type de canal à consulter (optionnel, tous par défaut)
+            
+        Returns:
+            Un tuple (canal, message), ou (None, None) si aucun message n'est disponible
+        """
+        with self.lock:
+            if channel_type:
+                channels = [self.channels[channel_type]] if channel_type in self.channels else []
+            else:
+                channels = list(self.channels.values())
+        
+        for channel in channels:
+            message = channel.receive_message(recipient_id, 0)  # Pas d'attente
+            if message:
+                return channel, message
+        
+        return None, None
+    
+    def _next_wait_time(self, deadline: Optional[float],
+                        channel_type: Optional[ChannelType] = None) -> Optional[float]:
+        """
+        Calcule la durée de la prochaine attente de notification.
+        
+        Args:
+            deadline: Échéance de la réception (horloge monotone), ou None
+            channel_type: Type de canal écouté (optionnel, tous par défaut)
+            
+        Returns:
+            La durée en secondes (négative ou nulle si l'échéance est atteinte), ou None pour une attente indéfinie
+        """
+        wait_time = None if deadline is None else deadline - time.monotonic()
+        if wait_time is not None and wait_time <= 0:
+            return wait_time
+        
+        # Les canaux muets ne réveillent personne quand un message y est déposé directement
+        with self.lock:
+            if channel_type:
+                silent = channel_type in self.channels and not self.channels[channel_type].notifies_deliveries
+            else:
+                silent = any(not channel.notifies_deliveries for channel in self.channels.values())
+        
+        if silent:
+            wait_time = self.poll_interval if wait_time is None else min(wait_time, self.poll_interval)
+        
+        return wait_time
+    
+    def _on_message_received(self, channel: Channel, message: Message) -> None:
+        """
+        Met à jour les statistiques et déclenche le traitement d'un message reçu.
+        
+        Args:
+            channel: Le canal d'où provient le message
+            message: Le message reçu
+        """
+        # Mettre à jour les statistiques
+        with self.lock:
+            self.stats["messages_received"] += 1
+            self.stats["by_channel"][channel.type.value]["received"] += 1
+        
+        # Vérifier si c'est une réponse à une requête en attente
+        if message.type == MessageType.RESPONSE and self.request_response:
+            request_id = message.metadata.get("reply_to")
+            if request_id:
+                self.logger.info(f"Received response {message.id} for request {request_id}")
+                result = self.request_response.handle_response(message)
+                self.logger.info(f"Response handler result: {result}")
         
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, lambda: self.receive_message(recipient_id, channel_type, timeout)
-        )
+        # Appeler les gestionnaires de messages
+        self._handle_message(message)
     
     def _handle_message(self, message: Message) -> None:
         """
@@ -441,7 +643,7 @@ class MessageMiddleware:
         from .pub_sub import PublishSubscribeProtocol
         
         self.request_response = RequestResponseProtocol(self)
-        self.publish_subscribe = PublishSubscribeProtocol(self)
+        self.publish_subscribe = PublishSubscribeProtocol(self, self.config.get("pub_sub"))
         
         # Ne pas enregistrer le gestionnaire de réponses ici car il est déjà appelé dans _handle_message
         # Cela évite le double traitement des réponses
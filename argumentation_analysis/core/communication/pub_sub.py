@@ -6,13 +6,391 @@ auxquels d'autres agents peuvent s'abonner. Ce modèle découple les émetteurs
 récepteurs et permet une communication one-to-many efficace.
 """
 
-import uuid
+import enum
+import heapq
+import itertools
+import logging
 import threading
-import asyncio
-from typing import Dict, Any, Optional, Callable, List, Set
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable, List, Iterable, FrozenSet, Tuple
 from datetime import datetime, timedelta
 
 from .message import Message, MessageType, MessagePriority, AgentLevel
+from .deadlines import DeadlineScheduler
+
+
+# Champs du message pouvant servir d'index pour sélectionner les abonnements candidats
+INDEXED_FIELDS = ("priority", "sender_level", "message_type")
+
+# Politiques appliquées lorsque la file d'un abonné est pleine
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+# Durée par défaut (en secondes) au-delà de laquelle un callback est considéré lent
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 0.5
+
+
+def _field_value(message: Message, field: str) -> Any:
+    """Extrait la valeur d'un champ filtrable d'un message."""
+    if field == "priority":
+        return message.priority.value
+    if field == "sender_level":
+        return message.sender_level.value
+    if field == "message_type":
+        return message.type.value
+    return message.sender
+
+
+def _as_value_set(value: Any) -> FrozenSet[Any]:
+    """Normalise un critère (valeur, liste ou énumération) en ensemble de valeurs acceptées."""
+    values = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+    return frozenset(v.value if isinstance(v, enum.Enum) else v for v in values)
+
+
+class CompiledFilter:
+    """
+    Prédicat précompilé à partir de critères de filtrage.
+    
+    Les critères sont analysés une seule fois à l'abonnement : les listes de valeurs
+    deviennent des ensembles et le champ indexé le plus sélectif est retenu pour
+    l'index des abonnements du topic.
+    """
+    
+    __slots__ = ("criteria", "fields", "content", "index_field")
+    
+    def __init__(self, filter_criteria: Optional[Dict[str, Any]] = None):
+        """
+        Compile des critères de filtrage.
+        
+        Args:
+            filter_criteria: Critères de filtrage (sender, priority, sender_level,
+                message_type, content) ou None pour accepter tous les messages
+        """
+        criteria = filter_criteria or {}
+        self.criteria = filter_criteria
+        self.fields: Dict[str, FrozenSet[Any]] = {
+            field: _as_value_set(criteria[field])
+            for field in ("sender",) + INDEXED_FIELDS
+            if field in criteria
+        }
+        self.content: List[Tuple[str, Any]] = list((criteria.get("content") or {}).items())
+        
+        indexed = [(len(self.fields[field]), field) for field in INDEXED_FIELDS if field in self.fields]
+        self.index_field: Optional[str] = min(indexed)[1] if indexed else None
+    
+    def matches(self, message: Message) -> bool:
+        """
+        Vérifie si un message satisfait le prédicat.
+        
+        Args:
+            message: Le message à vérifier
+            
+        Returns:
+            True si le message correspond aux critères, False sinon
+        """
+        for field, values in self.fields.items():
+            if _field_value(message, field) not in values:
+                return False
+        
+        content = message.content
+        for key, expected in self.content:
+            if key not in content:
+                return False
+            if isinstance(expected, list):
+                if content[key] not in expected:
+                    return False
+            elif content[key] != expected:
+                return False
+        
+        return True
+
+
+class Subscription:
+    """
+    Abonnement à un topic, avec sa file de messages en attente de distribution
+    et ses métriques de consommation.
+    """
+    
+    def __init__(
+        self,
+        subscription_id: str,
+        subscriber_id: str,
+        callback: Optional[Callable[[Message], None]],
+        filter_criteria: Optional[Dict[str, Any]],
+        sequence: int,
+        max_pending: int = 1000,
+        overflow_policy: str = "drop_oldest"
+    ):
+        """
+        Initialise un abonnement.
+        
+        Args:
+            subscription_id: Identifiant de l'abonnement
+            subscriber_id: Identifiant de l'abonné
+            callback: Fonction de rappel à appeler lors de la réception d'un message (optionnel)
+            filter_criteria: Critères de filtrage des messages (optionnel)
+            sequence: Rang de l'abonnement dans le topic (ordre de distribution)
+            max_pending: Nombre maximum de messages en attente de distribution
+            overflow_policy: Politique appliquée lorsque la file est pleine
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        
+        self.id = subscription_id
+        self.subscriber_id = subscriber_id
+        self.callback = callback
+        self.filter = CompiledFilter(filter_criteria)
+        self.sequence = sequence
+        self.created_at = datetime.now()
+        self.max_pending = max_pending
+        self.overflow_policy = overflow_policy
+        self.active = True
+        
+        self.pending: deque = deque()
+        self.scheduled = False  # Une tâche de distribution est planifiée ou en cours
+        self.lock = threading.Lock()
+        self.stats = {
+            "delivered": 0,
+            "dropped": 0,
+            "failed": 0,
+            "slow_callbacks": 0,
+            "max_pending": 0,
+            "callback_time": 0.0
+        }
+    
+    @property
+    def filter_criteria(self) -> Optional[Dict[str, Any]]:
+        """Critères de filtrage d'origine de l'abonnement."""
+        return self.filter.criteria
+    
+    def invoke(self, message: Message, slow_threshold: float, logger: logging.Logger) -> None:
+        """
+        Appelle le callback de l'abonné et met à jour ses métriques.
+        
+        Args:
+            message: Le message à distribuer
+            slow_threshold: Durée en secondes au-delà de laquelle un appel est considéré lent
+            logger: Logger utilisé pour les erreurs du callback
+        """
+        start = time.perf_counter()
+        try:
+            self.callback(message)
+            self.stats["delivered"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Error in subscriber callback for {self.subscriber_id} ({self.id}): {e}")
+        
+        elapsed = time.perf_counter() - start
+        self.stats["callback_time"] += elapsed
+        if elapsed >= slow_threshold:
+            self.stats["slow_callbacks"] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Récupère les métriques de l'abonnement.
+        
+        Returns:
+            Un dictionnaire de métriques
+        """
+        with self.lock:
+            return {
+                "subscriber_id": self.subscriber_id,
+                "pending": len(self.pending),
+                **self.stats
+            }
+
+
+class SubscriptionIndex:
+    """
+    Index immuable des abonnements d'un topic.
+    
+    Chaque abonnement est rangé dans les compartiments de son champ indexé le plus
+    sélectif, ou parmi les abonnements non indexés. La publication ne consulte que
+    les compartiments correspondant aux valeurs du message. L'index est reconstruit
+    à chaque abonnement ou désabonnement, ce qui permet de le lire sans verrou.
+    """
+    
+    def __init__(self, subscriptions: Iterable[Subscription] = ()):
+        """
+        Construit l'index.
+        
+        Args:
+            subscriptions: Les abonnements, dans l'ordre de leur création
+        """
+        self.unindexed: List[Subscription] = []
+        self.buckets: Dict[str, Dict[Any, List[Subscription]]] = {}
+        
+        for subscription in subscriptions:
+            field = subscription.filter.index_field
+            if field is None:
+                self.unindexed.append(subscription)
+                continue
+            bucket = self.buckets.setdefault(field, {})
+            for value in subscription.filter.fields[field]:
+                bucket.setdefault(value, []).append(subscription)
+    
+    def candidates(self, message: Message) -> Iterable[Subscription]:
+        """
+        Sélectionne les abonnements susceptibles de recevoir un message.
+        
+        Args:
+            message: Le message publié
+            
+        Returns:
+            Les abonnements candidats, dans l'ordre de leur création
+        """
+        groups = [self.unindexed] if self.unindexed else []
+        for field, bucket in self.buckets.items():
+            group = bucket.get(_field_value(message, field))
+            if group:
+                groups.append(group)
+        
+        if not groups:
+            return ()
+        if len(groups) == 1:
+            return groups[0]
+        return heapq.merge(*groups, key=lambda subscription: subscription.sequence)
+
+
+class SubscriptionDispatcher:
+    """
+    Distribue les messages aux callbacks des abonnés sur un pool de threads.
+    
+    Chaque abonnement possède une file bornée : les messages d'un même abonné sont
+    distribués dans l'ordre de publication, par au plus une tâche à la fois, tandis
+    que les abonnés différents sont servis en parallèle. Un abonné lent n'occupe donc
+    qu'un thread du pool et ne bloque ni les publieurs ni les autres abonnés.
+    """
+    
+    def __init__(self, max_workers: int = 4, slow_callback_threshold: float = DEFAULT_SLOW_CALLBACK_THRESHOLD,
+                 batch_size: int = 32, name: str = "PubSubDispatcher"):
+        """
+        Initialise le distributeur.
+        
+        Args:
+            max_workers: Nombre de threads du pool
+            slow_callback_threshold: Durée en secondes au-delà de laquelle un callback est considéré lent
+            batch_size: Nombre de messages distribués à un abonné avant de rendre la main au pool
+            name: Préfixe des threads et nom du logger
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self.slow_callback_threshold = slow_callback_threshold
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(name)
+        
+        self._idle = threading.Condition()
+        self._active = 0  # Nombre d'abonnements ayant une tâche de distribution planifiée
+        self._scheduled: Dict[Future, Subscription] = {}  # Tâches de distribution non terminées
+    
+    def dispatch(self, subscription: Subscription, message: Message) -> bool:
+        """
+        Place un message dans la file d'un abonné et planifie sa distribution.
+        
+        Args:
+            subscription: L'abonnement destinataire
+            message: Le message à distribuer
+            
+        Returns:
+            True si le message a été mis en file, False s'il a été rejeté
+        """
+        with subscription.lock:
+            if not subscription.active:
+                return False
+            
+            if len(subscription.pending) >= subscription.max_pending:
+                subscription.stats["dropped"] += 1
+                if subscription.overflow_policy == "drop_newest":
+                    return False
+                subscription.pending.popleft()
+            
+            subscription.pending.append(message)
+            if len(subscription.pending) > subscription.stats["max_pending"]:
+                subscription.stats["max_pending"] = len(subscription.pending)
+            
+            if subscription.scheduled:
+                return True
+            subscription.scheduled = True
+        
+        with self._idle:
+            self._active += 1
+        self._submit(subscription)
+        return True
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend que toutes les files des abonnés soient vides.
+        
+        Args:
+            timeout: Délai d'attente maximum en secondes (None pour attendre indéfiniment)
+            
+        Returns:
+            True si toutes les distributions sont terminées, False en cas de timeout
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._active == 0, timeout)
+    
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Arrête le pool de threads en abandonnant les distributions non commencées.
+        
+        Les messages des distributions annulées sont comptés comme abandonnés et
+        libèrent leur abonnement, de sorte qu'un `flush` ultérieur ne bloque pas.
+        
+        Args:
+            wait: Attendre la fin des distributions en cours
+        """
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+    
+    def _submit(self, subscription: Subscription) -> None:
+        try:
+            future = self.executor.submit(self._drain, subscription)
+        except RuntimeError:
+            # Pool arrêté : les messages en attente sont abandonnés
+            self._abandon(subscription)
+            return
+        with self._idle:
+            self._scheduled[future] = subscription
+        future.add_done_callback(self._on_drain_done)
+    
+    def _on_drain_done(self, future: Future) -> None:
+        with self._idle:
+            subscription = self._scheduled.pop(future, None)
+        if subscription is not None and future.cancelled():
+            # Distribution annulée par `shutdown` avant d'avoir commencé
+            self._abandon(subscription)
+    
+    def _abandon(self, subscription: Subscription) -> None:
+        with subscription.lock:
+            subscription.stats["dropped"] += len(subscription.pending)
+            subscription.pending.clear()
+            subscription.scheduled = False
+        self._release()
+    
+    def _release(self) -> None:
+        with self._idle:
+            self._active -= 1
+            if self._active == 0:
+                self._idle.notify_all()
+    
+    def _drain(self, subscription: Subscription) -> None:
+        for _ in range(self.batch_size):
+            with subscription.lock:
+                if not subscription.active:
+                    subscription.pending.clear()
+                if not subscription.pending:
+                    subscription.scheduled = False
+                    break
+                message = subscription.pending.popleft()
+            
+            subscription.invoke(message, self.slow_callback_threshold, self.logger)
+        else:
+            # Lot terminé avec des messages restants : replanifier pour laisser passer les autres abonnés
+            self._submit(subscription)
+            return
+        
+        self._release()
 
 
 class Topic:
@@ -23,7 +401,16 @@ class Topic:
     et auquel des agents peuvent s'abonner.
     """
     
-    def __init__(self, topic_id: str, description: Optional[str] = None, ttl: Optional[int] = None):
+    def __init__(
+        self,
+        topic_id: str,
+        description: Optional[str] = None,
+        ttl: Optional[int] = None,
+        dispatcher: Optional[SubscriptionDispatcher] = None,
+        max_history: int = 100,
+        max_pending: int = 1000,
+        overflow_policy: str = "drop_oldest"
+    ):
         """
         Initialise un nouveau topic.
         
@@ -31,14 +418,33 @@ class Topic:
             topic_id: Identifiant unique du topic
             description: Description du topic (optionnel)
             ttl: Durée de vie par défaut des messages en secondes (optionnel)
+            dispatcher: Distributeur des callbacks (optionnel, appel direct hors verrou sinon)
+            max_history: Nombre maximum de messages à conserver
+            max_pending: Nombre maximum de messages en attente par abonné
+            overflow_policy: Politique appliquée lorsque la file d'un abonné est pleine
         """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        
         self.id = topic_id
         self.description = description
         self.ttl = ttl
-        self.subscribers = {}  # Dictionnaire des abonnés avec leurs filtres
-        self.messages = []  # Historique des messages (pour les abonnés tardifs)
-        self.max_history = 100  # Nombre maximum de messages à conserver
+        self.dispatcher = dispatcher
+        self.max_pending = max_pending
+        self.overflow_policy = overflow_policy
+        self.subscribers: Dict[str, Subscription] = {}  # Abonnements par identifiant
+        self.messages: deque = deque(maxlen=max_history)  # Historique des messages (pour les abonnés tardifs)
         self.lock = threading.RLock()  # Verrou pour les opérations concurrentes
+        self.published_count = 0
+        
+        self._index = SubscriptionIndex()
+        self._sequence = itertools.count()
+        self.logger = logging.getLogger(f"Topic.{topic_id}")
+    
+    @property
+    def max_history(self) -> int:
+        """Nombre maximum de messages conservés dans l'historique."""
+        return self.messages.maxlen
     
     def add_subscriber(self, subscriber_id: str, callback: Optional[Callable[[Message], None]] = None,
                       filter_criteria: Optional[Dict[str, Any]] = None) -> str:
@@ -56,12 +462,11 @@ class Topic:
         subscription_id = f"sub-{uuid.uuid4().hex[:8]}"
         
         with self.lock:
-            self.subscribers[subscription_id] = {
-                "subscriber_id": subscriber_id,
-                "callback": callback,
-                "filter_criteria": filter_criteria,
-                "created_at": datetime.now()
-            }
+            self.subscribers[subscription_id] = Subscription(
+                subscription_id, subscriber_id, callback, filter_criteria, next(self._sequence),
+                self.max_pending, self.overflow_policy
+            )
+            self._index = SubscriptionIndex(self.subscribers.values())
         
         return subscription_id
     
@@ -76,46 +481,50 @@ class Topic:
             True si désabonnement réussi, False sinon
         """
         with self.lock:
-            if subscription_id in self.subscribers:
-                del self.subscribers[subscription_id]
-                return True
-            return False
+            subscription = self.subscribers.pop(subscription_id, None)
+            if subscription is None:
+                return False
+            self._index = SubscriptionIndex(self.subscribers.values())
+        
+        # Les messages encore en attente pour cet abonné ne lui seront pas distribués
+        with subscription.lock:
+            subscription.active = False
+            subscription.pending.clear()
+        return True
     
     def publish_message(self, message: Message) -> List[str]:
         """
         Publie un message sur ce topic et le distribue aux abonnés.
         
+        Le verrou du topic n'est tenu que pour l'ajout à l'historique : la sélection
+        des abonnés utilise l'index courant et les callbacks sont confiés au distributeur.
+        
         Args:
             message: Le message à publier
             
         Returns:
             Liste des identifiants des abonnés qui ont reçu le message
         """
-        recipients = []
-        
         with self.lock:
-            # Ajouter le message à l'historique
             self.messages.append({
                 "message": message,
                 "published_at": datetime.now()
             })
+            self.published_count += 1
+            index = self._index
+        
+        recipients = []
+        for subscription in index.candidates(message):
+            if not subscription.filter.matches(message):
+                continue
             
-            # Limiter la taille de l'historique
-            if len(self.messages) > self.max_history:
-                self.messages = self.messages[-self.max_history:]
+            if subscription.callback is not None:
+                if self.dispatcher is not None:
+                    self.dispatcher.dispatch(subscription, message)
+                else:
+                    subscription.invoke(message, DEFAULT_SLOW_CALLBACK_THRESHOLD, self.logger)
             
-            # Distribuer le message aux abonnés
-            for subscription_id, subscriber in self.subscribers.items():
-                # Vérifier si le message correspond aux critères de filtrage
-                if self._matches_filter(message, subscriber.get("filter_criteria")):
-                    # Appeler le callback si présent
-                    if subscriber.get("callback"):
-                        try:
-                            subscriber["callback"](message)
-                        except Exception as e:
-                            print(f"Error in subscriber callback: {e}")
-                    
-                    recipients.append(subscriber["subscriber_id"])
+            recipients.append(subscription.subscriber_id)
         
         return recipients
     
@@ -132,17 +541,42 @@ class Topic:
             Liste des messages récents
         """
         with self.lock:
-            # Filtrer les messages selon les critères
-            filtered_messages = [
-                entry["message"] for entry in self.messages
-                if not filter_criteria or self._matches_filter(entry["message"], filter_criteria)
-            ]
-            
-            # Limiter le nombre de messages
-            if count is not None:
-                filtered_messages = filtered_messages[-count:]
+            entries = list(self.messages)
+        
+        message_filter = CompiledFilter(filter_criteria)
+        filtered_messages = [
+            entry["message"] for entry in entries
+            if message_filter.matches(entry["message"])
+        ]
+        
+        # Limiter le nombre de messages
+        if count is not None:
+            filtered_messages = filtered_messages[-count:]
+        
+        return filtered_messages
+    
+    def expire_messages(self, now: Optional[datetime] = None) -> int:
+        """
+        Retire de l'historique les messages dont la durée de vie est écoulée.
+        
+        Args:
+            now: Instant de référence (maintenant par défaut)
             
-            return filtered_messages
+        Returns:
+            Le nombre de messages retirés
+        """
+        now = now or datetime.now()
+        
+        with self.lock:
+            kept = [
+                entry for entry in self.messages
+                if not entry["message"].metadata.get("ttl") or
+                entry["published_at"] + timedelta(seconds=entry["message"].metadata["ttl"]) > now
+            ]
+            expired = len(self.messages) - len(kept)
+            if expired:
+                self.messages = deque(kept, maxlen=self.messages.maxlen)
+            return expired
     
     def _matches_filter(self, message: Message, filter_criteria: Optional[Dict[str, Any]]) -> bool:
         """
@@ -155,43 +589,7 @@ class Topic:
         Returns:
             True si le message correspond aux critères, False sinon
         """
-        if not filter_criteria:
-            return True
-        
-        # Vérifier les critères de base
-        for key, value in filter_criteria.items():
-            if key == "sender":
-                if isinstance(value, list):
-                    if message.sender not in value:
-                        return False
-                elif message.sender != value:
-                    return False
-            elif key == "priority":
-                if isinstance(value, list):
-                    if message.priority.value not in value:
-                        return False
-                elif message.priority.value != value:
-                    return False
-            elif key == "sender_level":
-                if isinstance(value, list):
-                    if message.sender_level.value not in value:
-                        return False
-                elif message.sender_level.value != value:
-                    return False
-        
-        # Vérifier les critères de contenu
-        if "content" in filter_criteria:
-            content_filter = filter_criteria["content"]
-            for content_key, content_value in content_filter.items():
-                if content_key not in message.content:
-                    return False
-                if isinstance(content_value, list):
-                    if message.content[content_key] not in content_value:
-                        return False
-                elif message.content[content_key] != content_value:
-                    return False
-        
-        return True
+        return CompiledFilter(filter_criteria).matches(message)
     
     def get_subscriber_count(self) -> int:
         """
@@ -213,6 +611,25 @@ class Topic:
         with self.lock:
             return len(self.messages)
     
+    def get_subscription_stats(self, subscription_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Récupère les métriques de distribution des abonnements.
+        
+        Args:
+            subscription_id: Identifiant d'abonnement (None pour tous les abonnements)
+            
+        Returns:
+            Les métriques de l'abonnement, ou un dictionnaire des métriques par abonnement
+        """
+        with self.lock:
+            subscriptions = dict(self.subscribers)
+        
+        if subscription_id is not None:
+            subscription = subscriptions.get(subscription_id)
+            return subscription.get_stats() if subscription else {}
+        
+        return {sub_id: subscription.get_stats() for sub_id, subscription in subscriptions.items()}
+    
     def get_topic_info(self) -> Dict[str, Any]:
         """
         Récupère des informations sur ce topic.
@@ -220,6 +637,8 @@ class Topic:
         Returns:
             Un dictionnaire d'informations sur le topic
         """
+        subscription_stats = self.get_subscription_stats()
+        
         with self.lock:
             return {
                 "id": self.id,
@@ -227,6 +646,11 @@ class Topic:
                 "ttl": self.ttl,
                 "subscriber_count": len(self.subscribers),
                 "message_count": len(self.messages),
+                "published_count": self.published_count,
+                "delivered_count": sum(stats["delivered"] for stats in subscription_stats.values()),
+                "dropped_count": sum(stats["dropped"] for stats in subscription_stats.values()),
+                "slow_callback_count": sum(stats["slow_callbacks"] for stats in subscription_stats.values()),
+                "pending_count": sum(stats["pending"] for stats in subscription_stats.values()),
                 "created_at": self.messages[0]["published_at"].isoformat() if self.messages else None,
                 "last_message_at": self.messages[-1]["published_at"].isoformat() if self.messages else None
             }
@@ -240,22 +664,31 @@ class PublishSubscribeProtocol:
     publication de messages.
     """
     
-    def __init__(self, middleware):
+    def __init__(self, middleware, config: Optional[Dict[str, Any]] = None):
         """
         Initialise le protocole de publication-abonnement.
         
         Args:
             middleware: Le middleware de messagerie à utiliser pour l'envoi et la réception
+            config: Configuration du protocole (optionnel)
         """
         self.middleware = middleware
+        self.config = config or {}
         self.topics = {}  # Dictionnaire des topics
         self.lock = threading.RLock()  # Verrou pour les opérations concurrentes
+        self.logger = logging.getLogger("PublishSubscribeProtocol")
         
-        # Démarrer le thread de nettoyage des messages expirés
+        # Distribution des callbacks hors des verrous des topics
+        self.dispatcher = SubscriptionDispatcher(
+            max_workers=self.config.get("dispatch_workers", 4),
+            slow_callback_threshold=self.config.get("slow_callback_threshold", DEFAULT_SLOW_CALLBACK_THRESHOLD)
+        )
+        
+        # Planifier le nettoyage périodique des messages expirés
         self.running = True
-        self.cleanup_thread = threading.Thread(target=self._cleanup_expired_messages)
-        self.cleanup_thread.daemon = True
-        self.cleanup_thread.start()
+        self.cleanup_interval = self.config.get("cleanup_interval", 60)
+        self.scheduler = DeadlineScheduler("PubSubCleanup")
+        self.scheduler.schedule("cleanup", self.cleanup_interval, self._cleanup_expired_messages)
     
     def create_topic(self, topic_id: str, description: Optional[str] = None, 
                     ttl: Optional[int] = None) -> Topic:
@@ -274,7 +707,13 @@ class PublishSubscribeProtocol:
             if topic_id in self.topics:
                 return self.topics[topic_id]
             
-            topic = Topic(topic_id, description, ttl)
+            topic = Topic(
+                topic_id, description, ttl,
+                dispatcher=self.dispatcher,
+                max_history=self.config.get("max_history", 100),
+                max_pending=self.config.get("max_pending", 1000),
+                overflow_policy=self.config.get("overflow_policy", "drop_oldest")
+            )
             self.topics[topic_id] = topic
             return topic
     
@@ -449,31 +888,57 @@ class PublishSubscribeProtocol:
         
         return topic.get_topic_info()
     
+    def get_subscription_stats(self, topic_id: str, subscription_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Récupère les métriques de distribution des abonnements d'un topic.
+        
+        Args:
+            topic_id: Identifiant du topic
+            subscription_id: Identifiant d'abonnement (None pour tous les abonnements du topic)
+            
+        Returns:
+            Les métriques demandées, ou un dictionnaire vide si le topic n'existe pas
+        """
+        topic = self.get_topic(topic_id)
+        if not topic:
+            return {}
+        
+        return topic.get_subscription_stats(subscription_id)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Attend la distribution de tous les messages en attente aux abonnés.
+        
+        Args:
+            timeout: Délai d'attente maximum en secondes (None pour attendre indéfiniment)
+            
+        Returns:
+            True si toutes les distributions sont terminées, False en cas de timeout
+        """
+        return self.dispatcher.flush(timeout)
+    
     def _cleanup_expired_messages(self):
-        """Thread qui nettoie périodiquement les messages expirés."""
-        while self.running:
-            try:
-                now = datetime.now()
-                
-                with self.lock:
-                    for topic_id, topic in self.topics.items():
-                        with topic.lock:
-                            # Filtrer les messages non expirés
-                            topic.messages = [
-                                entry for entry in topic.messages
-                                if not entry["message"].metadata.get("ttl") or
-                                entry["published_at"] + timedelta(seconds=entry["message"].metadata["ttl"]) > now
-                            ]
-                
-                # Attendre avant le prochain nettoyage
-                threading.Event().wait(60)  # Nettoyer toutes les minutes
-                
-            except Exception as e:
-                print(f"Error in message cleanup: {e}")
-                threading.Event().wait(5)  # Attendre un peu en cas d'erreur
+        """Nettoie les messages expirés de tous les topics et planifie le prochain nettoyage."""
+        if not self.running:
+            return
+        
+        try:
+            now = datetime.now()
+            with self.lock:
+                topics = list(self.topics.values())
+            
+            for topic in topics:
+                topic.expire_messages(now)
+        
+        except Exception as e:
+            self.logger.error(f"Error in message cleanup: {e}")
+        
+        finally:
+            if self.running:
+                self.scheduler.schedule("cleanup", self.cleanup_interval, self._cleanup_expired_messages)
     
     def shutdown(self):
         """Arrête proprement le protocole."""
         self.running = False
-        if self.cleanup_thread.is_alive():
-            self.cleanup_thread.join(timeout=2)
\ No newline at end of file
+        self.scheduler.shutdown()
+        self.dispatcher.shutdown()
@@ -12,9 +12,13 @@ import threading
 import asyncio
 import logging
 from typing import Dict, Any, Optional, Callable, Tuple, List
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from .message import Message, MessageType, MessagePriority, AgentLevel
+from .deadlines import DeadlineScheduler
+
+# Durée de conservation des réponses reçues avant l'enregistrement de leur requête
+EARLY_RESPONSE_TTL = 300.0
 
 
 class RequestTimeoutError(Exception):
@@ -41,7 +45,6 @@ class RequestResponseProtocol:
         self.pending_requests = {}  # Dictionnaire des requêtes en attente de réponse
         self.response_callbacks = {}  # Callbacks pour les réponses asynchrones
         self.lock = threading.RLock()  # Verrou threading pour compatibilité avec les méthodes synchrones
-        self.async_lock = asyncio.Lock()  # Verrou AsyncIO pour les opérations asynchrones
         self.early_responses = {}  # File d'attente pour les réponses anticipées
         self.early_responses_by_conversation = {}  # Réponses anticipées indexées par conversation_id
         
@@ -49,11 +52,9 @@ class RequestResponseProtocol:
         self.logger = logging.getLogger("RequestResponseProtocol")
         self.logger.setLevel(logging.INFO)
         
-        # Démarrer le thread de surveillance des timeouts
+        # Échéances des requêtes à callback (timeouts, réessais) et des réponses anticipées
         self.running = True
-        self.timeout_thread = threading.Thread(target=self._monitor_timeouts)
-        self.timeout_thread.daemon = True
-        self.timeout_thread.start()
+        self.scheduler = DeadlineScheduler("RequestResponseDeadlines")
     
     def send_request(
         self,
@@ -110,42 +111,41 @@ class RequestResponseProtocol:
         
         # Vérifier s'il y a une réponse anticipée pour cette requête
         conversation_id = request.metadata.get("conversation_id")
-        with self.lock:
-            # Vérifier par ID de requête (cas peu probable mais possible)
-            if request.id in self.early_responses:
-                early_response = self.early_responses[request.id]["response"]
-                del self.early_responses[request.id]
-                self.logger.info(f"Using early response for request {request.id}")
-                return early_response
-            
-            # Vérifier par ID de conversation
-            if conversation_id and conversation_id in self.early_responses_by_conversation:
-                early_response = self.early_responses_by_conversation[conversation_id]["response"]
-                request_id = early_response.metadata.get("reply_to")
-                if request_id in self.early_responses:
-                    del self.early_responses[request_id]
-                del self.early_responses_by_conversation[conversation_id]
-                self.logger.info(f"Using early response for conversation {conversation_id}")
-                return early_response
+        early_response = self._pop_early_response(request.id, conversation_id)
+        if early_response is not None:
+            self.logger.info(f"Using early response for request {request.id}")
+            return early_response
         
         # Tentatives d'envoi avec réessais
         for attempt in range(retry_count + 1):
             try:
                 # Enregistrer la requête comme en attente
+                pending = {
+                    "request": request,
+                    "response": None,
+                    "completed": threading.Event()
+                }
                 with self.lock:
-                    self.pending_requests[request.id] = {
-                        "request": request,
-                        "expires_at": datetime.now() + timedelta(seconds=timeout),
-                        "response": None,
-                        "completed": threading.Event()
-                    }
+                    self.pending_requests[request.id] = pending
+                    
+                    # Une réponse à une tentative précédente a pu arriver pendant le délai de réessai
+                    early_response = self._pop_early_response(request.id, conversation_id)
+                    if early_response is not None:
+                        del self.pending_requests[request.id]
+                        self.logger.info(f"Using early response for request {request.id} after registration")
+                        return early_response
                 
                 # Envoyer la requête
                 self.middleware.send_message(request)
                 
-                # Attendre la réponse
-                pending = self.pending_requests[request.id]
-                if not pending["completed"].wait(timeout=timeout):
+                # Attendre la réponse : le thread appelant gère lui-même son échéance
+                completed = pending["completed"].wait(timeout=timeout)
+                
+                with self.lock:
+                    if self.pending_requests.get(request.id) is pending:
+                        del self.pending_requests[request.id]
+                
+                if not completed:
                     # Timeout atteint
                     if attempt < retry_count:
                         # Réessayer
@@ -155,38 +155,11 @@ class RequestResponseProtocol:
                         # Échec définitif
                         raise RequestTimeoutError(f"Request {request.id} timed out after {retry_count + 1} attempts")
                 
-                # Récupérer la réponse
-                response = None
-                with self.lock:
-                    if request.id in self.pending_requests:
-                        pending_entry = self.pending_requests[request.id]
-                        response = pending_entry["response"] # Récupérer la réponse stockée par handle_response
-                        # Pour les requêtes synchrones simples (pas de futur, pas de callback),
-                        # nous pouvons supprimer la requête ici car send_request est sur le point de retourner.
-                        if "future" not in pending_entry and "callback" not in pending_entry:
-                            del self.pending_requests[request.id]
-                            self.logger.info(f"Synchronous request {request.id} processed and removed by send_request.")
-                    elif request.id in self.early_responses: # Si elle a été traitée très rapidement
-                        self.logger.info(f"Request {request.id} was processed as early response, retrieving from early_responses.")
-                        response = self.early_responses[request.id]["response"]
-                        del self.early_responses[request.id]
-                        conversation_id = response.metadata.get("conversation_id")
-                        if conversation_id and conversation_id in self.early_responses_by_conversation:
-                            del self.early_responses_by_conversation[conversation_id]
-                    else:
-                        self.logger.warning(f"Request {request.id} not found in pending_requests or early_responses after wait.")
-
+                # Récupérer la réponse stockée par handle_response
+                response = pending["response"]
                 if response is None:
-                    self.logger.error(f"send_request for {request.id} completed wait but response is None. This indicates a timeout or logic error.")
-                    # Ne pas lever RequestTimeoutError ici si le wait a réussi, cela masquerait la cause.
-                    # Le timeout est géré par le `if not pending["completed"].wait(timeout=timeout):` plus haut.
-                    # Si on arrive ici, c'est que wait() a réussi mais response est None.
-                    # Cela peut arriver si _handle_timeout a été appelé et a supprimé la requête
-                    # avant que cette section ne soit atteinte, mais après que .wait() ait été débloqué.
-                    # Ou si handle_response n'a pas correctement stocké la réponse.
-                    # On retourne None, et l'appelant (test) échouera sur l'assertion.
-                    pass # Laisser l'assertion du test échouer si guidance est None
-
+                    self.logger.error(f"send_request for {request.id} completed wait but response is None (protocol shutdown?).")
+                
                 return response
                 
             except Exception as e:
@@ -255,85 +228,43 @@ class RequestResponseProtocol:
         
         # Vérifier s'il y a une réponse anticipée pour cette requête
         conversation_id = request.metadata.get("conversation_id")
-        with self.lock:
-            # D'abord, vérifier si une réponse anticipée existe pour cette requête spécifique
-            if request.id in self.early_responses:
-                early_response = self.early_responses[request.id]["response"]
-                del self.early_responses[request.id]
-                self.logger.info(f"Using early response for request {request.id}")
-                return early_response
-            
-            # Vérifier par ID de conversation
-            if conversation_id and conversation_id in self.early_responses_by_conversation:
-                early_response = self.early_responses_by_conversation[conversation_id]["response"]
-                request_id = early_response.metadata.get("reply_to")
-                if request_id in self.early_responses:
-                    del self.early_responses[request_id]
-                del self.early_responses_by_conversation[conversation_id]
-                self.logger.info(f"Using early response for conversation {conversation_id}")
-                return early_response
+        early_response = self._pop_early_response(request.id, conversation_id)
+        if early_response is not None:
+            self.logger.info(f"Using early response for request {request.id}")
+            return early_response
         
         # Tentatives d'envoi avec réessais
         for attempt in range(retry_count + 1):
             try:
-                # Créer un futur pour la réponse
-                response_future = asyncio.Future()
-                
-                # Race condition fix: attendre avant enregistrement des requêtes
-                await asyncio.sleep(0.1)
+                # Créer un futur pour la réponse, attendu nativement dans la boucle courante
+                loop = asyncio.get_running_loop()
+                response_future = loop.create_future()
                 
-                # Utiliser le verrou AsyncIO pour les opérations asynchrones
-                async with self.async_lock:
+                with self.lock:
                     # Enregistrer la requête comme en attente avec le futur
-                    with self.lock:
-                        self.pending_requests[request.id] = {
-                            "request": request,
-                            "expires_at": datetime.now() + timedelta(seconds=timeout),
-                            "response": None,
-                            "completed": threading.Event(),
-                            "future": response_future,
-                            "loop": asyncio.get_running_loop() # Stocker la boucle actuelle
-                        }
-                        self.logger.info(f"Registered request {request.id} in pending_requests")
-                        
-                        # Vérifier à nouveau s'il y a une réponse anticipée après avoir enregistré la requête
-                        # Cela permet de capturer les réponses qui sont arrivées entre-temps
-                        if request.id in self.early_responses:
-                            early_response = self.early_responses[request.id]["response"]
-                            del self.early_responses[request.id]
-                            self.logger.info(f"Using early response for request {request.id} after registration")
-                            
-                            # Compléter le futur avec la réponse anticipée
-                            response_future.set_result(early_response)
-                            
-                            # Supprimer la requête des requêtes en attente
-                            del self.pending_requests[request.id]
-                            
-                            return early_response
-                        
-                        # Vérifier par ID de conversation
-                        if conversation_id and conversation_id in self.early_responses_by_conversation:
-                            early_response = self.early_responses_by_conversation[conversation_id]["response"]
-                            request_id = early_response.metadata.get("reply_to")
-                            if request_id in self.early_responses:
-                                del self.early_responses[request_id]
-                            del self.early_responses_by_conversation[conversation_id]
-                            self.logger.info(f"Using early response for conversation {conversation_id} after registration")
-                            
-                            # Compléter le futur avec la réponse anticipée
-                            response_future.set_result(early_response)
-                            
-                            # Supprimer la requête des requêtes en attente
-                            del self.pending_requests[request.id]
-                            
-                            return early_response
-                
-                # Envoyer la requête
-                self.middleware.send_message(request)
-                self.logger.info(f"Sent request {request.id} to {recipient}")
+                    pending = {
+                        "request": request,
+                        "response": None,
+                        "completed": threading.Event(),
+                        "future": response_future,
+                        "loop": loop
+                    }
+                    self.pending_requests[request.id] = pending
+                    self.logger.info(f"Registered request {request.id} in pending_requests")
+                    
+                    # Une réponse à une tentative précédente a pu arriver pendant le délai de réessai
+                    early_response = self._pop_early_response(request.id, conversation_id)
+                    if early_response is not None:
+                        del self.pending_requests[request.id]
+                        self.logger.info(f"Using early response for request {request.id} after registration")
+                        return early_response
                 
-                # Attendre la réponse avec timeout
                 try:
+                    # Envoyer la requête
+                    self.middleware.send_message(request)
+                    self.logger.info(f"Sent request {request.id} to {recipient}")
+                    
+                    # Attendre la réponse avec timeout (échéance gérée par la boucle d'événements)
                     self.logger.info(f"Waiting for response to request {request.id} with timeout {timeout}s")
                     return await asyncio.wait_for(response_future, timeout=timeout)
                 except asyncio.TimeoutError:
@@ -347,14 +278,17 @@ class RequestResponseProtocol:
                         # Échec définitif
                         self.logger.error(f"Request {request.id} timed out after {retry_count + 1} attempts")
                         raise RequestTimeoutError(f"Request {request.id} timed out after {retry_count + 1} attempts")
+                finally:
+                    with self.lock:
+                        if self.pending_requests.get(request.id) is pending:
+                            del self.pending_requests[request.id]
                 
             except asyncio.CancelledError:
-                # Gérer l'annulation de la tâche
-                with self.lock:
-                    if request.id in self.pending_requests:
-                        del self.pending_requests[request.id]
+                # Gérer l'annulation de la tâche (la requête a déjà été retirée des requêtes en attente)
                 self.logger.warning(f"Request {request.id} was cancelled")
                 raise
+            except RequestTimeoutError:
+                raise
             except Exception as e:
                 if attempt < retry_count:
                     # Réessayer
@@ -421,15 +355,18 @@ class RequestResponseProtocol:
         with self.lock:
             self.pending_requests[request.id] = {
                 "request": request,
-                "expires_at": datetime.now() + timedelta(seconds=timeout),
                 "response": None,
                 "completed": threading.Event(),
                 "callback": callback,
+                "timeout": timeout,
                 "retry_count": retry_count,
                 "retry_delay": retry_delay,
                 "attempt": 0
             }
         
+        # Planifier l'échéance avant l'envoi, pour qu'une réponse immédiate puisse l'annuler
+        self.scheduler.schedule(("request", request.id), timeout, lambda: self._on_request_deadline(request.id))
+        
         # Envoyer la requête
         self.middleware.send_message(request)
         
@@ -458,6 +395,9 @@ class RequestResponseProtocol:
             if request_id in self.pending_requests:
                 pending = self.pending_requests[request_id]
                 
+                # Annuler l'échéance ou le réessai planifié
+                self.scheduler.cancel(("request", request_id))
+                
                 # Stocker la réponse
                 pending["response"] = response
                 
@@ -493,21 +433,11 @@ class RequestResponseProtocol:
                     except Exception as e:
                         self.logger.error(f"Error in response callback: {e}")
                 
-                # Pour les requêtes synchrones simples (pas de futur, pas de callback),
-                # la suppression est maintenant gérée par send_request après récupération de la réponse.
-                # Pour les requêtes avec futur ou callback, elles restent jusqu'à ce que le futur/callback
-                # soit traité ou qu'elles expirent.
-                if "future" in pending or "callback" in pending:
-                    # Ne pas supprimer ici, send_request_async ou _handle_timeout s'en chargeront
-                    pass
-                elif request_id in self.pending_requests : # S'assurer qu'elle n'a pas déjà été supprimée par send_request
-                    # Ce cas ne devrait plus être nécessaire si send_request gère la suppression
-                    # des requêtes synchrones simples.
-                    # self.logger.info(f"Removing request {request_id} from pending requests by handle_response (should be rare).")
-                    # del self.pending_requests[request_id]
-                    pass
-
-
+                # Les requêtes synchrones et asynchrones sont retirées par send_request et
+                # send_request_async ; une requête à callback est terminée une fois celui-ci appelé.
+                if "callback" in pending:
+                    del self.pending_requests[request_id]
+                
                 return True
             else:
                 # Vérifier si la réponse est pour une requête qui n'a pas encore été enregistrée
@@ -529,6 +459,12 @@ class RequestResponseProtocol:
                     }
                     self.logger.info(f"Stored early response for conversation {conversation_id}")
                 
+                # Planifier l'oubli de la réponse anticipée si aucune requête ne la réclame
+                self.scheduler.schedule(
+                    ("early_response", request_id), EARLY_RESPONSE_TTL,
+                    lambda: self._expire_early_response(request_id, response)
+                )
+                
                 self.logger.info(f"Stored early response for request {request_id}")
                 
                 # Afficher les requêtes en attente pour le débogage
@@ -538,67 +474,94 @@ class RequestResponseProtocol:
                 
                 return True
     
-    def _monitor_timeouts(self):
-        """Thread qui surveille les timeouts des requêtes en attente et nettoie les réponses anticipées."""
-        while self.running:
-            try:
-                now = datetime.now()
-                timed_out_requests = []
-                expired_early_responses = []
-                
-                # Identifier les requêtes expirées
-                with self.lock:
-                    # Vérifier les requêtes en attente
-                    for request_id, pending in list(self.pending_requests.items()):
-                        if now > pending["expires_at"] and not pending["completed"].is_set():
-                            # Vérifier s'il reste des tentatives
-                            if "retry_count" in pending and "attempt" in pending:
-                                if pending["attempt"] < pending["retry_count"]:
-                                    # Incrémenter le compteur de tentatives
-                                    pending["attempt"] += 1
-                                    
-                                    # Mettre à jour l'expiration
-                                    pending["expires_at"] = now + timedelta(seconds=pending["request"].content.get("timeout", 30.0))
-                                    
-                                    # Renvoyer la requête
-                                    self.middleware.send_message(pending["request"])
-                                    
-                                    # Attendre le délai de réessai sans bloquer le verrou
-                                    continue
-                            
-                            # Plus de tentatives ou pas de réessai configuré
-                            timed_out_requests.append(request_id)
-                    
-                    # Nettoyer les réponses anticipées expirées (plus de 5 minutes)
-                    for request_id, early_response in list(self.early_responses.items()):
-                        if (now - early_response["timestamp"]).total_seconds() > 300:  # 5 minutes
-                            expired_early_responses.append(("request", request_id))
-                    
-                    # Nettoyer les réponses anticipées par conversation expirées
-                    for conv_id, early_response in list(self.early_responses_by_conversation.items()):
-                        if (now - early_response["timestamp"]).total_seconds() > 300:  # 5 minutes
-                            expired_early_responses.append(("conversation", conv_id))
-                
-                # Traiter les requêtes expirées (en dehors du bloc verrouillé)
-                for request_id in timed_out_requests:
-                    self._handle_timeout(request_id)
-                
-                # Supprimer les réponses anticipées expirées
-                with self.lock:
-                    for type_id, id_value in expired_early_responses:
-                        if type_id == "request" and id_value in self.early_responses:
-                            del self.early_responses[id_value]
-                            self.logger.info(f"Removed expired early response for request {id_value}")
-                        elif type_id == "conversation" and id_value in self.early_responses_by_conversation:
-                            del self.early_responses_by_conversation[id_value]
-                            self.logger.info(f"Removed expired early response for conversation {id_value}")
-                
-                # Attendre un peu avant la prochaine vérification
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in timeout monitor: {e}")
-                time.sleep(1)
+    def _pop_early_response(self, request_id: str, conversation_id: Optional[str]) -> Optional[Message]:
+        """
+        Retire et retourne la réponse anticipée d'une requête, si elle existe.
+        
+        Args:
+            request_id: L'identifiant de la requête
+            conversation_id: L'identifiant de conversation de la requête (optionnel)
+            
+        Returns:
+            La réponse anticipée ou None
+        """
+        with self.lock:
+            if request_id in self.early_responses:
+                early_response = self.early_responses.pop(request_id)["response"]
+                self.early_responses_by_conversation.pop(early_response.metadata.get("conversation_id"), None)
+                self.scheduler.cancel(("early_response", request_id))
+                return early_response
+            
+            if conversation_id and conversation_id in self.early_responses_by_conversation:
+                early_response = self.early_responses_by_conversation.pop(conversation_id)["response"]
+                reply_to = early_response.metadata.get("reply_to")
+                self.early_responses.pop(reply_to, None)
+                self.scheduler.cancel(("early_response", reply_to))
+                return early_response
+        
+        return None
+    
+    def _on_request_deadline(self, request_id: str) -> None:
+        """
+        Traite l'échéance d'une requête à callback : réessai planifié ou timeout définitif.
+        
+        Args:
+            request_id: L'identifiant de la requête
+        """
+        with self.lock:
+            pending = self.pending_requests.get(request_id)
+            if pending is None or pending["completed"].is_set():
+                return
+            
+            # Vérifier s'il reste des tentatives
+            if pending.get("attempt", 0) < pending.get("retry_count", 0):
+                pending["attempt"] += 1
+                self.logger.warning(f"Timeout for request {request_id}, retrying ({pending['attempt']}/{pending['retry_count']})")
+                self.scheduler.schedule(
+                    ("request", request_id), pending["retry_delay"], lambda: self._resend_request(request_id)
+                )
+                return
+        
+        # Plus de tentatives ou pas de réessai configuré
+        self._handle_timeout(request_id)
+    
+    def _resend_request(self, request_id: str) -> None:
+        """
+        Renvoie une requête à callback après le délai de réessai et replanifie son échéance.
+        
+        Args:
+            request_id: L'identifiant de la requête
+        """
+        with self.lock:
+            pending = self.pending_requests.get(request_id)
+            if pending is None or pending["completed"].is_set():
+                return
+            request = pending["request"]
+            self.scheduler.schedule(
+                ("request", request_id), pending["timeout"], lambda: self._on_request_deadline(request_id)
+            )
+        
+        self.middleware.send_message(request)
+    
+    def _expire_early_response(self, request_id: str, response: Message) -> None:
+        """
+        Supprime une réponse anticipée qui n'a été réclamée par aucune requête.
+        
+        Args:
+            request_id: L'identifiant de la requête à laquelle la réponse est destinée
+            response: La réponse anticipée
+        """
+        with self.lock:
+            early_response = self.early_responses.get(request_id)
+            if early_response is not None and early_response["response"] is response:
+                del self.early_responses[request_id]
+                self.logger.info(f"Removed expired early response for request {request_id}")
+            
+            conversation_id = response.metadata.get("conversation_id")
+            early_response = self.early_responses_by_conversation.get(conversation_id)
+            if early_response is not None and early_response["response"] is response:
+                del self.early_responses_by_conversation[conversation_id]
+                self.logger.info(f"Removed expired early response for conversation {conversation_id}")
     
     def _handle_timeout(self, request_id):
         """
@@ -665,8 +628,7 @@ class RequestResponseProtocol:
     def shutdown(self):
         """Arrête proprement le protocole."""
         self.running = False
-        if self.timeout_thread.is_alive():
-            self.timeout_thread.join(timeout=2)
+        self.scheduler.shutdown()
         
         # Compléter toutes les requêtes en attente avec une erreur
         with self.lock:
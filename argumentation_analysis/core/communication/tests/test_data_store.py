@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le stockage binaire des données du canal de données.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from argumentation_analysis.core.communication.data_channel import DataStore, DataChannel, COMPRESSION_CODECS
+
+
+def make_payload(size: int = 200) -> dict:
+    return {"beliefs": [f"croyance {i} : le texte soutient la thèse" for i in range(size)], "source": "extrait-1"}
+
+
+class TestDataStore(unittest.TestCase):
+    """Tests pour le stockage de données."""
+
+    def setUp(self):
+        self.spill_dir = tempfile.mkdtemp()
+        self.store = DataStore("test", {"spill_dir": self.spill_dir})
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def test_round_trip_keeps_raw_compressed_bytes(self):
+        payload = make_payload()
+        version_id = self.store.store_data("d1", payload, {"auteur": "agent"})
+
+        data, metadata = self.store.get_data("d1", version_id)
+        info = self.store.get_data_info("d1")
+
+        self.assertEqual(data, payload)
+        self.assertEqual(metadata, {"auteur": "agent"})
+        self.assertTrue(info["is_compressed"])
+        self.assertIn(info["codec"], COMPRESSION_CODECS)
+        self.assertLess(info["compressed_size"], info["size"])
+        self.assertIsInstance(self.store.blobs[info["content_hash"]].payload, bytes)
+
+    def test_buffers_are_memoryviews(self):
+        payload = make_payload()
+        self.store.store_data("d1", payload)
+        small = {"a": 1}
+        self.store.store_data("d2", small, compress=True)
+
+        buffer = self.store.get_data_buffer("d1")
+        raw = self.store.get_data_buffer("d1", raw=True)
+        small_buffer = self.store.get_data_buffer("d2")
+
+        self.assertIsInstance(buffer, memoryview)
+        self.assertEqual(json.loads(buffer.tobytes()), payload)
+        self.assertLess(raw.nbytes, buffer.nbytes)
+        # Les petits contenus ne sont pas compressés : la vue porte sur les octets stockés
+        self.assertTrue(small_buffer.readonly)
+        self.assertEqual(small_buffer.obj, self.store.blobs[self.store.get_data_info("d2")["content_hash"]].payload)
+
+    def test_identical_versions_share_content(self):
+        payload = make_payload()
+        first = self.store.store_data("d1", payload)
+        second = self.store.store_data("d1", dict(payload))
+        self.store.store_data("d2", payload)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(self.store.blobs), 1)
+        self.assertEqual(self.store.get_storage_info()["deduplicated_versions"], 2)
+
+        self.store.delete_data("d1")
+        self.assertEqual(len(self.store.blobs), 1)
+        self.store.delete_data("d2")
+        self.assertEqual(self.store.blobs, {})
+
+    def test_large_content_is_spilled_to_mapped_file(self):
+        store = DataStore("spill", {"spill_dir": self.spill_dir, "spill_threshold": 256, "compression_threshold": 10 ** 9})
+        payload = make_payload(50)
+        version_id = store.store_data("d1", payload)
+        info = store.get_data_info("d1")
+        path = store.blobs[info["content_hash"]].path
+
+        self.assertTrue(info["spilled"])
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(store.get_data("d1", version_id)[0], payload)
+        self.assertEqual(json.loads(store.get_data_buffer("d1").tobytes()), payload)
+        self.assertGreater(store.get_storage_info()["spilled_bytes"], 0)
+
+        store.delete_data("d1")
+        self.assertFalse(os.path.exists(path))
+        store.close()
+
+    def test_version_retention_by_count(self):
+        store = DataStore("retention", {"max_versions": 2})
+        version_ids = [store.store_data("d1", {"version": i}) for i in range(5)]
+
+        self.assertEqual(store.get_versions("d1"), version_ids[-2:])
+        self.assertEqual(store.get_data("d1")[0], {"version": 4})
+        self.assertEqual(len(store.blobs), 2)
+        with self.assertRaises(KeyError):
+            store.get_data("d1", version_ids[0])
+
+    def test_version_retention_by_age_keeps_latest(self):
+        store = DataStore("retention", {"max_version_age": 60})
+        old, latest = store.store_data("d1", {"v": 1}), store.store_data("d1", {"v": 2})
+        store.store_data("d2", {"v": 1})
+        for data_item in store.data_items.values():
+            data_item["stored_at"] -= 120
+
+        self.assertEqual(store.apply_retention(), 1)
+        self.assertEqual(store.get_versions("d1"), [latest])
+        self.assertEqual(len(store.get_versions("d2")), 1)
+
+    def test_unknown_codec_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DataStore("codec", {"compression_codec": "inconnu"})
+
+
+class TestDataChannelStorage(unittest.TestCase):
+    """Tests pour l'utilisation du stockage par le canal de données."""
+
+    def test_channel_exposes_buffers_and_storage_info(self):
+        channel = DataChannel("data")
+        payload = make_payload()
+        version_id = channel.store_data("d1", payload)
+
+        self.assertEqual(json.loads(channel.get_data_buffer("d1", version_id).tobytes()), payload)
+        info = channel.get_channel_info()
+        self.assertEqual(info["storage"]["item_count"], 1)
+        self.assertGreater(info["stats"]["compressed_data_size"], 0)
+        self.assertLess(info["stats"]["compressed_data_size"], info["stats"]["total_data_size"])
+
+
+if __name__ == "__main__":
+    unittest.main()
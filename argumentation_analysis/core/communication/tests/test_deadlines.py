@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour l'ordonnanceur d'échéances et les timeouts du protocole de requête-réponse.
+"""
+
+import threading
+import time
+import unittest
+
+from argumentation_analysis.core.communication.message import Message, MessageType, AgentLevel
+from argumentation_analysis.core.communication.middleware import MessageMiddleware
+from argumentation_analysis.core.communication.hierarchical_channel import HierarchicalChannel
+from argumentation_analysis.core.communication.deadlines import DeadlineScheduler
+from argumentation_analysis.core.communication.request_response import RequestTimeoutError
+
+
+class TestDeadlineScheduler(unittest.TestCase):
+    """Tests pour l'ordonnanceur d'échéances."""
+
+    def setUp(self):
+        self.scheduler = DeadlineScheduler("test-deadlines")
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def test_callbacks_run_in_deadline_order(self):
+        fired = []
+        done = threading.Event()
+        self.scheduler.schedule("c", 0.06, lambda: (fired.append("c"), done.set()))
+        self.scheduler.schedule("a", 0.02, lambda: fired.append("a"))
+        self.scheduler.schedule("b", 0.04, lambda: fired.append("b"))
+
+        self.assertTrue(done.wait(2))
+        self.assertEqual(fired, ["a", "b", "c"])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_cancel_and_reschedule(self):
+        fired = []
+        done = threading.Event()
+        self.scheduler.schedule("annulee", 0.02, lambda: fired.append("annulee"))
+        self.scheduler.schedule("replanifiee", 0.02, lambda: fired.append("ancienne"))
+        self.scheduler.schedule("replanifiee", 0.05, lambda: (fired.append("nouvelle"), done.set()))
+
+        self.assertTrue(self.scheduler.cancel("annulee"))
+        self.assertFalse(self.scheduler.cancel("inconnue"))
+        self.assertTrue(done.wait(2))
+        self.assertEqual(fired, ["nouvelle"])
+
+    def test_earlier_deadline_wakes_sleeping_thread(self):
+        fired = threading.Event()
+        self.scheduler.schedule("lointaine", 60, lambda: None)
+        start = time.monotonic()
+        self.scheduler.schedule("proche", 0.02, fired.set)
+
+        self.assertTrue(fired.wait(2))
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertIn("lointaine", self.scheduler)
+
+    def test_failing_callback_does_not_stop_scheduler(self):
+        fired = threading.Event()
+        self.scheduler.schedule("erreur", 0, lambda: 1 / 0)
+        self.scheduler.schedule("suivante", 0.01, fired.set)
+
+        self.assertTrue(fired.wait(2))
+
+
+class TestRequestResponseDeadlines(unittest.TestCase):
+    """Tests pour les échéances du protocole de requête-réponse."""
+
+    def setUp(self):
+        self.middleware = MessageMiddleware()
+        self.middleware.register_channel(HierarchicalChannel("hierarchical"))
+        self.middleware.initialize_protocols()
+        self.protocol = self.middleware.request_response
+
+    def tearDown(self):
+        self.middleware.shutdown()
+
+    def send_callback_request(self, timeout, retry_count=0, retry_delay=0.0):
+        results = []
+        done = threading.Event()
+
+        def callback(response, error):
+            results.append((response, error))
+            done.set()
+
+        request_id = self.protocol.send_request_async_callback(
+            "strategic-1", AgentLevel.STRATEGIC, "tactical-1", "status", {},
+            callback, timeout=timeout, retry_count=retry_count, retry_delay=retry_delay
+        )
+        return request_id, results, done
+
+    def test_callback_request_times_out_precisely(self):
+        start = time.monotonic()
+        request_id, results, done = self.send_callback_request(timeout=0.05)
+
+        self.assertTrue(done.wait(2))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertIsInstance(results[0][1], RequestTimeoutError)
+        self.assertNotIn(request_id, self.protocol.pending_requests)
+
+    def test_retries_are_rescheduled_then_cancelled_by_response(self):
+        request_id, results, done = self.send_callback_request(timeout=0.05, retry_count=2, retry_delay=0.01)
+        first = self.middleware.receive_message("tactical-1", timeout=1)
+        resent = self.middleware.receive_message("tactical-1", timeout=1)
+
+        self.assertEqual(first.id, request_id)
+        self.assertEqual(resent.id, request_id)
+        self.assertEqual(self.protocol.pending_requests[request_id]["attempt"], 1)
+
+        self.protocol.handle_response(resent.create_response({"status": "ok"}))
+
+        self.assertTrue(done.wait(1))
+        self.assertEqual(results[0][0].content["status"], "ok")
+        self.assertNotIn(("request", request_id), self.protocol.scheduler)
+        self.assertNotIn(request_id, self.protocol.pending_requests)
+
+    def test_early_responses_expire(self):
+        orphan = Message(
+            message_type=MessageType.RESPONSE,
+            sender="tactical-1",
+            sender_level=AgentLevel.TACTICAL,
+            content={},
+            recipient="strategic-1",
+            metadata={"reply_to": "request-inconnue", "conversation_id": "conv-1"}
+        )
+        self.protocol.handle_response(orphan)
+        self.assertIn(("early_response", "request-inconnue"), self.protocol.scheduler)
+
+        self.protocol._expire_early_response("request-inconnue", orphan)
+
+        self.assertEqual(self.protocol.early_responses, {})
+        self.assertEqual(self.protocol.early_responses_by_conversation, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour la réception événementielle du middleware de messagerie.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from argumentation_analysis.core.communication.message import Message, MessageType, AgentLevel
+from argumentation_analysis.core.communication.channel_interface import ChannelType, LocalChannel
+from argumentation_analysis.core.communication.hierarchical_channel import HierarchicalChannel
+from argumentation_analysis.core.communication.collaboration_channel import CollaborationChannel
+from argumentation_analysis.core.communication.middleware import MessageMiddleware, DeliveryNotifier
+
+
+class CountingChannel(HierarchicalChannel):
+    """Canal hiérarchique qui compte les consultations de ses files."""
+
+    def __init__(self, channel_id: str):
+        super().__init__(channel_id)
+        self.receive_calls = 0
+
+    def receive_message(self, recipient_id, timeout=None):
+        self.receive_calls += 1
+        return super().receive_message(recipient_id, timeout)
+
+
+class SilentChannel(LocalChannel):
+    """Canal qui ne signale pas ses livraisons."""
+
+    notifies_deliveries = False
+
+    def __init__(self, channel_id: str):
+        super().__init__(channel_id)
+        self.type = ChannelType.DATA
+
+
+def make_message(recipient: str, text: str = "ping") -> Message:
+    return Message(
+        message_type=MessageType.INFORMATION,
+        sender="strategic-agent-1",
+        sender_level=AgentLevel.STRATEGIC,
+        content={"text": text},
+        recipient=recipient
+    )
+
+
+def send_later(delay: float, send, message: Message) -> threading.Thread:
+    def run():
+        time.sleep(delay)
+        send(message)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestDeliveryNotifier(unittest.TestCase):
+    """Tests pour le notificateur de livraisons."""
+
+    def test_wait_returns_immediately_after_missed_notification(self):
+        notifier = DeliveryNotifier()
+        version = notifier.version("agent")
+        notifier.notify("agent")
+
+        self.assertTrue(notifier.wait("agent", version, timeout=5))
+        self.assertFalse(notifier.wait("agent", notifier.version("agent"), timeout=0.05))
+
+    def test_wildcard_waiters_are_woken(self):
+        notifier = DeliveryNotifier()
+        version = notifier.version("*")
+        notifier.notify("agent")
+
+        self.assertNotEqual(notifier.version("*"), version)
+
+
+class TestEventDrivenReceive(unittest.TestCase):
+    """Tests pour la réception sans scrutation du middleware."""
+
+    def setUp(self):
+        self.middleware = MessageMiddleware()
+        self.hierarchical_channel = CountingChannel("hierarchical")
+        self.collaboration_channel = CollaborationChannel("collaboration")
+        self.middleware.register_channel(self.hierarchical_channel)
+        self.middleware.register_channel(self.collaboration_channel)
+
+    def test_blocking_receive_wakes_on_delivery_without_polling(self):
+        message = make_message("tactical-agent-1")
+        sender = send_later(0.3, self.middleware.send_message, message)
+
+        start = time.monotonic()
+        received = self.middleware.receive_message("tactical-agent-1", timeout=5)
+        elapsed = time.monotonic() - start
+        sender.join()
+
+        self.assertEqual(received.id, message.id)
+        self.assertLess(elapsed, 2)
+        # Une consultation avant l'attente, une après le réveil : pas de boucle toutes les 10 ms
+        self.assertLessEqual(self.hierarchical_channel.receive_calls, 3)
+        self.assertEqual(self.middleware.get_statistics()["by_channel"]["hierarchical"]["received"], 1)
+
+    def test_delivery_directly_on_channel_wakes_receiver(self):
+        group_id = self.collaboration_channel.create_group(name="analyse", members=["tactical-1", "tactical-2"])
+        message = make_message(None)
+        message.sender = "tactical-1"
+        message.metadata["group_id"] = group_id
+        sender = send_later(0.1, self.collaboration_channel.send_message, message)
+
+        received = self.middleware.receive_message("tactical-2", timeout=5)
+        sender.join()
+
+        self.assertEqual(received.id, message.id)
+
+    def test_receive_times_out(self):
+        start = time.monotonic()
+        received = self.middleware.receive_message("tactical-agent-1", timeout=0.2)
+
+        self.assertIsNone(received)
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_silent_channel_is_still_polled(self):
+        silent_channel = SilentChannel("silent")
+        self.middleware.register_channel(silent_channel)
+        self.middleware.poll_interval = 0.02
+        message = make_message("operational-agent-1")
+
+        # Dépôt direct dans le canal : aucune notification n'est émise
+        sender = send_later(0.1, silent_channel._message_queue.append, message)
+        received = self.middleware.receive_message("operational-agent-1", timeout=5)
+        sender.join()
+
+        self.assertEqual(received.id, message.id)
+
+
+class TestEventDrivenReceiveAsync(unittest.IsolatedAsyncioTestCase):
+    """Tests pour la réception asynchrone native du middleware."""
+
+    def setUp(self):
+        self.middleware = MessageMiddleware()
+        self.middleware.register_channel(HierarchicalChannel("hierarchical"))
+
+    async def test_async_receive_does_not_use_executor(self):
+        loop = asyncio.get_running_loop()
+        messages = [make_message(f"operational-agent-{i}") for i in range(20)]
+
+        with patch.object(loop, "run_in_executor", side_effect=AssertionError("executor used")):
+            receivers = [
+                asyncio.create_task(self.middleware.receive_message_async(message.recipient, timeout=5))
+                for message in messages
+            ]
+            await asyncio.sleep(0.05)
+            sender = send_later(0, lambda batch: [self.middleware.send_message(m) for m in batch], messages)
+            received = await asyncio.gather(*receivers)
+            sender.join()
+
+        self.assertEqual([m.id for m in received], [m.id for m in messages])
+
+    async def test_async_receive_on_channel_times_out(self):
+        received = await self.middleware.receive_message_async(
+            "tactical-agent-1", ChannelType.HIERARCHICAL, timeout=0.1
+        )
+
+        self.assertIsNone(received)
+
+
+if __name__ == "__main__":
+    unittest.main()
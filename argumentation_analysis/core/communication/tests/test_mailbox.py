@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour les boîtes aux lettres indexées des canaux de communication.
+"""
+
+import threading
+import time
+import unittest
+
+from argumentation_analysis.core.communication.message import Message, MessageType, MessagePriority, AgentLevel
+from argumentation_analysis.core.communication.mailbox import Mailbox, MailboxRegistry
+from argumentation_analysis.core.communication.hierarchical_channel import HierarchicalChannel
+from argumentation_analysis.core.communication.data_channel import DataChannel
+from argumentation_analysis.core.communication.collaboration_channel import CollaborationChannel
+
+
+def make_message(recipient: str = "tactical-agent-1", priority: MessagePriority = MessagePriority.NORMAL,
+                 ttl=None) -> Message:
+    return Message(
+        message_type=MessageType.INFORMATION,
+        sender="strategic-agent-1",
+        sender_level=AgentLevel.STRATEGIC,
+        content={"info": "test"},
+        recipient=recipient,
+        priority=priority,
+        metadata={"ttl": ttl} if ttl is not None else None
+    )
+
+
+class TestMailbox(unittest.TestCase):
+    """Tests pour la boîte aux lettres d'un destinataire."""
+
+    def test_pop_order_is_priority_then_arrival(self):
+        mailbox = Mailbox()
+        first, second, urgent = make_message(), make_message(), make_message()
+        mailbox.put(first, 2)
+        mailbox.put(second, 2)
+        mailbox.put(urgent, 0)
+
+        self.assertEqual([mailbox.pop().id for _ in range(3)], [urgent.id, first.id, second.id])
+        self.assertIsNone(mailbox.pop())
+
+    def test_snapshot_is_non_destructive(self):
+        mailbox = Mailbox()
+        messages = [make_message() for _ in range(5)]
+        for index, message in enumerate(messages):
+            mailbox.put(message, 4 - index)
+
+        self.assertEqual([m.id for m in mailbox.snapshot(2)], [messages[4].id, messages[3].id])
+        self.assertEqual(len(mailbox.snapshot()), 5)
+        self.assertEqual(len(mailbox), 5)
+        self.assertEqual(mailbox.pop().id, messages[4].id)
+
+    def test_remove_by_id(self):
+        mailbox = Mailbox()
+        kept, removed = make_message(), make_message()
+        mailbox.put(removed)
+        mailbox.put(kept)
+
+        self.assertTrue(mailbox.remove(removed.id))
+        self.assertFalse(mailbox.remove(removed.id))
+        self.assertNotIn(removed.id, mailbox)
+        self.assertEqual(mailbox.get(kept.id).id, kept.id)
+        self.assertEqual(len(mailbox), 1)
+        self.assertEqual(mailbox.pop().id, kept.id)
+
+    def test_ttl_messages_expire_in_bulk(self):
+        mailbox = Mailbox(default_ttl=60)
+        short_lived = [make_message(ttl=0.05) for _ in range(3)]
+        durable = make_message()
+        for message in short_lived + [durable]:
+            mailbox.put(message)
+
+        self.assertEqual(mailbox.expire(time.monotonic() + 1), 3)
+        self.assertEqual(mailbox.expired_count, 3)
+        self.assertEqual([m.id for m in mailbox.snapshot()], [durable.id])
+        self.assertEqual(mailbox.expire(time.monotonic() + 120), 1)
+        self.assertEqual(len(mailbox), 0)
+
+    def test_heap_is_compacted_after_removals(self):
+        mailbox = Mailbox()
+        messages = [make_message() for _ in range(200)]
+        for message in messages:
+            mailbox.put(message)
+        for message in messages[:150]:
+            mailbox.remove(message.id)
+
+        self.assertLessEqual(len(mailbox._heap), 100)
+        self.assertEqual(mailbox.pop().id, messages[150].id)
+
+    def test_blocking_pop_wakes_on_put(self):
+        mailbox = Mailbox()
+        message = make_message()
+        threading.Timer(0.05, mailbox.put, args=(message,)).start()
+
+        self.assertEqual(mailbox.pop(timeout=5).id, message.id)
+        self.assertIsNone(mailbox.pop(timeout=0.01))
+
+    def test_registry_creates_mailboxes_on_demand(self):
+        registry = MailboxRegistry()
+        self.assertIsNone(registry.get("agent", create=False))
+
+        registry.get("agent").put(make_message("agent"))
+
+        self.assertIn("agent", registry)
+        self.assertEqual(registry.sizes(), {"agent": 1})
+
+
+class TestChannelMailboxes(unittest.TestCase):
+    """Tests pour la consultation des messages en attente des canaux."""
+
+    def test_hierarchical_pending_messages_keep_queue_intact(self):
+        channel = HierarchicalChannel("hierarchical")
+        low = make_message(priority=MessagePriority.LOW)
+        critical = make_message(priority=MessagePriority.CRITICAL)
+        channel.send_message(low)
+        channel.send_message(critical)
+
+        pending = channel.get_pending_messages("tactical-agent-1")
+
+        self.assertEqual([m.id for m in pending], [critical.id, low.id])
+        self.assertEqual(channel.get_channel_info()["queue_sizes"], {"tactical-agent-1": 2})
+        self.assertEqual(channel.receive_message("tactical-agent-1", 0).id, critical.id)
+        self.assertEqual(channel.clear_queue("tactical-agent-1"), 1)
+
+    def test_hierarchical_channel_expires_messages(self):
+        channel = HierarchicalChannel("hierarchical", {"message_ttl": 0.01})
+        channel.send_message(make_message())
+        time.sleep(0.05)
+
+        self.assertEqual(channel.expire_messages(), 1)
+        self.assertIsNone(channel.receive_message("tactical-agent-1", 0))
+
+    def test_data_channel_receive_consumes_message(self):
+        channel = DataChannel("data")
+        message = make_message()
+        channel.send_message(message)
+
+        self.assertEqual(len(channel.get_pending_messages("tactical-agent-1")), 1)
+        self.assertEqual(channel.receive_message("tactical-agent-1").id, message.id)
+        self.assertEqual(channel.get_pending_messages("tactical-agent-1"), [])
+        self.assertIsNone(channel.receive_message("tactical-agent-1"))
+
+    def test_collaboration_direct_messages_are_fifo(self):
+        channel = CollaborationChannel("collaboration")
+        messages = [make_message("tactical-2") for _ in range(3)]
+        for message in messages:
+            channel.send_message(message)
+
+        self.assertEqual([m.id for m in channel.get_pending_messages("tactical-2", 2)], [m.id for m in messages[:2]])
+        self.assertEqual([channel.receive_message("tactical-2").id for _ in range(3)], [m.id for m in messages])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitaires pour le protocole de publication-abonnement.
+"""
+
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from argumentation_analysis.core.communication.message import Message, MessageType, MessagePriority, AgentLevel
+from argumentation_analysis.core.communication.pub_sub import (
+    CompiledFilter, PublishSubscribeProtocol, SubscriptionDispatcher, Topic
+)
+
+
+def make_publication(sender: str = "tactical-1", sender_level: AgentLevel = AgentLevel.TACTICAL,
+                     priority: MessagePriority = MessagePriority.NORMAL, content=None, ttl=None) -> Message:
+    return Message(
+        message_type=MessageType.PUBLICATION,
+        sender=sender,
+        sender_level=sender_level,
+        content=content or {"event": "update"},
+        priority=priority,
+        metadata={"topic": "events", "ttl": ttl}
+    )
+
+
+class TestCompiledFilter(unittest.TestCase):
+    """Tests pour les prédicats de filtrage précompilés."""
+
+    def test_matches_fields_and_content(self):
+        message_filter = CompiledFilter({
+            "sender": ["tactical-1", "tactical-2"],
+            "priority": "high",
+            "content": {"event": ["update", "alert"]}
+        })
+
+        self.assertTrue(message_filter.matches(make_publication(priority=MessagePriority.HIGH)))
+        self.assertFalse(message_filter.matches(make_publication(priority=MessagePriority.LOW)))
+        self.assertFalse(message_filter.matches(make_publication(sender="operational-1", priority=MessagePriority.HIGH)))
+        self.assertFalse(message_filter.matches(make_publication(priority=MessagePriority.HIGH, content={"other": 1})))
+
+    def test_enum_values_and_message_type_are_accepted(self):
+        message_filter = CompiledFilter({"sender_level": AgentLevel.TACTICAL, "message_type": MessageType.PUBLICATION})
+
+        self.assertTrue(message_filter.matches(make_publication()))
+        self.assertFalse(message_filter.matches(make_publication(sender_level=AgentLevel.OPERATIONAL)))
+
+    def test_most_selective_indexed_field_is_chosen(self):
+        self.assertEqual(CompiledFilter({"priority": ["low", "normal"], "sender_level": "tactical"}).index_field,
+                         "sender_level")
+        self.assertIsNone(CompiledFilter({"sender": "tactical-1"}).index_field)
+        self.assertIsNone(CompiledFilter(None).index_field)
+
+
+class TestTopic(unittest.TestCase):
+    """Tests pour la sélection des abonnés et l'historique d'un topic."""
+
+    def test_index_preserves_subscription_order(self):
+        topic = Topic("events")
+        topic.add_subscriber("all")
+        topic.add_subscriber("high", filter_criteria={"priority": "high"})
+        topic.add_subscriber("tactical", filter_criteria={"sender_level": "tactical"})
+        topic.add_subscriber("low", filter_criteria={"priority": "low"})
+
+        self.assertEqual(topic.publish_message(make_publication(priority=MessagePriority.HIGH)),
+                         ["all", "high", "tactical"])
+        self.assertEqual(topic.publish_message(make_publication(sender_level=AgentLevel.STRATEGIC)), ["all"])
+
+    def test_unsubscribed_subscriber_no_longer_matches(self):
+        topic = Topic("events")
+        subscription_id = topic.add_subscriber("agent", filter_criteria={"priority": "normal"})
+
+        self.assertTrue(topic.remove_subscriber(subscription_id))
+        self.assertFalse(topic.remove_subscriber(subscription_id))
+        self.assertEqual(topic.publish_message(make_publication()), [])
+
+    def test_history_is_bounded(self):
+        topic = Topic("events", max_history=3)
+        messages = [make_publication() for _ in range(5)]
+        for message in messages:
+            topic.publish_message(message)
+
+        self.assertEqual([m.id for m in topic.get_recent_messages()], [m.id for m in messages[-3:]])
+        self.assertEqual(topic.get_message_count(), 3)
+        self.assertEqual(topic.get_topic_info()["published_count"], 5)
+
+    def test_expire_messages_keeps_history_bounded(self):
+        topic = Topic("events", max_history=3)
+        topic.publish_message(make_publication(ttl=1))
+        durable = make_publication()
+        topic.publish_message(durable)
+
+        self.assertEqual(topic.expire_messages(datetime.now() + timedelta(seconds=5)), 1)
+        self.assertEqual([m.id for m in topic.get_recent_messages()], [durable.id])
+        self.assertEqual(topic.max_history, 3)
+
+    def test_callback_runs_without_topic_lock(self):
+        topic = Topic("events")
+        lock_free = []
+
+        def probe_lock(message):
+            # Le verrou est réentrant : la sonde doit s'exécuter dans un autre thread
+            def probe():
+                acquired = topic.lock.acquire(blocking=False)
+                lock_free.append(acquired)
+                if acquired:
+                    topic.lock.release()
+            prober = threading.Thread(target=probe)
+            prober.start()
+            prober.join()
+
+        topic.add_subscriber("agent", callback=probe_lock)
+        topic.publish_message(make_publication())
+
+        self.assertEqual(lock_free, [True])
+
+
+class TestSubscriptionDispatcher(unittest.TestCase):
+    """Tests pour la distribution asynchrone des callbacks."""
+
+    def setUp(self):
+        self.dispatcher = SubscriptionDispatcher(max_workers=2, slow_callback_threshold=0.05)
+
+    def tearDown(self):
+        self.dispatcher.shutdown(wait=True)
+
+    def test_slow_subscriber_does_not_block_publisher_or_others(self):
+        release = threading.Event()
+        fast = []
+        topic = Topic("events", dispatcher=self.dispatcher)
+        slow_id = topic.add_subscriber("slow", callback=lambda message: release.wait(5))
+        topic.add_subscriber("fast", callback=fast.append)
+
+        start = time.monotonic()
+        for _ in range(10):
+            topic.publish_message(make_publication())
+        publish_time = time.monotonic() - start
+
+        self.assertLess(publish_time, 0.5)
+        deadline = time.monotonic() + 2
+        while len(fast) < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(fast), 10)
+        self.assertGreater(topic.get_subscription_stats(slow_id)["pending"], 0)
+
+        release.set()
+        self.assertTrue(self.dispatcher.flush(2))
+        self.assertEqual(topic.get_subscription_stats(slow_id)["delivered"], 10)
+
+    def test_per_subscriber_order_is_preserved(self):
+        received = []
+        topic = Topic("events", dispatcher=self.dispatcher)
+        topic.add_subscriber("agent", callback=lambda message: received.append(message.content["n"]))
+
+        for n in range(100):
+            topic.publish_message(make_publication(content={"n": n}))
+
+        self.assertTrue(self.dispatcher.flush(2))
+        self.assertEqual(received, list(range(100)))
+
+    def test_overflow_drops_and_counts(self):
+        release = threading.Event()
+        received = []
+
+        def blocking_callback(message):
+            release.wait(5)
+            received.append(message.content["n"])
+
+        topic = Topic("events", dispatcher=self.dispatcher, max_pending=2)
+        subscription_id = topic.add_subscriber("slow", callback=blocking_callback)
+
+        topic.publish_message(make_publication(content={"n": 0}))
+        deadline = time.monotonic() + 2
+        while topic.get_subscription_stats(subscription_id)["pending"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for n in range(1, 6):
+            topic.publish_message(make_publication(content={"n": n}))
+
+        release.set()
+        self.assertTrue(self.dispatcher.flush(2))
+        stats = topic.get_subscription_stats(subscription_id)
+        self.assertEqual(received, [0, 4, 5])
+        self.assertEqual(stats["dropped"], 3)
+        self.assertEqual(stats["max_pending"], 2)
+        self.assertEqual(topic.get_topic_info()["dropped_count"], 3)
+
+    def test_flush_returns_after_shutdown_cancels_queued_drains(self):
+        dispatcher = SubscriptionDispatcher(max_workers=1)
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_callback(message):
+            started.set()
+            release.wait(5)
+
+        topic = Topic("events", dispatcher=dispatcher)
+        blocking_id = topic.add_subscriber("blocking", callback=blocking_callback)
+        queued_ids = [topic.add_subscriber(f"queued-{n}", callback=lambda message: None) for n in range(3)]
+        topic.publish_message(make_publication())
+        self.assertTrue(started.wait(2))
+
+        dispatcher.shutdown(wait=False)
+        release.set()
+
+        self.assertTrue(dispatcher.flush(2))
+        self.assertEqual(topic.get_subscription_stats(blocking_id)["delivered"], 1)
+        for subscription_id in queued_ids:
+            stats = topic.get_subscription_stats(subscription_id)
+            self.assertEqual((stats["delivered"], stats["dropped"], stats["pending"]), (0, 1, 0))
+
+    def test_failures_and_slow_callbacks_are_counted(self):
+        topic = Topic("events", dispatcher=self.dispatcher)
+        failing_id = topic.add_subscriber("failing", callback=lambda message: 1 / 0)
+        slow_id = topic.add_subscriber("slow", callback=lambda message: time.sleep(0.06))
+
+        topic.publish_message(make_publication())
+
+        self.assertTrue(self.dispatcher.flush(2))
+        self.assertEqual(topic.get_subscription_stats(failing_id)["failed"], 1)
+        self.assertEqual(topic.get_subscription_stats(slow_id)["slow_callbacks"], 1)
+
+    def test_rejects_unknown_overflow_policy(self):
+        with self.assertRaises(ValueError):
+            Topic("events", overflow_policy="block")
+
+
+class TestPublishSubscribeProtocol(unittest.TestCase):
+    """Tests pour le protocole de publication-abonnement."""
+
+    def setUp(self):
+        self.middleware = MagicMock()
+        self.protocol = PublishSubscribeProtocol(self.middleware, {"max_history": 5, "max_pending": 10})
+
+    def tearDown(self):
+        self.protocol.shutdown()
+
+    def test_publish_dispatches_to_matching_subscribers(self):
+        received = []
+        self.protocol.subscribe("events", "tactical-1", callback=received.append,
+                                filter_criteria={"priority": ["high", "critical"]})
+        self.protocol.subscribe("events", "tactical-2", callback=received.append,
+                                filter_criteria={"priority": "low"})
+
+        recipients = self.protocol.publish("events", "strategic-1", AgentLevel.STRATEGIC, {"event": "alert"},
+                                           priority=MessagePriority.HIGH)
+
+        self.assertEqual(recipients, ["tactical-1"])
+        self.assertTrue(self.protocol.flush(2))
+        self.assertEqual(len(received), 1)
+        self.assertEqual(self.protocol.get_topic("events").max_history, 5)
+        self.assertEqual(self.protocol.get_topic_info("events")["delivered_count"], 1)
+
+    def test_shutdown_is_prompt(self):
+        protocol = PublishSubscribeProtocol(self.middleware)
+        start = time.monotonic()
+        protocol.shutdown()
+
+        self.assertLess(time.monotonic() - start, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
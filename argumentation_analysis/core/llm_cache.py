@@ -0,0 +1,328 @@
+# core/llm_cache.py
+"""
+Cache local des réponses de complétion de chat des services LLM.
+
+Les requêtes sont identifiées par l'empreinte SHA-256 d'une forme normalisée de
+leur corps JSON (modèle, messages, outils, température, ...) : les clés sont
+triées, les champs sans effet sur la réponse sont ignorés et les espaces des
+contenus textuels sont normalisés, de sorte que des prompts quasi identiques
+partagent la même entrée.
+
+Les réponses sont conservées dans une base SQLite (`llm_cache.sqlite3`) avec une
+durée de validité optionnelle et un budget d'octets (éviction LRU). Les dates de
+dernier accès sont écrites par lots, au plus tous les `ACCESS_FLUSH_BATCH_SIZE`
+accès et avant toute éviction. Le mode `replay` sert exclusivement depuis le
+cache, sans aucun appel réseau, pour rejouer de façon déterministe des passes de
+corpus ou des benchmarks.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger("Orchestration.LLM.Cache")
+
+INDEX_FILENAME = "llm_cache.sqlite3"
+EVICTION_BATCH_SIZE = 64
+ACCESS_FLUSH_BATCH_SIZE = 256
+
+# Modes de fonctionnement du cache
+CACHE_MODES = ("read_write", "replay", "record")
+
+# Champs du corps de requête sans effet sur le contenu de la réponse
+IGNORED_REQUEST_FIELDS = frozenset({"user", "metadata", "store", "stream_options"})
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class CachedResponse(NamedTuple):
+    """Réponse HTTP conservée dans le cache."""
+    status_code: int
+    headers: List[List[str]]
+    body: bytes
+
+
+def _normalize_text(text: str) -> str:
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def _normalize_message(message: Any) -> Any:
+    if not isinstance(message, dict):
+        return message
+    normalized = dict(message)
+    content = normalized.get("content")
+    if isinstance(content, str):
+        normalized["content"] = _normalize_text(content)
+    elif isinstance(content, list):
+        normalized["content"] = [
+            dict(part, text=_normalize_text(part["text"]))
+            if isinstance(part, dict) and isinstance(part.get("text"), str) else part
+            for part in content
+        ]
+    return normalized
+
+
+def normalize_request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalise le corps d'une requête de complétion de chat.
+
+    Args:
+        payload (Dict[str, Any]): Corps JSON de la requête.
+
+    Returns:
+        Dict[str, Any]: Corps normalisé servant au calcul de la clé.
+    """
+    normalized = {key: value for key, value in payload.items() if key not in IGNORED_REQUEST_FIELDS}
+    if isinstance(normalized.get("messages"), list):
+        normalized["messages"] = [_normalize_message(message) for message in normalized["messages"]]
+    for key in ("temperature", "top_p", "frequency_penalty", "presence_penalty"):
+        if isinstance(normalized.get(key), (int, float)):
+            normalized[key] = round(float(normalized[key]), 6)
+    return normalized
+
+
+def make_request_key(url: str, body: bytes) -> Optional[str]:
+    """
+    Calcule la clé de cache d'une requête de complétion de chat.
+
+    Args:
+        url (str): Hôte et chemin de la requête.
+        body (bytes): Corps JSON de la requête.
+
+    Returns:
+        Optional[str]: La clé, ou None si la requête n'est pas cachable
+        (corps non JSON ou réponse en streaming).
+    """
+    try:
+        payload = json.loads(body)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("stream"):
+        return None
+
+    canonical = json.dumps(
+        {"url": url, "request": normalize_request(payload)},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Cache disque des réponses LLM, avec expiration et budget d'octets.
+
+    Les totaux sont tenus en mémoire par instance ; l'index SQLite peut être partagé
+    entre processus.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        mode: str = "read_write",
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None
+    ):
+        """
+        Args:
+            cache_dir (Path): Répertoire du cache.
+            mode (str): `read_write` (sert depuis le cache et enregistre les échecs de cache),
+                `replay` (sert uniquement depuis le cache) ou `record` (interroge toujours le
+                service et met à jour le cache).
+            ttl_seconds (Optional[float]): Durée de validité d'une réponse ; None pour illimitée.
+            max_bytes (Optional[int]): Budget en octets ; au-delà, les réponses les moins
+                récemment utilisées sont évincées.
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Mode de cache LLM inconnu: {mode}")
+
+        self.cache_dir = Path(cache_dir)
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._pending_access: Dict[str, float] = {}
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index = sqlite3.connect(
+            str(self.cache_dir / INDEX_FILENAME), check_same_thread=False, isolation_level=None
+        )
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model TEXT, status INTEGER NOT NULL, headers TEXT NOT NULL,"
+            " body BLOB NOT NULL, size INTEGER NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+
+        row = self._index.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._entry_count, self._total_bytes = row
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "replay_misses": 0, "evictions": 0, "expired": 0}
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMResponseCache"]:
+        """
+        Crée le cache configuré par les variables d'environnement LLM_CACHE_*.
+
+        Returns:
+            Optional[LLMResponseCache]: Le cache, ou None si LLM_CACHE_MODE est absent ou `off`.
+        """
+        mode = (os.getenv("LLM_CACHE_MODE") or "off").strip().lower()
+        if mode in ("", "off", "false", "0"):
+            return None
+        ttl = os.getenv("LLM_CACHE_TTL")
+        max_bytes = os.getenv("LLM_CACHE_MAX_BYTES")
+        return cls(
+            Path(os.getenv("LLM_CACHE_DIR") or Path.home() / ".cache" / "argumentation_analysis" / "llm"),
+            mode=mode,
+            ttl_seconds=float(ttl) if ttl else None,
+            max_bytes=int(max_bytes) if max_bytes else None
+        )
+
+    @property
+    def replay(self) -> bool:
+        """Indique si le cache sert exclusivement les réponses enregistrées."""
+        return self.mode == "replay"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Récupère une réponse enregistrée.
+
+        Args:
+            key (str): Clé de la requête.
+
+        Returns:
+            Optional[CachedResponse]: La réponse, ou None si absente ou expirée.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._index.execute(
+                "SELECT status, headers, body, size, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[4] > self.ttl_seconds:
+                self._delete(key, row[3])
+                self.stats["expired"] += 1
+                row = None
+
+            if row is None:
+                self.stats["replay_misses" if self.replay else "misses"] += 1
+                return None
+
+            self._touch(key, now)
+            self.stats["hits"] += 1
+            return CachedResponse(row[0], json.loads(row[1]), bytes(row[2]))
+
+    def put(self, key: str, status_code: int, headers: List[List[str]], body: bytes,
+            model: Optional[str] = None) -> None:
+        """
+        Enregistre une réponse.
+
+        Args:
+            key (str): Clé de la requête.
+            status_code (int): Code HTTP de la réponse.
+            headers (List[List[str]]): En-têtes de la réponse (paires nom/valeur).
+            body (bytes): Corps décodé de la réponse.
+            model (Optional[str]): Modèle interrogé (informatif).
+        """
+        now = time.time()
+        size = len(body)
+        with self._lock:
+            previous = self._index.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._index.execute(
+                "INSERT OR REPLACE INTO responses (key, model, status, headers, body, size, created_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, model, status_code, json.dumps(headers), sqlite3.Binary(body), size, now, now)
+            )
+            if previous is None:
+                self._entry_count += 1
+                self._total_bytes += size
+            else:
+                self._total_bytes += size - previous[0]
+            self.stats["stores"] += 1
+
+            if self.max_bytes is not None and self._total_bytes > self.max_bytes:
+                self._flush_access_times()
+                self._evict_lru()
+
+    def evict_expired(self) -> int:
+        """
+        Supprime les réponses expirées.
+
+        Returns:
+            int: Le nombre de réponses supprimées.
+        """
+        if self.ttl_seconds is None:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            rows = self._index.execute("SELECT key, size FROM responses WHERE created_at < ?", (cutoff,)).fetchall()
+            for key, size in rows:
+                self._delete(key, size)
+            self.stats["expired"] += len(rows)
+            return len(rows)
+
+    def clear(self) -> None:
+        """Supprime toutes les réponses enregistrées."""
+        with self._lock:
+            self._index.execute("DELETE FROM responses")
+            self._pending_access.clear()
+            self._entry_count = 0
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            Dict[str, Any]: Mode, taille, nombre d'entrées et compteurs d'accès.
+        """
+        with self._lock:
+            return dict(self.stats, mode=self.mode, entries=self._entry_count, total_bytes=self._total_bytes)
+
+    def close(self) -> None:
+        """Écrit les accès en attente et ferme l'index."""
+        with self._lock:
+            self._flush_access_times()
+            self._index.close()
+
+    def _touch(self, key: str, accessed_at: float) -> None:
+        """Enregistre un accès ; l'index est mis à jour par lots."""
+        self._pending_access[key] = accessed_at
+        if len(self._pending_access) >= ACCESS_FLUSH_BATCH_SIZE:
+            self._flush_access_times()
+
+    def _flush_access_times(self) -> None:
+        """Écrit les dates de dernier accès en attente dans l'index, en une transaction."""
+        if not self._pending_access:
+            return
+        updates = [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+        self._pending_access.clear()
+        self._index.execute("BEGIN")
+        try:
+            self._index.executemany("UPDATE responses SET last_access = ? WHERE key = ?", updates)
+            self._index.execute("COMMIT")
+        except Exception:
+            self._index.execute("ROLLBACK")
+            raise
+
+    def _delete(self, key: str, size: int) -> None:
+        self._pending_access.pop(key, None)
+        self._index.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._entry_count -= 1
+        self._total_bytes -= size
+
+    def _evict_lru(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entry_count > 0:
+            rows = self._index.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT ?", (EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            for key, size in rows:
+                self._delete(key, size)
+                self.stats["evictions"] += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
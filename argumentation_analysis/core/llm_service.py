@@ -1,27 +1,375 @@
 # core/llm_service.py
+import asyncio
+import hashlib
+import importlib.util
 import logging
 import os
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion, AzureChatCompletion
-from typing import Union # Pour type hint
+from semantic_kernel.connectors.ai.open_ai.const import DEFAULT_AZURE_API_VERSION
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union # Pour type hint
 import httpx # Ajout pour le client HTTP personnalisé
-from openai import AsyncOpenAI # Ajout pour instancier le client OpenAI
+from openai import AsyncAzureOpenAI, AsyncOpenAI # Ajout pour instancier le client OpenAI
 import json # Ajout de l'import manquant
 
+from argumentation_analysis.core.llm_cache import LLMResponseCache, make_request_key
+
 # Logger pour ce module
 logger = logging.getLogger("Orchestration.LLM")
 if not logger.handlers and not logger.propagate:
     handler = logging.StreamHandler(); formatter = logging.Formatter('%(asctime)s [%(levelname)s] [%(name)s] %(message)s', datefmt='%H:%M:%S'); handler.setFormatter(formatter); logger.addHandler(handler); logger.setLevel(logging.INFO)
 logger.info("<<<<< MODULE llm_service.py LOADED >>>>>")
 
+# Endpoint utilisé par le client OpenAI lorsqu'aucune URL de base n'est configurée
+DEFAULT_OPENAI_ENDPOINT = "https://api.openai.com/v1"
+
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def _ensure_environment_loaded(reload: bool = False) -> None:
+    """
+    Charge le fichier .env du répertoire courant une seule fois par processus.
+
+    Args:
+        reload (bool): Forcer le rechargement (les valeurs du .env écrasent l'environnement).
+    """
+    global _env_loaded
+    with _env_lock:
+        if _env_loaded and not reload:
+            return
+        dotenv_path = os.path.join(os.getcwd(), '.env')
+        success = load_dotenv(dotenv_path=dotenv_path, override=True)
+        logger.info(f"load_dotenv depuis '{dotenv_path}': {success}")
+        _env_loaded = True
+
+
+def _env_flag(name: str, default: Optional[bool] = None) -> Optional[bool]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _credentials_fingerprint(*credentials: Optional[str]) -> str:
+    """Empreinte courte des identifiants d'un service, pour ne jamais conserver la clé en clair."""
+    digest = hashlib.sha256("\x00".join(value or "" for value in credentials).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """
+    Transport HTTP partagé par endpoint, avec un pool de connexions par boucle d'événements.
+
+    Les connexions httpx sont liées à la boucle qui les a ouvertes : le client partagé
+    peut ainsi être utilisé depuis plusieurs boucles (asyncio.run successifs, threads)
+    tout en réutilisant ses connexions au sein d'une même boucle.
+    """
+
+    def __init__(self, http2: bool, limits: httpx.Limits):
+        self._http2 = http2
+        self._limits = limits
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(http2=self._http2, limits=self._limits)
+                self._transports[loop] = transport
+            return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._get_transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.pop(loop, None)
+            # Les pools des autres boucles ne peuvent pas être fermés depuis celle-ci : ils sont abandonnés
+            self._transports.clear()
+        if transport is not None:
+            await transport.aclose()
+
+
+class LLMServiceRegistry:
+    """
+    Registre des services LLM du processus.
+
+    Les services sont mis en cache par (service_id, modèle, endpoint) avec l'empreinte
+    de leurs identifiants : un changement de clé d'API recrée le service. Tous les
+    services d'un même endpoint (OpenAI ou Azure OpenAI) partagent un client httpx unique, dont le pool de
+    connexions (HTTP/2 si le paquet `h2` est disponible) est réglé par les limites
+    du registre. Les compteurs de requêtes et de latence de chaque endpoint sont
+    tenus par son LoggingHttpTransport. Si un cache de réponses est configuré, les
+    complétions de chat sont servies par un CachingHttpTransport placé devant.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: Optional[bool] = None,
+        timeout: float = 120.0,
+        log_bodies: bool = False,
+        response_cache: Optional[LLMResponseCache] = None
+    ):
+        """
+        Args:
+            max_connections (int): Nombre maximum de connexions par endpoint et par boucle.
+            max_keepalive_connections (int): Nombre maximum de connexions inactives conservées.
+            keepalive_expiry (float): Durée de conservation d'une connexion inactive, en secondes.
+            http2 (Optional[bool]): Activer HTTP/2 (None : activé si `h2` est installé).
+            timeout (float): Timeout des requêtes HTTP, en secondes.
+            log_bodies (bool): Journaliser le corps des requêtes et réponses (débogage uniquement).
+            response_cache (Optional[LLMResponseCache]): Cache local des complétions de chat (optionnel).
+        """
+        h2_available = importlib.util.find_spec("h2") is not None
+        if http2 and not h2_available:
+            logger.warning("HTTP/2 demandé pour les services LLM mais le paquet 'h2' est absent : HTTP/1.1 utilisé.")
+        self.http2 = h2_available if http2 is None else (http2 and h2_available)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = timeout
+        self.log_bodies = log_bodies
+        self.response_cache = response_cache
+
+        self._lock = threading.RLock()
+        self._services: Dict[Hashable, Tuple[str, Any]] = {}
+        self._http_clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, "LoggingHttpTransport"] = {}
+        self._openai_clients: Dict[str, AsyncOpenAI] = {}
+        self._azure_clients: Dict[Tuple[str, str], AsyncAzureOpenAI] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMServiceRegistry":
+        """
+        Crée un registre configuré par les variables d'environnement LLM_HTTP_* et LLM_CACHE_*.
+
+        Returns:
+            LLMServiceRegistry: Le registre configuré.
+        """
+        return cls(
+            max_connections=int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=_env_flag("LLM_HTTP2"),
+            timeout=float(os.getenv("LLM_HTTP_TIMEOUT", "120")),
+            log_bodies=bool(_env_flag("LLM_HTTP_LOG_BODIES", False)),
+            response_cache=LLMResponseCache.from_env()
+        )
+
+    def get_or_create(
+        self,
+        key: Tuple[str, str, str],
+        factory: Callable[[], Any],
+        credentials: Tuple[Optional[str], ...] = ()
+    ) -> Any:
+        """
+        Retourne le service enregistré pour une clé, en le créant au premier appel.
+
+        Le service enregistré est remplacé si les identifiants ont changé depuis sa création.
+
+        Args:
+            key (Tuple[str, str, str]): Clé (service_id, modèle, endpoint).
+            factory (Callable[[], Any]): Fonction de création du service.
+            credentials (Tuple[Optional[str], ...]): Identifiants du service (clé d'API,
+                organisation, ...), dont seule l'empreinte est conservée.
+
+        Returns:
+            Any: Le service enregistré.
+        """
+        fingerprint = _credentials_fingerprint(*credentials)
+        with self._lock:
+            entry = self._services.get(key)
+            if entry is not None and entry[0] == fingerprint:
+                return entry[1]
+            service = factory()
+            self._services[key] = (fingerprint, service)
+            if entry is None:
+                logger.info(f"Service LLM enregistré pour {key}.")
+            else:
+                logger.info(f"Identifiants modifiés : service LLM recréé pour {key}.")
+            return service
+
+    def get_http_client(self, endpoint: str) -> httpx.AsyncClient:
+        """
+        Retourne le client httpx partagé d'un endpoint.
+
+        Args:
+            endpoint (str): URL de base de l'endpoint.
+
+        Returns:
+            httpx.AsyncClient: Le client partagé.
+        """
+        with self._lock:
+            client = self._http_clients.get(endpoint)
+            if client is None:
+                transport = LoggingHttpTransport(
+                    logger=logger,
+                    wrapped_transport=_LoopLocalTransport(self.http2, self.limits),
+                    log_bodies=self.log_bodies
+                )
+                # Le cache est placé devant le transport instrumenté : ses compteurs ne mesurent que le réseau
+                client_transport = (
+                    CachingHttpTransport(self.response_cache, transport)
+                    if self.response_cache is not None else transport
+                )
+                client = httpx.AsyncClient(transport=client_transport, timeout=self.timeout)
+                self._transports[endpoint] = transport
+                self._http_clients[endpoint] = client
+            return client
+
+    def get_openai_client(self, endpoint: str, api_key: str, organization: Optional[str]) -> AsyncOpenAI:
+        """
+        Retourne le client AsyncOpenAI d'un endpoint, adossé au client httpx partagé.
+
+        Args:
+            endpoint (str): URL de base de l'endpoint.
+            api_key (str): Clé d'API.
+            organization (Optional[str]): Organisation OpenAI.
+
+        Returns:
+            AsyncOpenAI: Le client OpenAI.
+        """
+        with self._lock:
+            client = self._openai_clients.get(endpoint)
+            if client is None or client.api_key != api_key or client.organization != organization:
+                client = AsyncOpenAI(
+                    api_key=api_key,
+                    organization=organization,
+                    base_url=endpoint,
+                    http_client=self.get_http_client(endpoint)
+                )
+                self._openai_clients[endpoint] = client
+            return client
+
+    def get_azure_openai_client(self, endpoint: str, api_key: str, api_version: str) -> AsyncAzureOpenAI:
+        """
+        Retourne le client AsyncAzureOpenAI d'un endpoint, adossé au client httpx partagé.
+
+        Args:
+            endpoint (str): URL de la ressource Azure OpenAI.
+            api_key (str): Clé d'API.
+            api_version (str): Version de l'API Azure OpenAI.
+
+        Returns:
+            AsyncAzureOpenAI: Le client Azure OpenAI.
+        """
+        with self._lock:
+            client = self._azure_clients.get((endpoint, api_version))
+            if client is None or client.api_key != api_key:
+                client = AsyncAzureOpenAI(
+                    api_key=api_key,
+                    azure_endpoint=endpoint,
+                    api_version=api_version,
+                    http_client=self.get_http_client(endpoint)
+                )
+                self._azure_clients[(endpoint, api_version)] = client
+            return client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs de requêtes et de latence par endpoint.
+
+        Returns:
+            Dict[str, Any]: Nombre de services et statistiques par endpoint.
+        """
+        with self._lock:
+            transports = dict(self._transports)
+            service_count = len(self._services)
+        return {
+            "services": service_count,
+            "http2": self.http2,
+            "endpoints": {endpoint: transport.get_stats() for endpoint, transport in transports.items()},
+            "cache": self.response_cache.get_stats() if self.response_cache is not None else None
+        }
+
+    async def warm_up(self, timeout: float = 10.0) -> Dict[str, bool]:
+        """
+        Ouvre les connexions des endpoints enregistrés par une requête légère (liste des modèles).
+
+        Args:
+            timeout (float): Délai maximum par endpoint, en secondes.
+
+        Returns:
+            Dict[str, bool]: Succès du préchauffage par endpoint.
+        """
+        with self._lock:
+            clients = dict(self._openai_clients)
+            clients.update((endpoint, client) for (endpoint, _), client in self._azure_clients.items())
+
+        async def warm(endpoint: str, client: AsyncOpenAI) -> bool:
+            try:
+                await asyncio.wait_for(client.models.list(), timeout=timeout)
+                return True
+            except Exception as e:
+                logger.warning(f"Préchauffage de l'endpoint LLM '{endpoint}' échoué: {e}")
+                return False
+
+        results = await asyncio.gather(*(warm(endpoint, client) for endpoint, client in clients.items()))
+        return dict(zip(clients, results))
+
+    async def aclose(self) -> None:
+        """Ferme les clients HTTP partagés et vide le registre."""
+        with self._lock:
+            clients = list(self._http_clients.values())
+            self.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Erreur lors de la fermeture d'un client HTTP LLM: {e}")
+
+    def clear(self) -> None:
+        """Oublie les services et clients enregistrés sans fermer les connexions."""
+        with self._lock:
+            self._services.clear()
+            self._http_clients.clear()
+            self._transports.clear()
+            self._openai_clients.clear()
+            self._azure_clients.clear()
+
+
+_registry: Optional[LLMServiceRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_service_registry() -> LLMServiceRegistry:
+    """
+    Retourne le registre des services LLM du processus (créé au premier appel).
+
+    Returns:
+        LLMServiceRegistry: Le registre partagé.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _ensure_environment_loaded()
+            _registry = LLMServiceRegistry.from_env()
+        return _registry
+
 
 def create_llm_service(service_id: str = "global_llm_service", force_mock: bool = False) -> Union[OpenAIChatCompletion, AzureChatCompletion]:
     """
-    Charge la configuration depuis .env et crée une instance du service LLM
-    (OpenAI ou Azure OpenAI).
+    Retourne le service LLM (OpenAI ou Azure OpenAI) configuré par l'environnement.
+
+    Le .env n'est chargé qu'une fois par processus et les services sont partagés via
+    le registre du processus : les appels répétés avec la même configuration
+    réutilisent le même service et le même pool de connexions.
 
     Args:
         service_id (str): ID à assigner au service dans Semantic Kernel.
+        force_mock (bool): Retourner un service factice (jamais mis en cache).
 
     Returns:
         Union[OpenAIChatCompletion, AzureChatCompletion]: L'instance du service LLM configurée.
@@ -30,25 +378,10 @@ def create_llm_service(service_id: str = "global_llm_service", force_mock: bool
         ValueError: Si la configuration .env est incomplète ou invalide.
         RuntimeError: Si la création de l'instance échoue pour une autre raison.
     """
-    logger.critical("<<<<< get_llm_service FUNCTION CALLED >>>>>")
-    logger.info(f"--- Configuration du Service LLM ({service_id}) ---")
-    cwd = os.getcwd()
-    logger.info(f"Current working directory for dotenv: {cwd}")
-    dotenv_path = os.path.join(cwd, '.env')
-    logger.info(f"Attempting to load .env from explicit path: {dotenv_path}")
-    success = load_dotenv(dotenv_path=dotenv_path, override=True, verbose=True) # Ajout de verbose=True
-    logger.info(f"load_dotenv success with explicit path '{dotenv_path}': {success}")
+    logger.debug(f"--- Configuration du Service LLM ({service_id}) ---")
+    _ensure_environment_loaded()
 
     api_key = os.getenv("OPENAI_API_KEY")
-    logger.info(f"Value of api_key directly from os.getenv: '{api_key}'")
-    # AJOUT POUR DEBUGGING
-    if api_key and len(api_key) > 10: # Vérifier que la clé existe et est assez longue
-        logger.info(f"OpenAI API Key (first 5, last 5): {api_key[:5]}...{api_key[-5:]}")
-    elif api_key:
-        logger.info(f"OpenAI API Key loaded (short key): {api_key}")
-    else:
-        logger.warning("OpenAI API Key is None or empty after os.getenv.")
-    # FIN AJOUT
     model_id = os.getenv("OPENAI_CHAT_MODEL_ID")
     endpoint = os.getenv("OPENAI_ENDPOINT")
     org_id = os.getenv("OPENAI_ORG_ID")
@@ -95,55 +428,56 @@ def create_llm_service(service_id: str = "global_llm_service", force_mock: bool
 
             return MockLLMService(service_id=service_id)
 
+        registry = get_llm_service_registry()
+
         if use_azure_openai:
-            logger.info("Configuration Service: AzureChatCompletion...")
             if not all([api_key, model_id, endpoint]):
                 raise ValueError("Configuration Azure OpenAI incomplète dans .env (OPENAI_API_KEY, OPENAI_CHAT_MODEL_ID, OPENAI_ENDPOINT requis).")
-            
-            # Pour Azure, nous pourrions aussi vouloir injecter un client httpx personnalisé si nécessaire,
-            # mais la complexité est plus grande à cause de la gestion des credentials Azure.
-            # Pour l'instant, on se concentre sur OpenAI standard.
-            azure_async_client = httpx.AsyncClient() # Client standard pour l'instant
-            # TODO: Rechercher comment injecter un transport personnalisé pour AzureOpenAI si besoin de logs bruts.
-            # Pour l'instant, on utilise le client par défaut pour Azure.
-            # Si on voulait un client personnalisé pour Azure, il faudrait probablement passer un `AzureOpenAI` client
-            # à `AzureChatCompletion` de la même manière qu'on passe `AsyncOpenAI` à `OpenAIChatCompletion`.
-
-            llm_instance = AzureChatCompletion(
-                service_id=service_id,
-                deployment_name=model_id,
-                endpoint=endpoint,
-                api_key=api_key
-                # azure_ad_token_provider=... , # si auth Azure AD
-                # http_client=azure_async_client # Exemple si supporté
+
+            api_version = os.getenv("AZURE_OPENAI_API_VERSION") or DEFAULT_AZURE_API_VERSION
+
+            def create_azure_service():
+                logger.info("Configuration Service: AzureChatCompletion...")
+                # Client AsyncAzureOpenAI adossé au pool de connexions partagé de l'endpoint
+                azure_async_client = registry.get_azure_openai_client(endpoint, api_key, api_version)
+                service = AzureChatCompletion(
+                    service_id=service_id,
+                    deployment_name=model_id,
+                    endpoint=endpoint,
+                    api_key=api_key,
+                    api_version=api_version,
+                    async_client=azure_async_client
+                    # azure_ad_token_provider=... , # si auth Azure AD
+                )
+                logger.info(f"Service LLM Azure ({model_id}) créé avec ID '{service_id}' et HTTP client partagé.")
+                return service
+
+            llm_instance = registry.get_or_create(
+                (service_id, model_id, endpoint), create_azure_service, credentials=(api_key, api_version)
             )
-            logger.info(f"Service LLM Azure ({model_id}) créé avec ID '{service_id}'.")
         else:
-            logger.info("Configuration Service: OpenAIChatCompletion...")
             if not all([api_key, model_id]):
                 raise ValueError("Configuration OpenAI standard incomplète dans .env (OPENAI_API_KEY, OPENAI_CHAT_MODEL_ID requis).")
 
-            # Création du transport et du client httpx personnalisés
-            logging_http_transport = LoggingHttpTransport(logger=logger)
-            custom_httpx_client = httpx.AsyncClient(transport=logging_http_transport)
-
-            # Création du client AsyncOpenAI avec le client httpx personnalisé
-            # Création du client AsyncOpenAI avec le client httpx personnalisé
+            base_url = os.getenv("OPENAI_BASE_URL") or DEFAULT_OPENAI_ENDPOINT
             org_to_use = org_id if (org_id and "your_openai_org_id_here" not in org_id) else None
-            
-            openai_custom_async_client = AsyncOpenAI(
-                api_key=api_key,
-                organization=org_to_use,
-                http_client=custom_httpx_client
-            )
-            
-            llm_instance = OpenAIChatCompletion(
-                service_id=service_id,
-                ai_model_id=model_id,
-                async_client=openai_custom_async_client # Utilisation du client OpenAI personnalisé
-                # api_key et org_id ne sont plus passés directement ici, car gérés par openai_custom_async_client
+
+            def create_openai_service():
+                logger.info("Configuration Service: OpenAIChatCompletion...")
+                # Client AsyncOpenAI adossé au pool de connexions partagé de l'endpoint
+                openai_custom_async_client = registry.get_openai_client(base_url, api_key, org_to_use)
+                service = OpenAIChatCompletion(
+                    service_id=service_id,
+                    ai_model_id=model_id,
+                    async_client=openai_custom_async_client # Utilisation du client OpenAI partagé
+                    # api_key et org_id ne sont plus passés directement ici, car gérés par openai_custom_async_client
+                )
+                logger.info(f"Service LLM OpenAI ({model_id}) créé avec ID '{service_id}' et HTTP client partagé.")
+                return service
+
+            llm_instance = registry.get_or_create(
+                (service_id, model_id, base_url), create_openai_service, credentials=(api_key, org_to_use)
             )
-            logger.info(f"Service LLM OpenAI ({model_id}) créé avec ID '{service_id}' et HTTP client personnalisé.")
 
     except ValueError as ve: # Attraper specific ValueError de la validation
         logger.critical(f"Erreur de configuration LLM: {ve}")
@@ -160,12 +494,73 @@ def create_llm_service(service_id: str = "global_llm_service", force_mock: bool
 
 # Classe pour le transport HTTP personnalisé avec logging
 class LoggingHttpTransport(httpx.AsyncBaseTransport):
-    def __init__(self, logger: logging.Logger, wrapped_transport: httpx.AsyncBaseTransport = None):
+    """
+    Transport HTTP instrumenté des services LLM.
+
+    Tient des compteurs de requêtes et de latence (jusqu'à la réception des en-têtes)
+    sans lire les corps. Le journal détaillé des corps JSON n'est produit que si
+    `log_bodies` est activé, car il impose de lire et recopier chaque réponse.
+    """
+
+    def __init__(self, logger: logging.Logger, wrapped_transport: httpx.AsyncBaseTransport = None, log_bodies: bool = False):
         self.logger = logger
+        self.log_bodies = log_bodies
         # Si aucun transport n'est fourni, utiliser un transport HTTP standard
         self._wrapped_transport = wrapped_transport if wrapped_transport else httpx.AsyncHTTPTransport()
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "by_status": {}
+        }
 
     async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.log_bodies:
+            await self._log_request(request)
+
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["in_flight"] += 1
+        start = time.perf_counter()
+        try:
+            response = await self._wrapped_transport.handle_async_request(request)
+        except Exception:
+            with self._stats_lock:
+                self.stats["errors"] += 1
+                self.stats["in_flight"] -= 1
+            raise
+        latency = time.perf_counter() - start
+
+        with self._stats_lock:
+            self.stats["in_flight"] -= 1
+            self.stats["total_latency"] += latency
+            self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+            by_status = self.stats["by_status"]
+            by_status[response.status_code] = by_status.get(response.status_code, 0) + 1
+        self.logger.debug(f"LLM HTTP {request.method} {request.url.path} -> {response.status_code} en {latency * 1000:.0f} ms")
+
+        if self.log_bodies:
+            await self._log_response(response)
+
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne une copie des compteurs du transport.
+
+        Returns:
+            Dict[str, Any]: Compteurs, avec la latence moyenne des requêtes abouties.
+        """
+        with self._stats_lock:
+            stats = dict(self.stats, by_status=dict(self.stats["by_status"]))
+        completed = sum(stats["by_status"].values())
+        stats["average_latency"] = stats["total_latency"] / completed if completed else 0.0
+        return stats
+
+    async def _log_request(self, request: httpx.Request) -> None:
         self.logger.info(f"--- RAW HTTP REQUEST (LLM Service) ---")
         self.logger.info(f"  Method: {request.method}")
         self.logger.info(f"  URL: {request.url}")
@@ -181,10 +576,6 @@ class LoggingHttpTransport(httpx.AsyncBaseTransport):
                 pretty_json_content = json.dumps(json_content, indent=2, ensure_ascii=False)
                 self.logger.info(f"  Body (JSON):\n{pretty_json_content}")
             except (json.JSONDecodeError, UnicodeDecodeError):
-                # Si ce n'est pas du JSON ou si l'encodage échoue, logger en brut (tronqué)
-                # Il faut être prudent avec le logging du contenu brut, surtout pour les grosses requêtes
-                # content_preview = content_bytes[:500].decode('utf-8', errors='replace') + ('...' if len(content_bytes) > 500 else '')
-                # self.logger.info(f"  Body (Raw Preview): {content_preview}")
                 self.logger.info(f"  Body: (Contenu binaire ou non-JSON, taille: {len(content_bytes)} bytes)")
             except Exception as e_req:
                  self.logger.error(f"  Erreur lors du logging du corps de la requête: {e_req}")
@@ -192,8 +583,7 @@ class LoggingHttpTransport(httpx.AsyncBaseTransport):
             self.logger.info("  Body: (Vide)")
         self.logger.info(f"--- END RAW HTTP REQUEST (LLM Service) ---")
 
-        response = await self._wrapped_transport.handle_async_request(request)
-
+    async def _log_response(self, response: httpx.Response) -> None:
         self.logger.info(f"--- RAW HTTP RESPONSE (LLM Service) ---")
         self.logger.info(f"  Status Code: {response.status_code}")
         # self.logger.info(f"  Headers: {response.headers}")
@@ -209,18 +599,84 @@ class LoggingHttpTransport(httpx.AsyncBaseTransport):
             pretty_json_response_content = json.dumps(json_response_content, indent=2, ensure_ascii=False)
             self.logger.info(f"  Body (JSON):\n{pretty_json_response_content}")
         except (json.JSONDecodeError, UnicodeDecodeError):
-            # response_content_preview = response_content_bytes[:1500].decode('utf-8', errors='replace') + ('...' if len(response_content_bytes) > 1500 else '')
-            # self.logger.info(f"  Body (Raw Preview): {response_content_preview}")
             self.logger.info(f"  Body: (Contenu binaire ou non-JSON, taille: {len(response_content_bytes)} bytes)")
         except Exception as e_resp:
             self.logger.error(f"  Erreur lors du logging du corps de la réponse: {e_resp}")
         self.logger.info(f"--- END RAW HTTP RESPONSE (LLM Service) ---")
-        
-        return response
+
+    async def aclose(self) -> None:
+        await self._wrapped_transport.aclose()
+
+class CachingHttpTransport(httpx.AsyncBaseTransport):
+    """
+    Transport servant les complétions de chat depuis un LLMResponseCache.
+
+    Seules les requêtes POST vers `/chat/completions` sans streaming sont concernées ;
+    les autres sont transmises telles quelles. En mode `replay`, une requête absente
+    du cache reçoit une réponse 404 locale (non réessayée par le client OpenAI) et
+    aucun appel réseau n'est effectué. Les lectures et écritures de l'index SQLite
+    sont exécutées dans un thread pour ne pas bloquer la boucle d'événements.
+    """
+
+    # En-têtes liés à l'encodage du corps transmis, invalides pour un corps déjà décodé
+    _TRANSFER_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding", "connection"})
+
+    def __init__(self, cache: LLMResponseCache, wrapped_transport: httpx.AsyncBaseTransport):
+        self.cache = cache
+        self._wrapped_transport = wrapped_transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = None
+        if request.method == "POST" and request.url.path.endswith("/chat/completions"):
+            body = await request.aread()
+            key = make_request_key(f"{request.url.host}{request.url.path}", body)
+
+        if key is None:
+            return await self._wrapped_transport.handle_async_request(request)
+
+        if self.cache.mode != "record":
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                return httpx.Response(
+                    cached.status_code,
+                    headers=cached.headers + [["x-llm-cache", "hit"]],
+                    content=cached.body,
+                    request=request
+                )
+            if self.cache.replay:
+                logger.warning(f"Requête LLM absente du cache de rejeu ({key[:12]}).")
+                return httpx.Response(
+                    404,
+                    headers={"x-llm-cache": "replay-miss"},
+                    json={"error": {"message": f"LLM replay cache miss for request {key}", "type": "replay_cache_miss"}},
+                    request=request
+                )
+
+        response = await self._wrapped_transport.handle_async_request(request)
+        if not 200 <= response.status_code < 300:
+            return response
+
+        content = await response.aread()
+        headers = [
+            [name, value] for name, value in response.headers.multi_items()
+            if name.lower() not in self._TRANSFER_HEADERS
+        ]
+        try:
+            model = json.loads(content).get("model")
+        except (ValueError, AttributeError):
+            model = None
+        await asyncio.to_thread(self.cache.put, key, response.status_code, headers, content, model=model)
+        return httpx.Response(
+            response.status_code,
+            headers=headers + [["x-llm-cache", "miss"]],
+            content=content,
+            request=request,
+            extensions=response.extensions
+        )
 
     async def aclose(self) -> None:
         await self._wrapped_transport.aclose()
 
 # Optionnel : Log de chargement
 module_logger = logging.getLogger(__name__)
-module_logger.debug("Module core.llm_service chargé.")
\ No newline at end of file
+module_logger.debug("Module core.llm_service chargé.")
@@ -1,6 +1,8 @@
 # core/shared_state.py
 import json
-from typing import Dict, List, Any, Optional
+import types
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Any, Optional
 import logging
 
 # Logger spécifique pour l'état
@@ -9,6 +11,63 @@ state_logger = logging.getLogger("RhetoricalAnalysisState")
 if not state_logger.handlers and not state_logger.propagate:
      handler = logging.StreamHandler(); formatter = logging.Formatter('%(asctime)s [%(levelname)s] [%(name)s] %(message)s', datefmt='%H:%M:%S'); handler.setFormatter(formatter); state_logger.addHandler(handler); state_logger.setLevel(logging.INFO)
 
+# Préfixe des attributs internes de suivi des modifications (exclus des snapshots)
+_TRACKING_PREFIX = "_snapshot_"
+
+
+class _RenderedSection:
+    """Fragments JSON des entrées d'une section, pour une indentation donnée."""
+    __slots__ = ("version", "replaced_version", "positions", "entries", "fragment")
+
+    def __init__(self, version: int, replaced_version: int):
+        self.version = version
+        self.replaced_version = replaced_version
+        self.positions: Dict[Hashable, int] = {}
+        self.entries: List[str] = []
+        self.fragment = ""
+
+
+class _SectionLog:
+    """Suivi des modifications et fragments JSON mis en cache d'une section de l'état."""
+    __slots__ = ("version", "replaced_version", "entry_versions", "rendered")
+
+    def __init__(self):
+        self.version = 0
+        # Version du dernier remplacement (ou modification non localisée) de la section
+        self.replaced_version = 0
+        # Versions des entrées modifiées depuis le dernier remplacement, ordonnées par version
+        self.entry_versions: "OrderedDict[Hashable, int]" = OrderedDict()
+        self.rendered: Dict[Optional[int], _RenderedSection] = {}
+
+    def changed_since(self, version: int) -> List[Hashable]:
+        """Retourne les clés des entrées modifiées après `version`, de la plus ancienne à la plus récente."""
+        keys = []
+        for key, entry_version in reversed(self.entry_versions.items()):
+            if entry_version <= version:
+                break
+            keys.append(key)
+        keys.reverse()
+        return keys
+
+
+def _dump_value(value: Any, indent: Optional[int], depth: int) -> str:
+    """Sérialise une valeur placée à la profondeur `depth` d'un document JSON indenté."""
+    fragment = json.dumps(value, indent=indent, ensure_ascii=False, default=str)
+    if indent is not None and depth:
+        fragment = fragment.replace("\n", "\n" + " " * (indent * depth))
+    return fragment
+
+
+def _join_container(entries: List[str], opening: str, closing: str, indent: Optional[int], depth: int) -> str:
+    """Assemble des fragments d'entrées comme le ferait json.dumps."""
+    if not entries:
+        return opening + closing
+    if indent is None:
+        return opening + ", ".join(entries) + closing
+    padding = "\n" + " " * (indent * (depth + 1))
+    return opening + padding + ("," + padding).join(entries) + "\n" + " " * (indent * depth) + closing
+
+
 class RhetoricalAnalysisState:
     """Représente l'état partagé d'une analyse rhétorique collaborative."""
 
@@ -24,8 +83,19 @@ class RhetoricalAnalysisState:
     final_conclusion: Optional[str]
     _next_agent_designated: Optional[str] # Nom de l'agent désigné pour le prochain tour
 
+    # Suivi des modifications : chaque modification incrémente la version de l'état et
+    # invalide les fragments JSON de la section (ou de la seule entrée) concernée.
+    # Les affectations d'attributs sont détectées automatiquement ; les modifications
+    # en place faites hors des méthodes de cette classe doivent appeler mark_dirty().
+    _snapshot_version: int
+    _snapshot_sections: Dict[str, _SectionLog]
+
     def __init__(self, initial_text: str):
         """Initialise un état vide avec le texte brut."""
+        if "_snapshot_sections" not in self.__dict__:
+            # Conservé lors d'un reset_state pour que les versions restent croissantes
+            self._snapshot_version = 0
+            self._snapshot_sections = {}
         self.raw_text = initial_text
         self.analysis_tasks = {}
         self.identified_arguments = {}
@@ -39,6 +109,47 @@ class RhetoricalAnalysisState:
         self._next_agent_designated = None
         state_logger.debug(f"Nouvelle instance RhetoricalAnalysisState créée (id: {id(self)}) avec texte (longueur: {len(initial_text)}).")
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if not name.startswith(_TRACKING_PREFIX) and not callable(value) and "_snapshot_sections" in self.__dict__:
+            self._mark_dirty(name)
+
+    def __delattr__(self, name: str) -> None:
+        tracked = not name.startswith(_TRACKING_PREFIX) and not callable(self.__dict__.get(name))
+        object.__delattr__(self, name)
+        if tracked:
+            self._mark_dirty(name)
+
+    def _mark_dirty(self, section: str, key: Optional[Hashable] = None) -> None:
+        """Enregistre la modification d'une section, ou d'une seule de ses entrées si `key` est fourni."""
+        self._snapshot_version += 1
+        log = self._snapshot_sections.get(section)
+        if log is None:
+            log = self._snapshot_sections[section] = _SectionLog()
+        log.version = self._snapshot_version
+        if key is None:
+            log.replaced_version = self._snapshot_version
+            log.entry_versions.clear()
+        else:
+            log.entry_versions[key] = self._snapshot_version
+            log.entry_versions.move_to_end(key)
+
+    def mark_dirty(self, section: str, key: Optional[Hashable] = None) -> None:
+        """
+        Signale une modification faite en place hors des méthodes de l'état.
+
+        Args:
+            section: Nom de l'attribut modifié (ex: "belief_sets")
+            key: Clé (dictionnaire) ou index (liste) de l'entrée modifiée ou ajoutée ;
+                None si toute la section a pu changer (notamment après une suppression)
+        """
+        self._mark_dirty(section, key)
+
+    @property
+    def version(self) -> int:
+        """Version courante de l'état, incrémentée à chaque modification."""
+        return self._snapshot_version
+
     def _generate_id(self, prefix: str, current_dict_or_list: Any) -> str:
         """Génère un ID simple basé sur la taille actuelle."""
         index = 0
@@ -58,6 +169,7 @@ class RhetoricalAnalysisState:
         """Ajoute une tâche d'analyse et retourne son ID."""
         task_id = self._generate_id("task", self.analysis_tasks)
         self.analysis_tasks[task_id] = description
+        self._mark_dirty("analysis_tasks", task_id)
         state_logger.info(f"Tâche ajoutée: {task_id} - '{description[:60]}...'")
         state_logger.debug(f"État tasks après ajout {task_id}: {self.analysis_tasks}")
         return task_id
@@ -66,6 +178,7 @@ class RhetoricalAnalysisState:
         """Ajoute un argument identifié et retourne son ID."""
         arg_id = self._generate_id("arg", self.identified_arguments)
         self.identified_arguments[arg_id] = description
+        self._mark_dirty("identified_arguments", arg_id)
         state_logger.info(f"Argument ajouté: {arg_id} - '{description[:60]}...'")
         state_logger.debug(f"État arguments après ajout {arg_id}: {self.identified_arguments}")
         return arg_id
@@ -81,6 +194,7 @@ class RhetoricalAnalysisState:
              entry["target_argument_id"] = target_arg_id
              log_target_info = f" (cible: {target_arg_id})"
         self.identified_fallacies[fallacy_id] = entry
+        self._mark_dirty("identified_fallacies", fallacy_id)
         state_logger.info(f"Sophisme ajouté: {fallacy_id} - Type: {fallacy_type}{log_target_info}")
         state_logger.debug(f"État fallacies après ajout {fallacy_id}: {self.identified_fallacies}")
         return fallacy_id
@@ -90,6 +204,7 @@ class RhetoricalAnalysisState:
         normalized_type = logic_type.strip().lower().replace(" ", "_")
         bs_id = self._generate_id(f"{normalized_type}_bs", self.belief_sets)
         self.belief_sets[bs_id] = {"logic_type": logic_type, "content": content}
+        self._mark_dirty("belief_sets", bs_id)
         state_logger.info(f"Belief Set ajouté: {bs_id} - Type: {logic_type}")
         state_logger.debug(f"État belief_sets après ajout {bs_id}: {self.belief_sets}")
         return bs_id
@@ -101,6 +216,7 @@ class RhetoricalAnalysisState:
              state_logger.warning(f"ID Belief Set '{belief_set_id}' pour query log '{log_id}' non trouvé dans les belief sets ({list(self.belief_sets.keys())}).")
          log_entry = {"log_id": log_id, "belief_set_id": belief_set_id, "query": query, "raw_result": raw_result}
          self.query_log.append(log_entry)
+         self._mark_dirty("query_log", len(self.query_log) - 1)
          state_logger.info(f"Requête loggée: {log_id} (sur BS: {belief_set_id}, Query: '{query[:60]}...')")
          state_logger.debug(f"État query_log après ajout {log_id} (taille: {len(self.query_log)}): {self.query_log}")
          return log_id
@@ -110,6 +226,7 @@ class RhetoricalAnalysisState:
         if task_id not in self.analysis_tasks:
             state_logger.warning(f"ID Tâche '{task_id}' pour réponse de '{author_agent}' non trouvé dans les tâches définies ({list(self.analysis_tasks.keys())}).")
         self.answers[task_id] = {"author_agent": author_agent, "answer_text": answer_text, "source_ids": source_ids}
+        self._mark_dirty("answers", task_id)
         state_logger.info(f"Réponse ajoutée pour tâche '{task_id}' par agent '{author_agent}'.")
         state_logger.debug(f"État answers après ajout réponse pour {task_id}: {self.answers}")
 
@@ -132,6 +249,7 @@ class RhetoricalAnalysisState:
         extract_id = self._generate_id("extract", self.extracts)
         extract = {"id": extract_id, "name": name, "content": content}
         self.extracts.append(extract)
+        self._mark_dirty("extracts", len(self.extracts) - 1)
         state_logger.info(f"Extrait ajouté: {extract_id} - '{name}'")
         state_logger.debug(f"État extracts après ajout {extract_id}: {self.extracts}")
         return extract_id
@@ -143,6 +261,7 @@ class RhetoricalAnalysisState:
         error_id = self._generate_id("error", self.errors)
         error = {"id": error_id, "agent_name": agent_name, "message": message, "timestamp": None}
         self.errors.append(error)
+        self._mark_dirty("errors", len(self.errors) - 1)
         state_logger.warning(f"Erreur enregistrée: {error_id} - Agent: {agent_name} - '{message}'")
         state_logger.debug(f"État errors après ajout {error_id}: {self.errors}")
         return error_id
@@ -194,16 +313,152 @@ class RhetoricalAnalysisState:
                  "error_count": len(getattr(self, 'errors', [])),
                  "tasks_answered": list(self.answers.keys()),
                  "conclusion_present": self.final_conclusion is not None,
-                 "next_agent_designated": self._next_agent_designated
+                 "next_agent_designated": self._next_agent_designated,
+                 "state_version": self._snapshot_version
              }
         else:
             return json.loads(self.to_json(indent=None))
 
+    def _state_items(self) -> Dict[str, Any]:
+        return {
+            k: v for k, v in self.__dict__.items()
+            if not callable(v) and not k.startswith("_logger") and not k.startswith(_TRACKING_PREFIX)
+        }
+
+    def get_state_view(self) -> types.MappingProxyType:
+        """
+        Retourne une vue en lecture seule des sections de l'état, sans copie ni sérialisation.
+
+        Les valeurs sont les objets de l'état eux-mêmes : elles ne doivent pas être modifiées.
+        """
+        return types.MappingProxyType(self._state_items())
+
+    def get_state_delta(self, since_version: int) -> Dict[str, Any]:
+        """
+        Retourne les modifications de l'état survenues après une version donnée.
+
+        Pour chaque section modifiée, le delta contient soit les entrées ajoutées ou
+        modifiées (`updated` pour un dictionnaire, `from_index`/`items` pour une liste),
+        soit la nouvelle valeur complète (`value`) si la section a été remplacée.
+        Les valeurs ne sont pas copiées.
+
+        Args:
+            since_version: Version déjà connue de l'appelant (0 pour tout l'état)
+
+        Returns:
+            Dictionnaire avec la version courante, la version de référence, les
+            modifications par section et les sections supprimées
+        """
+        changes: Dict[str, Any] = {}
+        removed_sections: List[str] = []
+        for name, log in self._snapshot_sections.items():
+            if log.version <= since_version:
+                continue
+            if name not in self.__dict__:
+                removed_sections.append(name)
+                continue
+            value = self.__dict__[name]
+            if callable(value) or name.startswith("_logger"):
+                continue
+            if log.replaced_version > since_version or not isinstance(value, (dict, list)):
+                changes[name] = {"value": value}
+                continue
+
+            changed_keys = log.changed_since(since_version)
+            if isinstance(value, dict):
+                changes[name] = {
+                    "updated": {key: value[key] for key in changed_keys if key in value},
+                    "removed": [key for key in changed_keys if key not in value]
+                }
+            else:
+                start = min(changed_keys)
+                changes[name] = {"from_index": start, "items": value[start:]}
+
+        return {
+            "version": self._snapshot_version,
+            "since_version": since_version,
+            "changes": changes,
+            "removed_sections": removed_sections
+        }
+
+    def _section_fragment(self, name: str, value: Any, indent: Optional[int]) -> str:
+        """
+        Retourne le fragment JSON d'une section.
+
+        Les fragments des entrées sont conservés : seules les entrées modifiées ou
+        ajoutées depuis le dernier rendu sont resérialisées, puis les fragments sont
+        réassemblés.
+        """
+        log = self._snapshot_sections.get(name)
+        if log is None:
+            log = self._snapshot_sections[name] = _SectionLog()
+        rendered = log.rendered.get(indent)
+        if rendered is not None and rendered.version == log.version:
+            return rendered.fragment
+
+        if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+            opening, closing = "{", "}"
+        elif isinstance(value, list):
+            opening, closing = "[", "]"
+        else:
+            rendered = log.rendered[indent] = _RenderedSection(log.version, log.replaced_version)
+            rendered.fragment = _dump_value(value, indent, 1)
+            return rendered.fragment
+
+        if rendered is None or rendered.replaced_version != log.replaced_version or \
+                not self._update_entries(rendered, log.changed_since(rendered.version), value, indent):
+            rendered = self._render_entries(log, value, indent)
+        rendered.version = log.version
+        rendered.fragment = _join_container(rendered.entries, opening, closing, indent, 1)
+        return rendered.fragment
+
+    @staticmethod
+    def _render_entry(key: Hashable, item: Any, is_dict: bool, indent: Optional[int]) -> str:
+        fragment = _dump_value(item, indent, 2)
+        return json.dumps(key, ensure_ascii=False) + ": " + fragment if is_dict else fragment
+
+    def _render_entries(self, log: _SectionLog, value: Any, indent: Optional[int]) -> _RenderedSection:
+        rendered = log.rendered[indent] = _RenderedSection(log.version, log.replaced_version)
+        is_dict = isinstance(value, dict)
+        for key, item in (value.items() if is_dict else enumerate(value)):
+            rendered.positions[key] = len(rendered.entries)
+            rendered.entries.append(self._render_entry(key, item, is_dict, indent))
+        return rendered
+
+    def _update_entries(self, rendered: _RenderedSection, changed_keys: List[Hashable], value: Any,
+                        indent: Optional[int]) -> bool:
+        """Met à jour les fragments des entrées modifiées ; False si un rendu complet est nécessaire."""
+        is_dict = isinstance(value, dict)
+        for key in changed_keys:
+            if is_dict:
+                if key not in value:
+                    return False
+            elif not 0 <= key < len(value):
+                return False
+            position = rendered.positions.get(key)
+            if position is None:
+                # Une nouvelle entrée doit suivre les entrées déjà rendues (ordre d'insertion / ajout en fin de liste)
+                if not is_dict and key != len(rendered.entries):
+                    return False
+                position = rendered.positions[key] = len(rendered.entries)
+                rendered.entries.append("")
+            rendered.entries[position] = self._render_entry(key, value[key], is_dict, indent)
+        return len(rendered.entries) == len(value)
+
     def to_json(self, indent: Optional[int] = 2) -> str:
-        """Sérialise l'état actuel en chaîne JSON."""
-        state_dict = {k: v for k, v in self.__dict__.items() if not callable(v) and not k.startswith("_logger")}
+        """
+        Sérialise l'état actuel en chaîne JSON.
+
+        Le document est assemblé à partir des fragments mis en cache par section et par
+        entrée : seules les parties modifiées depuis le dernier appel sont resérialisées.
+        """
+        state_dict = self._state_items()
         try:
-            return json.dumps(state_dict, indent=indent, ensure_ascii=False, default=str)
+            entries = [
+                json.dumps(name, ensure_ascii=False) + ": " + self._section_fragment(name, value, indent)
+                for name, value in state_dict.items()
+            ]
+            return _join_container(entries, "{", "}", indent, 0)
         except TypeError as e:
             state_logger.error(f"Erreur de sérialisation JSON de l'état: {e}")
             safe_dict = {k: repr(v) for k, v in state_dict.items()}
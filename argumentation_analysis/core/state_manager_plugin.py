@@ -31,9 +31,12 @@ class StateManagerPlugin:
         """Retourne l'état actuel sous forme de chaîne JSON."""
         self._logger.info(f"Appel get_current_state_snapshot (state id: {id(self._state)}, summarize={summarize})...")
         try:
-            snapshot_dict = self._state.get_state_snapshot(summarize=summarize)
-            indent = 2 if not summarize else None
-            snapshot_json = json.dumps(snapshot_dict, indent=indent, ensure_ascii=False, default=str)
+            if summarize:
+                snapshot_dict = self._state.get_state_snapshot(summarize=True)
+                snapshot_json = json.dumps(snapshot_dict, indent=None, ensure_ascii=False, default=str)
+            else:
+                # Assemblé depuis les fragments JSON mis en cache par l'état (sans aller-retour par un dict)
+                snapshot_json = self._state.to_json(indent=2)
             self._logger.info(" -> Snapshot de l'état généré avec succès.")
             self._logger.debug(f" -> Snapshot (summarize={summarize}): {snapshot_json[:500] + '...' if len(snapshot_json)>500 else snapshot_json}")
             return snapshot_json
@@ -41,6 +44,19 @@ class StateManagerPlugin:
             self._logger.error(f"Erreur lors de la récupération/sérialisation du snapshot de l'état: {e}", exc_info=True)
             return json.dumps({"error": f"Erreur récupération/sérialisation snapshot: {e}"})
 
+    @kernel_function(description="Récupère uniquement les modifications de l'état depuis une version donnée (state_version d'un aperçu précédent).", name="get_state_changes")
+    def get_state_changes(self, since_version: int = 0) -> str:
+        """Retourne sous forme de chaîne JSON les modifications de l'état depuis une version."""
+        self._logger.info(f"Appel get_state_changes (state id: {id(self._state)}, since_version={since_version})...")
+        try:
+            delta = self._state.get_state_delta(int(since_version))
+            delta_json = json.dumps(delta, ensure_ascii=False, default=str)
+            self._logger.info(f" -> {len(delta['changes'])} section(s) modifiée(s) depuis la version {since_version}.")
+            return delta_json
+        except Exception as e:
+            self._logger.error(f"Erreur lors de la récupération des modifications de l'état: {e}", exc_info=True)
+            return json.dumps({"error": f"Erreur récupération modifications: {e}"})
+
     @kernel_function(description="Ajoute une nouvelle tâche d'analyse à l'état.", name="add_analysis_task")
     def add_analysis_task(self, description: str) -> str:
         """Interface Kernel Function pour ajouter une tâche via l'état."""
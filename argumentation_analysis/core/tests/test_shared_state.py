@@ -301,6 +301,80 @@ class TestRhetoricalAnalysisState(unittest.TestCase):
         self.assertEqual(state.final_conclusion, "Conclusion finale")
         self.assertEqual(state._next_agent_designated, "agent_1")
     
+    def _reference_json(self, indent):
+        state_dict = {k: v for k, v in self.state.get_state_view().items()}
+        return json.dumps(state_dict, indent=indent, ensure_ascii=False, default=str)
+
+    def test_to_json_matches_full_serialization_after_updates(self):
+        """Test que le JSON assemblé depuis les fragments en cache est identique à une sérialisation complète."""
+        for i in range(3):
+            task_id = self.state.add_task(f"Tâche {i}")
+            arg_id = self.state.add_argument(f"Argument\n{i}")
+            self.state.add_fallacy("ad_hominem", "Justification", arg_id)
+            bs_id = self.state.add_belief_set("Propositional", "a => b")
+            self.state.log_query(bs_id, "a", "ACCEPTED")
+            self.state.add_answer(task_id, "agent_1", "Réponse", [arg_id])
+            self.state.add_extract("Extrait", "Contenu")
+            for indent in (None, 2):
+                self.assertEqual(self.state.to_json(indent=indent), self._reference_json(indent))
+
+        self.state.set_conclusion("Conclusion")
+        self.assertEqual(self.state.to_json(indent=2), self._reference_json(2))
+        self.assertEqual(self.state.get_state_snapshot(summarize=False), json.loads(self._reference_json(None)))
+
+    def test_get_state_delta(self):
+        """Test des modifications retournées depuis une version donnée."""
+        self.state.add_task("Tâche 1")
+        bs_id = self.state.add_belief_set("Propositional", "a => b")
+        self.state.log_query(bs_id, "a", "ACCEPTED")
+        version = self.state.version
+
+        task_id = self.state.add_task("Tâche 2")
+        log_id = self.state.log_query(bs_id, "b", "REJECTED")
+        self.state.set_conclusion("Conclusion")
+        delta = self.state.get_state_delta(version)
+
+        self.assertEqual(delta["version"], self.state.version)
+        self.assertEqual(delta["changes"]["analysis_tasks"]["updated"], {task_id: "Tâche 2"})
+        self.assertEqual(delta["changes"]["query_log"]["from_index"], 1)
+        self.assertEqual([entry["log_id"] for entry in delta["changes"]["query_log"]["items"]], [log_id])
+        self.assertEqual(delta["changes"]["final_conclusion"], {"value": "Conclusion"})
+        self.assertNotIn("belief_sets", delta["changes"])
+        self.assertEqual(self.state.get_state_delta(self.state.version)["changes"], {})
+
+    def test_replaced_sections_and_manual_dirty_marking(self):
+        """Test de la détection des affectations et des modifications signalées par mark_dirty."""
+        self.state.add_task("Tâche 1")
+        self.state.to_json(indent=None)
+        version = self.state.version
+
+        self.state.analysis_tasks = {"task_9": "Remplacée"}
+        self.assertEqual(self.state.get_state_delta(version)["changes"]["analysis_tasks"], {"value": {"task_9": "Remplacée"}})
+
+        self.state.belief_sets["bs_1"] = {"logic_type": "PL", "content": "a"}
+        self.state.mark_dirty("belief_sets", "bs_1")
+        self.assertEqual(self.state.to_json(indent=None), self._reference_json(None))
+
+    def test_reset_state_keeps_version_increasing(self):
+        """Test que la réinitialisation invalide les fragments sans faire régresser la version."""
+        self.state.add_task("Tâche 1")
+        version = self.state.version
+
+        self.state.reset_state()
+
+        self.assertGreater(self.state.version, version)
+        self.assertEqual(self.state.to_json(indent=None), self._reference_json(None))
+        self.assertEqual(self.state.get_state_delta(version)["changes"]["analysis_tasks"], {"value": {}})
+
+    def test_get_state_view_is_read_only(self):
+        """Test que la vue de l'état n'est ni copiée ni modifiable."""
+        view = self.state.get_state_view()
+
+        self.assertIs(view["analysis_tasks"], self.state.analysis_tasks)
+        self.assertNotIn("_snapshot_sections", view)
+        with self.assertRaises(TypeError):
+            view["raw_text"] = "modifié"
+
     def test_shared_state_alias(self):
         """Test que SharedState est bien un alias de RhetoricalAnalysisState."""
         self.assertEqual(SharedState, RhetoricalAnalysisState)
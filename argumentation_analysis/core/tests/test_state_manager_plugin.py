@@ -59,6 +59,16 @@ class TestStateManagerPlugin(unittest.TestCase):
             
             self.assertIn("error", snapshot)
     
+    def test_get_state_changes(self):
+        """Test de la récupération des modifications de l'état via le plugin."""
+        version = json.loads(self.plugin.get_current_state_snapshot())["state_version"]
+        task_id = self.plugin.add_analysis_task("Nouvelle tâche")
+
+        delta = json.loads(self.plugin.get_state_changes(version))
+
+        self.assertEqual(delta["since_version"], version)
+        self.assertEqual(delta["changes"]["analysis_tasks"]["updated"], {task_id: "Nouvelle tâche"})
+
     def test_add_analysis_task(self):
         """Test de l'ajout d'une tâche via le plugin."""
         # Espionner la méthode add_task de l'état
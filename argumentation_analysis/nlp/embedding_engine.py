@@ -0,0 +1,260 @@
+"""
+Moteur de génération d'embeddings par micro-lots, avec registre de modèles et cache disque.
+
+Ce module fournit les briques indépendantes du fournisseur utilisées par
+`embedding_utils.get_embeddings_for_chunks` :
+    1.  `EmbeddingModelRegistry`: registre borné (LRU) des modèles et clients
+        chargés, pour ne pas reconstruire un `SentenceTransformer` ou un client
+        OpenAI à chaque appel.
+    2.  `EmbeddingCache`: cache disque adressé par contenu, une entrée `.npy`
+        (float32) par couple (modèle, hash SHA-256 du morceau de texte).
+    3.  `EmbeddingEngine`: dé-duplique les morceaux identiques, interroge le
+        cache, découpe les morceaux restants en micro-lots bornés en nombre et
+        en taille, et retourne une matrice numpy float32.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_BATCH_CHARS = 200_000
+DEFAULT_MAX_LOADED_MODELS = 4
+
+# Fonction d'encodage d'un micro-lot : liste de textes -> vecteurs (un par texte)
+EncodeFunction = Callable[[List[str]], Any]
+
+
+class EmbeddingModelRegistry:
+    """
+    Registre borné des modèles d'embedding chargés (politique LRU).
+
+    Les entrées sont indexées par une clé fournie par l'appelant (typiquement
+    le nom du modèle et le constructeur utilisé). Lorsque la capacité est
+    atteinte, le modèle le moins récemment utilisé est libéré.
+    """
+
+    def __init__(self, max_models: int = DEFAULT_MAX_LOADED_MODELS):
+        """
+        :param max_models: Nombre maximum de modèles conservés en mémoire.
+        :type max_models: int
+        """
+        self.max_models = max(1, max_models)
+        self._models: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Retourne le modèle associé à `key`, en le chargeant via `loader` si nécessaire.
+
+        :param key: Clé du modèle (ex: ("sentence-transformers", nom, constructeur)).
+        :type key: Hashable
+        :param loader: Fonction sans argument qui charge le modèle.
+        :type loader: Callable[[], Any]
+        :return: Le modèle chargé.
+        :rtype: Any
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            # Le chargement se fait sous verrou pour qu'un modèle ne soit jamais chargé deux fois.
+            model = loader()
+            self._models[key] = model
+            while len(self._models) > self.max_models:
+                self._models.popitem(last=False)
+                logger.info(f"Modèle d'embedding le moins récemment utilisé libéré du registre (capacité: {self.max_models}).")
+            return model
+
+    def clear(self) -> None:
+        """Libère tous les modèles du registre."""
+        with self._lock:
+            self._models.clear()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+default_model_registry = EmbeddingModelRegistry()
+
+
+def chunk_digest(model_name: str, text: str) -> str:
+    """
+    Calcule la clé de cache d'un morceau de texte pour un modèle donné.
+
+    :param model_name: Nom du modèle d'embedding.
+    :type model_name: str
+    :param text: Morceau de texte.
+    :type text: str
+    :return: Empreinte SHA-256 hexadécimale de (modèle, texte).
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache disque des vecteurs, adressé par le contenu des morceaux de texte.
+
+    Chaque vecteur est stocké dans `<racine>/<ab>/<empreinte>.npy` où l'empreinte
+    est `chunk_digest(modèle, texte)`. Les écritures sont atomiques (fichier
+    temporaire puis renommage), ce qui permet à plusieurs processus de partager
+    le même répertoire.
+    """
+
+    def __init__(self, root: Path):
+        """
+        :param root: Répertoire racine du cache (créé à la première écriture).
+        :type root: Path
+        """
+        self.root = Path(root)
+
+    def _path_for(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.npy"
+
+    def get(self, digest: str) -> Optional[np.ndarray]:
+        """Retourne le vecteur en cache pour une empreinte, ou None (entrée absente ou illisible)."""
+        path = self._path_for(digest)
+        try:
+            return np.load(path, allow_pickle=False)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrée de cache d'embedding illisible ignorée ({path}): {e}")
+            return None
+
+    def put(self, digest: str, vector: np.ndarray) -> None:
+        """Enregistre un vecteur (float32) pour une empreinte ; les erreurs d'écriture sont journalisées."""
+        path = self._path_for(digest)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=digest[:8], suffix=".tmp", dir=path.parent)
+            with os.fdopen(fd, 'wb') as cache_file:
+                np.save(cache_file, np.asarray(vector, dtype=np.float32))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Impossible d'écrire l'entrée de cache d'embedding {path}: {e}")
+
+
+def iter_micro_batches(texts: Sequence[str], max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                       max_batch_chars: int = DEFAULT_MAX_BATCH_CHARS) -> Iterator[List[int]]:
+    """
+    Découpe une séquence de textes en micro-lots bornés en nombre et en caractères.
+
+    Un texte plus long que `max_batch_chars` forme à lui seul un micro-lot.
+
+    :param texts: Textes à découper.
+    :type texts: Sequence[str]
+    :param max_batch_size: Nombre maximum de textes par micro-lot.
+    :type max_batch_size: int
+    :param max_batch_chars: Nombre maximum de caractères cumulés par micro-lot.
+    :type max_batch_chars: int
+    :return: Itérateur sur les listes d'indices de chaque micro-lot.
+    :rtype: Iterator[List[int]]
+    """
+    batch: List[int] = []
+    batch_chars = 0
+    for index, text in enumerate(texts):
+        if batch and (len(batch) >= max_batch_size or batch_chars + len(text) > max_batch_chars):
+            yield batch
+            batch, batch_chars = [], 0
+        batch.append(index)
+        batch_chars += len(text)
+    if batch:
+        yield batch
+
+
+class EmbeddingEngine:
+    """
+    Génère des embeddings par micro-lots, avec dé-duplication et cache disque optionnel.
+    """
+
+    def __init__(self, model_name: str, encode: EncodeFunction,
+                 cache_dir: Optional[Path] = None,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_batch_chars: int = DEFAULT_MAX_BATCH_CHARS):
+        """
+        :param model_name: Nom du modèle (fait partie de la clé de cache).
+        :type model_name: str
+        :param encode: Fonction d'encodage d'un micro-lot fournie par le backend.
+        :type encode: EncodeFunction
+        :param cache_dir: Répertoire du cache disque ; None pour désactiver le cache.
+        :type cache_dir: Optional[Path]
+        :param max_batch_size: Nombre maximum de textes par appel au backend.
+        :type max_batch_size: int
+        :param max_batch_chars: Nombre maximum de caractères par appel au backend.
+        :type max_batch_chars: int
+        """
+        self.model_name = model_name
+        self._encode = encode
+        self.cache = EmbeddingCache(cache_dir) if cache_dir is not None else None
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_chars = max(1, max_batch_chars)
+        self.stats: Dict[str, int] = {"requested": 0, "unique": 0, "cache_hits": 0, "encoded": 0, "batches": 0}
+
+    def embed(self, text_chunks: Sequence[str]) -> np.ndarray:
+        """
+        Retourne les embeddings des morceaux de texte, dans l'ordre d'entrée.
+
+        :param text_chunks: Morceaux de texte à encoder.
+        :type text_chunks: Sequence[str]
+        :return: Matrice float32 de forme (nombre de morceaux, dimension).
+        :rtype: np.ndarray
+        :raises ValueError: Si le backend ne retourne pas un vecteur par texte.
+        """
+        self.stats["requested"] += len(text_chunks)
+        if not text_chunks:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        # Dé-duplication : chaque texte distinct n'est encodé (ou lu en cache) qu'une fois
+        row_of_text: Dict[str, int] = {}
+        unique_texts: List[str] = []
+        rows = np.empty(len(text_chunks), dtype=np.intp)
+        for position, text in enumerate(text_chunks):
+            row = row_of_text.get(text)
+            if row is None:
+                row = row_of_text[text] = len(unique_texts)
+                unique_texts.append(text)
+            rows[position] = row
+        self.stats["unique"] += len(unique_texts)
+
+        vectors: List[Optional[np.ndarray]] = [None] * len(unique_texts)
+        digests: List[Optional[str]] = [None] * len(unique_texts)
+        missing: List[int] = []
+        for row, text in enumerate(unique_texts):
+            if self.cache is not None:
+                digests[row] = chunk_digest(self.model_name, text)
+                vectors[row] = self.cache.get(digests[row])
+            if vectors[row] is None:
+                missing.append(row)
+        self.stats["cache_hits"] += len(unique_texts) - len(missing)
+
+        missing_texts = [unique_texts[row] for row in missing]
+        for batch in iter_micro_batches(missing_texts, self.max_batch_size, self.max_batch_chars):
+            batch_texts = [missing_texts[index] for index in batch]
+            encoded = np.asarray(self._encode(batch_texts), dtype=np.float32)
+            if encoded.ndim != 2 or encoded.shape[0] != len(batch_texts):
+                raise ValueError(
+                    f"Le modèle '{self.model_name}' a retourné {encoded.shape} pour un lot de {len(batch_texts)} textes."
+                )
+            self.stats["batches"] += 1
+            for index, vector in zip(batch, encoded):
+                row = missing[index]
+                vectors[row] = vector
+                if self.cache is not None:
+                    self.cache.put(digests[row], vector)
+        self.stats["encoded"] += len(missing)
+
+        return np.stack(vectors).astype(np.float32, copy=False)[rows]
@@ -0,0 +1,230 @@
+"""
+Stockage binaire compact des embeddings, avec ajout incrémental et lecture paresseuse.
+
+Un `EmbeddingStore` est un répertoire contenant :
+    - `store.json` : en-tête (version du format, dimension, type float32/float16) ;
+    - `vectors.bin` : matrice brute (lignes contiguës), lue par `numpy.memmap` ;
+    - `index.jsonl` : journal en ajout seul ; chaque ligne associe un identifiant
+      (source, extrait...) à une plage de lignes `[start, stop)` et à ses métadonnées.
+      Pour un identifiant ajouté plusieurs fois, la dernière entrée fait foi.
+
+Les vecteurs sont écrits avant l'entrée d'index correspondante : après une
+interruption, les lignes non indexées sont ignorées puis écrasées à l'ajout
+suivant. La lecture ne charge pas le corpus entier : `get` retourne une vue
+sur le fichier projeté en mémoire.
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+HEADER_FILENAME = "store.json"
+VECTORS_FILENAME = "vectors.bin"
+INDEX_FILENAME = "index.jsonl"
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+class EmbeddingStore:
+    """
+    Magasin d'embeddings adressé par identifiant, projeté en mémoire en lecture.
+    """
+
+    def __init__(self, root: Union[str, Path], dtype: str = "float32"):
+        """
+        Ouvre (ou prépare) un magasin. Le répertoire n'est créé qu'au premier ajout.
+
+        :param root: Répertoire du magasin.
+        :type root: Union[str, Path]
+        :param dtype: Type de stockage des vecteurs ("float32" ou "float16") pour un
+                      nouveau magasin ; un magasin existant conserve son type.
+        :type dtype: str
+        :raises ValueError: Si le type demandé n'est pas supporté ou si l'en-tête est invalide.
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Type de stockage non supporté: {dtype} (attendu: {SUPPORTED_DTYPES})")
+        self.root = Path(root)
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        self._ranges: Dict[str, Tuple[int, int]] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._row_count = 0
+        self._memmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def header_path(self) -> Path:
+        return self.root / HEADER_FILENAME
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.root / VECTORS_FILENAME
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / INDEX_FILENAME
+
+    def _load(self) -> None:
+        """Lit l'en-tête et rejoue le journal d'index d'un magasin existant."""
+        if not self.header_path.is_file():
+            return
+        with open(self.header_path, 'r', encoding='utf-8') as header_file:
+            header = json.load(header_file)
+        if header.get("format_version") != STORE_FORMAT_VERSION:
+            raise ValueError(f"Version de magasin d'embeddings non supportée dans {self.root}: {header.get('format_version')}")
+        self.dtype = np.dtype(header["dtype"])
+        self.dim = int(header["dim"])
+
+        if self.index_path.is_file():
+            with open(self.index_path, 'r', encoding='utf-8') as index_file:
+                for line_number, line in enumerate(index_file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Dernière ligne tronquée par une interruption : les vecteurs associés sont ignorés
+                        logger.warning(f"Entrée d'index illisible ignorée ({self.index_path}:{line_number}).")
+                        continue
+                    self._ranges[entry["id"]] = (entry["start"], entry["stop"])
+                    self._metadata[entry["id"]] = entry.get("metadata", {})
+                    self._row_count = max(self._row_count, entry["stop"])
+
+    def _write_header(self, dim: int) -> None:
+        header = {"format_version": STORE_FORMAT_VERSION, "dtype": self.dtype.name, "dim": dim}
+        with open(self.header_path, 'w', encoding='utf-8') as header_file:
+            json.dump(header, header_file)
+        self.dim = dim
+
+    def append(self, record_id: str, vectors: Any, metadata: Optional[Dict[str, Any]] = None) -> Tuple[int, int]:
+        """
+        Ajoute les vecteurs d'un identifiant à la fin du magasin.
+
+        Si l'identifiant existe déjà, sa nouvelle plage remplace l'ancienne.
+
+        :param record_id: Identifiant (source, extrait...) des vecteurs.
+        :type record_id: str
+        :param vectors: Matrice (n, dimension) ou vecteur unique.
+        :type vectors: Any
+        :param metadata: Métadonnées JSON-sérialisables associées à l'identifiant.
+        :type metadata: Optional[Dict[str, Any]]
+        :return: La plage de lignes `(start, stop)` occupée par les vecteurs.
+        :rtype: Tuple[int, int]
+        :raises ValueError: Si les vecteurs sont vides ou si leur dimension ne correspond pas à celle du magasin.
+        """
+        matrix = np.atleast_2d(np.asarray(vectors, dtype=self.dtype))
+        if matrix.ndim != 2:
+            raise ValueError(f"Les vecteurs de '{record_id}' doivent former une matrice 2D (forme reçue: {matrix.shape}).")
+        if matrix.shape[0] == 0 or matrix.shape[1] == 0:
+            raise ValueError(f"Aucun vecteur à ajouter pour '{record_id}' (forme reçue: {matrix.shape}).")
+        record_id = str(record_id)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if self.dim is None:
+                self._write_header(matrix.shape[1])
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"Dimension {matrix.shape[1]} incompatible avec le magasin {self.root} (dimension {self.dim}).")
+
+            start = self._row_count
+            stop = start + matrix.shape[0]
+            with open(self.vectors_path, 'ab') as vectors_file:
+                # Écraser d'éventuelles lignes non indexées laissées par une interruption
+                vectors_file.truncate(start * self.dim * self.dtype.itemsize)
+                vectors_file.write(np.ascontiguousarray(matrix).tobytes())
+            entry = {"id": record_id, "start": start, "stop": stop, "metadata": metadata or {}}
+            line = json.dumps(entry, ensure_ascii=False) + "\n"
+            if not self._index_ends_with_newline():
+                line = "\n" + line # Isoler une dernière ligne tronquée par une interruption
+            with open(self.index_path, 'a', encoding='utf-8') as index_file:
+                index_file.write(line)
+
+            self._ranges[record_id] = (start, stop)
+            self._metadata[record_id] = metadata or {}
+            self._row_count = stop
+            self._memmap = None
+            return start, stop
+
+    def _index_ends_with_newline(self) -> bool:
+        """Indique si le journal d'index est absent, vide ou terminé par un saut de ligne."""
+        try:
+            with open(self.index_path, 'rb') as index_file:
+                index_file.seek(0, 2)
+                if index_file.tell() == 0:
+                    return True
+                index_file.seek(-1, 2)
+                return index_file.read(1) == b"\n"
+        except FileNotFoundError:
+            return True
+
+    def _matrix(self) -> np.ndarray:
+        """Retourne la projection mémoire en lecture seule de toutes les lignes indexées."""
+        if self._memmap is None or self._memmap.shape[0] != self._row_count:
+            if self._row_count == 0 or self.dim is None:
+                return np.zeros((0, self.dim or 0), dtype=self.dtype)
+            self._memmap = np.memmap(self.vectors_path, dtype=self.dtype, mode='r', shape=(self._row_count, self.dim))
+        return self._memmap
+
+    def get(self, record_id: str) -> np.ndarray:
+        """
+        Retourne les vecteurs d'un identifiant (vue en lecture seule, sans copie).
+
+        :param record_id: Identifiant recherché.
+        :type record_id: str
+        :return: Matrice (n, dimension) des vecteurs de l'identifiant.
+        :rtype: np.ndarray
+        :raises KeyError: Si l'identifiant est absent du magasin.
+        """
+        start, stop = self._ranges[str(record_id)]
+        return self._matrix()[start:stop]
+
+    def get_many(self, record_ids: Iterable[str]) -> np.ndarray:
+        """Concatène les vecteurs de plusieurs identifiants (copie limitée aux lignes demandées)."""
+        parts = [self.get(record_id) for record_id in record_ids]
+        if not parts:
+            return np.zeros((0, self.dim or 0), dtype=self.dtype)
+        return np.concatenate(parts)
+
+    def metadata(self, record_id: str) -> Dict[str, Any]:
+        """Retourne les métadonnées d'un identifiant."""
+        return self._metadata[str(record_id)]
+
+    def row_range(self, record_id: str) -> Tuple[int, int]:
+        """Retourne la plage de lignes `(start, stop)` d'un identifiant."""
+        return self._ranges[str(record_id)]
+
+    def ids(self) -> List[str]:
+        """Retourne les identifiants du magasin, dans l'ordre de leur dernier ajout."""
+        return sorted(self._ranges, key=lambda record_id: self._ranges[record_id][0])
+
+    def iter_records(self) -> Iterator[Tuple[str, np.ndarray]]:
+        """Parcourt les couples (identifiant, vecteurs) sans charger tout le corpus."""
+        for record_id in self.ids():
+            yield record_id, self.get(record_id)
+
+    def __contains__(self, record_id: object) -> bool:
+        return str(record_id) in self._ranges
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+
+def load_embedding_store(root: Union[str, Path]) -> EmbeddingStore:
+    """
+    Ouvre un magasin d'embeddings existant pour la lecture.
+
+    :param root: Répertoire du magasin.
+    :type root: Union[str, Path]
+    :return: Le magasin ouvert (les vecteurs sont projetés en mémoire à la demande).
+    :rtype: EmbeddingStore
+    :raises FileNotFoundError: Si le répertoire ne contient pas de magasin.
+    """
+    root = Path(root)
+    if not (root / HEADER_FILENAME).is_file():
+        raise FileNotFoundError(f"Aucun magasin d'embeddings dans {root}")
+    return EmbeddingStore(root)
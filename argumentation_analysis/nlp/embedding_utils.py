@@ -5,22 +5,33 @@ Ce module fournit des fonctions pour :
     1.  `get_embeddings_for_chunks`: Générer des embeddings pour une liste de
         morceaux de texte en utilisant soit les modèles d'OpenAI (par exemple,
         "text-embedding-3-small"), soit des modèles de la bibliothèque
-        Sentence Transformers (par exemple, "all-MiniLM-L6-v2").
+        Sentence Transformers (par exemple, "all-MiniLM-L6-v2"), par micro-lots,
+        avec dé-duplication et cache disque optionnel (voir `embedding_engine`).
     2.  `save_embeddings_data`: Sauvegarder les données d'embeddings obtenues
         (incluant potentiellement les textes originaux et d'autres métadonnées)
-        dans un fichier au format JSON.
+        dans un magasin binaire (voir `embedding_store`).
 
 Il gère les importations conditionnelles pour OpenAI et Sentence Transformers,
 permettant une utilisation flexible même si l'une des bibliothèques n'est pas
 installée (bien que cela lèvera une `ImportError` si le modèle correspondant
 est sollicité).
 """
-import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from typing import List
 import logging
 
+import numpy as np
+
+from argumentation_analysis.nlp.embedding_engine import (
+    DEFAULT_MAX_BATCH_CHARS,
+    DEFAULT_MAX_BATCH_SIZE,
+    EmbeddingEngine,
+    EncodeFunction,
+    default_model_registry,
+)
+from argumentation_analysis.nlp.embedding_store import EmbeddingStore
+
 # Importation conditionnelle ou gestion d'erreur si openai n'est pas installé.
 # Pour l'instant, on suppose qu'il est disponible.
 try:
@@ -39,13 +50,65 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-def get_embeddings_for_chunks(text_chunks: List[str], embedding_model_name: str) -> List[List[float]]:
+def _build_encoder(embedding_model_name: str) -> EncodeFunction:
+    """
+    Retourne la fonction d'encodage par micro-lot du backend correspondant au modèle.
+
+    Le client OpenAI ou le modèle Sentence Transformer est obtenu depuis le
+    registre borné `default_model_registry` : il n'est construit qu'au premier usage.
+
+    :param embedding_model_name: Nom du modèle d'embedding.
+    :type embedding_model_name: str
+    :return: Fonction qui encode une liste de textes en une liste de vecteurs.
+    :rtype: EncodeFunction
+    :raises ImportError: Si la bibliothèque requise n'est pas installée.
+    """
+    if embedding_model_name.startswith("text-embedding-"):
+        if OpenAI is None or APIError is None:
+            # Commentaire : Vérification critique pour s'assurer que la dépendance OpenAI est disponible.
+            # Si elle ne l'est pas, une ImportError est levée pour informer l'utilisateur.
+            raise ImportError(
+                "La bibliothèque OpenAI est requise pour les modèles 'text-embedding-*' mais n'a pas pu être importée. "
+                "Veuillez l'installer pour utiliser les modèles d'embedding OpenAI."
+            )
+        # Un seul client (pool de connexions HTTP) partagé par tous les modèles OpenAI
+        client = default_model_registry.get(("openai", OpenAI), OpenAI)
+
+        def encode_openai(batch: List[str]) -> List[List[float]]:
+            response = client.embeddings.create(input=batch, model=embedding_model_name)
+            return [item.embedding for item in response.data]
+        return encode_openai
+
+    # Supposition : les autres modèles sont des Sentence Transformers.
+    if SentenceTransformer is None:
+        raise ImportError(
+            f"La bibliothèque 'sentence-transformers' est requise pour le modèle '{embedding_model_name}' "
+            "mais n'a pas pu être importée. Veuillez l'installer."
+        )
+
+    def load_sentence_transformer():
+        logger.info(f"Chargement du modèle Sentence Transformer: {embedding_model_name}")
+        return SentenceTransformer(embedding_model_name)
+
+    model = default_model_registry.get(
+        ("sentence-transformers", embedding_model_name, SentenceTransformer), load_sentence_transformer
+    )
+    return model.encode
+
+
+def get_embeddings_for_chunks(text_chunks: List[str], embedding_model_name: str,
+                              cache_dir: Optional[Path] = None,
+                              max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                              max_batch_chars: int = DEFAULT_MAX_BATCH_CHARS) -> np.ndarray:
     """
     Génère les embeddings pour une liste de morceaux de texte en utilisant un modèle spécifié.
 
-    Cette fonction prend une liste de chaînes de caractères (morceaux de texte) et le nom
-    d'un modèle d'embedding, puis retourne une liste d'embeddings (chaque embedding
-    étant une liste de flottants).
+    Les morceaux identiques ne sont encodés qu'une fois, et les morceaux restants
+    sont envoyés au modèle par micro-lots bornés (`max_batch_size` textes et
+    `max_batch_chars` caractères au plus par appel). Les modèles et clients sont
+    conservés dans un registre borné entre les appels. Si `cache_dir` est fourni,
+    les vecteurs sont lus et écrits dans un cache disque adressé par
+    (modèle, hash du morceau), ce qui rend quasi gratuit le ré-encodage d'un corpus inchangé.
 
     Supporte les modèles d'embedding OpenAI (par exemple, "text-embedding-3-small")
     et les modèles Sentence Transformers (par exemple, "all-MiniLM-L6-v2").
@@ -57,16 +120,19 @@ def get_embeddings_for_chunks(text_chunks: List[str], embedding_model_name: str)
                                  Peut être un modèle OpenAI (commençant par "text-embedding-")
                                  ou un modèle Sentence Transformer (par exemple, "all-MiniLM-L6-v2").
     :type embedding_model_name: str
+    :param cache_dir: Répertoire du cache disque des vecteurs ; None pour ne pas l'utiliser.
+    :type cache_dir: Optional[Path]
+    :param max_batch_size: Nombre maximum de morceaux par appel au modèle.
+    :type max_batch_size: int
+    :param max_batch_chars: Nombre maximum de caractères cumulés par appel au modèle.
+    :type max_batch_chars: int
 
-    :return: Une liste d'embeddings, où chaque embedding est une liste de flottants.
-             L'ordre des embeddings correspond à l'ordre des morceaux de texte en entrée.
-    :rtype: List[List[float]]
+    :return: Une matrice float32 de forme (nombre de morceaux, dimension). La ligne i
+             correspond au morceau i de l'entrée.
+    :rtype: np.ndarray
 
     :raises ImportError: Si la bibliothèque requise (OpenAI ou Sentence Transformers)
                          n'est pas installée lors de la tentative d'utilisation du modèle correspondant.
-    :raises NotImplementedError: Si le `embedding_model_name` ne correspond pas à un type de modèle supporté
-                                 (bien que la logique actuelle tente de traiter tout ce qui n'est pas OpenAI
-                                 comme un Sentence Transformer, ce qui pourrait être affiné).
     :raises openai.APIError: Si une erreur se produit lors de l'appel à l'API OpenAI.
     :raises ValueError: Si le modèle Sentence Transformer ne peut pas être chargé ou si une
                         erreur survient pendant la génération des embeddings avec Sentence Transformers.
@@ -76,22 +142,11 @@ def get_embeddings_for_chunks(text_chunks: List[str], embedding_model_name: str)
     # Choix de la méthode de génération d'embeddings en fonction du nom du modèle
     if embedding_model_name.startswith("text-embedding-"):
         # Utilisation des modèles OpenAI
-        if OpenAI is None or APIError is None:
-            # Commentaire : Vérification critique pour s'assurer que la dépendance OpenAI est disponible.
-            # Si elle ne l'est pas, une ImportError est levée pour informer l'utilisateur.
-            raise ImportError(
-                "La bibliothèque OpenAI est requise pour les modèles 'text-embedding-*' mais n'a pas pu être importée. "
-                "Veuillez l'installer pour utiliser les modèles d'embedding OpenAI."
-            )
+        encode = _build_encoder(embedding_model_name)
         try:
-            client = OpenAI() # Initialisation du client OpenAI
-            response = client.embeddings.create(
-                input=text_chunks,
-                model=embedding_model_name
-            )
-            # Extraction des embeddings de la réponse de l'API
-            embeddings = [item.embedding for item in response.data]
-            return embeddings
+            engine = EmbeddingEngine(embedding_model_name, encode, cache_dir=cache_dir,
+                                     max_batch_size=max_batch_size, max_batch_chars=max_batch_chars)
+            return engine.embed(text_chunks)
         except APIError as e:
             logger.error(f"Erreur de l'API OpenAI lors de la génération des embeddings avec le modèle {embedding_model_name}: {e}")
             # Relance l'exception APIError pour que l'appelant puisse la gérer spécifiquement.
@@ -101,29 +156,20 @@ def get_embeddings_for_chunks(text_chunks: List[str], embedding_model_name: str)
             # Relance une exception générique pour les autres erreurs.
             raise
     else:
-        # Supposition : les autres modèles sont des Sentence Transformers.
         # Ce bloc gère la génération d'embeddings en utilisant la bibliothèque sentence-transformers.
-        if SentenceTransformer is None:
-            # Commentaire : Vérification similaire à celle d'OpenAI pour sentence-transformers.
-            raise ImportError(
-                f"La bibliothèque 'sentence-transformers' est requise pour le modèle '{embedding_model_name}' "
-                "mais n'a pas pu être importée. Veuillez l'installer."
-            )
         try:
-            logger.info(f"Chargement du modèle Sentence Transformer: {embedding_model_name}")
-            model = SentenceTransformer(embedding_model_name) # Chargement du modèle
+            encode = _build_encoder(embedding_model_name)
+            engine = EmbeddingEngine(embedding_model_name, encode, cache_dir=cache_dir,
+                                     max_batch_size=max_batch_size, max_batch_chars=max_batch_chars)
             logger.info(f"Génération des embeddings avec {embedding_model_name} pour {len(text_chunks)} morceaux.")
-            embeddings_np = model.encode(text_chunks) # Génération des embeddings (typiquement un ndarray NumPy)
-            
-            # Conversion en liste de listes de flottants Python standard
-            # Commentaire : Assure un format de sortie cohérent, quel que soit le type de retour de model.encode().
-            if hasattr(embeddings_np, 'tolist'):
-                embeddings = embeddings_np.tolist() # Méthode standard pour les arrays NumPy
-            else:
-                # Cas de repli si embeddings_np n'est pas un array NumPy (par exemple, déjà une liste de listes)
-                embeddings = [list(map(float, emb)) for emb in embeddings_np]
-            logger.info("Embeddings générés avec succès.")
+            embeddings = engine.embed(text_chunks)
+            logger.info(
+                f"Embeddings générés avec succès ({engine.stats['encoded']} encodés, "
+                f"{engine.stats['cache_hits']} lus en cache, {engine.stats['batches']} lot(s))."
+            )
             return embeddings
+        except ImportError:
+            raise
         except OSError as e:
             # Commentaire : OSError peut survenir si le modèle n'est pas trouvé localement
             # et que le téléchargement échoue (problème de réseau, nom de modèle incorrect).
@@ -136,20 +182,33 @@ def get_embeddings_for_chunks(text_chunks: List[str], embedding_model_name: str)
             logger.error(f"Erreur inattendue lors de la génération des embeddings avec Sentence Transformer '{embedding_model_name}': {e}")
             # Encapsule l'exception originale dans un ValueError pour plus de contexte.
             raise ValueError(f"Erreur inattendue avec Sentence Transformer '{embedding_model_name}': {e}")
-def save_embeddings_data(embeddings_data: Dict[str, Any], output_path: Path) -> bool:
+
+def save_embeddings_data(embeddings_data: Dict[str, Any], output_path: Path,
+                         record_id: Optional[str] = None, dtype: str = "float32",
+                         store: Optional[EmbeddingStore] = None) -> bool:
     """
-    Sauvegarde les données d'embeddings dans un fichier JSON.
+    Ajoute des embeddings à un magasin binaire (`EmbeddingStore`).
 
-    Les données peuvent inclure les embeddings eux-mêmes, les morceaux de texte
-    originaux, et d'autres métadonnées pertinentes.
+    Les vecteurs (clé "embeddings") sont écrits en float32 (ou float16) dans le
+    fichier de vecteurs du magasin, et les autres champs du dictionnaire sont
+    conservés comme métadonnées dans son index. Le magasin peut être relu sans
+    charger tout le corpus via `embedding_store.load_embedding_store`.
 
     :param embeddings_data: Un dictionnaire contenant les données d'embeddings.
-                            La structure attendue est flexible mais devrait contenir
-                            au moins une clé pour les embeddings.
+                            Il doit contenir la clé "embeddings" (matrice ou liste
+                            de vecteurs) ; les autres clés JSON-sérialisables sont
+                            conservées comme métadonnées.
     :type embeddings_data: Dict[str, Any]
-    :param output_path: Le chemin (objet Path) du fichier où sauvegarder les données.
-                        Le répertoire parent sera créé s'il n'existe pas.
+    :param output_path: Le répertoire du magasin d'embeddings. Il sera créé s'il n'existe pas.
     :type output_path: Path
+    :param record_id: Identifiant des vecteurs dans le magasin ; par défaut la valeur
+                      de "source_id" dans `embeddings_data`, sinon "default".
+    :type record_id: Optional[str]
+    :param dtype: Type de stockage pour un nouveau magasin ("float32" ou "float16").
+    :type dtype: str
+    :param store: Magasin déjà ouvert sur `output_path`, réutilisé pour éviter de relire
+                  son index à chaque sauvegarde ; par défaut le magasin est ouvert ici.
+    :type store: Optional[EmbeddingStore]
 
     :return: True si la sauvegarde a réussi, False sinon.
     :rtype: bool
@@ -162,20 +221,15 @@ def save_embeddings_data(embeddings_data: Dict[str, Any], output_path: Path) ->
     """
     logger.info(f"Tentative de sauvegarde des données d'embeddings vers {output_path}")
     try:
-        # S'assurer que le répertoire parent existe
-        # Commentaire : S'assure que le répertoire de destination existe avant d'écrire le fichier.
-        # L'option `parents=True` crée les répertoires parents nécessaires.
-        # `exist_ok=True` évite une erreur si le répertoire existe déjà.
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        logger.debug(f"Répertoire parent {output_path.parent} pour la sauvegarde vérifié/créé.")
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Commentaire : Utilisation de json.dump pour sérialiser le dictionnaire en JSON.
-            # `ensure_ascii=False` permet de sauvegarder correctement les caractères non-ASCII.
-            # `indent=4` formate le JSON pour une meilleure lisibilité.
-            json.dump(embeddings_data, f, ensure_ascii=False, indent=4)
-        
-        logger.info(f"[OK] Données d'embeddings sauvegardées avec succès dans {output_path}")
+        if record_id is None:
+            record_id = str(embeddings_data.get("source_id", "default"))
+        metadata = {key: value for key, value in embeddings_data.items() if key != "embeddings"}
+
+        if store is None:
+            store = EmbeddingStore(output_path, dtype=dtype)
+        start, stop = store.append(record_id, embeddings_data["embeddings"], metadata=metadata)
+
+        logger.info(f"[OK] Embeddings de '{record_id}' sauvegardés dans {output_path} (lignes {start}-{stop}).")
         return True
     except IOError as e: # Gestion spécifique des erreurs d'entrée/sortie
         logger.error(f"❌ Erreur d'E/S lors de la sauvegarde des embeddings dans {output_path}: {e}", exc_info=True)
@@ -249,15 +249,15 @@ class GroupChatOrchestration:
         
         self.logger.info(f"Coordination d'analyse asynchrone avec {len(target_agents)} agents")
         
-        # Préparer les tâches d'analyse
+        # Préparer les tâches d'analyse (le timeout de chaque tâche est borné par le timeout global)
         analysis_tasks = []
+        task_agents = []
         for agent_id in target_agents:
             if agent_id in self.active_agents:
                 task_def = {
                     'func': self._analyze_with_agent,
                     'args': (agent_id, text),
                     'kwargs': {},
-                    'timeout': timeout / len(target_agents),
                     'fallback_result': {
                         "agent_id": agent_id,
                         "analysis_type": self._get_agent_type(agent_id),
@@ -268,6 +268,7 @@ class GroupChatOrchestration:
                     }
                 }
                 analysis_tasks.append(task_def)
+                task_agents.append(agent_id)
         
         # Exécuter les analyses en parallèle
         start_time = datetime.now()
@@ -277,12 +278,8 @@ class GroupChatOrchestration:
             global_timeout=timeout
         )
         
-        # Convertir la liste en dictionnaire
-        individual_results = {}
-        for i, result in enumerate(individual_results_list):
-            if i < len(target_agents):
-                agent_id = target_agents[i]
-                individual_results[agent_id] = result
+        # Convertir la liste (dans l'ordre des tâches) en dictionnaire
+        individual_results = dict(zip(task_agents, individual_results_list))
         
         # Résultats consolidés
         collaborative_results = {
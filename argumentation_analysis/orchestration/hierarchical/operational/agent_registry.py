@@ -151,18 +151,20 @@ class OperationalAgentRegistry:
         
         return best_agent
     
-    async def process_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_task(self, task: Dict[str, Any], agent: Optional[OperationalAgent] = None) -> Dict[str, Any]:
         """
         Traite une tâche en sélectionnant l'agent approprié.
         
         Args:
             task: La tâche à traiter
+            agent: L'agent déjà sélectionné pour la tâche. Si None, il est sélectionné ici.
             
         Returns:
             Le résultat du traitement de la tâche
         """
         # Sélectionner l'agent approprié
-        agent = await self.select_agent_for_task(task)
+        if agent is None:
+            agent = await self.select_agent_for_task(task)
         
         if not agent:
             return {
@@ -7,6 +7,8 @@ d'interface entre le niveau tactique et les agents opérationnels.
 
 import logging
 import asyncio
+import heapq
+import time
 from typing import Dict, List, Any, Optional, Union, Callable
 from datetime import datetime
 import uuid
@@ -24,6 +26,14 @@ from argumentation_analysis.core.communication import (
     ChannelType, MessagePriority, MessageType, AgentLevel
 )
 
+# Rang de dépilement de chaque priorité (les rangs les plus faibles sont traités en premier)
+PRIORITY_RANKS = {
+    MessagePriority.CRITICAL: 0,
+    MessagePriority.HIGH: 1,
+    MessagePriority.NORMAL: 2,
+    MessagePriority.LOW: 3
+}
+
 
 class OperationalManager:
     """
@@ -38,7 +48,11 @@ class OperationalManager:
                  tactical_operational_interface: Optional['TacticalOperationalInterface'] = None,
                  middleware: Optional[MessageMiddleware] = None,
                  kernel: Optional[sk.Kernel] = None,  # Ajout du kernel
-                 llm_service_id: Optional[str] = None): # Ajout de llm_service_id
+                 llm_service_id: Optional[str] = None, # Ajout de llm_service_id
+                 num_workers: int = 4,
+                 agent_concurrency: Optional[Dict[str, int]] = None,
+                 default_agent_concurrency: int = 1,
+                 max_queue_size: int = 100):
         """
         Initialise un nouveau gestionnaire opérationnel.
         
@@ -48,6 +62,12 @@ class OperationalManager:
             middleware: Le middleware de communication à utiliser.
             kernel: Le kernel Semantic Kernel à utiliser pour les agents.
             llm_service_id: L'ID du service LLM à utiliser.
+            num_workers: Nombre de workers traitant la file d'attente en parallèle.
+            agent_concurrency: Nombre maximal de tâches simultanées par type d'agent
+                (par exemple {"informal": 2}).
+            default_agent_concurrency: Limite appliquée aux types d'agents absents de `agent_concurrency`.
+            max_queue_size: Nombre maximal de tâches en attente avant que l'ajout d'une
+                tâche ne soit suspendu.
         """
         self.operational_state = operational_state if operational_state else OperationalState()
         self.tactical_operational_interface = tactical_operational_interface
@@ -59,10 +79,30 @@ class OperationalManager:
             llm_service_id=self.llm_service_id
         )
         self.logger = logging.getLogger("OperationalManager")
-        self.task_queue = asyncio.Queue()
-        self.result_queue = asyncio.Queue()
+        self.num_workers = max(1, num_workers)
+        self.agent_concurrency = dict(agent_concurrency or {})
+        self.default_agent_concurrency = default_agent_concurrency
+        self.max_queue_size = max(1, max_queue_size)
+        self.task_queue = asyncio.PriorityQueue()
         self.running = False
-        self.worker_task = None
+        self.worker_tasks: List[asyncio.Task] = []
+        
+        # État du pool de workers
+        self._queue_capacity = asyncio.Semaphore(self.max_queue_size)
+        self._task_sequence = 0
+        self._deferred_tasks: Dict[str, List[tuple]] = {}
+        self._agent_active: Dict[str, int] = {}
+        self._busy_workers = 0
+        self._pool_metrics = {
+            "tasks_enqueued": 0,
+            "tasks_completed": 0,
+            "tasks_failed": 0,
+            "max_queue_depth": 0,
+            "backpressure_waits": 0,
+            "wait_time_ms": self._new_timing_stats(),
+            "service_time_ms": self._new_timing_stats(),
+            "agents": {}
+        }
         
         # Initialiser le middleware de communication
         self.middleware = middleware if middleware else MessageMiddleware()
@@ -95,8 +135,8 @@ class OperationalManager:
             return
         
         self.running = True
-        self.worker_task = asyncio.create_task(self._worker())
-        self.logger.info("Gestionnaire opérationnel démarré")
+        self.worker_tasks = [asyncio.create_task(self._worker(index)) for index in range(self.num_workers)]
+        self.logger.info(f"Gestionnaire opérationnel démarré avec {self.num_workers} workers")
     
     async def stop(self) -> None:
         """
@@ -107,13 +147,17 @@ class OperationalManager:
             return
         
         self.running = False
-        if self.worker_task:
-            self.worker_task.cancel()
-            try:
-                await self.worker_task
-            except asyncio.CancelledError:
-                pass
-            self.worker_task = None
+        for worker_task in self.worker_tasks:
+            worker_task.cancel()
+        await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+        self.worker_tasks = []
+        
+        # Remettre en file les tâches mises de côté pour qu'elles soient traitées au redémarrage
+        for deferred in self._deferred_tasks.values():
+            for entry in deferred:
+                self.task_queue.put_nowait(entry)
+                self.task_queue.task_done()
+        self._deferred_tasks.clear()
         
         self.logger.info("Gestionnaire opérationnel arrêté")
     
@@ -168,8 +212,12 @@ class OperationalManager:
             sender_id: L'identifiant de l'expéditeur de la tâche
         """
         try:
+            # Créer un futur pour attendre le résultat de cette tâche
+            result_future = asyncio.Future()
+            self.operational_state.add_result_future(task.get("id"), result_future)
+            
             # Ajouter la tâche à la file d'attente
-            await self.task_queue.put(task)
+            await self._enqueue_task(task)
             
             # Envoyer une notification de début de traitement
             self.adapter.send_status_update(
@@ -183,7 +231,7 @@ class OperationalManager:
             )
             
             # Attendre le résultat
-            operational_result = await self.result_queue.get()
+            operational_result = await result_future
             
             # Traduire le résultat opérationnel en résultat tactique
             if self.tactical_operational_interface:
@@ -231,7 +279,7 @@ class OperationalManager:
             capabilities = await self.get_agent_capabilities()
             
             # Récupérer les tâches en cours
-            tasks_in_progress = self.operational_state.get_tasks_in_progress()
+            tasks_in_progress = self.operational_state.get_in_progress_tasks()
             
             # Créer le statut
             status = {
@@ -240,6 +288,7 @@ class OperationalManager:
                 "tasks_in_progress": len(tasks_in_progress),
                 "tasks_completed": len(self.operational_state.get_completed_tasks()),
                 "tasks_failed": len(self.operational_state.get_failed_tasks()),
+                "task_pool": self.get_task_pool_metrics(),
                 "is_running": self.running
             }
             
@@ -303,7 +352,7 @@ class OperationalManager:
             self.operational_state.add_result_future(operational_task["id"], result_future)
             
             # Ajouter la tâche à la file d'attente
-            await self.task_queue.put(operational_task)
+            await self._enqueue_task(operational_task)
             
             # Attendre le résultat
             operational_result = await result_future
@@ -330,85 +379,237 @@ class OperationalManager:
                 }]
             }
     
-    async def _worker(self) -> None:
+    async def _worker(self, worker_index: int = 0) -> None:
         """
         Traite les tâches de la file d'attente.
+        
+        Une tâche destinée à un agent ayant atteint sa limite de concurrence est mise
+        de côté ; elle sera traitée par le worker qui libère l'agent, ce qui évite de
+        bloquer les tâches destinées aux autres agents.
+        
+        Args:
+            worker_index: Numéro du worker dans le pool
         """
-        self.logger.info("Worker opérationnel démarré")
+        self.logger.info(f"Worker opérationnel {worker_index} démarré")
         
         while self.running:
             try:
-                # Récupérer une tâche de la file d'attente
-                task = await self.task_queue.get()
-                
-                # Traiter la tâche
-                result = await self.agent_registry.process_task(task)
-                
-                # Récupérer le futur associé à la tâche
-                result_future = self.operational_state.get_result_future(task["id"])
-                
-                if result_future and not result_future.done():
-                    # Définir le résultat du futur
-                    result_future.set_result(result)
+                # Récupérer la tâche la plus prioritaire de la file d'attente
+                entry = await self.task_queue.get()
+                task = entry[3]
                 
-                # Ajouter le résultat à la file d'attente des résultats
-                await self.result_queue.put(result)
+                try:
+                    agent = await self.agent_registry.select_agent_for_task(task)
+                except Exception as e:
+                    self.logger.error(f"Erreur lors de la sélection de l'agent pour la tâche {task.get('id', 'unknown')}: {e}")
+                    agent = None
+                agent_type = self._get_agent_type(agent)
                 
-                # Publier le résultat sur le canal de données
-                self.middleware.publish(
-                    topic_id=f"operational_results.{task['id']}",
-                    sender="operational_manager",
-                    sender_level=AgentLevel.OPERATIONAL,
-                    content={
-                        "result_type": "task_completion",
-                        "result_data": result
-                    },
-                    priority=self._map_priority_to_enum(task.get("priority", "medium"))
-                )
+                if agent_type is not None and self._agent_active.get(agent_type, 0) >= self._get_agent_limit(agent_type):
+                    # L'agent est saturé : la tâche attend qu'un de ses créneaux se libère
+                    heapq.heappush(self._deferred_tasks.setdefault(agent_type, []), entry)
+                    continue
                 
-                # Marquer la tâche comme terminée
-                self.task_queue.task_done()
+                await self._run_agent_tasks(agent_type, agent, entry)
             
             except asyncio.CancelledError:
-                self.logger.info("Worker opérationnel annulé")
+                self.logger.info(f"Worker opérationnel {worker_index} annulé")
                 break
             
             except Exception as e:
-                self.logger.error(f"Erreur dans le worker opérationnel: {e}")
-                
-                # Créer un résultat d'erreur
-                error_result = {
-                    "id": f"result-error-{uuid.uuid4().hex[:8]}",
-                    "task_id": task.get("id", "unknown") if 'task' in locals() else "unknown",
-                    "tactical_task_id": task.get("tactical_task_id", "unknown") if 'task' in locals() else "unknown",
-                    "status": "failed",
-                    "outputs": {},
-                    "metrics": {},
-                    "issues": [{
-                        "type": "worker_error",
-                        "description": f"Erreur dans le worker opérationnel: {str(e)}",
-                        "severity": "high",
-                        "details": {
-                            "exception": str(e)
-                        }
-                    }]
-                }
-                
-                # Récupérer le futur associé à la tâche
-                if 'task' in locals():
-                    result_future = self.operational_state.get_result_future(task["id"])
-                    
-                    if result_future and not result_future.done():
-                        # Définir le résultat du futur
-                        result_future.set_result(error_result)
-                
-                # Ajouter le résultat d'erreur à la file d'attente des résultats
-                try:
-                    await self.result_queue.put(error_result)
-                except Exception as e2:
-                    self.logger.error(f"Erreur lors de l'ajout du résultat d'erreur à la file d'attente: {e2}")
+                self.logger.error(f"Erreur dans le worker opérationnel {worker_index}: {e}")
+        
+        self.logger.info(f"Worker opérationnel {worker_index} arrêté")
+    
+    async def _run_agent_tasks(self, agent_type: Optional[str], agent: Any, entry: tuple) -> None:
+        """
+        Traite une tâche puis, tant que le créneau de l'agent est occupé, les tâches
+        mises de côté pour ce même agent.
+        
+        Args:
+            agent_type: Le type de l'agent sélectionné (None si aucun agent ne convient)
+            agent: L'agent sélectionné
+            entry: L'entrée de la file d'attente (rang de priorité, séquence, date d'ajout, tâche)
+        """
+        if agent_type is not None:
+            self._agent_active[agent_type] = self._agent_active.get(agent_type, 0) + 1
+        self._busy_workers += 1
+        try:
+            while entry is not None:
+                await self._execute_task(agent_type, agent, entry)
+                deferred = self._deferred_tasks.get(agent_type) if agent_type is not None else None
+                entry = heapq.heappop(deferred) if deferred else None
+        finally:
+            self._busy_workers -= 1
+            if agent_type is not None:
+                self._agent_active[agent_type] -= 1
+    
+    async def _execute_task(self, agent_type: Optional[str], agent: Any, entry: tuple) -> None:
+        """
+        Exécute une tâche avec l'agent sélectionné et publie son résultat.
+        
+        Args:
+            agent_type: Le type de l'agent sélectionné
+            agent: L'agent sélectionné
+            entry: L'entrée de la file d'attente (rang de priorité, séquence, date d'ajout, tâche)
+        """
+        _, _, enqueued_at, task = entry
+        started_at = time.perf_counter()
+        self._queue_capacity.release()
+        self._record_timing(self._pool_metrics["wait_time_ms"], (started_at - enqueued_at) * 1000)
+        
+        try:
+            # Traiter la tâche
+            result = await self.agent_registry.process_task(task, agent=agent)
+        except Exception as e:
+            self.logger.error(f"Erreur dans le worker opérationnel: {e}")
+            
+            # Créer un résultat d'erreur
+            result = {
+                "id": f"result-error-{uuid.uuid4().hex[:8]}",
+                "task_id": task.get("id", "unknown"),
+                "tactical_task_id": task.get("tactical_task_id", "unknown"),
+                "status": "failed",
+                "outputs": {},
+                "metrics": {},
+                "issues": [{
+                    "type": "worker_error",
+                    "description": f"Erreur dans le worker opérationnel: {str(e)}",
+                    "severity": "high",
+                    "details": {
+                        "exception": str(e)
+                    }
+                }]
+            }
+        finally:
+            self.task_queue.task_done()
+        
+        service_time_ms = (time.perf_counter() - started_at) * 1000
+        self._record_timing(self._pool_metrics["service_time_ms"], service_time_ms)
+        if agent_type is not None:
+            agent_metrics = self._pool_metrics["agents"].setdefault(
+                agent_type, {"completed": 0, "service_time_ms": self._new_timing_stats()}
+            )
+            agent_metrics["completed"] += 1
+            self._record_timing(agent_metrics["service_time_ms"], service_time_ms)
+        self._pool_metrics["tasks_completed"] += 1
+        if result.get("status") == "failed":
+            self._pool_metrics["tasks_failed"] += 1
+        
+        # Récupérer le futur associé à la tâche
+        result_future = self.operational_state.get_result_future(task.get("id"))
+        
+        if result_future and not result_future.done():
+            # Définir le résultat du futur
+            result_future.set_result(result)
+        
+        try:
+            # Publier le résultat sur le canal de données
+            self.middleware.publish(
+                topic_id=f"operational_results.{task.get('id')}",
+                sender="operational_manager",
+                sender_level=AgentLevel.OPERATIONAL,
+                content={
+                    "result_type": "task_completion",
+                    "result_data": result
+                },
+                priority=self._map_priority_to_enum(task.get("priority", "medium"))
+            )
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la publication du résultat de la tâche {task.get('id')}: {e}")
+    
+    async def _enqueue_task(self, task: Dict[str, Any]) -> None:
+        """
+        Ajoute une tâche à la file d'attente selon sa priorité.
+        
+        Lorsque le nombre de tâches en attente atteint `max_queue_size`, l'appel
+        attend qu'une tâche soit prise en charge (contre-pression).
         
-        self.logger.info("Worker opérationnel arrêté")
+        Args:
+            task: La tâche opérationnelle à ajouter
+        """
+        if self._queue_capacity.locked():
+            self._pool_metrics["backpressure_waits"] += 1
+            self.logger.debug(f"File d'attente opérationnelle pleine, la tâche {task.get('id')} attend")
+        await self._queue_capacity.acquire()
+        
+        priority = self._map_priority_to_enum(task.get("priority", "medium"))
+        self._task_sequence += 1
+        await self.task_queue.put((PRIORITY_RANKS[priority], self._task_sequence, time.perf_counter(), task))
+        
+        self._pool_metrics["tasks_enqueued"] += 1
+        self._pool_metrics["max_queue_depth"] = max(self._pool_metrics["max_queue_depth"], self._get_queue_depth())
+    
+    def _get_agent_type(self, agent: Any) -> Optional[str]:
+        """Retrouve le type sous lequel un agent est enregistré dans le registre."""
+        if agent is None:
+            return None
+        for agent_type, registered_agent in self.agent_registry.agents.items():
+            if registered_agent is agent:
+                return agent_type
+        return getattr(agent, "name", str(agent))
+    
+    def _get_agent_limit(self, agent_type: str) -> int:
+        """Retourne le nombre maximal de tâches simultanées pour un type d'agent."""
+        return max(1, self.agent_concurrency.get(agent_type, self.default_agent_concurrency))
+    
+    def _get_queue_depth(self) -> int:
+        """Retourne le nombre de tâches en attente, y compris celles mises de côté."""
+        return self.task_queue.qsize() + sum(len(tasks) for tasks in self._deferred_tasks.values())
+    
+    @staticmethod
+    def _new_timing_stats() -> Dict[str, float]:
+        return {"count": 0, "total": 0.0, "max": 0.0}
+    
+    @staticmethod
+    def _record_timing(stats: Dict[str, float], value_ms: float) -> None:
+        stats["count"] += 1
+        stats["total"] += value_ms
+        stats["max"] = max(stats["max"], value_ms)
+    
+    @staticmethod
+    def _summarize_timing(stats: Dict[str, float]) -> Dict[str, float]:
+        return {
+            "count": stats["count"],
+            "avg": stats["total"] / stats["count"] if stats["count"] else 0.0,
+            "max": stats["max"]
+        }
+    
+    def get_task_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Récupère les métriques du pool de workers.
+        
+        Returns:
+            Un dictionnaire contenant la profondeur de la file d'attente, les temps
+            d'attente et de service (en millisecondes) et l'activité de chaque agent
+        """
+        agents = {}
+        for agent_type in set(self._pool_metrics["agents"]) | set(self._agent_active) | set(self._deferred_tasks):
+            agent_metrics = self._pool_metrics["agents"].get(agent_type, {})
+            agents[agent_type] = {
+                "active": self._agent_active.get(agent_type, 0),
+                "limit": self._get_agent_limit(agent_type),
+                "deferred": len(self._deferred_tasks.get(agent_type, [])),
+                "completed": agent_metrics.get("completed", 0),
+                "service_time_ms": self._summarize_timing(
+                    agent_metrics.get("service_time_ms", self._new_timing_stats())
+                )
+            }
+        
+        return {
+            "num_workers": self.num_workers,
+            "busy_workers": self._busy_workers,
+            "queue_depth": self._get_queue_depth(),
+            "max_queue_depth": self._pool_metrics["max_queue_depth"],
+            "queue_capacity": self.max_queue_size,
+            "backpressure_waits": self._pool_metrics["backpressure_waits"],
+            "tasks_enqueued": self._pool_metrics["tasks_enqueued"],
+            "tasks_completed": self._pool_metrics["tasks_completed"],
+            "tasks_failed": self._pool_metrics["tasks_failed"],
+            "wait_time_ms": self._summarize_timing(self._pool_metrics["wait_time_ms"]),
+            "service_time_ms": self._summarize_timing(self._pool_metrics["service_time_ms"]),
+            "agents": agents
+        }
     
     async def get_agent_capabilities(self) -> Dict[str, List[str]]:
         """
@@ -430,9 +631,13 @@ class OperationalManager:
         """
         Récupère l'état opérationnel.
         
+        Les métriques du pool de workers sont actualisées dans
+        `operational_metrics["task_pool"]`.
+        
         Returns:
             L'état opérationnel
         """
+        self.operational_state.operational_metrics["task_pool"] = self.get_task_pool_metrics()
         return self.operational_state
     
     def _map_priority_to_enum(self, priority: str) -> MessagePriority:
@@ -440,12 +645,13 @@ class OperationalManager:
         Convertit une priorité textuelle en valeur d'énumération MessagePriority.
         
         Args:
-            priority: La priorité textuelle ("high", "medium", "low")
+            priority: La priorité textuelle ("critical", "high", "medium", "low")
             
         Returns:
             La valeur d'énumération MessagePriority correspondante
         """
         priority_map = {
+            "critical": MessagePriority.CRITICAL,
             "high": MessagePriority.HIGH,
             "medium": MessagePriority.NORMAL,
             "low": MessagePriority.LOW
@@ -461,9 +667,10 @@ class OperationalManager:
             # Créer le statut
             status = {
                 "timestamp": datetime.now().isoformat(),
-                "tasks_in_progress": len(self.operational_state.get_tasks_in_progress()),
+                "tasks_in_progress": len(self.operational_state.get_in_progress_tasks()),
                 "tasks_completed": len(self.operational_state.get_completed_tasks()),
                 "tasks_failed": len(self.operational_state.get_failed_tasks()),
+                "task_pool": self.get_task_pool_metrics(),
                 "is_running": self.running
             }
             
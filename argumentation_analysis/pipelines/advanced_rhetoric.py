@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
 """
 Pipeline pour l'analyse rhétorique avancée de multiples extraits.
+
+Deux modes d'exécution sont disponibles :
+- séquentiel : les extraits sont analysés un à un et l'ensemble des résultats est
+  sauvegardé dans un fichier JSON à la fin ;
+- parallèle (`max_workers`) : les extraits sont répartis par lots entre des
+  processus qui initialisent chacun les outils d'analyse une seule fois. Chaque
+  résultat est ajouté au fichier JSON Lines de sortie dès qu'il est disponible, et
+  une exécution interrompue reprend en ignorant les extraits déjà présents.
 """
 
 import logging
 import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from tqdm import tqdm
 
 # Imports des outils réels (à gérer avec try-except si nécessaire dans un contexte plus large)
@@ -26,11 +36,77 @@ from argumentation_analysis.orchestration.advanced_analyzer import analyze_extra
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SHARD_SIZE = 4
+
+# Outils d'analyse d'un processus de travail, initialisés une seule fois par processus
+_worker_tools: Optional[Dict[str, Any]] = None
+
+ExtractJob = Tuple[Dict[str, Any], str, Optional[Dict[str, Any]]]
+
+
+def _create_advanced_tools(use_real_tools: bool) -> Dict[str, Any]:
+    """Initialise les outils d'analyse avancés (réels si demandés et disponibles, sinon mocks)."""
+    if use_real_tools and REAL_TOOLS_AVAILABLE:
+        try:
+            tools = {
+                "complex_fallacy_analyzer": EnhancedComplexFallacyAnalyzer(),
+                "contextual_fallacy_analyzer": EnhancedContextualFallacyAnalyzer(),
+                "fallacy_severity_evaluator": EnhancedFallacySeverityEvaluator(),
+                "rhetorical_result_analyzer": EnhancedRhetoricalResultAnalyzer()
+            }
+            logger.info("[OK] Outils d'analyse rhétorique avancés (réels) initialisés.")
+            return tools
+        except Exception as e: # Attraper une exception plus large au cas où l'init échoue
+            logger.warning(f"Erreur lors de l'initialisation des outils réels: {e}. Utilisation des mocks.")
+            return create_mock_advanced_rhetorical_tools()
+
+    if use_real_tools and not REAL_TOOLS_AVAILABLE:
+        logger.warning("Les outils réels ont été demandés mais ne sont pas disponibles. Utilisation des mocks.")
+    tools = create_mock_advanced_rhetorical_tools()
+    logger.info("[OK] Outils d'analyse rhétorique avancés (mocks) initialisés.")
+    return tools
+
+
+def _index_base_results(base_results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Indexe les résultats de l'analyse de base par clé `source:extrait`."""
+    base_results_dict: Dict[str, Dict[str, Any]] = {}
+    for result in base_results:
+        extract_name = result.get("extract_name")
+        source_name = result.get("source_name")
+        if extract_name and source_name:
+            key = f"{source_name}:{extract_name}"
+            base_results_dict[key] = result
+    return base_results_dict
+
+
+def _analyze_extract_safely(
+    extract_def: Dict[str, Any],
+    source_name: str,
+    base_result_for_extract: Optional[Dict[str, Any]],
+    tools: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Analyse un extrait ; une erreur produit une entrée d'erreur au lieu d'interrompre le pipeline."""
+    extract_name = extract_def.get("extract_name", "Extrait sans nom")
+    try:
+        # Appel à la fonction d'orchestration pour un seul extrait
+        return analyze_extract_advanced(extract_def, source_name, base_result_for_extract, tools)
+    except Exception as e:
+        logger.error(f"Erreur dans le pipeline pour l'extrait '{extract_name}': {e}", exc_info=True)
+        return {
+            "extract_name": extract_name,
+            "source_name": source_name,
+            "error": f"Erreur de pipeline: {str(e)}"
+        }
+
+
 def run_advanced_rhetoric_pipeline(
     extract_definitions: List[Dict[str, Any]],
     base_results: List[Dict[str, Any]],
     output_file: Path,
-    use_real_tools: bool = False # Paramètre pour choisir entre outils réels et mocks
+    use_real_tools: bool = False, # Paramètre pour choisir entre outils réels et mocks
+    max_workers: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    resume: bool = True
 ) -> None:
     """
     Analyse tous les extraits avec les outils avancés et sauvegarde les résultats.
@@ -55,38 +131,30 @@ def run_advanced_rhetoric_pipeline(
                            réels (si disponibles) ou les versions mockées.
                            Par défaut à False (utilise les mocks).
     :type use_real_tools: bool
+    :param max_workers: Nombre de processus d'analyse. S'il est positif, active le mode
+                        parallèle : les résultats sont écrits au fil de l'eau au
+                        format JSON Lines (voir `run_advanced_rhetoric_pipeline_parallel`).
+                        Par défaut (None) ou à 0, les extraits sont analysés séquentiellement.
+    :type max_workers: Optional[int]
+    :param shard_size: Nombre d'extraits par lot confié à un processus (mode parallèle).
+    :type shard_size: int
+    :param resume: En mode parallèle, reprendre à partir d'un fichier de sortie partiel.
+    :type resume: bool
     :return: None
     :rtype: None
     """
+    if max_workers:
+        run_advanced_rhetoric_pipeline_parallel(
+            extract_definitions, base_results, output_file, use_real_tools,
+            max_workers=max_workers, shard_size=shard_size, resume=resume
+        )
+        return
+
     logger.info("Démarrage du pipeline d'analyse rhétorique avancée...")
     
     # Initialiser les outils d'analyse avancés
-    tools: Dict[str, Any]
-    if use_real_tools and REAL_TOOLS_AVAILABLE:
-        try:
-            tools = {
-                "complex_fallacy_analyzer": EnhancedComplexFallacyAnalyzer(),
-                "contextual_fallacy_analyzer": EnhancedContextualFallacyAnalyzer(),
-                "fallacy_severity_evaluator": EnhancedFallacySeverityEvaluator(),
-                "rhetorical_result_analyzer": EnhancedRhetoricalResultAnalyzer()
-            }
-            logger.info("[OK] Outils d'analyse rhétorique avancés (réels) initialisés.")
-        except Exception as e: # Attraper une exception plus large au cas où l'init échoue
-            logger.warning(f"Erreur lors de l'initialisation des outils réels: {e}. Utilisation des mocks.")
-            tools = create_mock_advanced_rhetorical_tools()
-    else:
-        if use_real_tools and not REAL_TOOLS_AVAILABLE:
-            logger.warning("Les outils réels ont été demandés mais ne sont pas disponibles. Utilisation des mocks.")
-        tools = create_mock_advanced_rhetorical_tools()
-        logger.info("[OK] Outils d'analyse rhétorique avancés (mocks) initialisés.")
-            
-    base_results_dict: Dict[str, Dict[str, Any]] = {}
-    for result in base_results:
-        extract_name = result.get("extract_name")
-        source_name = result.get("source_name")
-        if extract_name and source_name:
-            key = f"{source_name}:{extract_name}"
-            base_results_dict[key] = result
+    tools = _create_advanced_tools(use_real_tools)
+    base_results_dict = _index_base_results(base_results)
     
     total_extracts = sum(len(source.get("extracts", [])) for source in extract_definitions)
     logger.info(f"Pipeline d'analyse avancée pour {total_extracts} extraits...")
@@ -104,19 +172,9 @@ def run_advanced_rhetoric_pipeline(
             key = f"{source_name}:{extract_name}"
             base_result_for_extract = base_results_dict.get(key)
             
-            try:
-                # Appel à la fonction d'orchestration pour un seul extrait
-                single_extract_results = analyze_extract_advanced(
-                    extract_def, source_name, base_result_for_extract, tools
-                )
-                all_pipeline_results.append(single_extract_results)
-            except Exception as e:
-                logger.error(f"Erreur dans le pipeline pour l'extrait '{extract_name}': {e}", exc_info=True)
-                all_pipeline_results.append({
-                    "extract_name": extract_name,
-                    "source_name": source_name,
-                    "error": f"Erreur de pipeline: {str(e)}"
-                })
+            all_pipeline_results.append(
+                _analyze_extract_safely(extract_def, source_name, base_result_for_extract, tools)
+            )
             
             progress_bar.update(1)
     
@@ -128,4 +186,172 @@ def run_advanced_rhetoric_pipeline(
             json.dump(all_pipeline_results, f, ensure_ascii=False, indent=2)
         logger.info(f"[OK] Résultats du pipeline d'analyse avancée sauvegardés dans {output_file}")
     except Exception as e:
-        logger.error(f"❌ Erreur lors de la sauvegarde des résultats du pipeline: {e}", exc_info=True)
\ No newline at end of file
+        logger.error(f"❌ Erreur lors de la sauvegarde des résultats du pipeline: {e}", exc_info=True)
+
+
+def load_completed_extracts(output_file: Path) -> Set[str]:
+    """
+    Lit un fichier de résultats JSON Lines partiel et retourne les extraits terminés.
+
+    Les extraits en erreur ne sont pas considérés comme terminés et seront analysés à
+    nouveau. Le fichier est compacté pour que la reprise n'y laisse qu'un résultat par
+    extrait : les lignes d'erreur, les doublons, les lignes illisibles et une dernière
+    ligne incomplète (interruption pendant l'écriture) en sont supprimés.
+
+    :param output_file: Fichier JSON Lines de sortie du mode parallèle.
+    :type output_file: Path
+    :return: Clés `source:extrait` des extraits analysés avec succès.
+    :rtype: Set[str]
+    """
+    completed: Set[str] = set()
+    if not output_file.exists():
+        return completed
+
+    compacted_file = output_file.with_name(output_file.name + ".tmp")
+    dropped = 0
+    with open(output_file, 'rb') as f, open(compacted_file, 'wb') as compacted:
+        for line in f:
+            if not line.endswith(b"\n"):
+                logger.warning(f"Dernière ligne incomplète supprimée de {output_file}")
+                dropped += 1
+                break
+            try:
+                result = json.loads(line)
+            except ValueError:
+                logger.warning(f"Ligne illisible supprimée de {output_file}")
+                dropped += 1
+                continue
+            key = f"{result.get('source_name')}:{result.get('extract_name')}" if isinstance(result, dict) else None
+            if key is None or "error" in result or key in completed:
+                dropped += 1
+                continue
+            completed.add(key)
+            compacted.write(line)
+
+    if dropped:
+        os.replace(compacted_file, output_file)
+        logger.info(f"{dropped} ligne(s) obsolète(s) retirée(s) de {output_file} avant la reprise")
+    else:
+        compacted_file.unlink()
+    return completed
+
+
+def _init_worker(use_real_tools: bool) -> None:
+    global _worker_tools
+    _worker_tools = _create_advanced_tools(use_real_tools)
+
+
+def _analyze_shard(shard: List[ExtractJob]) -> List[Dict[str, Any]]:
+    return [_analyze_extract_safely(extract_def, source_name, base_result, _worker_tools)
+            for extract_def, source_name, base_result in shard]
+
+
+def _iter_shards(
+    extract_definitions: List[Dict[str, Any]],
+    base_results_dict: Dict[str, Dict[str, Any]],
+    completed: Set[str],
+    shard_size: int
+) -> Iterator[List[ExtractJob]]:
+    shard: List[ExtractJob] = []
+    for source in extract_definitions:
+        source_name = source.get("source_name", "Source sans nom")
+        for extract_def in source.get("extracts", []):
+            key = f"{source_name}:{extract_def.get('extract_name', 'Extrait sans nom')}"
+            if key in completed:
+                continue
+            shard.append((extract_def, source_name, base_results_dict.get(key)))
+            if len(shard) >= shard_size:
+                yield shard
+                shard = []
+    if shard:
+        yield shard
+
+
+def run_advanced_rhetoric_pipeline_parallel(
+    extract_definitions: List[Dict[str, Any]],
+    base_results: List[Dict[str, Any]],
+    output_file: Path,
+    use_real_tools: bool = False,
+    max_workers: Optional[int] = None,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    resume: bool = True
+) -> Dict[str, int]:
+    """
+    Analyse les extraits dans un pool de processus et écrit les résultats au fil de l'eau.
+
+    Les extraits sont regroupés en lots de `shard_size` ; chaque processus initialise
+    les outils d'analyse une seule fois. Seuls quelques lots sont en cours à un instant
+    donné et chaque résultat est ajouté au fichier JSON Lines dès la fin de son lot :
+    la mémoire utilisée ne dépend pas du nombre d'extraits. Les résultats sont écrits
+    dans l'ordre où ils se terminent.
+
+    :param extract_definitions: Liste des définitions d'extraits à analyser.
+    :type extract_definitions: List[Dict[str, Any]]
+    :param base_results: Résultats de l'analyse de base correspondants aux extraits.
+    :type base_results: List[Dict[str, Any]]
+    :param output_file: Fichier JSON Lines de sortie (un résultat par ligne).
+    :type output_file: Path
+    :param use_real_tools: Utiliser les outils d'analyse réels (si disponibles).
+    :type use_real_tools: bool
+    :param max_workers: Nombre de processus (par défaut, le nombre de processeurs).
+    :type max_workers: Optional[int]
+    :param shard_size: Nombre d'extraits par lot confié à un processus.
+    :type shard_size: int
+    :param resume: Ignorer les extraits déjà présents (sans erreur) dans `output_file`,
+                   compacté au préalable (voir `load_completed_extracts`) ; si False,
+                   le fichier est réécrit.
+    :type resume: bool
+    :return: Compteurs `total`, `skipped`, `analyzed` et `errors`.
+    :rtype: Dict[str, int]
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    shard_size = max(1, shard_size)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    completed = load_completed_extracts(output_file) if resume else set()
+    total_extracts = sum(len(source.get("extracts", [])) for source in extract_definitions)
+    base_results_dict = _index_base_results(base_results)
+    counts = {"total": total_extracts, "skipped": 0, "analyzed": 0, "errors": 0}
+    for source in extract_definitions:
+        source_name = source.get("source_name", "Source sans nom")
+        counts["skipped"] += sum(
+            1 for extract_def in source.get("extracts", [])
+            if f"{source_name}:{extract_def.get('extract_name', 'Extrait sans nom')}" in completed
+        )
+
+    logger.info(f"Pipeline d'analyse avancée parallèle pour {total_extracts} extraits "
+                f"({counts['skipped']} déjà analysés, {max_workers} processus)...")
+
+    shards = _iter_shards(extract_definitions, base_results_dict, completed, shard_size)
+    progress_bar = tqdm(total=total_extracts - counts["skipped"], desc="Pipeline d'analyse avancée", unit="extrait")
+
+    with open(output_file, 'a' if resume else 'w', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                initargs=(use_real_tools,)) as executor:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            # Limiter le nombre de lots en cours pour borner la mémoire
+            while not exhausted and len(pending) < max_workers * 2:
+                shard = next(shards, None)
+                if shard is None:
+                    exhausted = True
+                else:
+                    pending.add(executor.submit(_analyze_shard, shard))
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+                    counts["analyzed"] += 1
+                    if "error" in result:
+                        counts["errors"] += 1
+                    progress_bar.update(1)
+                out.flush()
+
+    progress_bar.close()
+    logger.info(f"[OK] {counts['analyzed']} résultats ajoutés à {output_file} "
+                f"({counts['errors']} erreurs, {counts['skipped']} extraits repris)")
+    return counts
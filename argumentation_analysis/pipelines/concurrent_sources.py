@@ -0,0 +1,351 @@
+"""
+Traitement concurrent et reprenable des sources du pipeline d'embeddings.
+
+Les récupérations (réseau ou disque) s'exécutent sur un pool de threads borné,
+avec une limite de requêtes simultanées par hôte pour ne pas saturer un même
+serveur. Chaque texte récupéré est aussitôt confié à un worker d'embedding
+unique : le calcul des embeddings chevauche ainsi les entrées/sorties restantes,
+sans exécuter plusieurs modèles en parallèle.
+
+Un `SourceCheckpointJournal` (journal JSONL en ajout seul et textes récupérés)
+permet à une exécution interrompue de reprendre sans récupérer ni vectoriser à
+nouveau les sources déjà terminées. Une source est identifiée par son `id` et
+par l'empreinte des champs qui la localisent : modifier sa définition (URL,
+chemin, méthode) invalide son point de reprise.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILENAME = "journal.jsonl"
+TEXTS_DIRNAME = "texts"
+LOCAL_HOST_KEY = "<local>"
+LOCATOR_FIELDS = ("fetch_method", "source_type", "url", "schema", "host_parts", "path")
+
+SourceFetcher = Callable[[Dict[str, Any]], Optional[str]]
+SourceEmbedder = Callable[[str, Dict[str, Any]], bool]
+
+
+def get_source_id(source_info: Dict[str, Any], position: int) -> str:
+    """Retourne l'identifiant d'une source, avec le même défaut que le pipeline séquentiel."""
+    return str(source_info.get('id', f"SourceNonIdentifiée_{position + 1}"))
+
+
+def source_locator_digest(source_info: Dict[str, Any]) -> str:
+    """
+    Calcule l'empreinte des champs qui localisent une source (méthode, URL, chemin).
+
+    :param source_info: Définition de la source.
+    :type source_info: Dict[str, Any]
+    :return: Empreinte SHA-256 hexadécimale.
+    :rtype: str
+    """
+    locator = {field: source_info.get(field) for field in LOCATOR_FIELDS}
+    encoded = json.dumps(locator, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Retourne l'empreinte SHA-256 d'un texte."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def get_source_host(source_info: Dict[str, Any]) -> str:
+    """
+    Détermine l'hôte servant une source, clé de la limite de concurrence par hôte.
+
+    Les sources locales (`fetch_method == "file"`) partagent la clé `LOCAL_HOST_KEY`.
+
+    :param source_info: Définition de la source.
+    :type source_info: Dict[str, Any]
+    :return: Nom d'hôte (avec port éventuel) en minuscules.
+    :rtype: str
+    """
+    if source_info.get("fetch_method", source_info.get("source_type")) == "file":
+        return LOCAL_HOST_KEY
+    url = source_info.get("url")
+    if url:
+        return urlparse(str(url)).netloc.lower() or LOCAL_HOST_KEY
+    host_parts = source_info.get("host_parts") or []
+    host = ".".join(part for part in host_parts if part)
+    return host.lower() or LOCAL_HOST_KEY
+
+
+class HostConcurrencyLimiter:
+    """
+    Limite le nombre de récupérations simultanées vers un même hôte.
+    """
+
+    def __init__(self, max_per_host: int = 2):
+        if max_per_host < 1:
+            raise ValueError(f"max_per_host doit être >= 1 (reçu: {max_per_host})")
+        self.max_per_host = max_per_host
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, host: str) -> Iterator[None]:
+        """Réserve une place pour `host` le temps du bloc `with`."""
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+
+class SourceCheckpointJournal:
+    """
+    Points de reprise du pipeline : journal JSONL et textes récupérés.
+
+    Le répertoire contient `journal.jsonl` (une ligne par étape terminée :
+    `fetched` ou `embedded`) et `texts/<empreinte>.txt` (les textes récupérés,
+    écrits avant l'entrée de journal qui les référence).
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Ouvre (ou prépare) un journal. Le répertoire n'est créé qu'à la première écriture.
+
+        :param root: Répertoire du journal.
+        :type root: Union[str, Path]
+        """
+        self.root = Path(root)
+        self._fetched: Dict[Tuple[str, str], str] = {}
+        self._embedded: Set[Tuple[str, str, str, str]] = set()
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def journal_path(self) -> Path:
+        return self.root / JOURNAL_FILENAME
+
+    @property
+    def texts_dir(self) -> Path:
+        return self.root / TEXTS_DIRNAME
+
+    def _load(self) -> None:
+        """Rejoue le journal d'une exécution précédente."""
+        if not self.journal_path.is_file():
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as journal_file:
+            for line_number, line in enumerate(journal_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dernière ligne tronquée par une interruption : l'étape sera refaite
+                    logger.warning(f"Entrée de journal illisible ignorée ({self.journal_path}:{line_number}).")
+                    continue
+                key = (entry["id"], entry["locator"])
+                if entry.get("stage") == "fetched":
+                    self._fetched[key] = entry["text_digest"]
+                elif entry.get("stage") == "embedded":
+                    self._embedded.add(key + (entry["model"], entry["text_digest"]))
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_path, 'a', encoding='utf-8') as journal_file:
+                # Une ligne entière par écriture, isolée d'une éventuelle ligne tronquée
+                if journal_file.tell() > 0 and not self._ends_with_newline():
+                    line = "\n" + line
+                journal_file.write(line)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.journal_path, 'rb') as journal_file:
+            journal_file.seek(-1, os.SEEK_END)
+            return journal_file.read(1) == b"\n"
+
+    def _text_path(self, digest: str) -> Path:
+        return self.texts_dir / f"{digest}.txt"
+
+    def get_fetched_text(self, source_id: str, source_info: Dict[str, Any]) -> Optional[str]:
+        """
+        Retourne le texte récupéré lors d'une exécution précédente, s'il est encore disponible.
+
+        :param source_id: Identifiant de la source.
+        :type source_id: str
+        :param source_info: Définition de la source (pour vérifier qu'elle n'a pas changé).
+        :type source_info: Dict[str, Any]
+        :return: Le texte récupéré, ou None s'il n'y a pas de point de reprise valide.
+        :rtype: Optional[str]
+        """
+        digest = self._fetched.get((source_id, source_locator_digest(source_info)))
+        if digest is None:
+            return None
+        try:
+            text = self._text_path(digest).read_text(encoding='utf-8')
+        except OSError:
+            return None
+        return text if text_digest(text) == digest else None
+
+    def record_fetched(self, source_id: str, source_info: Dict[str, Any], text: str) -> None:
+        """Enregistre le texte récupéré pour une source."""
+        digest = text_digest(text)
+        text_path = self._text_path(digest)
+        if not text_path.is_file():
+            self.texts_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = text_path.with_name(f"{text_path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, text_path)
+        locator = source_locator_digest(source_info)
+        self._append({"stage": "fetched", "id": source_id, "locator": locator, "text_digest": digest})
+        with self._lock:
+            self._fetched[(source_id, locator)] = digest
+
+    def is_embedded(self, source_id: str, source_info: Dict[str, Any], model_name: str, text: str) -> bool:
+        """Indique si ce texte de la source a déjà été vectorisé avec ce modèle."""
+        key = (source_id, source_locator_digest(source_info), model_name, text_digest(text))
+        return key in self._embedded
+
+    def record_embedded(self, source_id: str, source_info: Dict[str, Any], model_name: str, text: str) -> None:
+        """Enregistre que les embeddings de la source ont été générés et sauvegardés."""
+        locator = source_locator_digest(source_info)
+        digest = text_digest(text)
+        self._append({"stage": "embedded", "id": source_id, "locator": locator, "model": model_name, "text_digest": digest})
+        with self._lock:
+            self._embedded.add((source_id, locator, model_name, digest))
+
+
+def _has_text(source_info: Dict[str, Any]) -> bool:
+    return bool((source_info.get('full_text') or '').strip())
+
+
+def process_sources_concurrently(
+    sources: List[Dict[str, Any]],
+    fetch_text: SourceFetcher,
+    embed_source: Optional[SourceEmbedder] = None,
+    model_name: Optional[str] = None,
+    journal: Optional[SourceCheckpointJournal] = None,
+    max_workers: int = 8,
+    max_per_host: int = 2,
+    is_embedding_stored: Optional[Callable[[str, str], bool]] = None
+) -> Dict[str, int]:
+    """
+    Récupère les textes manquants en parallèle et génère les embeddings au fil de l'eau.
+
+    Les définitions de `sources` sont mises à jour en place (`full_text`), uniquement
+    depuis le thread appelant. `embed_source` est toujours appelé depuis un unique
+    worker dédié, dans l'ordre d'arrivée des textes.
+
+    :param sources: Définitions des sources à traiter.
+    :type sources: List[Dict[str, Any]]
+    :param fetch_text: Récupère le texte d'une source (None si indisponible) ; peut lever une exception.
+    :type fetch_text: SourceFetcher
+    :param embed_source: Génère et sauvegarde les embeddings d'une source, retourne True en cas de succès.
+                         Si None, aucun embedding n'est généré.
+    :type embed_source: Optional[SourceEmbedder]
+    :param model_name: Nom du modèle d'embedding, utilisé pour les points de reprise.
+    :type model_name: Optional[str]
+    :param journal: Journal de reprise optionnel.
+    :type journal: Optional[SourceCheckpointJournal]
+    :param max_workers: Nombre maximal de récupérations simultanées.
+    :type max_workers: int
+    :param max_per_host: Nombre maximal de récupérations simultanées vers un même hôte.
+    :type max_per_host: int
+    :param is_embedding_stored: Vérifie, pour un identifiant et le texte de la source, que les
+                                embeddings de ce texte sont bien présents dans le magasin
+                                avant de faire confiance au journal.
+    :type is_embedding_stored: Optional[Callable[[str, str], bool]]
+    :return: Compteurs : `fetched`, `resumed_fetches`, `fetch_errors`, `embedded`,
+             `resumed_embeddings`, `embedding_errors`.
+    :rtype: Dict[str, int]
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers doit être >= 1 (reçu: {max_workers})")
+    limiter = HostConcurrencyLimiter(max_per_host)
+    stats = dict.fromkeys(
+        ("fetched", "resumed_fetches", "fetch_errors", "embedded", "resumed_embeddings", "embedding_errors"), 0
+    )
+    stats_lock = threading.Lock()
+
+    def count(key: str) -> None:
+        with stats_lock:
+            stats[key] += 1
+
+    def fetch_task(source_id: str, source_info: Dict[str, Any]) -> Optional[str]:
+        with limiter.slot(get_source_host(source_info)):
+            logger.info(f"  Récupération du texte de la source {source_id}...")
+            return fetch_text(source_info)
+
+    def embed_task(source_id: str, source_info: Dict[str, Any], text: str) -> None:
+        if journal is not None and model_name is not None and journal.is_embedded(source_id, source_info, model_name, text) \
+                and (is_embedding_stored is None or is_embedding_stored(source_id, text)):
+            logger.info(f"  Embeddings déjà générés pour la source {source_id} (reprise).")
+            count("resumed_embeddings")
+            return
+        try:
+            success = embed_source(source_id, source_info)
+        except Exception as e:
+            logger.error(f"    Erreur lors de la génération/sauvegarde des embeddings pour la source {source_id}: {e}")
+            success = False
+        if not success:
+            count("embedding_errors")
+            return
+        count("embedded")
+        if journal is not None and model_name is not None:
+            journal.record_embedded(source_id, source_info, model_name, text)
+
+    fetch_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="source-fetch")
+    embed_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="source-embed")
+    embed_futures: List[Future] = []
+
+    def schedule_embedding(source_id: str, source_info: Dict[str, Any]) -> None:
+        if embed_source is not None and _has_text(source_info):
+            embed_futures.append(embed_pool.submit(embed_task, source_id, source_info, source_info['full_text']))
+
+    try:
+        pending: Dict[Future, Tuple[str, Dict[str, Any]]] = {}
+        for position, source_info in enumerate(sources):
+            source_id = get_source_id(source_info, position)
+            if not _has_text(source_info) and journal is not None:
+                resumed_text = journal.get_fetched_text(source_id, source_info)
+                if resumed_text:
+                    source_info['full_text'] = resumed_text
+                    logger.info(f"  Texte de la source {source_id} repris depuis le journal ({len(resumed_text)} caractères).")
+                    count("resumed_fetches")
+            if _has_text(source_info):
+                schedule_embedding(source_id, source_info)
+            else:
+                pending[fetch_pool.submit(fetch_task, source_id, source_info)] = (source_id, source_info)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                source_id, source_info = pending.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:
+                    logger.error(f"  Erreur lors de la récupération du texte pour la source {source_id}: {e}")
+                    text = None
+                if not text:
+                    logger.warning(f"  Impossible de récupérer le texte complet pour la source {source_id}.")
+                    count("fetch_errors")
+                    continue
+                source_info['full_text'] = text
+                count("fetched")
+                if journal is not None:
+                    journal.record_fetched(source_id, source_info, text)
+                schedule_embedding(source_id, source_info)
+
+        for future in embed_futures:
+            future.result()
+    finally:
+        # En cas d'interruption, ne pas lancer les tâches restantes : le journal permettra de les reprendre
+        fetch_pool.shutdown(wait=True, cancel_futures=True)
+        embed_pool.shutdown(wait=True, cancel_futures=True)
+
+    return stats
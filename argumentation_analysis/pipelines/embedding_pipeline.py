@@ -21,7 +21,7 @@ import os
 import sys
 from pathlib import Path
 import json
-from typing import Optional, List, Dict, Any # Ajout pour Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TYPE_CHECKING # Ajout pour Optional, List, Dict, Any
 
 # Assurer que le répertoire racine du projet est dans sys.path
 # Ceci est nécessaire si ce module est exécuté directement ou importé par des scripts
@@ -43,9 +43,118 @@ from argumentation_analysis.ui.file_operations import load_extract_definitions,
 from argumentation_analysis.ui.utils import get_full_text_for_source
 from argumentation_analysis.ui.config import ENCRYPTION_KEY as CONFIG_UI_ENCRYPTION_KEY
 from argumentation_analysis.nlp.embedding_utils import get_embeddings_for_chunks, save_embeddings_data
+from argumentation_analysis.nlp.embedding_store import EmbeddingStore
+from argumentation_analysis.pipelines.concurrent_sources import (
+    SourceCheckpointJournal,
+    get_source_id,
+    process_sources_concurrently,
+)
+
+if TYPE_CHECKING:
+    from argumentation_analysis.services.fetch_service import FetchService
 
 logger = logging.getLogger(__name__)
 
+def _fetch_source_text(source_info: Dict[str, Any], fetch_service: Optional["FetchService"] = None) -> Optional[str]:
+    """Récupère le texte complet d'une source selon sa méthode de récupération.
+
+    Sûre pour un appel depuis plusieurs threads : la définition de la source
+    n'est pas modifiée.
+
+    :param source_info: Définition de la source.
+    :type source_info: Dict[str, Any]
+    :param fetch_service: Service de récupération optionnel pour les sources distantes.
+        Si None, `get_full_text_for_source` (configuration de `ui.config`) est utilisé.
+    :type fetch_service: Optional[FetchService]
+    :return: Le texte récupéré, ou None s'il est indisponible.
+    :rtype: Optional[str]
+    :raises FileNotFoundError: Si le fichier d'une source locale est introuvable.
+    """
+    # Déterminer la méthode de récupération (compatibilité avec 'source_type')
+    fetch_method = source_info.get("fetch_method", source_info.get("source_type", "unknown"))
+    source_id = source_info.get('id', 'N/A')
+
+    if fetch_method == "file":
+        file_path_str = source_info.get("path")
+        if not file_path_str:
+            logger.error(f"  Champ 'path' manquant pour la source locale de type 'file': {source_id}.")
+            return None
+        document_path = Path(file_path_str)
+        # Résoudre le chemin relatif par rapport à la racine du projet si nécessaire
+        if not document_path.is_absolute():
+            document_path = (PROJECT_ROOT / file_path_str).resolve()
+        logger.info(f"  Récupération du contenu du fichier local: {document_path}")
+        text = load_document_content(document_path)
+        if text is None: # load_document_content logue déjà l'erreur
+            logger.warning(f"  load_document_content n'a pas pu lire {document_path} pour la source {source_id}.")
+        return text
+    if fetch_method in ["url", "api", "web_page"]: # Autres types gérés par get_full_text_for_source
+        if fetch_service is not None:
+            text, status = fetch_service.fetch_text(source_info)
+            if text is None:
+                logger.warning(f"  FetchService n'a pas pu récupérer la source {source_id}: {status}")
+            return text
+        logger.info(f"  Utilisation de get_full_text_for_source pour la source {source_id} (méthode: {fetch_method}).")
+        # `app_config` n'est pas directement disponible ici, on passe None.
+        # `get_full_text_for_source` devrait utiliser les valeurs par défaut de `ui.config`.
+        return get_full_text_for_source(source_info, app_config=None)
+    logger.warning(f"  Méthode de récupération '{fetch_method}' non reconnue pour la source {source_id}.")
+    return None
+
+def _is_embedding_stored(store: EmbeddingStore, source_id: str, full_text: str) -> bool:
+    """Indique si le magasin contient déjà les embeddings de ce texte pour la source.
+
+    Un texte modifié depuis la précédente exécution doit être vectorisé à nouveau.
+    """
+    if source_id not in store:
+        return False
+    return store.metadata(source_id).get("text_chunks") == [full_text]
+
+def _generate_and_save_embeddings(
+    source_id: str,
+    full_text: str,
+    model_name: str,
+    cache_dir: Path,
+    store: EmbeddingStore
+) -> bool:
+    """Génère les embeddings du texte d'une source et les ajoute au magasin du modèle.
+
+    :return: True si les embeddings ont été générés et sauvegardés, False sinon
+        (les erreurs sont loguées, pas propagées).
+    :rtype: bool
+    """
+    logger.info(f"  Tentative de génération d'embeddings pour la source {source_id} avec le modèle '{model_name}'...")
+    try:
+        # Simplification: le texte complet est traité comme un seul chunk.
+        # Pour une application réelle, un découpage (chunking) plus sophistiqué serait nécessaire.
+        text_chunks = [full_text]
+        # Le cache disque (adressé par modèle et contenu) rend gratuite la ré-exécution sur un corpus inchangé
+        embeddings = get_embeddings_for_chunks(text_chunks, model_name, cache_dir=cache_dir)
+
+        if len(embeddings) == 0:
+            logger.warning(f"    Aucun embedding valide n'a été généré ou retourné pour la source {source_id} avec le modèle '{model_name}'.")
+            return False
+        logger.info(f"    Embeddings générés: {len(embeddings)} vecteur(s). Dimension du premier: {len(embeddings[0])}.")
+
+        # Préparation des données à sauvegarder
+        embeddings_data_to_save = {
+            "source_id": source_id,
+            "model_name": model_name,
+            "text_chunks": text_chunks, # Sauvegarde des chunks pour référence
+            "embeddings": embeddings    # Vecteurs d'embedding (stockés en binaire)
+        }
+
+        logger.info(f"    Sauvegarde des embeddings pour la source {source_id} dans: {store.root}")
+        if save_embeddings_data(embeddings_data_to_save, store.root, store=store):
+            logger.info(f"    Embeddings pour {source_id} sauvegardés avec succès.")
+            return True
+        # save_embeddings_data logue déjà l'échec
+        logger.error(f"    Échec de la sauvegarde des embeddings pour {source_id} (détails ci-dessus).")
+        return False
+    except Exception as emb_exc: # Erreur pendant la génération ou sauvegarde des embeddings
+        logger.error(f"    Erreur lors de la génération/sauvegarde des embeddings pour la source {source_id} (modèle '{model_name}'): {emb_exc}")
+        return False
+
 def run_embedding_generation_pipeline(
     input_config_path: Optional[Path],
     json_string: Optional[str],
@@ -54,7 +163,11 @@ def run_embedding_generation_pipeline(
     generate_embeddings_model: Optional[str],
     force_overwrite: bool,
     log_level: str = "INFO",
-    passphrase: Optional[str] = None
+    passphrase: Optional[str] = None,
+    max_workers: int = 1,
+    max_per_host: int = 2,
+    checkpoint_dir: Optional[Path] = None,
+    fetch_service: Optional["FetchService"] = None
 ) -> None:
     """Exécute le pipeline de génération d'embeddings.
 
@@ -71,7 +184,12 @@ def run_embedding_generation_pipeline(
         a.  Récupération du texte complet si absent.
         b.  Si `generate_embeddings_model` est fourni et le texte complet est disponible,
             génération des embeddings pour le texte.
-        c.  Sauvegarde des embeddings générés dans un fichier JSON dédié.
+        c.  Ajout des embeddings générés au magasin binaire du modèle
+            (`embeddings_data/model_<modèle>/`, voir `nlp.embedding_store`).
+        En mode concurrent (`max_workers > 1` ou `checkpoint_dir` fourni), les
+        récupérations s'exécutent en parallèle et les embeddings sont générés au
+        fil de l'eau ; un journal de reprise évite de récupérer ou vectoriser à
+        nouveau les sources terminées (voir `pipelines.concurrent_sources`).
     5.  Sauvegarde des définitions d'extraits mises à jour (potentiellement avec
         les nouveaux textes complets) dans le fichier de configuration de sortie chiffré.
 
@@ -100,6 +218,17 @@ def run_embedding_generation_pipeline(
     :param passphrase: Passphrase (OBSOLÈTE pour la dérivation de clé dans ce
         pipeline, mais conservé pour la signature de la fonction).
     :type passphrase: Optional[str]
+    :param max_workers: Nombre maximal de récupérations simultanées. 1 (défaut)
+        conserve le traitement séquentiel.
+    :type max_workers: int
+    :param max_per_host: Nombre maximal de récupérations simultanées vers un même hôte
+        (mode concurrent).
+    :type max_per_host: int
+    :param checkpoint_dir: Répertoire du journal de reprise. En mode concurrent, vaut
+        par défaut `<output_config_path>.checkpoint` à côté du fichier de sortie.
+    :type checkpoint_dir: Optional[Path]
+    :param fetch_service: Service de récupération optionnel pour les sources distantes.
+    :type fetch_service: Optional[FetchService]
     :return: None. La fonction termine par `sys.exit(1)` en cas d'erreur critique.
     :rtype: None
     :raises SystemExit: Si une erreur critique empêche la poursuite du pipeline
@@ -221,102 +350,79 @@ def run_embedding_generation_pipeline(
     # est spécifié et que le texte complet est disponible.
     updated_sources_count = 0
     sources_with_errors_count = 0
+    embeddings_cache_dir = output_config_path.parent / "embeddings_cache"
+
+    embeddings_store = None
+    if generate_embeddings_model:
+        # Un magasin binaire par modèle, dans lequel chaque source est indexée par son identifiant.
+        # Il est ouvert une seule fois et partagé par toutes les sauvegardes du pipeline.
+        sanitized_model_name = sanitize_filename(str(generate_embeddings_model))
+        embeddings_store = EmbeddingStore(output_config_path.parent / "embeddings_data" / f"model_{sanitized_model_name}")
 
-    for i, source_info in enumerate(extract_definitions):
-        source_id = source_info.get('id', f"SourceNonIdentifiée_{i+1}") # ID par défaut si manquant
-        logger.info(f"Traitement de la source: {source_id} (Type: {source_info.get('type', 'N/A')}, Chemin/URL: {source_info.get('path', 'N/A')})")
-
-        full_text_content_retrieved_this_run: Optional[str] = None # Pour suivre si le texte a été récupéré dans cette exécution
-
-        # Étape 3a: Récupération du texte complet si absent
-        if source_info.get('full_text') and source_info['full_text'].strip():
-            logger.info(f"  Le texte complet est déjà présent pour la source {source_id}.")
-        else:
-            logger.info(f"  Texte complet manquant pour la source {source_id}. Tentative de récupération...")
-            try:
-                # Déterminer la méthode de récupération (compatibilité avec 'source_type')
-                fetch_method = source_info.get("fetch_method", source_info.get("source_type", "unknown"))
-                
-                if fetch_method == "file":
-                    file_path_str = source_info.get("path")
-                    if file_path_str:
-                        document_path = Path(file_path_str)
-                        # Résoudre le chemin relatif par rapport à la racine du projet si nécessaire
-                        if not document_path.is_absolute():
-                            document_path = (PROJECT_ROOT / file_path_str).resolve()
-                        logger.info(f"  Récupération du contenu du fichier local: {document_path}")
-                        full_text_content_retrieved_this_run = load_document_content(document_path)
-                        if full_text_content_retrieved_this_run is None: # load_document_content logue déjà l'erreur
-                             logger.warning(f"  load_document_content n'a pas pu lire {document_path} pour la source {source_id}.")
+    concurrent_mode = max_workers > 1 or checkpoint_dir is not None
+
+    def embed_source(source_id: str, source_info: Dict[str, Any]) -> bool:
+        return _generate_and_save_embeddings(
+            source_id, source_info['full_text'], generate_embeddings_model, embeddings_cache_dir, embeddings_store
+        )
+
+    if concurrent_mode:
+        # Mode concurrent : récupérations parallèles (bornées par hôte), embeddings au fil de l'eau, reprise possible
+        effective_checkpoint_dir = checkpoint_dir or output_config_path.parent / f"{output_config_path.name}.checkpoint"
+        logger.info(f"Mode concurrent: {max_workers} worker(s), {max_per_host} par hôte, journal de reprise: {effective_checkpoint_dir}")
+        journal = SourceCheckpointJournal(effective_checkpoint_dir)
+        stats = process_sources_concurrently(
+            extract_definitions,
+            fetch_text=lambda source_info: _fetch_source_text(source_info, fetch_service),
+            embed_source=embed_source if generate_embeddings_model else None,
+            model_name=generate_embeddings_model,
+            journal=journal,
+            max_workers=max_workers,
+            max_per_host=max_per_host,
+            is_embedding_stored=(
+                (lambda source_id, text: _is_embedding_stored(embeddings_store, source_id, text))
+                if embeddings_store is not None else None
+            )
+        )
+        updated_sources_count = stats["fetched"] + stats["resumed_fetches"]
+        sources_with_errors_count = stats["fetch_errors"]
+        logger.info(f"Embeddings: {stats['embedded']} générés, {stats['resumed_embeddings']} repris, {stats['embedding_errors']} erreurs.")
+    else:
+        for i, source_info in enumerate(extract_definitions):
+            source_id = get_source_id(source_info, i)
+            logger.info(f"Traitement de la source: {source_id} (Type: {source_info.get('type', 'N/A')}, Chemin/URL: {source_info.get('path', 'N/A')})")
+
+            # Étape 3a: Récupération du texte complet si absent
+            if source_info.get('full_text') and source_info['full_text'].strip():
+                logger.info(f"  Le texte complet est déjà présent pour la source {source_id}.")
+            else:
+                logger.info(f"  Texte complet manquant pour la source {source_id}. Tentative de récupération...")
+                try:
+                    full_text_content_retrieved_this_run = _fetch_source_text(source_info, fetch_service)
+
+                    # Mettre à jour source_info si le texte a été récupéré
+                    if full_text_content_retrieved_this_run:
+                        source_info['full_text'] = full_text_content_retrieved_this_run
+                        logger.info(f"  Texte complet récupéré et mis à jour pour la source {source_id} (longueur: {len(full_text_content_retrieved_this_run)}).")
+                        updated_sources_count += 1
                     else:
-                        logger.error(f"  Champ 'path' manquant pour la source locale de type 'file': {source_id}.")
-                elif fetch_method in ["url", "api", "web_page"]: # Autres types gérés par get_full_text_for_source
-                    logger.info(f"  Utilisation de get_full_text_for_source pour la source {source_id} (méthode: {fetch_method}).")
-                    # `app_config` n'est pas directement disponible ici, on passe None.
-                    # `get_full_text_for_source` devrait utiliser les valeurs par défaut de `ui.config`.
-                    full_text_content_retrieved_this_run = get_full_text_for_source(source_info, app_config=None)
-                else:
-                    logger.warning(f"  Méthode de récupération '{fetch_method}' non reconnue pour la source {source_id}.")
-
-                # Mettre à jour source_info si le texte a été récupéré
-                if full_text_content_retrieved_this_run:
-                    source_info['full_text'] = full_text_content_retrieved_this_run
-                    logger.info(f"  Texte complet récupéré et mis à jour pour la source {source_id} (longueur: {len(full_text_content_retrieved_this_run)}).")
-                    updated_sources_count += 1
-                elif not (source_info.get('full_text') and source_info['full_text'].strip()): # Si toujours pas de texte
-                    logger.warning(f"  Impossible de récupérer le texte complet pour la source {source_id} (méthode: {fetch_method}). 'full_text' reste vide ou inchangé.")
+                        logger.warning(f"  Impossible de récupérer le texte complet pour la source {source_id}. 'full_text' reste vide ou inchangé.")
+                        sources_with_errors_count += 1
+                except FileNotFoundError as fnf_err:
+                    logger.error(f"  Fichier non trouvé lors de la récupération du texte pour la source {source_id}: {fnf_err}")
+                    sources_with_errors_count += 1
+                except Exception as e: # Capturer les autres erreurs pendant la récupération
+                    logger.error(f"  Erreur générique lors de la récupération du texte pour la source {source_id}: {e}")
                     sources_with_errors_count += 1
-            except FileNotFoundError as fnf_err:
-                logger.error(f"  Fichier non trouvé lors de la récupération du texte pour la source {source_id}: {fnf_err}")
-                sources_with_errors_count += 1
-            except Exception as e: # Capturer les autres erreurs pendant la récupération
-                logger.error(f"  Erreur générique lors de la récupération du texte pour la source {source_id}: {e}")
-                sources_with_errors_count += 1
         
-        # Étape 3b & 3c: Génération et sauvegarde des embeddings
-        # Condition: modèle spécifié ET texte complet disponible (soit préexistant, soit récupéré)
-        if generate_embeddings_model and (source_info.get('full_text') or '').strip():
-            current_full_text_for_embedding = source_info['full_text']
-            logger.info(f"  Tentative de génération d'embeddings pour la source {source_id} avec le modèle '{generate_embeddings_model}'...")
-            try:
-                # Simplification: le texte complet est traité comme un seul chunk.
-                # Pour une application réelle, un découpage (chunking) plus sophistiqué serait nécessaire.
-                text_chunks = [current_full_text_for_embedding]
-                embeddings = get_embeddings_for_chunks(text_chunks, generate_embeddings_model)
-                
-                if embeddings and embeddings[0] is not None: # Vérifier si des embeddings ont été retournés et ne sont pas None
-                    logger.info(f"    Embeddings générés: {len(embeddings)} vecteur(s). Dimension du premier: {len(embeddings[0])}.")
-                    
-                    # Préparation des données à sauvegarder
-                    embeddings_data_to_save = {
-                        "source_id": source_id,
-                        "model_name": generate_embeddings_model,
-                        "text_chunks": text_chunks, # Sauvegarde des chunks pour référence
-                        "embeddings": embeddings    # Sauvegarde des vecteurs d'embedding
-                    }
-                    
-                    # Définition du chemin de sortie pour les embeddings
-                    base_output_dir = output_config_path.parent
-                    embeddings_output_dir = base_output_dir / "embeddings_data" # Répertoire dédié pour les embeddings
-                    embeddings_output_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    # Nom de fichier sécurisé pour les embeddings
-                    sanitized_source_id = sanitize_filename(str(source_id))
-                    sanitized_model_name = sanitize_filename(str(generate_embeddings_model))
-                    embedding_filename = f"embedding_{sanitized_source_id}_model_{sanitized_model_name}.json"
-                    output_path_embeddings = embeddings_output_dir / embedding_filename
-                    
-                    logger.info(f"    Sauvegarde des embeddings pour la source {source_id} dans: {output_path_embeddings}")
-                    if save_embeddings_data(embeddings_data_to_save, output_path_embeddings):
-                        logger.info(f"    Embeddings pour {source_id} sauvegardés avec succès.")
-                    else: # save_embeddings_data logue déjà l'échec
-                        logger.error(f"    Échec de la sauvegarde des embeddings pour {source_id} (détails ci-dessus).")
+            # Étape 3b & 3c: Génération et sauvegarde des embeddings
+            # Condition: modèle spécifié ET texte complet disponible (soit préexistant, soit récupéré)
+            if generate_embeddings_model and (source_info.get('full_text') or '').strip():
+                if _is_embedding_stored(embeddings_store, source_id, source_info['full_text']):
+                    # Ré-exécution : ne pas ajouter une seconde fois les vecteurs de la source au magasin
+                    logger.info(f"  Embeddings déjà présents dans le magasin pour la source {source_id}, génération ignorée.")
                 else:
-                    logger.warning(f"    Aucun embedding valide n'a été généré ou retourné pour la source {source_id} avec le modèle '{generate_embeddings_model}'.")
-            except Exception as emb_exc: # Erreur pendant la génération ou sauvegarde des embeddings
-                logger.error(f"    Erreur lors de la génération/sauvegarde des embeddings pour la source {source_id} (modèle '{generate_embeddings_model}'): {emb_exc}")
-                # Ne pas incrémenter sources_with_errors_count ici, car cela concerne la récupération du texte.
-                # On pourrait avoir un compteur séparé pour les erreurs d'embedding.
+                    embed_source(source_id, source_info)
 
     logger.info(f"Traitement des sources terminé. {updated_sources_count} sources ont eu leur texte complet mis à jour/récupéré. {sources_with_errors_count} erreurs lors de la récupération de texte.")
 
@@ -378,6 +484,18 @@ if __name__ == '__main__':
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         help="Niveau de verbosité du logging."
     )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Nombre de récupérations simultanées (> 1 active le mode concurrent et reprenable)."
+    )
+    parser.add_argument(
+        "--max-per-host", type=int, default=2,
+        help="Nombre maximal de récupérations simultanées vers un même hôte."
+    )
+    parser.add_argument(
+        "--checkpoint-dir", type=Path, default=None,
+        help="Répertoire du journal de reprise (active le mode concurrent)."
+    )
     # L'argument passphrase n'est plus utilisé pour la dérivation de clé dans le pipeline lui-même,
     # mais on le garde pour une éventuelle compatibilité si le script lanceur le passe.
     parser.add_argument(
@@ -395,5 +513,8 @@ if __name__ == '__main__':
         generate_embeddings_model=args.generate_embeddings,
         force_overwrite=args.force,
         log_level=args.log_level,
-        passphrase=args.passphrase # Passé même si non utilisé activement pour la clé
+        passphrase=args.passphrase, # Passé même si non utilisé activement pour la clé
+        max_workers=args.workers,
+        max_per_host=args.max_per_host,
+        checkpoint_dir=args.checkpoint_dir
     )
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Ordonnancement concurrent des étapes d'un pipeline d'analyse.
+
+Chaque étape déclare les étapes dont elle dépend. Une étape démarre dès que toutes
+ses dépendances sont terminées : les étapes indépendantes s'exécutent donc
+simultanément sur la boucle asyncio. Chaque étape peut avoir son propre timeout ;
+une étape en échec ou hors délai produit son résultat de repli, et les étapes qui
+en dépendent s'exécutent quand même avec ce résultat.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+StageFunction = Callable[[Dict[str, Any]], Awaitable[Any]]
+StageFallback = Callable[[str, Optional[BaseException]], Any]
+
+
+class PipelineStage:
+    """
+    Étape d'un pipeline ordonnancé par `StageScheduler`.
+
+    :param name: Nom unique de l'étape.
+    :param func: Coroutine recevant les résultats des dépendances (par nom d'étape).
+    :param depends_on: Noms des étapes à terminer avant celle-ci.
+    :param timeout: Durée maximale de l'étape en secondes (None pour illimitée).
+    :param fallback: Fonction `(statut, exception)` produisant le résultat de l'étape
+        en cas d'échec (`"error"`) ou de dépassement du délai (`"timeout"`).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: StageFunction,
+        depends_on: Sequence[str] = (),
+        timeout: Optional[float] = None,
+        fallback: Optional[StageFallback] = None
+    ):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.fallback = fallback
+
+    def fallback_result(self, status: str, error: Optional[BaseException]) -> Any:
+        if self.fallback is not None:
+            return self.fallback(status, error)
+        return {"status": status, "message": str(error) if error else status}
+
+
+class StageScheduler:
+    """
+    Exécute un ensemble d'étapes selon leurs dépendances.
+
+    Les dépendances vers des étapes absentes sont ignorées, ce qui permet de
+    désactiver une étape sans modifier celles qui en dépendent.
+    """
+
+    def __init__(self, stages: Sequence[PipelineStage]):
+        self.stages: Dict[str, PipelineStage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Étape en double: {stage.name}")
+            self.stages[stage.name] = stage
+        self._check_acyclic()
+
+    def _check_acyclic(self) -> None:
+        visiting, done = set(), set()
+
+        def visit(name: str, path: List[str]) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle de dépendances: {' -> '.join(path + [name])}")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                if dependency in self.stages:
+                    visit(dependency, path + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name, [])
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Exécute toutes les étapes.
+
+        :return: Dictionnaire `{"results": {étape: résultat}, "timings": {étape: mesure}}`.
+            Chaque mesure contient `status` (`success`, `error` ou `timeout`), `started_ms`
+            (démarrage relatif au lancement du pipeline), `duration_ms` et `waited_ms`
+            (attente des dépendances).
+        """
+        origin = time.perf_counter()
+        results: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: PipelineStage) -> Any:
+            dependencies = [name for name in stage.depends_on if name in self.stages]
+            if dependencies:
+                await asyncio.gather(*(tasks[name] for name in dependencies))
+            started = time.perf_counter()
+            status, error = "success", None
+            try:
+                result = await asyncio.wait_for(
+                    stage.func({name: results[name] for name in dependencies}), stage.timeout
+                )
+            except asyncio.TimeoutError as e:
+                status, error = "timeout", e
+                logger.warning(f"Étape '{stage.name}' interrompue après {stage.timeout}s")
+            except Exception as e:
+                status, error = "error", e
+                logger.error(f"Erreur dans l'étape '{stage.name}': {e}", exc_info=True)
+            if error is not None:
+                result = stage.fallback_result(status, error)
+
+            finished = time.perf_counter()
+            results[stage.name] = result
+            timings[stage.name] = {
+                "status": status,
+                "started_ms": (started - origin) * 1000,
+                "duration_ms": (finished - started) * 1000,
+                "waited_ms": (started - origin) * 1000 if dependencies else 0.0
+            }
+            return result
+
+        for name, stage in self.stages.items():
+            tasks[name] = asyncio.ensure_future(run_stage(stage))
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        return {"results": {name: results[name] for name in self.stages}, "timings": timings}
@@ -17,6 +17,7 @@ Fonctionnalités unifiées :
 """
 
 import asyncio
+import contextlib
 import logging
 import time
 from datetime import datetime
@@ -36,6 +37,7 @@ from argumentation_analysis.orchestration.conversation_orchestrator import Conve
 
 # Imports du pipeline existant
 from argumentation_analysis.pipelines.analysis_pipeline import run_text_analysis_pipeline
+from argumentation_analysis.pipelines.stage_scheduler import PipelineStage, StageScheduler
 
 # Imports des agents et outils
 from argumentation_analysis.agents.core.logic.logic_factory import LogicAgentFactory
@@ -46,6 +48,14 @@ from argumentation_analysis.agents.core.synthesis.synthesis_agent import Synthes
 
 logger = logging.getLogger("UnifiedTextAnalysis")
 
+# Étapes du pipeline et clé de leur résultat dans le rapport d'analyse
+STAGE_RESULT_KEYS = {
+    "orchestration": "orchestration_analysis",
+    "informal": "informal_analysis",
+    "formal": "formal_analysis",
+    "unified": "unified_analysis"
+}
+
 
 class UnifiedAnalysisConfig:
     """Configuration d'analyse unifiée - Version pipeline réutilisable."""
@@ -58,7 +68,8 @@ class UnifiedAnalysisConfig:
                  use_mocks: bool = False,
                  enable_jvm: bool = True,
                  orchestration_mode: str = "standard",
-                 enable_conversation_logging: bool = True):
+                 enable_conversation_logging: bool = True,
+                 stage_timeouts: Optional[Dict[str, float]] = None):
         """
         Initialise la configuration d'analyse unifiée.
         
@@ -71,6 +82,8 @@ class UnifiedAnalysisConfig:
             enable_jvm: Activer l'initialisation JVM
             orchestration_mode: Mode d'orchestration ("standard", "real", "conversation")
             enable_conversation_logging: Activer logging conversationnel
+            stage_timeouts: Timeout en secondes par étape ("orchestration", "informal",
+                "formal", "unified"), sans limite pour les étapes absentes
         """
         self.analysis_modes = analysis_modes or ["fallacies", "coherence", "semantic"]
         self.logic_type = logic_type
@@ -80,6 +93,7 @@ class UnifiedAnalysisConfig:
         self.enable_jvm = enable_jvm
         self.orchestration_mode = orchestration_mode
         self.enable_conversation_logging = enable_conversation_logging
+        self.stage_timeouts = dict(stage_timeouts or {})
         
     def to_dict(self) -> Dict[str, Any]:
         """Convertit la configuration en dictionnaire."""
@@ -91,7 +105,8 @@ class UnifiedAnalysisConfig:
             "use_mocks": self.use_mocks,
             "enable_jvm": self.enable_jvm,
             "orchestration_mode": self.orchestration_mode,
-            "enable_conversation_logging": self.enable_conversation_logging
+            "enable_conversation_logging": self.enable_conversation_logging,
+            "stage_timeouts": self.stage_timeouts
         }
     
     @classmethod
@@ -129,6 +144,11 @@ class UnifiedTextAnalysisPipeline:
         self.orchestrator = None
         self.conversation_logger = None
         
+        # Kernels réutilisés d'une analyse à l'autre ; chaque analyse formelle en cours
+        # emprunte son propre agent logique (avec son kernel), remis en service ensuite
+        self._kernels: Dict[str, sk.Kernel] = {}
+        self._idle_logic_agents: List[Any] = []
+        
         # Initialisation du logging conversationnel si activé
         if self.config.enable_conversation_logging:
             if self.config.orchestration_mode == "real":
@@ -231,10 +251,8 @@ class UnifiedTextAnalysisPipeline:
                 
                 # SynthesisAgent pour analyse unifiée
                 if self.llm_service and "unified" in self.config.analysis_modes:
-                    kernel = sk.Kernel()
-                    kernel.add_service(self.llm_service)
                     self.analysis_tools["synthesis_agent"] = SynthesisAgent(
-                        kernel=kernel,
+                        kernel=self._get_kernel("synthesis"),
                         agent_name="UnifiedPipeline_SynthesisAgent",
                         enable_advanced_features=self.config.use_advanced_tools
                     )
@@ -283,53 +301,195 @@ class UnifiedTextAnalysisPipeline:
             "recommendations": []
         }
         
-        # 1. Analyse via orchestrateur si disponible
+        # 1. Exécution des étapes : les étapes indépendantes s'exécutent simultanément
+        schedule = await StageScheduler(self._build_stages(text, source_info)).run()
+        for stage_name, stage_result in schedule["results"].items():
+            results[STAGE_RESULT_KEYS[stage_name]] = stage_result
+        results["metadata"]["stage_timings"] = schedule["timings"]
+        
+        # 2. Génération des recommandations
+        results["recommendations"] = self._generate_recommendations(results)
+        
+        # 3. Finalisation
+        processing_time = (datetime.now() - start_time).total_seconds() * 1000
+        results["metadata"]["processing_time_ms"] = processing_time
+        
+        logger.info(f"[ANALYSIS] Analyse unifiee terminee en {processing_time:.2f}ms")
+        if self.conversation_logger and hasattr(self.conversation_logger, 'info'):
+            self.conversation_logger.info(f"Pipeline: Analyse terminee ({processing_time:.1f}ms)")
+        
+        return results
+    
+    async def analyze_many(self,
+                           texts: List[str],
+                           source_infos: Optional[List[Dict[str, Any]]] = None,
+                           max_concurrency: int = 4) -> Dict[str, Any]:
+        """
+        Analyse un corpus de textes avec un parallélisme borné.
+        
+        Args:
+            texts: Textes à analyser
+            source_infos: Informations sur la source de chaque texte (optionnel)
+            max_concurrency: Nombre maximal d'analyses simultanées
+            
+        Returns:
+            Dict contenant les résultats (dans l'ordre des textes) et les durées cumulées
+            par étape
+        """
+        source_infos = source_infos or [None] * len(texts)
+        if len(source_infos) != len(texts):
+            raise ValueError("source_infos doit contenir une entrée par texte")
+        
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        start = time.perf_counter()
+        
+        async def analyze(text: str, source_info: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze_text_unified(text, source_info)
+        
+        logger.info(f"[BATCH] Analyse de {len(texts)} textes (concurrence max: {max_concurrency})")
+        results = await asyncio.gather(*(analyze(text, info) for text, info in zip(texts, source_infos)))
+        total_time_ms = (time.perf_counter() - start) * 1000
+        
+        stage_timings: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            for stage_name, timing in result["metadata"]["stage_timings"].items():
+                summary = stage_timings.setdefault(
+                    stage_name, {"runs": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0, "timeouts": 0}
+                )
+                summary["runs"] += 1
+                summary["total_ms"] += timing["duration_ms"]
+                summary["max_ms"] = max(summary["max_ms"], timing["duration_ms"])
+                if timing["status"] == "error":
+                    summary["errors"] += 1
+                elif timing["status"] == "timeout":
+                    summary["timeouts"] += 1
+        for summary in stage_timings.values():
+            summary["mean_ms"] = summary["total_ms"] / summary["runs"]
+        
+        logger.info(f"[BATCH] {len(texts)} textes analyses en {total_time_ms:.2f}ms")
+        return {
+            "results": results,
+            "stage_timings": stage_timings,
+            "total_time_ms": total_time_ms
+        }
+    
+    def _build_stages(self, text: str, source_info: Dict[str, Any]) -> List[PipelineStage]:
+        """
+        Construit les étapes d'analyse d'un texte selon la configuration.
+        
+        L'analyse informelle dépend de l'orchestration (dont elle peut réutiliser les
+        résultats) ; les analyses formelle et unifiée sont indépendantes.
+        """
+        timeouts = self.config.stage_timeouts
+        stages = []
+        
         if self.orchestrator:
-            logger.info("🎯 Analyse via orchestrateur...")
-            try:
+            async def orchestration_stage(_: Dict[str, Any]) -> Dict[str, Any]:
+                logger.info("🎯 Analyse via orchestrateur...")
                 orchestration_results = await self._analyze_with_orchestrator(text, source_info)
-                results["orchestration_analysis"] = orchestration_results
-                
                 if self.conversation_logger:
                     self.conversation_logger.log_agent_message(
                         "Orchestrator", "Analyse orchestrée terminée", "orchestration"
                     )
-            except Exception as e:
-                logger.error(f"❌ Erreur analyse orchestrateur: {e}")
-                results["orchestration_analysis"] = {"status": "error", "message": str(e)}
+                return orchestration_results
+            
+            stages.append(PipelineStage(
+                "orchestration", orchestration_stage,
+                timeout=timeouts.get("orchestration"),
+                fallback=lambda status, error: {"status": "error", "message": self._stage_error_message(status, error)}
+            ))
         
-        # 2. Analyse informelle (sophismes, cohérence, sémantique)
         if any(mode in self.config.analysis_modes for mode in ["fallacies", "coherence", "semantic"]):
-            # Si on a des données d'orchestration, extraire depuis là au lieu de refaire l'analyse
-            if "orchestration_analysis" in results and results["orchestration_analysis"].get("status") == "success":
-                logger.info("[INFORMAL] Extraction des données d'orchestration...")
-                results["informal_analysis"] = self._extract_informal_from_orchestration(results["orchestration_analysis"])
-            else:
+            async def informal_stage(dependencies: Dict[str, Any]) -> Dict[str, Any]:
+                # Si on a des données d'orchestration, extraire depuis là au lieu de refaire l'analyse
+                if dependencies.get("orchestration", {}).get("status") == "success":
+                    logger.info("[INFORMAL] Extraction des données d'orchestration...")
+                    return self._extract_informal_from_orchestration(dependencies["orchestration"])
                 logger.info("[INFORMAL] Analyse informelle en cours...")
-                results["informal_analysis"] = await self._perform_informal_analysis(text)
+                return await self._perform_informal_analysis(text)
+            
+            stages.append(PipelineStage(
+                "informal", informal_stage, depends_on=["orchestration"],
+                timeout=timeouts.get("informal"),
+                fallback=lambda status, error: {
+                    "fallacies": [],
+                    "summary": {"total_fallacies": 0, "average_confidence": 0, "severity_distribution": {}},
+                    "error": self._stage_error_message(status, error)
+                }
+            ))
         
-        # 3. Analyse formelle (logique)
         if "formal" in self.config.analysis_modes:
-            logger.info("[FORMAL] Analyse formelle en cours...")
-            results["formal_analysis"] = await self._perform_formal_analysis(text)
+            async def formal_stage(_: Dict[str, Any]) -> Dict[str, Any]:
+                logger.info("[FORMAL] Analyse formelle en cours...")
+                return await self._perform_formal_analysis(text)
+            
+            stages.append(PipelineStage(
+                "formal", formal_stage,
+                timeout=timeouts.get("formal"),
+                fallback=lambda status, error: {
+                    "logic_type": self.config.logic_type,
+                    "status": "Timeout" if status == "timeout" else "Error",
+                    "reason": self._stage_error_message(status, error)
+                }
+            ))
         
-        # 4. Analyse unifiée (SynthesisAgent)
         if "unified" in self.config.analysis_modes and "synthesis_agent" in self.analysis_tools:
-            logger.info("[UNIFIED] Analyse unifiee en cours...")
-            results["unified_analysis"] = await self._perform_unified_analysis(text)
-        
-        # 5. Génération des recommandations
-        results["recommendations"] = self._generate_recommendations(results)
-        
-        # 6. Finalisation
-        processing_time = (datetime.now() - start_time).total_seconds() * 1000
-        results["metadata"]["processing_time_ms"] = processing_time
+            async def unified_stage(_: Dict[str, Any]) -> Dict[str, Any]:
+                logger.info("[UNIFIED] Analyse unifiee en cours...")
+                return await self._perform_unified_analysis(text)
+            
+            stages.append(PipelineStage(
+                "unified", unified_stage,
+                timeout=timeouts.get("unified"),
+                fallback=lambda status, error: {
+                    "status": "Timeout" if status == "timeout" else "Error",
+                    "reason": self._stage_error_message(status, error)
+                }
+            ))
         
-        logger.info(f"[ANALYSIS] Analyse unifiee terminee en {processing_time:.2f}ms")
-        if self.conversation_logger and hasattr(self.conversation_logger, 'info'):
-            self.conversation_logger.info(f"Pipeline: Analyse terminee ({processing_time:.1f}ms)")
+        return stages
+    
+    @staticmethod
+    def _stage_error_message(status: str, error: Optional[BaseException]) -> str:
+        if status == "timeout":
+            return "Délai de l'étape dépassé"
+        return str(error)
+    
+    def _get_kernel(self, role: str) -> sk.Kernel:
+        """Retourne le kernel dédié à un rôle (créé une seule fois avec le service LLM)."""
+        kernel = self._kernels.get(role)
+        if kernel is None:
+            kernel = sk.Kernel()
+            kernel.add_service(self.llm_service)
+            self._kernels[role] = kernel
+        return kernel
+    
+    def _create_logic_agent(self):
+        """Crée un agent logique avec son propre kernel."""
+        kernel = sk.Kernel()
+        kernel.add_service(self.llm_service)
+        return LogicAgentFactory.create_agent(self.config.logic_type, kernel, self.llm_service.service_id)
+    
+    @contextlib.asynccontextmanager
+    async def _lease_logic_agent(self):
+        """
+        Prête un agent logique à une analyse formelle.
         
-        return results
+        Les analyses simultanées n'utilisent jamais le même agent : un agent libre est
+        réutilisé, sinon un nouveau est créé. Un agent dont l'analyse a été annulée
+        (timeout) n'est pas remis en service, son thread pouvant encore l'utiliser.
+        """
+        agent = self._idle_logic_agents.pop() if self._idle_logic_agents else self._create_logic_agent()
+        cancelled = False
+        try:
+            yield agent
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if agent is not None and not cancelled:
+                self._idle_logic_agents.append(agent)
     
     async def _analyze_with_orchestrator(self, text: str, source_info: Dict[str, Any]) -> Dict[str, Any]:
         """Effectue l'analyse via l'orchestrateur configuré."""
@@ -361,7 +521,13 @@ class UnifiedTextAnalysisPipeline:
             return {"status": "error", "message": str(e)}
     
     async def _perform_informal_analysis(self, text: str) -> Dict[str, Any]:
-        """Effectue l'analyse informelle (fallacies, coherence, semantic)."""
+        """Effectue l'analyse informelle (fallacies, coherence, semantic) dans un thread."""
+        # Les détecteurs sont synchrones : les exécuter hors de la boucle laisse les
+        # autres étapes progresser et le timeout de l'étape s'appliquer
+        return await asyncio.to_thread(self._run_informal_analysis, text)
+    
+    def _run_informal_analysis(self, text: str) -> Dict[str, Any]:
+        """Analyse informelle synchrone (voir `_perform_informal_analysis`)."""
         informal_results = {
             "fallacies": [],
             "coherence_analysis": {},
@@ -437,54 +603,47 @@ class UnifiedTextAnalysisPipeline:
             return formal_results
         
         try:
-            # Création de l'agent logique
-            kernel = sk.Kernel()
-            kernel.add_service(self.llm_service)
-            
-            logic_agent = LogicAgentFactory.create_agent(
-                self.config.logic_type,
-                kernel,
-                self.llm_service.service_id
-            )
-            
-            if not logic_agent:
-                formal_results["status"] = "Failed"
-                formal_results["reason"] = f"Impossible de créer l'agent logique '{self.config.logic_type}'"
-                return formal_results
-            
-            # Conversion en ensemble de croyances
-            belief_set, status = await logic_agent.text_to_belief_set(text)
-            
-            if belief_set:
-                # Vérification de cohérence
-                is_consistent, consistency_details = logic_agent.is_consistent(belief_set)
+            # Agent logique propre à cette analyse pendant toute sa durée
+            async with self._lease_logic_agent() as logic_agent:
+                if not logic_agent:
+                    formal_results["status"] = "Failed"
+                    formal_results["reason"] = f"Impossible de créer l'agent logique '{self.config.logic_type}'"
+                    return formal_results
                 
-                # Génération de requêtes
-                queries = await logic_agent.generate_queries(text, belief_set)
+                # Conversion en ensemble de croyances
+                belief_set, status = await logic_agent.text_to_belief_set(text)
                 
-                # Exécution des requêtes
-                query_results = []
-                for query in queries[:3]:  # Limite pour performance
-                    result, raw_output = logic_agent.execute_query(belief_set, query)
-                    query_results.append({
-                        "query": query,
-                        "result": "Entailed" if result else "Not Entailed" if result is not None else "Unknown",
-                        "raw_output": raw_output
+                if belief_set:
+                    # Vérification de cohérence (appel JVM bloquant, exécuté dans un thread)
+                    is_consistent, consistency_details = await asyncio.to_thread(logic_agent.is_consistent, belief_set)
+                    
+                    # Génération de requêtes
+                    queries = await logic_agent.generate_queries(text, belief_set)
+                    
+                    # Exécution des requêtes en un seul lot
+                    queries = queries[:3]  # Limite pour performance
+                    batch_results = await asyncio.to_thread(logic_agent.execute_queries, belief_set, queries)
+                    query_results = []
+                    for query, (result, raw_output) in zip(queries, batch_results):
+                        query_results.append({
+                            "query": query,
+                            "result": "Entailed" if result else "Not Entailed" if result is not None else "Unknown",
+                            "raw_output": raw_output
+                        })
+                    
+                    formal_results.update({
+                        "status": "Success",
+                        "belief_set_summary": {
+                            "is_consistent": is_consistent,
+                            "details": consistency_details,
+                            "formulas_count": len(belief_set.content.split('\n')) if hasattr(belief_set, 'content') else 0
+                        },
+                        "queries": query_results,
+                        "consistency_check": is_consistent
                     })
-                
-                formal_results.update({
-                    "status": "Success",
-                    "belief_set_summary": {
-                        "is_consistent": is_consistent,
-                        "details": consistency_details,
-                        "formulas_count": len(belief_set.content.split('\n')) if hasattr(belief_set, 'content') else 0
-                    },
-                    "queries": query_results,
-                    "consistency_check": is_consistent
-                })
-            else:
-                formal_results["status"] = "Failed"
-                formal_results["reason"] = f"Échec conversion en ensemble de croyances: {status}"
+                else:
+                    formal_results["status"] = "Failed"
+                    formal_results["reason"] = f"Échec conversion en ensemble de croyances: {status}"
                 
         except Exception as e:
             logger.error(f"Erreur analyse formelle: {e}")
@@ -3,73 +3,356 @@ Service de cache pour l'analyse d'argumentation.
 
 Ce module fournit un service centralisé pour la gestion du cache de textes,
 permettant de stocker et récupérer des contenus textuels à partir d'URLs.
+
+Les textes sont répartis dans des sous-répertoires selon le préfixe de leur
+hachage (`<ab>/<hachage>.txt`) et décrits par un index SQLite
+(`cache_index.sqlite3` : URL, taille, date de récupération, dernier accès,
+empreinte du contenu). L'index permet une éviction LRU sous un budget d'octets,
+une expiration (TTL) et des requêtes de taille en O(1). Un niveau mémoire LRU
+optionnel sert les textes les plus demandés sans accès disque ni écriture
+dans l'index : les dates de dernier accès sont tenues en mémoire et écrites
+par lots (avant une éviction, à la fermeture ou tous les
+`ACCESS_FLUSH_BATCH_SIZE` accès). Les fichiers
+d'un cache à plat (ancien format) sont migrés au premier accès.
+
+Les totaux sont tenus en mémoire par instance : plusieurs processus partageant
+un même répertoire voient l'index commun mais des totaux propres à chacun.
 """
 
 import hashlib
+import json
 import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 # Configuration du logging
 logger = logging.getLogger("Services.CacheService")
 
+INDEX_FILENAME = "cache_index.sqlite3"
+EVICTION_BATCH_SIZE = 64
+ACCESS_FLUSH_BATCH_SIZE = 256
+
 
 class CacheService:
     """Service pour la gestion du cache de textes."""
-    
-    def __init__(self, cache_dir: Path):
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        memory_cache_bytes: int = 0
+    ):
         """
         Initialise le service de cache.
 
         :param cache_dir: Le chemin (objet Path) vers le répertoire où le cache sera stocké.
         :type cache_dir: Path
+        :param max_bytes: Budget optionnel en octets ; au-delà, les entrées les moins
+                          récemment utilisées sont évincées.
+        :type max_bytes: Optional[int]
+        :param ttl_seconds: Durée de validité optionnelle d'une entrée depuis sa récupération.
+        :type ttl_seconds: Optional[float]
+        :param memory_cache_bytes: Taille (en octets UTF-8) du niveau mémoire LRU ; 0 le désactive.
+        :type memory_cache_bytes: int
         """
-        self.cache_dir = cache_dir
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.memory_cache_bytes = memory_cache_bytes
         self.logger = logger
-        
+        self._lock = threading.RLock()
+        self._memory: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        # Dates de dernier accès non encore écrites dans l'index
+        self._pending_access: Dict[str, float] = {}
+
         # S'assurer que le répertoire de cache existe
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.cache_dir / INDEX_FILENAME
+        index_exists = index_path.exists()
+        self._index = sqlite3.connect(str(index_path), check_same_thread=False, isolation_level=None)
+        self._index.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, url TEXT, size INTEGER NOT NULL, fetched_at REAL NOT NULL,"
+            " last_access REAL NOT NULL, content_hash TEXT)"
+        )
+        self._index.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        if not index_exists:
+            self._rebuild_index()
+        self._entry_count, self._total_bytes = self._index.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
         self.logger.info(f"Répertoire de cache initialisé: {self.cache_dir}")
-    
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
     def get_cache_filepath(self, url: str) -> Path:
         """
         Génère le chemin du fichier cache pour une URL donnée.
 
-        Le nom du fichier est basé sur un hachage SHA256 de l'URL.
+        Le nom du fichier est basé sur un hachage SHA256 de l'URL ; les deux premiers
+        caractères du hachage désignent le sous-répertoire.
 
         :param url: L'URL pour laquelle générer le chemin du fichier cache.
         :type url: str
         :return: Le chemin (objet Path) complet vers le fichier cache potentiel.
         :rtype: Path
         """
-        url_hash = hashlib.sha256(url.encode()).hexdigest()
-        return self.cache_dir / f"{url_hash}.txt"
-    
+        url_hash = self._key(url)
+        return self.cache_dir / url_hash[:2] / f"{url_hash}.txt"
+
+    def get_metadata_filepath(self, url: str) -> Path:
+        """
+        Génère le chemin du fichier de métadonnées HTTP associé à l'entrée de cache d'une URL.
+
+        :param url: L'URL concernée.
+        :type url: str
+        :return: Le chemin (objet Path) `<hachage>.meta.json` à côté du fichier cache.
+        :rtype: Path
+        """
+        return self.get_cache_filepath(url).with_suffix(".meta.json")
+
+    def _resolve_filepath(self, url: str) -> Path:
+        """Retourne le chemin réparti d'une entrée, après migration éventuelle d'un fichier à plat."""
+        filepath = self.get_cache_filepath(url)
+        if not filepath.exists():
+            legacy_filepath = self.cache_dir / filepath.name
+            if legacy_filepath.exists():
+                filepath.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(legacy_filepath, filepath)
+                legacy_metadata = legacy_filepath.with_suffix(".meta.json")
+                if legacy_metadata.exists():
+                    os.replace(legacy_metadata, filepath.with_suffix(".meta.json"))
+        return filepath
+
+    def _rebuild_index(self) -> None:
+        """Indexe les fichiers d'un cache existant (répartis ou à plat) lors de la création de l'index."""
+        entries = []
+        for filepath in list(self.cache_dir.glob("*.txt")) + list(self.cache_dir.glob("??/*.txt")):
+            try:
+                stat = filepath.stat()
+            except OSError:
+                continue
+            entries.append((filepath.stem, None, stat.st_size, stat.st_mtime, stat.st_mtime, None))
+        if entries:
+            self._index.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", entries)
+            self.logger.info(f"Index du cache reconstruit: {len(entries)} entrées existantes.")
+
+    def _is_expired(self, fetched_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - fetched_at > self.ttl_seconds
+
+    def _remember(self, key: str, text: str, size: int, fetched_at: float) -> None:
+        """Place un texte dans le niveau mémoire, en évinçant les moins récemment utilisés."""
+        if size > self.memory_cache_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+        self._memory[key] = (text, size, fetched_at)
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_cache_bytes:
+            _, (_, evicted_size, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+
+    def _touch(self, key: str, accessed_at: float) -> None:
+        """Enregistre un accès ; l'index est mis à jour par lots."""
+        self._pending_access[key] = accessed_at
+        if len(self._pending_access) >= ACCESS_FLUSH_BATCH_SIZE:
+            self._flush_access_times()
+
+    def _flush_access_times(self) -> None:
+        """Écrit les dates de dernier accès en attente dans l'index, en une transaction."""
+        if not self._pending_access:
+            return
+        updates = [(accessed_at, key) for key, accessed_at in self._pending_access.items()]
+        self._pending_access.clear()
+        self._index.execute("BEGIN")
+        try:
+            self._index.executemany("UPDATE entries SET last_access = ? WHERE key = ?", updates)
+            self._index.execute("COMMIT")
+        except Exception:
+            self._index.execute("ROLLBACK")
+            raise
+
+    def _forget(self, key: str) -> None:
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous[1]
+
+    def _drop_index_entry(self, key: str) -> None:
+        self._pending_access.pop(key, None)
+        row = self._index.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._index.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._entry_count -= 1
+            self._total_bytes -= row[0]
+
+    def _remove_entry(self, key: str) -> None:
+        """Supprime une entrée (fichiers, index, niveau mémoire)."""
+        filepath = self.cache_dir / key[:2] / f"{key}.txt"
+        for path in (filepath, filepath.with_suffix(".meta.json")):
+            if path.exists():
+                path.unlink()
+        self._drop_index_entry(key)
+        self._forget(key)
+
+    def _enforce_budget(self, protected_key: str) -> None:
+        """Évince les entrées les moins récemment utilisées tant que le budget est dépassé."""
+        if self.max_bytes is None:
+            return
+        if self._total_bytes > self.max_bytes:
+            # L'ordre LRU doit refléter les accès servis depuis la mémoire
+            self._flush_access_times()
+        while self._total_bytes > self.max_bytes:
+            rows = self._index.execute(
+                "SELECT key FROM entries WHERE key != ? ORDER BY last_access LIMIT ?",
+                (protected_key, EVICTION_BATCH_SIZE)
+            ).fetchall()
+            if not rows:
+                break
+            for (key,) in rows:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                try:
+                    self._remove_entry(key)
+                    self.logger.debug(f"Entrée de cache évincée (LRU): {key}")
+                except Exception as e:
+                    self.logger.warning(f"Erreur lors de l'éviction de {key}: {e}")
+                    self._drop_index_entry(key)
+
+    def has_entry(self, url: str) -> bool:
+        """
+        Indique si une entrée valide (non expirée) existe pour une URL, sans lire son contenu.
+
+        :param url: L'URL concernée.
+        :type url: str
+        :rtype: bool
+        """
+        key = self._key(url)
+        with self._lock:
+            if not self._resolve_filepath(url).exists():
+                return False
+            row = self._index.execute("SELECT fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+            return row is None or not self._is_expired(row[0])
+
+    def load_cache_metadata(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Charge les validateurs HTTP (`etag`, `last_modified`) de l'entrée de cache d'une URL.
+
+        Ils permettent de revalider l'entrée par une requête conditionnelle
+        (`If-None-Match` / `If-Modified-Since`) plutôt que par un téléchargement complet.
+
+        :param url: L'URL concernée.
+        :type url: str
+        :return: Les validateurs connus, ou None si l'entrée n'en possède pas.
+        :rtype: Optional[Dict[str, str]]
+        """
+        with self._lock:
+            self._resolve_filepath(url)
+        filepath = self.get_metadata_filepath(url)
+        if not filepath.exists():
+            return None
+        try:
+            metadata = json.loads(filepath.read_text(encoding='utf-8'))
+        except Exception as e:
+            self.logger.warning(f"Erreur lecture métadonnées cache {filepath.name}: {e}")
+            return None
+        return metadata if isinstance(metadata, dict) and metadata else None
+
+    def save_cache_metadata(self, url: str, metadata: Dict[str, str]) -> bool:
+        """
+        Sauvegarde les validateurs HTTP de l'entrée de cache d'une URL.
+
+        :param url: L'URL concernée.
+        :type url: str
+        :param metadata: Les validateurs (`etag`, `last_modified`). Un dictionnaire vide
+                         efface les métadonnées existantes.
+        :type metadata: Dict[str, str]
+        :return: True si la sauvegarde a réussi, False sinon.
+        :rtype: bool
+        """
+        filepath = self.get_metadata_filepath(url)
+        try:
+            if not metadata:
+                if filepath.exists():
+                    filepath.unlink()
+                return True
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            filepath.write_text(json.dumps(metadata), encoding='utf-8')
+            return True
+        except Exception as e:
+            self.logger.error(f"Erreur sauvegarde métadonnées cache {filepath.name}: {e}")
+            return False
+
     def load_from_cache(self, url: str) -> Optional[str]:
         """
         Charge le contenu textuel depuis le cache pour une URL donnée, si disponible.
 
+        Une entrée expirée (voir `ttl_seconds`) est supprimée et traitée comme absente.
+
         :param url: L'URL dont le contenu est à charger depuis le cache.
         :type url: str
         :return: Le contenu textuel en tant que chaîne de caractères si trouvé dans le cache,
                  sinon None.
         :rtype: Optional[str]
         """
-        filepath = self.get_cache_filepath(url)
-        if filepath.exists():
-            try:
-                self.logger.info(f"Lecture depuis cache: {filepath.name}")
-                return filepath.read_text(encoding='utf-8')
-            except Exception as e:
-                self.logger.warning(f"Erreur lecture cache {filepath.name}: {e}")
+        key = self._key(url)
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and not self._is_expired(cached[2]):
+                self._memory.move_to_end(key)
+                self._touch(key, now)
+                return cached[0]
+            filepath = self._resolve_filepath(url)
+            if not filepath.exists():
+                self.logger.debug(f"Cache miss pour URL: {url}")
                 return None
-        self.logger.debug(f"Cache miss pour URL: {url}")
-        return None
-    
+            row = self._index.execute("SELECT fetched_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and self._is_expired(row[0]):
+                self.logger.info(f"Entrée de cache expirée pour URL: {url}")
+                try:
+                    self._remove_entry(key)
+                except Exception as e:
+                    self.logger.warning(f"Erreur suppression entrée expirée {filepath.name}: {e}")
+                return None
+        try:
+            self.logger.info(f"Lecture depuis cache: {filepath.name}")
+            text = filepath.read_text(encoding='utf-8')
+        except Exception as e:
+            self.logger.warning(f"Erreur lecture cache {filepath.name}: {e}")
+            return None
+        with self._lock:
+            if row is None:
+                # Fichier présent mais non indexé (écrit par un autre processus, par exemple)
+                size = filepath.stat().st_size
+                self._index.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", (key, url, size, now, now, None)
+                )
+                self._entry_count += 1
+                self._total_bytes += size
+                fetched_at = now
+            else:
+                self._touch(key, now)
+                fetched_at = row[0]
+            self._remember(key, text, len(text.encode('utf-8')), fetched_at)
+        return text
+
     def save_to_cache(self, url: str, text: str) -> bool:
         """
         Sauvegarde le contenu textuel dans le cache pour une URL donnée.
 
+        Si un budget `max_bytes` est défini, les entrées les moins récemment utilisées
+        sont ensuite évincées jusqu'à le respecter.
+
         :param url: L'URL associée au contenu textuel.
         :type url: str
         :param text: Le contenu textuel à sauvegarder.
@@ -80,18 +363,60 @@ class CacheService:
         if not text:
             self.logger.info("Texte vide, non sauvegardé.")
             return False
-        
+
+        key = self._key(url)
         filepath = self.get_cache_filepath(url)
+        data = text.encode('utf-8')
+        now = time.time()
         try:
             # S'assurer que le dossier cache existe
             filepath.parent.mkdir(parents=True, exist_ok=True)
-            filepath.write_text(text, encoding='utf-8')
+            tmp_path = filepath.with_name(f"{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, filepath)
+            with self._lock:
+                legacy_filepath = self.cache_dir / filepath.name
+                if legacy_filepath.exists():
+                    legacy_filepath.unlink()
+                self._drop_index_entry(key)
+                self._index.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, url, len(data), now, now, hashlib.sha256(data).hexdigest())
+                )
+                self._entry_count += 1
+                self._total_bytes += len(data)
+                self._remember(key, text, len(data), now)
+                self._enforce_budget(key)
             self.logger.info(f"Texte sauvegardé: {filepath.name}")
             return True
         except Exception as e:
             self.logger.error(f"Erreur sauvegarde cache {filepath.name}: {e}")
             return False
-    
+
+    def evict_expired(self) -> int:
+        """
+        Supprime toutes les entrées expirées (voir `ttl_seconds`).
+
+        :return: Le nombre d'entrées supprimées.
+        :rtype: int
+        """
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            rows = self._index.execute(
+                "SELECT key FROM entries WHERE fetched_at < ?", (time.time() - self.ttl_seconds,)
+            ).fetchall()
+            removed = 0
+            for (key,) in rows:
+                try:
+                    self._remove_entry(key)
+                    removed += 1
+                except Exception as e:
+                    self.logger.warning(f"Erreur lors de la suppression de l'entrée expirée {key}: {e}")
+        if removed:
+            self.logger.info(f"{removed} entrées de cache expirées supprimées.")
+        return removed
+
     def clear_cache(self, url: Optional[str] = None) -> Tuple[int, int]:
         """
         Efface le cache pour une URL spécifique ou l'intégralité du cache.
@@ -106,51 +431,70 @@ class CacheService:
         """
         if url:
             # Effacer le cache pour une URL spécifique
-            filepath = self.get_cache_filepath(url)
-            if filepath.exists():
-                try:
-                    filepath.unlink()
-                    self.logger.info(f"Cache effacé pour {url}: {filepath.name}")
-                    return 1, 0
-                except Exception as e:
-                    self.logger.error(f"Erreur lors de l'effacement du cache pour {url}: {e}")
-                    return 0, 1
+            with self._lock:
+                key = self._key(url)
+                filepath = self._resolve_filepath(url)
+                if filepath.exists():
+                    try:
+                        self._remove_entry(key)
+                        self.logger.info(f"Cache effacé pour {url}: {filepath.name}")
+                        return 1, 0
+                    except Exception as e:
+                        self.logger.error(f"Erreur lors de l'effacement du cache pour {url}: {e}")
+                        return 0, 1
+                self._drop_index_entry(key)
+                self._forget(key)
             return 0, 0
         else:
             # Effacer tout le cache
             deleted = 0
             errors = 0
-            for file in self.cache_dir.glob("*.txt"):
-                try:
-                    file.unlink()
-                    deleted += 1
-                except Exception as e:
-                    self.logger.error(f"Erreur lors de l'effacement du fichier {file.name}: {e}")
-                    errors += 1
-            
+            with self._lock:
+                for file in list(self.cache_dir.glob("*.txt")) + list(self.cache_dir.glob("??/*.txt")):
+                    try:
+                        file.unlink()
+                        deleted += 1
+                    except Exception as e:
+                        self.logger.error(f"Erreur lors de l'effacement du fichier {file.name}: {e}")
+                        errors += 1
+                for metadata_file in list(self.cache_dir.glob("*.meta.json")) + list(self.cache_dir.glob("??/*.meta.json")):
+                    try:
+                        metadata_file.unlink()
+                    except Exception as e:
+                        self.logger.warning(f"Erreur lors de l'effacement des métadonnées {metadata_file.name}: {e}")
+                self._pending_access.clear()
+                self._index.execute("DELETE FROM entries")
+                self._entry_count, self._total_bytes = self._index.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+                self._memory.clear()
+                self._memory_bytes = 0
+
             self.logger.info(f"Cache entièrement effacé: {deleted} fichiers supprimés, {errors} erreurs")
             return deleted, errors
-    
+
     def get_cache_size(self) -> Tuple[int, int]:
         """
         Récupère la taille actuelle du cache.
 
-        Calcule le nombre total de fichiers .txt dans le répertoire de cache
-        et leur taille cumulée en octets.
+        Les totaux sont maintenus par l'index à chaque écriture ou éviction :
+        l'appel ne parcourt pas le répertoire.
 
         :return: Un tuple contenant le nombre de fichiers dans le cache et
                  la taille totale du cache en octets.
         :rtype: Tuple[int, int]
         """
-        file_count = 0
-        total_size = 0
-        
-        for file in self.cache_dir.glob("*.txt"):
-            file_count += 1
-            total_size += file.stat().st_size
-        
-        return file_count, total_size
-    
+        with self._lock:
+            return self._entry_count, self._total_bytes
+
+    def close(self) -> None:
+        """Écrit les dates de dernier accès en attente puis ferme la connexion à l'index."""
+        with self._lock:
+            try:
+                self._flush_access_times()
+            finally:
+                self._index.close()
+
     def get_cache_info(self) -> str:
         """
         Récupère des informations formatées sur l'état actuel du cache.
@@ -160,12 +504,12 @@ class CacheService:
         :rtype: str
         """
         file_count, total_size = self.get_cache_size()
-        
+
         # Convertir la taille en format lisible
         size_str = self._format_size(total_size)
-        
+
         return f"Cache: {file_count} fichiers, {size_str}"
-    
+
     def _format_size(self, size_bytes: int) -> str:
         """
         Formate une taille donnée en octets en une chaîne de caractères lisible par l'homme
@@ -180,5 +524,5 @@ class CacheService:
             if size_bytes < 1024.0 or unit == 'GB':
                 break
             size_bytes /= 1024.0
-        
-        return f"{size_bytes:.2f} {unit}"
\ No newline at end of file
+
+        return f"{size_bytes:.2f} {unit}"
@@ -3,14 +3,23 @@ Service de récupération de texte pour l'analyse d'argumentation.
 
 Ce module fournit un service centralisé pour la récupération de texte à partir d'URLs,
 avec prise en charge de différentes méthodes (direct, Jina, Tika) et gestion du cache.
+
+Toutes les requêtes passent par une `requests.Session` propre au service : les
+connexions (keep-alive) sont réutilisées d'une source à l'autre au lieu de payer
+une poignée de main TCP/TLS par requête. Les validateurs HTTP (`ETag`,
+`Last-Modified`) sont conservés avec les entrées du `CacheService`, ce qui permet
+de les revalider par requête conditionnelle (réponse 304 sans corps).
 """
 
+import asyncio
 import hashlib
 import logging
 import os
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any, Union
+from typing import Optional, Tuple, List, Dict, Any, Union, Iterable
 from dotenv import load_dotenv, find_dotenv
 
 from argumentation_analysis.models.extract_definition import SourceDefinition
@@ -22,6 +31,9 @@ load_dotenv(find_dotenv())
 # Configuration du logging
 logger = logging.getLogger("Services.FetchService")
 
+USER_AGENT = 'ArgumentAnalysisApp/1.0'
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class FetchService:
     """Service pour la récupération de texte à partir d'URLs."""
@@ -33,7 +45,11 @@ class FetchService:
         tika_server_url: Optional[str] = None,
         tika_server_timeout: Optional[int] = None,
         temp_download_dir: Optional[Path] = None,
-        plaintext_extensions: Optional[List[str]] = None
+        plaintext_extensions: Optional[List[str]] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        session: Optional[requests.Session] = None
     ):
         """
         Initialise le service de récupération de texte.
@@ -55,6 +71,15 @@ class FetchService:
         :param plaintext_extensions: Liste optionnelle des extensions de fichiers à considérer
                                      comme du texte brut (pour éviter Tika si possible).
         :type plaintext_extensions: Optional[List[str]]
+        :param pool_connections: Nombre d'hôtes dont les connexions sont conservées.
+        :type pool_connections: int
+        :param pool_maxsize: Nombre maximal de connexions conservées par hôte ; à aligner
+                             sur la concurrence de `fetch_many`.
+        :type pool_maxsize: int
+        :param max_retries: Nombre de nouvelles tentatives de connexion (erreurs réseau).
+        :type max_retries: int
+        :param session: Session HTTP optionnelle à utiliser telle quelle (partage entre services, tests).
+        :type session: Optional[requests.Session]
         """
         self.cache_service = cache_service
         self.jina_reader_prefix = jina_reader_prefix
@@ -68,6 +93,7 @@ class FetchService:
         self.temp_download_dir = temp_download_dir
         self.plaintext_extensions = plaintext_extensions or ['.txt', '.md', '.json', '.csv', '.xml', '.py', '.js', '.html', '.htm']
         self.logger = logger
+        self.session = session or self._create_session(pool_connections, pool_maxsize, max_retries)
         
         self.logger.info(f"FetchService initialisé avec Tika URL: {self.tika_server_url}, timeout: {self.tika_server_timeout}s")
         
@@ -76,6 +102,54 @@ class FetchService:
             self.temp_download_dir.mkdir(parents=True, exist_ok=True)
             self.logger.info(f"Répertoire temporaire initialisé: {self.temp_download_dir}")
     
+    @staticmethod
+    def _create_session(pool_connections: int, pool_maxsize: int, max_retries: int) -> requests.Session:
+        """Crée une session HTTP avec un pool de connexions persistantes par hôte."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=max_retries)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers['User-Agent'] = USER_AGENT
+        return session
+    
+    def close(self) -> None:
+        """Ferme les connexions conservées par la session."""
+        self.session.close()
+    
+    def __enter__(self) -> "FetchService":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _conditional_headers(self, cache_key: str) -> Dict[str, str]:
+        """
+        Construit les en-têtes de revalidation d'une entrée de cache existante.
+
+        :return: `If-None-Match` / `If-Modified-Since` si l'entrée possède des validateurs,
+                 sinon un dictionnaire vide.
+        :rtype: Dict[str, str]
+        """
+        if not self.cache_service.has_entry(cache_key):
+            return {}
+        metadata = self.cache_service.load_cache_metadata(cache_key) or {}
+        headers = {}
+        if metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        return headers
+    
+    def _save_validators(self, cache_key: str, response: Any) -> None:
+        """Conserve les validateurs HTTP d'une réponse avec l'entrée de cache."""
+        headers = getattr(response, 'headers', None) or {}
+        metadata = {}
+        if headers.get('ETag'):
+            metadata['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            metadata['last_modified'] = headers['Last-Modified']
+        self.cache_service.save_cache_metadata(cache_key, metadata)
+    
     def reconstruct_url(self, schema: str, host_parts: List[str], path: str) -> Optional[str]:
         """
         Reconstruit une URL complète à partir de ses composants.
@@ -102,7 +176,8 @@ class FetchService:
     def fetch_text(
         self,
         source_info: Union[Dict[str, Any], SourceDefinition],
-        force_refresh: bool = False
+        force_refresh: bool = False,
+        revalidate: bool = False
     ) -> Tuple[Optional[str], str]:
         """
         Récupère le texte d'une source en utilisant la méthode de récupération appropriée
@@ -114,6 +189,10 @@ class FetchService:
         :param force_refresh: Si True, ignore le cache et force une nouvelle récupération
                               du contenu. Par défaut à False.
         :type force_refresh: bool
+        :param revalidate: Si True, une entrée de cache possédant des validateurs HTTP est
+                           revalidée par requête conditionnelle (hors Jina) au lieu d'être
+                           servie directement. Par défaut à False.
+        :type revalidate: bool
         :return: Un tuple contenant:
                  - Le texte source récupéré (str, ou None si échec).
                  - Un message de statut ou l'URL traitée (str).
@@ -140,10 +219,12 @@ class FetchService:
         # Vérifier le cache si force_refresh est False
         if not force_refresh:
             cached_text = self.cache_service.load_from_cache(url)
-            if cached_text is not None:
+            needs_revalidation = revalidate and source_type != "jina" and self.cache_service.load_cache_metadata(url)
+            if cached_text is not None and not needs_revalidation:
                 return cached_text, url
         
         # Récupérer le texte selon le type de source
+        conditional = not force_refresh
         try:
             if source_type == "jina":
                 return self.fetch_with_jina(url), url
@@ -151,16 +232,51 @@ class FetchService:
                 # Vérifier si c'est un fichier texte
                 is_plaintext = any(path.lower().endswith(ext) for ext in self.plaintext_extensions)
                 if is_plaintext:
-                    return self.fetch_direct_text(url), url
+                    return self.fetch_direct_text(url, conditional=conditional), url
                 else:
-                    return self.fetch_with_tika(url), url
+                    return self.fetch_with_tika(url, conditional=conditional), url
             else:  # direct_download ou autre
-                return self.fetch_direct_text(url), url
+                return self.fetch_direct_text(url, conditional=conditional), url
         except Exception as e:
             self.logger.error(f"Erreur lors de la récupération de {url}: {e}")
             return None, f"Erreur: {str(e)}"
     
-    def fetch_direct_text(self, url: str, timeout: int = 60) -> Optional[str]:
+    async def fetch_many(
+        self,
+        sources: Iterable[Union[Dict[str, Any], SourceDefinition]],
+        max_concurrency: int = 8,
+        force_refresh: bool = False,
+        revalidate: bool = False
+    ) -> List[Tuple[Optional[str], str]]:
+        """
+        Récupère le texte d'un ensemble de sources en parallèle, avec un parallélisme borné.
+
+        Chaque récupération s'exécute via `fetch_text` dans un thread ; la session
+        partagée réutilise les connexions ouvertes vers un même hôte.
+
+        :param sources: Les sources à récupérer (dictionnaires ou SourceDefinition).
+        :type sources: Iterable[Union[Dict[str, Any], SourceDefinition]]
+        :param max_concurrency: Nombre maximal de récupérations simultanées.
+        :type max_concurrency: int
+        :param force_refresh: Transmis à `fetch_text`.
+        :type force_refresh: bool
+        :param revalidate: Transmis à `fetch_text`.
+        :type revalidate: bool
+        :return: Les résultats de `fetch_text`, dans l'ordre des sources.
+        :rtype: List[Tuple[Optional[str], str]]
+        :raises ValueError: Si `max_concurrency` est inférieur à 1.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency doit être >= 1 (reçu: {max_concurrency})")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_one(source_info):
+            async with semaphore:
+                return await asyncio.to_thread(self.fetch_text, source_info, force_refresh, revalidate)
+
+        return await asyncio.gather(*(fetch_one(source_info) for source_info in sources))
+    
+    def fetch_direct_text(self, url: str, timeout: int = 60, conditional: bool = False) -> Optional[str]:
         """
         Récupère le contenu texte brut d'une URL par téléchargement direct.
 
@@ -168,16 +284,24 @@ class FetchService:
         :type url: str
         :param timeout: Le délai d'attente en secondes pour la requête HTTP.
         :type timeout: int
+        :param conditional: Si True et que l'URL est en cache avec des validateurs, la
+                            requête est conditionnelle ; une réponse 304 retourne le cache.
+        :type conditional: bool
         :return: Le contenu textuel de la réponse si la requête réussit, sinon None.
                  Le texte est décodé en UTF-8.
         :rtype: Optional[str]
         """
         self.logger.info(f"Téléchargement direct depuis: {url}...")
         
-        headers = {'User-Agent': 'ArgumentAnalysisApp/1.0'}
+        headers = {'User-Agent': USER_AGENT}
+        if conditional:
+            headers.update(self._conditional_headers(url))
         
         try:
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = self.session.get(url, headers=headers, timeout=timeout)
+            if response.status_code == 304:
+                self.logger.info(f"Contenu inchangé (304), cache conservé pour {url}.")
+                return self.cache_service.load_from_cache(url)
             response.raise_for_status()
             
             texte_brut = response.content.decode('utf-8', errors='ignore')
@@ -185,6 +309,7 @@ class FetchService:
             
             # Sauvegarder dans le cache
             self.cache_service.save_to_cache(url, texte_brut)
+            self._save_validators(url, response)
             
             return texte_brut
         except requests.exceptions.RequestException as e:
@@ -208,10 +333,10 @@ class FetchService:
         jina_url = f"{self.jina_reader_prefix}{url}"
         self.logger.info(f"Récupération via Jina: {jina_url}...")
         
-        headers = {'Accept': 'text/markdown', 'User-Agent': 'ArgumentAnalysisApp/1.0'}
+        headers = {'Accept': 'text/markdown', 'User-Agent': USER_AGENT}
         
         try:
-            response = requests.get(jina_url, headers=headers, timeout=timeout)
+            response = self.session.get(jina_url, headers=headers, timeout=timeout)
             response.raise_for_status()
             
             content = response.text
@@ -229,6 +354,32 @@ class FetchService:
             self.logger.error(f"Erreur Jina ({jina_url}): {e}")
             return None
     
+    def _stream_download(self, response: Any, target_path: Optional[Path]) -> Union[bytes, Path]:
+        """
+        Lit le corps d'une réponse par blocs, vers `target_path` si fourni.
+
+        Écrit sur disque, le document n'est jamais entièrement chargé en mémoire :
+        il est ensuite transmis à Tika directement depuis le fichier.
+
+        :return: Le chemin du fichier écrit, ou le contenu si `target_path` est None.
+        :rtype: Union[bytes, Path]
+        :raises OSError: Si l'écriture du fichier échoue.
+        """
+        if target_path is None:
+            return b"".join(chunk for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE) if chunk)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target_path.with_name(f"{target_path.name}.{os.getpid()}.{threading.get_ident()}.part")
+        try:
+            with open(tmp_path, 'wb') as raw_file:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        raw_file.write(chunk)
+            os.replace(tmp_path, target_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return target_path
+    
     def fetch_with_tika(
         self,
         url: Optional[str] = None,
@@ -236,16 +387,18 @@ class FetchService:
         file_name: str = "fichier",
         raw_file_cache_path: Optional[Union[Path, str]] = None,
         timeout_dl: int = 60,
-        timeout_tika: Optional[int] = None
+        timeout_tika: Optional[int] = None,
+        conditional: bool = False
     ) -> Optional[str]:
         """
         Récupère et extrait le contenu textuel d'une URL ou d'un contenu binaire
         de fichier en utilisant un serveur Apache Tika.
 
         Si une URL est fournie et qu'elle ne pointe pas vers un type de fichier texte simple,
-        le contenu est d'abord téléchargé (et mis en cache brut si `temp_download_dir`
-        est configuré), puis envoyé à Tika. Si `file_content` est fourni, il est
-        directement envoyé à Tika (sauf s'il s'agit d'un type texte simple).
+        le contenu est d'abord téléchargé par blocs (et écrit dans le cache brut si
+        `temp_download_dir` est configuré, puis transmis à Tika depuis ce fichier), puis
+        envoyé à Tika. Si `file_content` est fourni, il est directement envoyé à Tika
+        (sauf s'il s'agit d'un type texte simple).
 
         :param url: URL optionnelle du fichier à traiter.
         :type url: Optional[str]
@@ -261,13 +414,18 @@ class FetchService:
         :param timeout_tika: Délai d'attente optionnel en secondes pour la requête au serveur Tika.
                              Utilise `self.tika_server_timeout` si None.
         :type timeout_tika: Optional[int]
+        :param conditional: Si True et que le texte de l'URL est en cache avec des validateurs,
+                            le téléchargement est conditionnel ; une réponse 304 retourne le
+                            texte en cache sans nouvelle extraction Tika.
+        :type conditional: bool
         :return: Le contenu textuel extrait par Tika, ou None si une erreur survient.
                  Retourne une chaîne vide si Tika ne retourne aucun texte mais que la requête réussit.
         :rtype: Optional[str]
         """
         cache_key = url if url else f"file://{file_name}"
         
-        content_to_send = None
+        content_to_send: Optional[Union[bytes, Path]] = None
+        download_response = None
         
         if url:
             original_filename = Path(url).name
@@ -275,46 +433,51 @@ class FetchService:
             # Vérifier si c'est un fichier texte
             if any(url.lower().endswith(ext) for ext in self.plaintext_extensions):
                 self.logger.info(f"URL détectée comme texte simple ({url}). Fetch direct.")
-                return self.fetch_direct_text(url)
+                return self.fetch_direct_text(url, conditional=conditional)
             
             # Gestion cache brut
             url_hash = hashlib.sha256(url.encode()).hexdigest()
             file_extension = Path(original_filename).suffix if Path(original_filename).suffix else ".download"
+            effective_raw_cache_path = None
+            conditional_headers = self._conditional_headers(url) if conditional else {}
             
             if self.temp_download_dir:
                 effective_raw_cache_path = Path(raw_file_cache_path) if raw_file_cache_path else self.temp_download_dir / f"{url_hash}{file_extension}"
                 
-                # Vérifier si le fichier brut est déjà en cache
-                if effective_raw_cache_path.exists() and effective_raw_cache_path.stat().st_size > 0:
-                    try:
-                        self.logger.info(f"Lecture fichier brut depuis cache local: {effective_raw_cache_path.name}")
-                        content_to_send = effective_raw_cache_path.read_bytes()
-                    except Exception as e_read_raw:
-                        self.logger.warning(f"Erreur lecture cache brut {effective_raw_cache_path.name}: {e_read_raw}. Re-téléchargement...")
-                        content_to_send = None
+                # Vérifier si le fichier brut est déjà en cache (sauf revalidation demandée)
+                if not conditional_headers and effective_raw_cache_path.exists() and effective_raw_cache_path.stat().st_size > 0:
+                    if os.access(effective_raw_cache_path, os.R_OK):
+                        # Transmis à Tika depuis le fichier (envoi en flux, sans le charger en mémoire)
+                        self.logger.info(f"Utilisation du fichier brut en cache local: {effective_raw_cache_path.name}")
+                        content_to_send = effective_raw_cache_path
+                    else:
+                        self.logger.warning(f"Cache brut {effective_raw_cache_path.name} illisible. Re-téléchargement...")
             
             # Télécharger si nécessaire
             if content_to_send is None:
                 self.logger.info(f"Téléchargement (pour Tika) depuis: {url}...")
                 
                 try:
-                    response_dl = requests.get(url, stream=True, timeout=timeout_dl)
-                    response_dl.raise_for_status()
-                    
-                    content_to_send = response_dl.content
-                    self.logger.info(f"Doc téléchargé ({len(content_to_send)} bytes).")
-                    
-                    # Sauvegarder dans le cache brut
-                    if self.temp_download_dir and effective_raw_cache_path:
-                        try:
-                            effective_raw_cache_path.parent.mkdir(parents=True, exist_ok=True)
-                            effective_raw_cache_path.write_bytes(content_to_send)
-                            self.logger.info(f"Doc brut sauvegardé: {effective_raw_cache_path}")
-                        except Exception as e_save:
-                            self.logger.error(f"Erreur sauvegarde brut: {e_save}")
+                    response_dl = self.session.get(url, headers=conditional_headers, stream=True, timeout=timeout_dl)
+                    try:
+                        if response_dl.status_code == 304:
+                            self.logger.info(f"Document inchangé (304), texte en cache conservé pour {url}.")
+                            return self.cache_service.load_from_cache(url)
+                        response_dl.raise_for_status()
+                        content_to_send = self._stream_download(response_dl, effective_raw_cache_path)
+                        download_response = response_dl
+                    finally:
+                        response_dl.close()
+                    if isinstance(content_to_send, Path):
+                        self.logger.info(f"Doc brut sauvegardé: {content_to_send} ({content_to_send.stat().st_size} bytes)")
+                    else:
+                        self.logger.info(f"Doc téléchargé ({len(content_to_send)} bytes).")
                 except requests.exceptions.RequestException as e:
                     self.logger.error(f"Erreur téléchargement {url}: {e}")
                     return None
+                except OSError as e_save:
+                    self.logger.error(f"Erreur sauvegarde brut: {e_save}")
+                    return None
         elif file_content:
             self.logger.info(f"Utilisation contenu fichier '{file_name}' ({len(file_content)} bytes)...")
             content_to_send = file_content
@@ -334,7 +497,8 @@ class FetchService:
             return None
         
         # Vérifier que le contenu est disponible
-        if not content_to_send:
+        content_size = content_to_send.stat().st_size if isinstance(content_to_send, Path) else len(content_to_send or b"")
+        if not content_size:
             self.logger.warning("Contenu brut vide ou non récupéré. Impossible d'envoyer à Tika.")
             self.cache_service.save_to_cache(cache_key, "")
             return ""
@@ -352,7 +516,12 @@ class FetchService:
         }
         
         try:
-            response_tika = requests.put(self.tika_server_url, data=content_to_send, headers=headers, timeout=effective_timeout)
+            if isinstance(content_to_send, Path):
+                # Envoi en flux depuis le fichier brut
+                with open(content_to_send, 'rb') as document:
+                    response_tika = self.session.put(self.tika_server_url, data=document, headers=headers, timeout=effective_timeout)
+            else:
+                response_tika = self.session.put(self.tika_server_url, data=content_to_send, headers=headers, timeout=effective_timeout)
             response_tika.raise_for_status()
             
             texte_brut = response_tika.text
@@ -364,6 +533,8 @@ class FetchService:
             
             # Sauvegarder dans le cache
             self.cache_service.save_to_cache(cache_key, texte_brut)
+            if download_response is not None:
+                self._save_validators(cache_key, download_response)
             
             return texte_brut
         except requests.exceptions.Timeout:
@@ -371,4 +542,4 @@ class FetchService:
             return None
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Erreur Tika: {e}")
-            return None
\ No newline at end of file
+            return None
@@ -11,9 +11,10 @@ asynchrones avec gestion robuste des timeouts et des erreurs.
 import asyncio
 import logging
 import functools
+import queue
 import threading
 import time
-from typing import Any, Callable, Coroutine, Optional, Union, Dict, List
+from typing import Any, AsyncIterator, Callable, Coroutine, Iterator, Optional, Union, Dict, List, Tuple
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as ConcurrentTimeoutError
 from datetime import datetime, timedelta
 
@@ -187,50 +188,287 @@ class AsyncManager:
         """
         Exécute plusieurs tâches en parallèle de manière hybride.
         
+        Au plus max_concurrent tâches s'exécutent simultanément. Les tâches encore en
+        cours ou en attente à l'expiration du timeout global sont annulées et
+        remplacées par leur fallback_result.
+        
+        Args:
+            tasks: Liste de dictionnaires avec 'func', 'args', 'kwargs' et optionnellement
+                'timeout' et 'fallback_result'
+            max_concurrent: Nombre maximum de tâches concurrentes
+            global_timeout: Timeout global en secondes
+            
+        Returns:
+            Liste des résultats, dans l'ordre des tâches
+        """
+        return self._run_until_complete(
+            self.run_multiple_hybrid_async(tasks, max_concurrent=max_concurrent, global_timeout=global_timeout)
+        )
+    
+    async def run_multiple_hybrid_async(
+        self,
+        tasks: List[Dict[str, Any]],
+        max_concurrent: int = 5,
+        global_timeout: float = 60.0
+    ) -> List[Any]:
+        """
+        Version asynchrone de run_multiple_hybrid.
+        
         Args:
             tasks: Liste de dictionnaires avec 'func', 'args', 'kwargs'
             max_concurrent: Nombre maximum de tâches concurrentes
             global_timeout: Timeout global en secondes
             
         Returns:
-            Liste des résultats
+            Liste des résultats, dans l'ordre des tâches
+        """
+        results = [task_def.get('fallback_result') for task_def in tasks]
+        async for index, result in self.as_completed_hybrid(tasks, max_concurrent, global_timeout):
+            results[index] = result
+        return results
+    
+    async def as_completed_hybrid(
+        self,
+        tasks: List[Dict[str, Any]],
+        max_concurrent: int = 5,
+        global_timeout: float = 60.0
+    ) -> AsyncIterator[Tuple[int, Any]]:
         """
-        self.logger.info(f"Exécution de {len(tasks)} tâches en parallèle")
+        Exécute plusieurs tâches en parallèle et produit les résultats au fil de l'eau.
         
-        results = []
-        start_time = time.time()
+        Chaque tâche dispose de son propre timeout ('timeout' de sa définition, à défaut
+        le temps global restant), toujours borné par l'échéance globale. Le décompte
+        commence lorsque la tâche obtient une place d'exécution.
         
-        # Diviser les tâches en batches
-        for i in range(0, len(tasks), max_concurrent):
-            batch = tasks[i:i + max_concurrent]
-            batch_results = []
+        Args:
+            tasks: Liste de dictionnaires avec 'func', 'args', 'kwargs'
+            max_concurrent: Nombre maximum de tâches concurrentes
+            global_timeout: Timeout global en secondes
             
-            # Vérifier le timeout global
-            elapsed = time.time() - start_time
-            if elapsed >= global_timeout:
-                self.logger.warning("Timeout global atteint")
-                break
+        Yields:
+            Couples (index de la tâche, résultat) dans l'ordre de terminaison
+        """
+        self.logger.info(f"Exécution de {len(tasks)} tâches en parallèle (max {max_concurrent})")
+        if not tasks:
+            return
+        
+        loop = asyncio.get_running_loop()
+        global_deadline = loop.time() + global_timeout
+        concurrency = max(1, min(max_concurrent, len(tasks)))
+        semaphore = asyncio.Semaphore(concurrency)
+        # Pool dédié : les fonctions synchrones d'un lot ne se disputent pas les workers de run_hybrid
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="AsyncManagerBatch")
+        
+        pending = {
+            asyncio.ensure_future(self._run_bounded(task_def, semaphore, executor, global_deadline)): index
+            for index, task_def in enumerate(tasks)
+        }
+        
+        try:
+            while pending:
+                remaining = global_deadline - loop.time()
+                done, _ = await asyncio.wait(
+                    pending, timeout=max(remaining, 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for future in done:
+                    yield pending.pop(future), future.result()
             
-            remaining_timeout = global_timeout - elapsed
+            if pending:
+                self.logger.warning(f"Timeout global atteint: annulation de {len(pending)} tâches")
+                stragglers = sorted(pending.values())
+                for future in list(pending):
+                    future.cancel()
+                pending.clear()
+                for index in stragglers:
+                    yield index, tasks[index].get('fallback_result')
+        
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def iter_multiple_hybrid(
+        self,
+        tasks: List[Dict[str, Any]],
+        max_concurrent: int = 5,
+        global_timeout: float = 60.0
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Version synchrone de as_completed_hybrid.
+        
+        Les tâches s'exécutent dans une boucle d'événements dédiée, sur un thread
+        séparé ; interrompre l'itération annule les tâches restantes.
+        
+        Args:
+            tasks: Liste de dictionnaires avec 'func', 'args', 'kwargs'
+            max_concurrent: Nombre maximum de tâches concurrentes
+            global_timeout: Timeout global en secondes
             
-            for task_def in batch:
+        Yields:
+            Couples (index de la tâche, résultat) dans l'ordre de terminaison
+        """
+        results = queue.Queue()
+        stop = threading.Event()
+        finished = object()
+        
+        async def produce():
+            stream = self.as_completed_hybrid(tasks, max_concurrent, global_timeout)
+            try:
+                async for item in stream:
+                    results.put(item)
+                    if stop.is_set():
+                        break
+            finally:
+                await stream.aclose()
+        
+        def run():
+            try:
+                self._run_until_complete(produce())
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'exécution des tâches: {e}")
+            finally:
+                results.put(finished)
+        
+        producer = threading.Thread(target=run, name="AsyncManagerStream", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = results.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            stop.set()
+    
+    async def _run_bounded(
+        self,
+        task_def: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        executor: ThreadPoolExecutor,
+        global_deadline: float
+    ) -> Any:
+        """
+        Exécute une tâche d'un lot dès qu'une place se libère.
+        
+        Args:
+            task_def: Définition de la tâche
+            semaphore: Sémaphore bornant le nombre de tâches concurrentes
+            executor: Pool de threads pour les fonctions synchrones
+            global_deadline: Échéance globale (horloge de la boucle)
+            
+        Returns:
+            Résultat de la tâche ou son fallback_result
+        """
+        func = task_def['func']
+        fallback = task_def.get('fallback_result')
+        task_id = self._generate_task_id()
+        started = False
+        
+        try:
+            async with semaphore:
+                loop = asyncio.get_running_loop()
+                remaining = global_deadline - loop.time()
+                if remaining <= 0:
+                    return fallback
+                
+                timeout = min(task_def.get('timeout') or remaining, remaining)
+                self.active_tasks[task_id] = {
+                    'start_time': datetime.now(),
+                    'timeout': timeout,
+                    'status': 'running'
+                }
+                started = True
+                
                 try:
-                    func = task_def['func']
-                    args = task_def.get('args', ())
-                    kwargs = task_def.get('kwargs', {})
-                    task_timeout = task_def.get('timeout', min(remaining_timeout / len(batch), 10.0))
-                    fallback = task_def.get('fallback_result')
-                    
-                    result = self.run_hybrid(func, *args, timeout=task_timeout, fallback_result=fallback, **kwargs)
-                    batch_results.append(result)
-                    
+                    result = await asyncio.wait_for(
+                        self._invoke_task(func, task_def.get('args', ()), task_def.get('kwargs', {}), executor),
+                        timeout=timeout
+                    )
+                    self.active_tasks[task_id]['status'] = 'completed'
+                    return result
+                except asyncio.TimeoutError:
+                    self.logger.warning(f"Timeout de task_{task_id} après {timeout:.2f}s")
+                    self.active_tasks[task_id]['status'] = 'error'
+                    self.active_tasks[task_id]['error'] = 'timeout'
+                    return fallback
+                except asyncio.CancelledError:
+                    self.active_tasks[task_id]['status'] = 'cancelled'
+                    raise
                 except Exception as e:
-                    self.logger.error(f"Erreur dans une tâche du batch: {e}")
-                    batch_results.append(task_def.get('fallback_result'))
+                    self.logger.error(f"Erreur lors de l'exécution task_{task_id}: {e}")
+                    self.active_tasks[task_id]['status'] = 'error'
+                    self.active_tasks[task_id]['error'] = str(e)
+                    return fallback
+        
+        finally:
+            if started:
+                end_time = datetime.now()
+                self.active_tasks[task_id]['end_time'] = end_time
+                self.active_tasks[task_id]['duration'] = (
+                    end_time - self.active_tasks[task_id]['start_time']
+                ).total_seconds()
+            elif asyncio.iscoroutine(func):
+                # Coroutine jamais démarrée : la fermer évite l'avertissement "never awaited"
+                func.close()
+    
+    async def _invoke_task(self, func: Union[Callable, Coroutine], args: tuple, kwargs: dict,
+                           executor: ThreadPoolExecutor) -> Any:
+        """
+        Exécute une fonction synchrone, une fonction asynchrone ou une coroutine.
+        
+        Args:
+            func: Fonction ou coroutine à exécuter
+            args: Arguments positionnels
+            kwargs: Arguments nommés
+            executor: Pool de threads pour les fonctions synchrones
             
-            results.extend(batch_results)
+        Returns:
+            Résultat de l'exécution
+        """
+        if asyncio.iscoroutine(func):
+            return await func
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
         
-        return results
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    
+    def _run_until_complete(self, coro: Coroutine) -> Any:
+        """
+        Exécute une coroutine jusqu'à son terme dans une boucle d'événements privée.
+        
+        La boucle n'est pas installée comme boucle courante du thread. Si une boucle
+        tourne déjà dans ce thread, la coroutine est exécutée sur un thread séparé.
+        
+        Args:
+            coro: Coroutine à exécuter
+            
+        Returns:
+            Résultat de la coroutine
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="AsyncManagerLoop") as runner:
+                return runner.submit(self._run_until_complete, coro).result()
+        
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            try:
+                remaining = asyncio.all_tasks(loop)
+                for task in remaining:
+                    task.cancel()
+                if remaining:
+                    loop.run_until_complete(asyncio.gather(*remaining, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
     
     def create_async_wrapper(self, sync_func: Callable) -> Callable:
         """
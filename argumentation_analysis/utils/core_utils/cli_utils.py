@@ -6,6 +6,13 @@ Utilitaires pour la gestion des arguments de ligne de commande (CLI).
 import argparse
 # from pathlib import Path # Pas nécessaire pour cette fonction spécifique, mais souvent utile avec argparse
 
+def _non_negative_int(value: str) -> int:
+    """Convertit un argument en entier positif ou nul (type argparse)."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"doit être positif ou nul : {value}")
+    return number
+
 def parse_advanced_analysis_arguments() -> argparse.Namespace:
     """
     Parse les arguments de ligne de commande spécifiques au script d'analyse rhétorique avancée.
@@ -36,6 +43,13 @@ def parse_advanced_analysis_arguments() -> argparse.Namespace:
         default=None
     )
     
+    parser.add_argument(
+        "--workers", "-w",
+        type=_non_negative_int,
+        help="Nombre de processus d'analyse ; active le mode parallèle avec sortie JSON Lines reprenable (0 : séquentiel)",
+        default=None
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -215,6 +215,8 @@ class TaxonomyLoader:
         En mode réel (USE_MOCK=False):
         - Charge les données depuis le fichier de taxonomie
         - Nécessite que le fichier existe localement ou soit téléchargeable
+        - Utilise l'instantané binaire (`<nom>.snapshot.npz`) s'il correspond au CSV,
+          et le régénère sinon (voir `utils.taxonomy_snapshot`)
         
         Returns:
             list: Liste des entrées de la taxonomie (complète ou échantillon)
@@ -268,7 +270,16 @@ class TaxonomyLoader:
             logger.info(f"Taxonomie mock chargée avec succès: {len(mock_entries)} entrées")
             return mock_entries
         else:
-            # Cette partie serait implémentée pour charger le fichier réel
-            # Pour l'instant, elle n'est pas implémentée car nous utilisons la version mock
-            logger.error("Version réelle de load_taxonomy() non implémentée")
-            raise NotImplementedError("Version réelle de load_taxonomy() non disponible en mode mock")
\ No newline at end of file
+            # Import différé : le mode mock ne nécessite ni pandas ni numpy
+            from argumentation_analysis.utils.taxonomy_snapshot import load_taxonomy_dataframe
+
+            self.taxonomy_path = get_taxonomy_path()
+            df, _ = load_taxonomy_dataframe(self.taxonomy_path)
+            if df is None:
+                logger.error(f"Impossible de charger la taxonomie depuis {self.taxonomy_path}")
+                raise ValueError(f"Impossible de charger la taxonomie depuis {self.taxonomy_path}")
+
+            records = df.reset_index()
+            entries = records.astype(object).where(records.notna(), None).to_dict('records')
+            logger.info(f"Taxonomie chargée avec succès: {len(entries)} entrées")
+            return entries
\ No newline at end of file
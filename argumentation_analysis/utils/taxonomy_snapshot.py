@@ -0,0 +1,228 @@
+"""
+Instantané binaire de la taxonomie des sophismes pour un démarrage à froid rapide.
+
+Le CSV de taxonomie est lu et préparé (index `PK` entier) une seule fois, puis
+enregistré à côté du fichier source dans un paquet numpy non compressé
+(`<nom>.snapshot.npz`, chargé sans pickle). L'instantané contient l'empreinte
+SHA-256 du CSV dont il provient : si le CSV change, l'instantané est ignoré et
+régénéré automatiquement au chargement suivant.
+
+Format (version `SNAPSHOT_FORMAT_VERSION`) :
+- `manifest` : JSON (version, empreinte du CSV, colonnes et leur encodage) ;
+- colonnes numériques : tableau numpy de la colonne ;
+- colonnes texte : octets UTF-8 concaténés, offsets en caractères et masque
+  des valeurs manquantes (évite les tableaux `U` à largeur fixe).
+
+Ce module est utilisé par `utils.taxonomy_loader.TaxonomyLoader` et par
+`InformalAnalysisPlugin`.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from argumentation_analysis.utils.core_utils.file_loaders import load_csv_file
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snapshot.npz"
+
+_KIND_NUMERIC = "numeric"
+_KIND_TEXT = "text"
+
+
+def compute_taxonomy_fingerprint(taxonomy_file_path: Optional[Union[str, Path]]) -> Optional[str]:
+    """
+    Calcule l'empreinte SHA-256 du contenu d'un fichier de taxonomie.
+
+    :param taxonomy_file_path: Chemin du fichier CSV de taxonomie
+    :return: Empreinte hexadécimale, ou None si le fichier est vide ou n'est pas lisible
+    """
+    if taxonomy_file_path is None:
+        return None
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with open(taxonomy_file_path, 'rb') as taxonomy_file:
+            while True:
+                block = taxonomy_file.read(1 << 20)
+                if not block:
+                    break
+                digest.update(block)
+                size += len(block)
+    except (OSError, TypeError):
+        return None
+    return digest.hexdigest() if size else None
+
+
+def get_snapshot_path(taxonomy_file_path: Union[str, Path]) -> Path:
+    """Retourne le chemin de l'instantané associé à un CSV de taxonomie."""
+    taxonomy_file_path = Path(taxonomy_file_path)
+    return taxonomy_file_path.with_name(taxonomy_file_path.stem + SNAPSHOT_SUFFIX)
+
+
+def prepare_taxonomy_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise la colonne `PK` (entiers, valeurs invalides à 0) et l'utilise comme index.
+
+    :param df: DataFrame brut lu depuis le CSV
+    :return: DataFrame indexé par `PK` (le DataFrame fourni est modifié)
+    """
+    if 'PK' not in df.columns:
+        logger.warning("Colonne 'PK' non trouvée dans la taxonomie. L'index ne sera pas défini.")
+        return df
+
+    pks = pd.to_numeric(df['PK'], errors='coerce').fillna(0)
+    try:
+        pks = pks.astype("int64")
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Échec de la conversion de 'PK' en int64 ({e}), conservée en {pks.dtype}.")
+    df['PK'] = pks
+    df.set_index('PK', inplace=True)
+    logger.debug(f"Colonne 'PK' définie comme index ({df.index.dtype}, {len(df)} entrées).")
+    return df
+
+
+def _encode_column(values: pd.Series, key: str, arrays: Dict[str, np.ndarray]) -> str:
+    """Ajoute les tableaux d'une colonne à `arrays` et retourne son encodage."""
+    if pd.api.types.is_numeric_dtype(values.dtype) and isinstance(values.dtype, np.dtype):
+        arrays[f"{key}_values"] = values.to_numpy()
+        return _KIND_NUMERIC
+
+    missing = values.isna().to_numpy()
+    texts = ['' if is_missing else str(value) for value, is_missing in zip(values.tolist(), missing)]
+    offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in texts], out=offsets[1:])
+    arrays[f"{key}_data"] = np.frombuffer(''.join(texts).encode('utf-8'), dtype=np.uint8)
+    arrays[f"{key}_offsets"] = offsets
+    arrays[f"{key}_missing"] = missing
+    return _KIND_TEXT
+
+
+def _decode_column(bundle: Any, key: str, kind: str) -> Any:
+    """Reconstruit les valeurs d'une colonne à partir des tableaux de l'instantané."""
+    if kind == _KIND_NUMERIC:
+        return bundle[f"{key}_values"]
+    text = bundle[f"{key}_data"].tobytes().decode('utf-8')
+    offsets = bundle[f"{key}_offsets"].tolist()
+    values = np.array([text[start:end] for start, end in zip(offsets, offsets[1:])], dtype=object)
+    values[bundle[f"{key}_missing"]] = np.nan
+    return values
+
+
+def write_taxonomy_snapshot(df: pd.DataFrame, fingerprint: str, snapshot_path: Union[str, Path]) -> bool:
+    """
+    Écrit l'instantané binaire d'un DataFrame de taxonomie préparé.
+
+    L'écriture passe par un fichier temporaire remplacé atomiquement, de sorte
+    qu'un processus concurrent ne lit jamais un instantané partiel.
+
+    :param df: DataFrame préparé (voir `prepare_taxonomy_dataframe`)
+    :param fingerprint: Empreinte du CSV source
+    :param snapshot_path: Chemin de l'instantané à écrire
+    :return: True si l'instantané a été écrit, False sinon (l'erreur est journalisée)
+    """
+    snapshot_path = Path(snapshot_path)
+    arrays: Dict[str, np.ndarray] = {}
+    columns = []
+    try:
+        index_kind = _encode_column(df.index.to_series(), "index", arrays)
+        for position, name in enumerate(df.columns):
+            columns.append({"name": str(name), "kind": _encode_column(df[name], f"col{position}", arrays)})
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "source_sha256": fingerprint,
+            "index_name": df.index.name,
+            "index_kind": index_kind,
+            "columns": columns,
+        }
+        arrays["manifest"] = np.array(json.dumps(manifest, ensure_ascii=False))
+
+        fd, temp_path = tempfile.mkstemp(prefix=snapshot_path.name, suffix=".tmp", dir=snapshot_path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as snapshot_file:
+                np.savez(snapshot_file, **arrays)
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+    except Exception as e:
+        logger.warning(f"Impossible d'écrire l'instantané de taxonomie {snapshot_path}: {e}")
+        return False
+
+    logger.info(f"Instantané de taxonomie écrit: {snapshot_path} ({len(df)} entrées).")
+    return True
+
+
+def read_taxonomy_snapshot(snapshot_path: Union[str, Path], fingerprint: Optional[str]) -> Optional[pd.DataFrame]:
+    """
+    Lit un instantané s'il correspond à l'empreinte attendue du CSV.
+
+    :param snapshot_path: Chemin de l'instantané
+    :param fingerprint: Empreinte actuelle du CSV source
+    :return: DataFrame préparé, ou None si l'instantané est absent, périmé ou illisible
+    """
+    snapshot_path = Path(snapshot_path)
+    if fingerprint is None or not snapshot_path.is_file():
+        return None
+    try:
+        with np.load(snapshot_path, allow_pickle=False) as bundle:
+            manifest = json.loads(str(bundle["manifest"]))
+            if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+                logger.info(f"Instantané de taxonomie {snapshot_path} d'un ancien format, régénération.")
+                return None
+            if manifest.get("source_sha256") != fingerprint:
+                logger.info(f"Instantané de taxonomie {snapshot_path} périmé (CSV modifié), régénération.")
+                return None
+            data = {
+                column["name"]: _decode_column(bundle, f"col{position}", column["kind"])
+                for position, column in enumerate(manifest["columns"])
+            }
+            index = pd.Index(_decode_column(bundle, "index", manifest["index_kind"]), name=manifest["index_name"])
+    except Exception as e:
+        logger.warning(f"Instantané de taxonomie {snapshot_path} illisible ({e}), relecture du CSV.")
+        return None
+
+    return pd.DataFrame(data, index=index, columns=[column["name"] for column in manifest["columns"]])
+
+
+def load_taxonomy_dataframe(taxonomy_file_path: Union[str, Path], fingerprint: Optional[str] = None,
+                            use_snapshot: bool = True) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """
+    Charge la taxonomie préparée, depuis l'instantané s'il est à jour, sinon depuis le CSV.
+
+    Après une lecture du CSV, l'instantané est (ré)écrit pour les démarrages suivants.
+
+    :param taxonomy_file_path: Chemin du CSV de taxonomie
+    :param fingerprint: Empreinte du CSV si déjà calculée par l'appelant
+    :param use_snapshot: False pour ignorer et ne pas écrire d'instantané
+    :return: Tuple (DataFrame préparé ou None si le CSV n'a pas pu être lu, empreinte du CSV)
+    """
+    taxonomy_file_path = Path(taxonomy_file_path)
+    if fingerprint is None:
+        fingerprint = compute_taxonomy_fingerprint(taxonomy_file_path)
+    snapshot_path = get_snapshot_path(taxonomy_file_path)
+
+    if use_snapshot:
+        df = read_taxonomy_snapshot(snapshot_path, fingerprint)
+        if df is not None:
+            logger.info(f"Taxonomie chargée depuis l'instantané {snapshot_path}: {len(df)} entrées.")
+            return df, fingerprint
+
+    df = load_csv_file(taxonomy_file_path)
+    if df is None:
+        return None, fingerprint
+    df = prepare_taxonomy_dataframe(df)
+
+    if use_snapshot and fingerprint is not None:
+        write_taxonomy_snapshot(df, fingerprint, snapshot_path)
+    return df, fingerprint
@@ -146,7 +146,8 @@ def main():
     output_file = args.output
     if not output_file:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = Path("results") / f"advanced_rhetorical_analysis_{timestamp}.json"
+        extension = "jsonl" if args.workers else "json"
+        output_file = Path("results") / f"advanced_rhetorical_analysis_{timestamp}.{extension}"
     
     output_path = Path(output_file)
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -160,7 +161,7 @@ def main():
     # Analyser les extraits avec les outils avancés
     # Le paramètre use_real_tools peut être ajouté ici si on veut le contrôler depuis les args CLI.
     # Pour l'instant, on utilise le comportement par défaut du pipeline (mocks si réels non dispo).
-    run_advanced_rhetoric_pipeline(extract_definitions, base_results, output_path)
+    run_advanced_rhetoric_pipeline(extract_definitions, base_results, output_path, max_workers=args.workers)
     
     logger.info("Analyse rhétorique avancée terminée avec succès.")
 
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# tests/agents/core/logic/test_pl_handler.py
+"""
+Tests unitaires pour le cache des bases de connaissances analysées de PLHandler.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("jpype")
+
+from argumentation_analysis.agents.core.logic import pl_handler
+from argumentation_analysis.agents.core.logic.pl_handler import PLHandler
+
+
+class FakeBeliefSet(list):
+    def add(self, formula):
+        self.append(formula)
+
+
+class FakeSignature(set):
+    def contains(self, proposition):
+        return proposition in self
+
+
+class FakeParser:
+    def __init__(self):
+        self.parsed = []
+
+    def parseFormula(self, formula, signature=None):
+        self.parsed.append(formula)
+        return ("formula", formula)
+
+
+class FakeReasoner:
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, kb, formula):
+        self.queries += 1
+        return formula in kb
+
+
+JAVA_CLASSES = {
+    "org.tweetyproject.logics.pl.syntax.PlBeliefSet": FakeBeliefSet,
+    "org.tweetyproject.logics.pl.syntax.PlSignature": FakeSignature,
+    "org.tweetyproject.logics.pl.syntax.Proposition": str,
+    "org.tweetyproject.logics.pl.syntax.Contradiction": lambda: ("formula", "-"),
+}
+
+
+class TestPLHandlerKnowledgeBaseCache(unittest.TestCase):
+    """Tests pour le cache des bases de connaissances de PLHandler."""
+
+    def setUp(self):
+        self.patchers = [
+            patch.object(pl_handler.jpype, "JClass", side_effect=JAVA_CLASSES.__getitem__),
+            patch.object(pl_handler, "JString", side_effect=str),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+        self.parser = FakeParser()
+        self.reasoner = FakeReasoner()
+        initializer = MagicMock()
+        initializer.get_pl_parser.return_value = self.parser
+        initializer.get_pl_reasoner.return_value = self.reasoner
+        self.handler = PLHandler(initializer, kb_cache_size=2)
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def test_knowledge_base_is_parsed_once(self):
+        kb = "a\na => b\n```"
+
+        self.assertTrue(self.handler.pl_query(kb, "a"))
+        self.assertFalse(self.handler.pl_query(kb, "c"))
+        self.assertTrue(self.handler.pl_check_consistency(kb))
+        self.assertTrue(self.handler.pl_check_consistency(kb))
+
+        # 2 formules de la base + 2 requêtes
+        self.assertEqual(len(self.parser.parsed), 4)
+        # Le résultat de cohérence est conservé avec la base analysée
+        self.assertEqual(self.reasoner.queries, 3)
+        stats = self.handler.get_kb_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (3, 1, 1))
+
+    def test_constants_are_part_of_the_key(self):
+        kb = "a"
+        self.handler.pl_query(kb, "a")
+        self.handler.pl_query(kb, "a", constants=["a"])
+
+        self.assertEqual(self.handler.get_kb_cache_stats()["misses"], 2)
+
+    def test_cache_is_bounded_lru(self):
+        for kb in ("a", "b", "a", "c"):
+            self.handler.pl_query(kb, "a")
+
+        stats = self.handler.get_kb_cache_stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.handler.pl_query("a", "a")
+        self.assertEqual(self.handler.get_kb_cache_stats()["hits"], 2)
+
+    def test_query_batch_uses_one_parsed_knowledge_base(self):
+        results = self.handler.pl_query_batch("a\nb", ["a", "b", "c", "```"])
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(self.handler.get_kb_cache_stats()["misses"], 1)
+        self.assertEqual(len(self.parser.parsed), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
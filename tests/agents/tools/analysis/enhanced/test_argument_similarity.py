@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le module agents.tools.analysis.enhanced.argument_similarity.
+"""
+
+import numpy as np
+import pytest
+
+from argumentation_analysis.agents.tools.analysis.enhanced import argument_similarity
+from argumentation_analysis.agents.tools.analysis.enhanced.argument_similarity import (
+    ArgumentSimilarityEngine, threshold_clusters, tokenize
+)
+
+ARGUMENTS = [
+    "Les vaccins sont sûrs car les experts le disent.",
+    "Les experts disent que les vaccins sont sûrs, donc il faut les utiliser.",
+    "Cependant, le climat change et les glaciers fondent.",
+    "",
+    "Par exemple, les glaciers des Alpes fondent depuis 1900.",
+]
+
+
+def pairwise_jaccard(text1, text2):
+    words1, words2 = set(text1.lower().split()), set(text2.lower().split())
+    union = words1 | words2
+    return len(words1 & words2) / len(union) if union else 0.0
+
+
+@pytest.fixture(params=[True, False], ids=["scipy", "numpy"])
+def engine(request, monkeypatch):
+    if request.param and not argument_similarity.HAS_SCIPY:
+        pytest.skip("SciPy non installé")
+    monkeypatch.setattr(argument_similarity, "HAS_SCIPY", request.param)
+    return ArgumentSimilarityEngine(ARGUMENTS)
+
+
+def test_engine_tokenizes_each_argument_once(engine):
+    assert tokenize("Les  Experts disent") == ["les", "experts", "disent"]
+    assert engine.tokens == [tokenize(argument) for argument in ARGUMENTS]
+
+
+def test_jaccard_matrix_matches_pairwise_computation(engine):
+    matrix = engine.jaccard_matrix()
+
+    expected = [[pairwise_jaccard(a, b) for b in ARGUMENTS] for a in ARGUMENTS]
+    assert matrix.tolist() == expected
+
+
+def test_tfidf_cosine_matrix(engine):
+    matrix = engine.tfidf_cosine_matrix()
+
+    assert matrix.shape == (5, 5)
+    assert np.allclose(matrix, matrix.T)
+    assert np.allclose(np.diag(matrix), [1.0, 1.0, 1.0, 0.0, 1.0])
+    assert matrix[0, 1] > matrix[0, 2]
+
+
+def test_embedding_cosine_matrix(engine):
+    embeddings = [[1.0, 0.0], [1.0, 1.0], [0.0, 2.0], [0.0, 0.0], [3.0, 0.0]]
+
+    matrix = engine.embedding_cosine_matrix(embeddings)
+
+    assert matrix[0, 4] == pytest.approx(1.0)
+    assert matrix[0, 1] == pytest.approx(2 ** -0.5)
+    assert matrix[3, 3] == 0.0
+    with pytest.raises(ValueError):
+        engine.embedding_cosine_matrix(embeddings[:2])
+
+
+def test_match_keywords_once_per_argument(engine):
+    matches = engine.match_keywords({
+        "support": ["donc", "ainsi"],
+        "contradiction": ["cependant", "mais"],
+        "example": ["par exemple", "comme"],
+    })
+
+    assert matches == [{}, {"support": ["donc"]}, {"contradiction": ["cependant"]}, {}, {"example": ["par exemple"]}]
+
+
+def test_threshold_clusters():
+    matrix = np.array([
+        [1.0, 0.6, 0.1, 0.7],
+        [0.6, 1.0, 0.9, 0.2],
+        [0.1, 0.9, 1.0, 0.0],
+        [0.7, 0.2, 0.0, 1.0],
+    ])
+
+    assert threshold_clusters(matrix, 0.5) == [[0, 1, 3], [2]]
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le module agents.tools.analysis.enhanced.nlp_inference.
+"""
+
+import threading
+
+import pytest
+
+from argumentation_analysis.agents.tools.analysis.enhanced import nlp_inference
+from argumentation_analysis.agents.tools.analysis.enhanced.nlp_inference import (
+    BatchedInference, LazyModel, get_shared_model_keys, lazy_pipeline, split_sentences
+)
+
+
+class FakePipeline:
+    """Pipeline factice enregistrant les appels reçus."""
+
+    def __init__(self, task, model=None):
+        self.task = task
+        self.model = model
+        self.calls = []
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append(inputs)
+        if isinstance(inputs, list):
+            return [{"label": "POSITIVE", "score": len(text) / 100} for text in inputs]
+        return [{"label": "POSITIVE", "score": len(inputs) / 100}]
+
+
+@pytest.fixture(autouse=True)
+def clear_models():
+    nlp_inference.clear_shared_models()
+    yield
+    nlp_inference.clear_shared_models()
+
+
+def test_models_are_loaded_lazily_and_shared():
+    created = []
+
+    def factory(task, model=None):
+        created.append((task, model))
+        return FakePipeline(task, model)
+
+    first = lazy_pipeline(factory, "sentiment-analysis")
+    second = lazy_pipeline(factory, "sentiment-analysis")
+    unused = lazy_pipeline(factory, "text-generation", model="gpt2")
+
+    assert created == []
+    first("Une phrase")
+    second("Une autre phrase")
+
+    assert created == [("sentiment-analysis", None)]
+    assert first.get() is second.get()
+    assert not unused.loaded
+    assert get_shared_model_keys() == [("pipeline", "sentiment-analysis", None)]
+
+
+def test_concurrent_first_use_loads_once():
+    created = []
+    barrier = threading.Barrier(8)
+
+    def loader():
+        created.append(1)
+        return FakePipeline("ner")
+
+    models = [LazyModel(("pipeline", "ner", None), loader) for _ in range(8)]
+
+    def use(model):
+        barrier.wait()
+        model.get()
+
+    threads = [threading.Thread(target=use, args=(model,)) for model in models]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+
+
+def test_run_batches_unique_texts_sorted_by_length():
+    model = FakePipeline("sentiment-analysis")
+    inference = BatchedInference(batch_size=2)
+    texts = ["ccc", "a", "bb", "a", "dddd"]
+
+    results = inference.run(model, texts)
+
+    assert [result["score"] for result in results] == [0.03, 0.01, 0.02, 0.01, 0.04]
+    assert model.calls == [["a", "bb"], ["ccc", "dddd"]]
+    assert inference.stats == {"texts": 5, "inferences": 4, "batches": 2}
+
+
+def test_run_falls_back_to_single_calls():
+    def single_text_model(text):
+        return [{"entity": "B-PER", "word": text}]
+
+    results = BatchedInference(batch_size=8).run(single_text_model, ["Einstein", "Curie"])
+
+    assert results == [[{"entity": "B-PER", "word": "Einstein"}], [{"entity": "B-PER", "word": "Curie"}]]
+
+
+def test_batch_size_from_environment(monkeypatch):
+    monkeypatch.setenv("NLP_BATCH_SIZE", "4")
+    assert BatchedInference().batch_size == 4
+    assert BatchedInference(batch_size=0).batch_size == 1
+
+
+def test_split_sentences_skips_empty_segments():
+    assert split_sentences("Première phrase. . Deuxième phrase") == ["Première phrase", "Deuxième phrase"]
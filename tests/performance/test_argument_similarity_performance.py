@@ -0,0 +1,76 @@
+"""
+Micro-benchmark des matrices de similarité entre arguments.
+
+La matrice de Jaccard de quelques centaines d'arguments et les clusters thématiques
+qui en découlent sont calculés par le moteur vectorisé, puis par la comparaison
+paire par paire des textes qu'utilisait l'analyseur de sophismes complexes.
+"""
+
+import os
+import random
+import time
+
+import pytest
+
+from argumentation_analysis.agents.tools.analysis.enhanced.argument_similarity import (
+    ArgumentSimilarityEngine, threshold_clusters
+)
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+ARGUMENT_COUNT = 600
+VOCABULARY = [f"mot{i}" for i in range(400)] + ["donc", "cependant", "experts", "climat", "vaccins"]
+
+
+def build_arguments():
+    rng = random.Random(42)
+    return [" ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(10, 40))) for _ in range(ARGUMENT_COUNT)]
+
+
+def pairwise_jaccard(text1, text2):
+    words1, words2 = set(text1.lower().split()), set(text2.lower().split())
+    union = words1 | words2
+    return len(words1 & words2) / len(union) if union else 0.0
+
+
+def pairwise_clusters(arguments):
+    matrix = [[pairwise_jaccard(a, b) for b in arguments] for a in arguments]
+    clusters, visited = [], set()
+    for i in range(len(arguments)):
+        if i in visited:
+            continue
+        cluster = [i]
+        visited.add(i)
+        for j in range(len(arguments)):
+            if j not in visited and matrix[i][j] > 0.5:
+                cluster.append(j)
+                visited.add(j)
+        clusters.append(cluster)
+    return matrix, clusters
+
+
+@pytest.mark.performance
+def test_vectorized_similarity_matrix():
+    arguments = build_arguments()
+
+    start = time.perf_counter()
+    matrix, clusters = pairwise_clusters(arguments)
+    pairwise_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = ArgumentSimilarityEngine(arguments)
+    vectorized = engine.jaccard_matrix()
+    vectorized_clusters = threshold_clusters(vectorized, 0.5)
+    vectorized_time = time.perf_counter() - start
+
+    print(f"\n{ARGUMENT_COUNT} arguments: paire par paire {pairwise_time:.3f} s, "
+          f"vectorisé {vectorized_time:.3f} s (x{pairwise_time / vectorized_time:.0f})")
+
+    assert vectorized.tolist() == matrix
+    assert vectorized_clusters == clusters
+    assert vectorized_time * 10 < pairwise_time
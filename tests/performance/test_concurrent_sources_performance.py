@@ -0,0 +1,101 @@
+"""
+Micro-benchmark du débit de récupération des sources du pipeline d'embeddings.
+
+Compare, contre un serveur HTTP local simulant la latence réseau de plusieurs
+hôtes, le traitement avec un seul worker au traitement concurrent borné par hôte.
+"""
+
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from argumentation_analysis.pipelines.concurrent_sources import (
+    SourceCheckpointJournal,
+    process_sources_concurrently,
+)
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+LATENCY = 0.05
+SOURCE_COUNT = 60
+HOST_COUNT = 6
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        time.sleep(LATENCY)
+        body = (self.path * 200).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def servers():
+    started = []
+    for _ in range(HOST_COUNT):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append(server)
+    yield started
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def make_sources(servers):
+    return [
+        {"id": f"s{i}", "fetch_method": "url", "url": "http://%s:%d/doc/%d" % (servers[i % len(servers)].server_address + (i,))}
+        for i in range(SOURCE_COUNT)
+    ]
+
+
+def http_fetch(source_info):
+    with urllib.request.urlopen(source_info["url"], timeout=10) as response:
+        return response.read().decode("utf-8")
+
+
+def slow_embed(source_id, source_info):
+    time.sleep(LATENCY / 5)  # Coût de calcul simulé, qui doit chevaucher les E/S
+    return True
+
+
+@pytest.mark.performance
+def test_concurrent_fetch_throughput(servers, tmp_path):
+    start = time.perf_counter()
+    process_sources_concurrently(make_sources(servers), http_fetch, slow_embed, model_name="m", max_workers=1)
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = process_sources_concurrently(
+        make_sources(servers), http_fetch, slow_embed, model_name="m",
+        journal=SourceCheckpointJournal(tmp_path), max_workers=16, max_per_host=3
+    )
+    concurrent_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resumed = process_sources_concurrently(
+        make_sources(servers), http_fetch, slow_embed, model_name="m",
+        journal=SourceCheckpointJournal(tmp_path), max_workers=16, max_per_host=3
+    )
+    resume_time = time.perf_counter() - start
+
+    print(f"\n{SOURCE_COUNT} sources: séquentiel {sequential_time:.2f}s, concurrent {concurrent_time:.2f}s, "
+          f"reprise {resume_time:.3f}s ({sequential_time / concurrent_time:.1f}x)")
+    assert stats["embedded"] == SOURCE_COUNT
+    assert resumed["resumed_embeddings"] == SOURCE_COUNT
+    assert concurrent_time * 4 < sequential_time
+    assert resume_time < concurrent_time
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark du débit et de la latence de réception du middleware de messagerie.
+
+Un émetteur dépose des messages sur le canal hiérarchique pendant que des
+récepteurs attendent sur tous les canaux : la latence mesurée est celle du
+réveil par notification, que la scrutation toutes les 10 ms bornait auparavant.
+"""
+
+import asyncio
+import os
+import statistics
+import threading
+import time
+
+import pytest
+
+from argumentation_analysis.core.communication.message import Message, MessageType, AgentLevel
+from argumentation_analysis.core.communication.hierarchical_channel import HierarchicalChannel
+from argumentation_analysis.core.communication.collaboration_channel import CollaborationChannel
+from argumentation_analysis.core.communication.data_channel import DataChannel
+from argumentation_analysis.core.communication.middleware import MessageMiddleware
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+ROUND_TRIPS = 500
+AGENT_COUNT = 20
+MESSAGES_PER_AGENT = 100
+
+
+@pytest.fixture
+def middleware():
+    middleware = MessageMiddleware()
+    middleware.register_channel(HierarchicalChannel("hierarchical"))
+    middleware.register_channel(CollaborationChannel("collaboration"))
+    middleware.register_channel(DataChannel("data"))
+    yield middleware
+    middleware.shutdown()
+
+
+def make_message(sender: str, recipient: str, index: int) -> Message:
+    return Message(
+        message_type=MessageType.INFORMATION,
+        sender=sender,
+        sender_level=AgentLevel.TACTICAL,
+        content={"index": index, "sent_at": time.perf_counter()},
+        recipient=recipient
+    )
+
+
+@pytest.mark.performance
+def test_ping_pong_latency(middleware):
+    def responder():
+        for index in range(ROUND_TRIPS):
+            middleware.receive_message("tactical-pong", timeout=5)
+            middleware.send_message(make_message("tactical-pong", "tactical-ping", index))
+
+    thread = threading.Thread(target=responder, daemon=True)
+    thread.start()
+
+    latencies = []
+    start = time.perf_counter()
+    for index in range(ROUND_TRIPS):
+        sent_at = time.perf_counter()
+        middleware.send_message(make_message("tactical-ping", "tactical-pong", index))
+        assert middleware.receive_message("tactical-ping", timeout=5) is not None
+        latencies.append(time.perf_counter() - sent_at)
+    elapsed = time.perf_counter() - start
+    thread.join()
+
+    median = statistics.median(latencies)
+    p99 = sorted(latencies)[int(len(latencies) * 0.99) - 1]
+    print(f"\n{ROUND_TRIPS} allers-retours: {ROUND_TRIPS * 2 / elapsed:.0f} messages/s, "
+          f"latence médiane {median * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+    # Une scrutation toutes les 10 ms coûtait en moyenne 5 ms par saut, soit 10 ms par aller-retour
+    assert median < 0.005
+
+
+@pytest.mark.performance
+def test_async_fan_in_throughput(middleware):
+    async def receive_all(recipient_id):
+        latencies = []
+        for _ in range(MESSAGES_PER_AGENT):
+            message = await middleware.receive_message_async(recipient_id, timeout=10)
+            latencies.append(time.perf_counter() - message.content["sent_at"])
+        return latencies
+
+    def send_all():
+        for index in range(MESSAGES_PER_AGENT):
+            for agent in range(AGENT_COUNT):
+                middleware.send_message(make_message("tactical-source", f"operational-{agent}", index))
+
+    async def run():
+        receivers = [asyncio.create_task(receive_all(f"operational-{agent}")) for agent in range(AGENT_COUNT)]
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        await asyncio.to_thread(send_all)
+        results = await asyncio.gather(*receivers)
+        return time.perf_counter() - start, [latency for latencies in results for latency in latencies]
+
+    elapsed, latencies = asyncio.run(run())
+    total = AGENT_COUNT * MESSAGES_PER_AGENT
+
+    print(f"\n{AGENT_COUNT} récepteurs asynchrones: {total / elapsed:.0f} messages/s, "
+          f"latence médiane {statistics.median(latencies) * 1000:.2f} ms")
+    assert len(latencies) == total
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark de l'inférence NLP par lots des analyseurs améliorés.
+
+Un long document est découpé en phrases, puis analysé par le pipeline de
+sentiment phrase par phrase (comportement historique) et par lots triés par
+longueur. Le benchmark mesure aussi le coût de création d'un second analyseur,
+qui réutilise les modèles déjà chargés par le premier.
+"""
+
+import os
+import time
+
+import pytest
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("torch")
+
+from argumentation_analysis.agents.tools.analysis.enhanced.nlp_inference import (
+    BatchedInference, lazy_pipeline, split_sentences
+)
+
+SENTENCE_COUNT = 256
+BATCH_SIZE = 32
+
+
+def build_document() -> str:
+    templates = [
+        "Les experts affirment que ce produit est absolument sûr",
+        "Des millions de personnes l'utilisent déjà chaque jour sans le moindre problème",
+        "Vous seriez irresponsable de ne pas protéger vos enfants",
+        "Le rapport publié hier présente des résultats nuancés sur plusieurs années d'observation",
+    ]
+    return ". ".join(f"{templates[i % len(templates)]} ({i})" for i in range(SENTENCE_COUNT))
+
+
+@pytest.mark.performance
+def test_batched_sentiment_is_faster_than_per_sentence():
+    sentiment = lazy_pipeline(transformers.pipeline, "sentiment-analysis")
+    sentences = split_sentences(build_document())
+
+    start = time.perf_counter()
+    sentiment.get()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reused = lazy_pipeline(transformers.pipeline, "sentiment-analysis").get()
+    reuse_time = time.perf_counter() - start
+    assert reused is sentiment.get()
+
+    start = time.perf_counter()
+    per_sentence = [sentiment(sentence)[0] for sentence in sentences]
+    per_sentence_time = time.perf_counter() - start
+
+    inference = BatchedInference(batch_size=BATCH_SIZE)
+    start = time.perf_counter()
+    batched = inference.run(sentiment, sentences)
+    batched_time = time.perf_counter() - start
+
+    print(f"\n{len(sentences)} phrases, lots de {BATCH_SIZE} ({inference.stats['batches']} lots)")
+    print(f"Chargement du pipeline: {load_time:.2f} s, réutilisation: {reuse_time * 1000:.3f} ms")
+    print(f"Phrase par phrase: {per_sentence_time:.2f} s, par lots: {batched_time:.2f} s "
+          f"(x{per_sentence_time / batched_time:.1f})")
+
+    assert [result["label"] for result in batched] == [result["label"] for result in per_sentence]
+    assert batched_time < per_sentence_time
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark de la distribution des publications aux abonnés.
+
+Un topic porte plusieurs centaines d'abonnements filtrés par priorité et niveau
+d'émetteur, dont un abonné lent. La publication ne doit évaluer que les abonnements
+des compartiments correspondant au message et ne jamais attendre les callbacks.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from argumentation_analysis.core.communication.message import Message, MessageType, MessagePriority, AgentLevel
+from argumentation_analysis.core.communication.pub_sub import SubscriptionDispatcher, Topic
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+SUBSCRIBER_COUNT = 400
+MESSAGE_COUNT = 5000
+
+
+@pytest.mark.performance
+def test_fanout_with_slow_subscriber():
+    dispatcher = SubscriptionDispatcher(max_workers=4)
+    topic = Topic("events", dispatcher=dispatcher, max_pending=MESSAGE_COUNT)
+    priorities = list(MessagePriority)
+    levels = list(AgentLevel)
+
+    delivered = []
+    release = threading.Event()
+    topic.add_subscriber("slow", callback=lambda message: release.wait(30))
+    for index in range(SUBSCRIBER_COUNT):
+        criteria = (
+            {"priority": priorities[index % len(priorities)].value}
+            if index % 2 else {"sender_level": levels[index % len(levels)].value}
+        )
+        topic.add_subscriber(f"agent-{index}", callback=delivered.append, filter_criteria=criteria)
+
+    messages = [
+        Message(
+            message_type=MessageType.PUBLICATION,
+            sender=f"agent-{index % 50}",
+            sender_level=levels[index % len(levels)],
+            content={"n": index},
+            priority=priorities[index % len(priorities)]
+        )
+        for index in range(MESSAGE_COUNT)
+    ]
+
+    start = time.perf_counter()
+    recipient_count = sum(len(topic.publish_message(message)) for message in messages)
+    publish_time = time.perf_counter() - start
+
+    deadline = time.monotonic() + 30
+    while len(delivered) < recipient_count - MESSAGE_COUNT and time.monotonic() < deadline:
+        time.sleep(0.01)
+    fanout_time = time.perf_counter() - start
+
+    release.set()
+    assert dispatcher.flush(30)
+    dispatcher.shutdown(wait=True)
+
+    print(f"\n{MESSAGE_COUNT} publications vers {SUBSCRIBER_COUNT} abonnements filtrés: "
+          f"{MESSAGE_COUNT / publish_time:.0f} publications/s, "
+          f"{len(delivered) / fanout_time:.0f} distributions/s")
+    assert len(delivered) == recipient_count - MESSAGE_COUNT
+    assert publish_time < 5
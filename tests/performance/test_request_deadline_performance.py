@@ -0,0 +1,82 @@
+"""
+Micro-benchmark de la précision des timeouts du protocole de requête-réponse.
+
+Des milliers de requêtes à callback sont en vol simultanément : la moitié reçoit une
+réponse, l'autre expire. Le retard de chaque expiration par rapport à son échéance
+mesure la précision de l'ordonnanceur, que l'ancien thread de surveillance bornait
+à 100 ms.
+"""
+
+import os
+import random
+import statistics
+import threading
+import time
+
+import pytest
+
+from argumentation_analysis.core.communication.message import AgentLevel
+from argumentation_analysis.core.communication.middleware import MessageMiddleware
+from argumentation_analysis.core.communication.hierarchical_channel import HierarchicalChannel
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+REQUEST_COUNT = 4000
+
+# Période de l'ancien thread de surveillance des timeouts (borne du retard avant l'échéancier)
+LEGACY_POLL_INTERVAL = 0.1
+
+
+@pytest.mark.performance
+def test_timeout_precision_under_load():
+    middleware = MessageMiddleware()
+    middleware.register_channel(HierarchicalChannel("hierarchical"))
+    middleware.initialize_protocols()
+    protocol = middleware.request_response
+
+    lateness = []
+    responses = []
+    lock = threading.Lock()
+    done = threading.Event()
+    rng = random.Random(42)
+
+    def make_callback(deadline):
+        def callback(response, error):
+            with lock:
+                if error is not None:
+                    lateness.append(time.monotonic() - deadline)
+                else:
+                    responses.append(response)
+                if len(lateness) + len(responses) == REQUEST_COUNT:
+                    done.set()
+        return callback
+
+    request_ids = []
+    for index in range(REQUEST_COUNT):
+        timeout = rng.uniform(1.5, 2.5)
+        request_ids.append(protocol.send_request_async_callback(
+            "strategic-1", AgentLevel.STRATEGIC, f"tactical-{index % 50}", "status", {},
+            make_callback(time.monotonic() + timeout), timeout=timeout
+        ))
+
+    start = time.perf_counter()
+    for index in range(0, REQUEST_COUNT, 2):
+        request = middleware.receive_message(f"tactical-{index % 50}", timeout=1)
+        protocol.handle_response(request.create_response({"status": "ok"}))
+    response_time = time.perf_counter() - start
+
+    assert done.wait(10)
+    middleware.shutdown()
+
+    ordered = sorted(lateness)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"\n{REQUEST_COUNT} requêtes en vol: {len(responses) / response_time:.0f} réponses/s, "
+          f"retard des timeouts médian {statistics.median(ordered) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms")
+    assert len(responses) == REQUEST_COUNT // 2
+    # Borne relative à l'ancienne période de scrutation, robuste à la charge des machines de CI
+    assert p99 < LEGACY_POLL_INTERVAL / 2
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark des aperçus de l'état partagé au fil d'une longue conversation.
+
+Chaque tour simule un agent qui enrichit l'état (argument, belief set, requête,
+extrait) puis un agent qui en consulte l'aperçu complet. Le coût par tour de
+l'assemblage depuis les fragments en cache est comparé à une sérialisation
+complète de l'état, dont le coût croît avec la taille de l'état.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from argumentation_analysis.core.shared_state import RhetoricalAnalysisState
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+TURN_COUNT = 1500
+WINDOW = 150
+
+
+def full_serialization(state: RhetoricalAnalysisState) -> str:
+    return json.dumps(dict(state.get_state_view()), indent=2, ensure_ascii=False, default=str)
+
+
+def play_turn(state: RhetoricalAnalysisState, turn: int) -> None:
+    arg_id = state.add_argument(f"Argument {turn} : " + "le texte soutient la thèse " * 4)
+    bs_id = state.add_belief_set("Propositional", " && ".join(f"p{turn}_{i} => q{turn}_{i}" for i in range(8)))
+    state.log_query(bs_id, f"q{turn}_0", "ACCEPTED (True)")
+    state.add_extract(f"Extrait {turn}", "Contenu de l'extrait " * 10)
+    if turn % 5 == 0:
+        state.add_fallacy("ad_hominem", "Attaque la personne plutôt que l'argument", arg_id)
+
+
+@pytest.mark.performance
+def test_snapshot_cost_stays_flat_over_long_conversation():
+    state = RhetoricalAnalysisState("Texte à analyser. " * 200)
+    incremental, full = [], []
+
+    for turn in range(TURN_COUNT):
+        play_turn(state, turn)
+
+        start = time.perf_counter()
+        snapshot = state.to_json(indent=2)
+        incremental.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        reference = full_serialization(state)
+        full.append(time.perf_counter() - start)
+
+    assert snapshot == reference
+
+    early_incremental = sum(incremental[WINDOW:2 * WINDOW]) / WINDOW
+    late_incremental = sum(incremental[-WINDOW:]) / WINDOW
+    late_full = sum(full[-WINDOW:]) / WINDOW
+    print(f"\n{TURN_COUNT} tours, état final de {len(snapshot) / 1024:.0f} Ko")
+    print(f"Aperçu incrémental: {early_incremental * 1000:.3f} ms/tour (début), "
+          f"{late_incremental * 1000:.3f} ms/tour (fin)")
+    print(f"Sérialisation complète: {late_full * 1000:.3f} ms/tour (fin)")
+
+    assert late_incremental * 5 < late_full
+
+    version = state.version
+    play_turn(state, TURN_COUNT)
+    start = time.perf_counter()
+    delta = json.dumps(state.get_state_delta(version), ensure_ascii=False, default=str)
+    delta_time = time.perf_counter() - start
+    print(f"Delta d'un tour: {len(delta)} octets en {delta_time * 1000:.3f} ms")
+    assert len(delta) < len(snapshot) / 100
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark du détecteur de sophismes basé sur la taxonomie réelle.
+
+Compare l'ancienne analyse lexicale (`iterrows` sur tout le DataFrame) au
+moteur compilé de `taxonomy_detection_engine` sur `argumentum_fallacies_taxonomy.csv`.
+"""
+
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from argumentation_analysis.agents.core.informal.taxonomy_detection_engine import (
+    CompiledTaxonomyEngine,
+    clear_engine_cache,
+)
+from argumentation_analysis.agents.core.informal.taxonomy_sophism_detector import TaxonomySophismDetector
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+TAXONOMY_PATH = Path(__file__).resolve().parents[2] / "argumentation_analysis" / "data" / "argumentum_fallacies_taxonomy.csv"
+
+
+def _legacy_lexical_pass(df: pd.DataFrame, text: str) -> int:
+    """Ancienne boucle lexicale (sans enrichissement), retourne le nombre de détections."""
+    text_lower = text.lower()
+    hits = 0
+    for _, row in df.iterrows():
+        confidence = 0.0
+        nom_vulgarise = str(row.get('nom_vulgarisé', '')).lower()
+        name = str(row.get('Name', '')).lower()
+        description = str(row.get('text_fr', '')).lower()
+        if nom_vulgarise and nom_vulgarise in text_lower:
+            confidence += 0.7
+        if name and name in text_lower:
+            confidence += 0.5
+        for word in [w for w in description.split() if len(w) > 4][:5]:
+            if word in text_lower:
+                confidence += 0.1
+        if confidence >= 0.3:
+            hits += 1
+    return hits
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    df = pd.read_csv(TAXONOMY_PATH, encoding='utf-8').set_index('PK')
+    examples = df['example_fr'].dropna().astype(str).tolist()
+    return [" ".join(examples[i:i + 5]) for i in range(0, min(len(examples), 250), 5)]
+
+
+@pytest.mark.performance
+def test_compiled_engine_vs_legacy_lexical_pass(corpus):
+    df = pd.read_csv(TAXONOMY_PATH, encoding='utf-8').set_index('PK')
+
+    start = time.perf_counter()
+    engine = CompiledTaxonomyEngine(df)
+    build_time = time.perf_counter() - start
+
+    sample = corpus[:10]
+    start = time.perf_counter()
+    for text in sample:
+        _legacy_lexical_pass(df, text)
+    legacy_per_text = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    for text in corpus:
+        engine.score_text(text)
+    engine_per_text = (time.perf_counter() - start) / len(corpus)
+
+    print(f"\nCompilation: {build_time * 1000:.1f} ms")
+    print(f"Ancienne passe lexicale: {legacy_per_text * 1000:.2f} ms/texte")
+    print(f"Moteur compilé: {engine_per_text * 1000:.2f} ms/texte "
+          f"(x{legacy_per_text / max(engine_per_text, 1e-9):.0f})")
+
+    assert engine_per_text < legacy_per_text
+
+
+@pytest.mark.performance
+def test_detect_batch_throughput(corpus):
+    clear_engine_cache()
+    detector = TaxonomySophismDetector(taxonomy_file_path=str(TAXONOMY_PATH))
+
+    start = time.perf_counter()
+    results = detector.detect_batch(corpus)
+    elapsed = time.perf_counter() - start
+
+    print(f"\ndetect_batch: {len(corpus)} textes en {elapsed:.2f} s "
+          f"({len(corpus) / max(elapsed, 1e-9):.1f} textes/s)")
+    assert len(results) == len(corpus)
@@ -0,0 +1,53 @@
+"""
+Micro-benchmark du démarrage à froid de la taxonomie.
+
+Compare, sur une copie de `argumentum_fallacies_taxonomy.csv`, la lecture et la
+préparation du CSV à la lecture de l'instantané binaire de `taxonomy_snapshot`.
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from argumentation_analysis.utils.core_utils.file_loaders import load_csv_file
+from argumentation_analysis.utils.taxonomy_snapshot import (
+    get_snapshot_path,
+    load_taxonomy_dataframe,
+    prepare_taxonomy_dataframe,
+)
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+TAXONOMY_PATH = Path(__file__).resolve().parents[2] / "argumentation_analysis" / "data" / "argumentum_fallacies_taxonomy.csv"
+
+
+@pytest.mark.performance
+def test_snapshot_cold_start_vs_csv(tmp_path):
+    csv_path = tmp_path / TAXONOMY_PATH.name
+    shutil.copy(TAXONOMY_PATH, csv_path)
+
+    start = time.perf_counter()
+    df_csv = prepare_taxonomy_dataframe(load_csv_file(csv_path))
+    csv_time = time.perf_counter() - start
+
+    load_taxonomy_dataframe(csv_path)  # Écrit l'instantané
+    assert get_snapshot_path(csv_path).is_file()
+
+    start = time.perf_counter()
+    df_snapshot, _ = load_taxonomy_dataframe(csv_path)
+    snapshot_time = time.perf_counter() - start
+
+    print(f"\nCSV + préparation: {csv_time * 1000:.1f} ms")
+    print(f"Instantané (empreinte comprise): {snapshot_time * 1000:.1f} ms")
+
+    pd.testing.assert_frame_equal(df_snapshot, df_csv)
+    assert snapshot_time < csv_time
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark du store partagé de la taxonomie.
+
+Compare, sur `argumentum_fallacies_taxonomy.csv`, l'ancienne exploration de la
+hiérarchie (copie du DataFrame puis filtrage par `path`) aux lectures des
+listes d'adjacence de `TaxonomyStore`, en latence et en mémoire.
+"""
+
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from argumentation_analysis.agents.core.informal.informal_definitions import InformalAnalysisPlugin
+from argumentation_analysis.agents.core.informal.taxonomy_store import clear_taxonomy_store_registry
+
+PERFORMANCE_TESTS_ENABLED = os.environ.get('ENABLE_PERFORMANCE_TESTS', 'false').lower() == 'true'
+
+pytestmark = pytest.mark.skipif(
+    not PERFORMANCE_TESTS_ENABLED,
+    reason="Tests de performance désactivés (ENABLE_PERFORMANCE_TESTS=false)"
+)
+
+TAXONOMY_PATH = Path(__file__).resolve().parents[2] / "argumentation_analysis" / "data" / "argumentum_fallacies_taxonomy.csv"
+
+
+def _legacy_children(df: pd.DataFrame, pk: int) -> list:
+    """Ancienne recherche des enfants : copie défensive puis filtrage par préfixe de `path`."""
+    df = df.copy()
+    current_path = str(df.loc[pk, 'path'])
+    df['path'] = df['path'].astype(str)
+    mask = df['path'].str.startswith(current_path + '.') & ~df['path'].str[len(current_path) + 1:].str.contains(r'\.')
+    return df[mask].index.tolist()
+
+
+@pytest.mark.performance
+def test_store_children_vs_legacy_filtering():
+    clear_taxonomy_store_registry()
+    plugin = InformalAnalysisPlugin(taxonomy_file_path=str(TAXONOMY_PATH))
+    df = plugin._get_taxonomy_dataframe()
+    store = plugin._get_taxonomy_store()
+    pks = list(df.index[:200])
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    legacy = [_legacy_children(df, pk) for pk in pks]
+    legacy_per_call = (time.perf_counter() - start) / len(pks)
+    _, legacy_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for pk in pks:
+        plugin._internal_explore_hierarchy(pk, df)
+    store_per_call = (time.perf_counter() - start) / len(pks)
+    _, store_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\nAncien filtrage: {legacy_per_call * 1000:.2f} ms/appel, pic mémoire {legacy_peak / 1024:.0f} Ko")
+    print(f"Store partagé (explore_hierarchy complet): {store_per_call * 1000:.3f} ms/appel, "
+          f"pic mémoire {store_peak / 1024:.0f} Ko")
+
+    assert [[store.pks[p] for p in store.children_of(pk)] for pk in pks] == legacy
+    assert store_per_call < legacy_per_call
+    assert store_peak < legacy_peak
+
+
+@pytest.mark.performance
+def test_plugins_share_taxonomy_data():
+    clear_taxonomy_store_registry()
+    InformalAnalysisPlugin(taxonomy_file_path=str(TAXONOMY_PATH))._get_taxonomy_dataframe()
+    frame_bytes = pd.read_csv(TAXONOMY_PATH).memory_usage(deep=True).sum()
+    plugin_count = 20
+
+    tracemalloc.start()
+    plugins = [InformalAnalysisPlugin(taxonomy_file_path=str(TAXONOMY_PATH)) for _ in range(plugin_count)]
+    frames = [plugin._get_taxonomy_dataframe() for plugin in plugins]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"\n{plugin_count} plugins: pic mémoire {peak / 1024:.0f} Ko "
+          f"(DataFrame de taxonomie: {frame_bytes / 1024:.0f} Ko)")
+    assert len({id(frame) for frame in frames}) == plugin_count
+    # Les vues partagent les données du store : les plugins ne recopient pas la taxonomie
+    assert peak < frame_bytes
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du moteur de détection compilé (`taxonomy_detection_engine`).
+
+Les résultats du moteur sont comparés à une réimplémentation de l'ancienne
+boucle `iterrows` de `TaxonomySophismDetector.detect_sophisms_from_taxonomy`.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from argumentation_analysis.agents.core.informal.taxonomy_detection_engine import (
+    CompiledTaxonomyEngine,
+    clear_engine_cache,
+    compute_taxonomy_fingerprint,
+    get_compiled_engine,
+)
+from argumentation_analysis.agents.core.informal.taxonomy_sophism_detector import TaxonomySophismDetector
+
+DATA_DIR = Path(__file__).resolve().parents[6] / "argumentation_analysis" / "data"
+SMALL_TAXONOMY = DATA_DIR / "mock_taxonomy_small.csv"
+
+
+def _legacy_scores(df: pd.DataFrame, text: str, max_sophisms: int = 10):
+    """Réimplémentation de référence de l'ancienne analyse lexicale."""
+    detected = []
+    text_lower = text.lower()
+    for pk, row in df.iterrows():
+        confidence = 0.0
+        matches = []
+        name = str(row.get('Name', '')).lower()
+        nom_vulgarise = str(row.get('nom_vulgarisé', '')).lower()
+        description = str(row.get('text_fr', '')).lower()
+        if nom_vulgarise and nom_vulgarise in text_lower:
+            confidence += 0.7
+            matches.append(f"Nom vulgarisé: '{nom_vulgarise}'")
+        if name and name in text_lower:
+            confidence += 0.5
+            matches.append(f"Nom officiel: '{name}'")
+        if description:
+            for word in [w for w in description.split() if len(w) > 4][:5]:
+                if word in text_lower:
+                    confidence += 0.1
+                    matches.append(f"Mot-clé: '{word}'")
+        if confidence >= 0.3:
+            detected.append((int(pk), min(confidence, 1.0), matches))
+    detected.sort(key=lambda x: x[1], reverse=True)
+    return detected[:max_sophisms]
+
+
+@pytest.fixture
+def taxonomy_df():
+    df = pd.read_csv(SMALL_TAXONOMY, encoding='utf-8')
+    return df.set_index('PK')
+
+
+@pytest.fixture(autouse=True)
+def _reset_engine_cache():
+    clear_engine_cache()
+    yield
+    clear_engine_cache()
+
+
+TEXTS = [
+    "Vous pensez qu'une idée est valide seulement parce que celui qui la présente est riche.",
+    "C'est la raison du plus riche : il ne serait pas parvenu où il en est aujourd'hui.",
+    "Renverser la charge de la preuve est une tactique courante en politique.",
+    "Un texte sans aucun rapport.",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_scores_match_legacy_implementation(taxonomy_df, text):
+    engine = CompiledTaxonomyEngine(taxonomy_df)
+    expected = _legacy_scores(taxonomy_df, text)
+    actual = [
+        (int(taxonomy_df.index[position]), min(confidence, 1.0), matches)
+        for position, confidence, matches in engine.score_text(text)
+    ]
+    assert actual == expected
+
+
+def test_related_sophisms_match_path_prefix_filter(taxonomy_df):
+    engine = CompiledTaxonomyEngine(taxonomy_df)
+    for pk, row in taxonomy_df.iterrows():
+        parts = str(row['path']).split('.')
+        related = engine.get_related_sophisms(int(pk))
+        if len(parts) <= 1:
+            assert related == {'siblings': []}
+            continue
+        parent_path = '.'.join(parts[:-1])
+        siblings = taxonomy_df[taxonomy_df['path'].astype(str).str.startswith(parent_path + '.', na=False)]
+        expected = [int(k) for k in siblings.index if k != pk][:5]
+        assert [s['taxonomy_key'] for s in related['siblings']] == expected
+
+
+def test_engine_is_shared_per_fingerprint(taxonomy_df):
+    fingerprint = compute_taxonomy_fingerprint(SMALL_TAXONOMY)
+    assert fingerprint is not None
+    assert get_compiled_engine(taxonomy_df, fingerprint) is get_compiled_engine(taxonomy_df, fingerprint)
+    assert get_compiled_engine(taxonomy_df, None) is not get_compiled_engine(taxonomy_df, None)
+
+
+def test_fingerprint_of_missing_file_is_none(tmp_path):
+    assert compute_taxonomy_fingerprint(tmp_path / "absent.csv") is None
+
+
+def test_detect_batch_preserves_order_and_matches_single_calls():
+    detector = TaxonomySophismDetector(taxonomy_file_path=str(SMALL_TAXONOMY))
+    texts = [TEXTS[0], TEXTS[3], TEXTS[0]]
+    batch = detector.detect_batch(texts, max_sophisms=3)
+    assert len(batch) == 3
+    for text, result in zip(texts, batch):
+        assert result == detector.detect_sophisms_from_taxonomy(text, max_sophisms=3)
+    assert batch[0] is not batch[2]
+
+
+def test_branch_context_errors_are_not_cached(taxonomy_df):
+    engine = CompiledTaxonomyEngine(taxonomy_df)
+    calls = []
+
+    def compute(key):
+        calls.append(key)
+        return {'error': "indisponible"} if len(calls) == 1 else {'node': key}
+
+    assert engine.get_branch_context(1, compute) == {'error': "indisponible"}
+    assert engine.get_branch_context(1, compute) == {'node': 1}
+    assert engine.get_branch_context(1, compute) == {'node': 1}
+    assert calls == [1, 1]
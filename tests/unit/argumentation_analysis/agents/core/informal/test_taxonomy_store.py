@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Tests du store partagé en lecture seule de la taxonomie (`taxonomy_store`).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from argumentation_analysis.agents.core.informal.informal_definitions import InformalAnalysisPlugin
+from argumentation_analysis.agents.core.informal.taxonomy_store import (
+    TaxonomyStore,
+    clear_taxonomy_store_registry,
+    get_registered_taxonomy_store,
+    register_taxonomy_store,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[6] / "argumentation_analysis" / "data"
+SMALL_TAXONOMY = DATA_DIR / "mock_taxonomy_small.csv"
+
+
+@pytest.fixture(autouse=True)
+def _reset_store_registry():
+    clear_taxonomy_store_registry()
+    yield
+    clear_taxonomy_store_registry()
+
+
+@pytest.fixture
+def fk_df():
+    df = pd.DataFrame({
+        'PK': [0, 1, 2, 3],
+        'FK_Parent': [None, 0, 0, 1],
+        'text_fr': ['Racine', 'Catégorie 1', 'Catégorie 2', 'Sous-catégorie 1.1'],
+        'nom_vulgarisé': ['Sophismes', 'Ad Hominem', 'Faux Dilemme', 'Attaque Personnelle'],
+        'Famille': [None, 'Pertinence', 'Structure', 'Pertinence'],
+        'depth': [0, 1, 1, 2]
+    })
+    return df.set_index('PK')
+
+
+@pytest.fixture
+def path_df():
+    df = pd.DataFrame({
+        'PK': [10, 11, 12, 13, 14],
+        'path': ['1', '1.1', '1.2', '1.1.1', '2'],
+        'nom_vulgarisé': ['A', 'B', 'C', 'D', 'E'],
+        'depth': [1, 2, 2, 3, 1]
+    })
+    return df.set_index('PK')
+
+
+def test_children_from_parent_column(fk_df):
+    store = TaxonomyStore(fk_df)
+    assert store.children_of(0) == (1, 2)
+    assert store.children_of(1) == (3,)
+    assert store.children_of(3) == ()
+    assert store.children_of(99) == ()
+    assert store.parent_of(3) == store.position_of(1)
+    assert store.parent_of(0) is None
+
+
+def test_children_and_parent_from_path(path_df):
+    store = TaxonomyStore(path_df)
+    assert [store.pks[p] for p in store.children_of(10)] == [11, 12]
+    assert [store.pks[p] for p in store.children_of(11)] == [13]
+    assert store.children_of(14) == ()
+    assert store.pks[store.parent_of(13)] == 11
+    assert store.parent_of(10) is None
+
+
+def test_path_fallbacks_for_missing_paths():
+    df = pd.DataFrame({
+        'PK': [20, 21, 22, 23, 24],
+        'path': [None, float('nan'), '3.1', '', '3'],
+        'depth': [0, None, 1, 1, 1]
+    }).set_index('PK')
+    store = TaxonomyStore(df)
+    assert [store.pks[p] for p in store.children_of(20)] == [22, 23, 24]
+    assert store.children_of(21) == ()
+    assert [store.pks[p] for p in store.children_of(24)] == [22]
+    assert store.parent_of(21) is None
+    assert store.pks[store.parent_of(22)] == 24
+
+
+def test_frame_is_a_shared_read_only_view(fk_df):
+    store = TaxonomyStore(fk_df)
+    frame = store.frame
+    assert frame is not fk_df and store.is_built_from(fk_df)
+    # Les vues partagent les données du store au lieu de les recopier
+    assert np.shares_memory(frame['depth'].to_numpy(), fk_df['depth'].to_numpy())
+    assert np.shares_memory(store.column('depth'), fk_df['depth'].to_numpy())
+
+    frame.loc[0, 'nom_vulgarisé'] = 'modifié'
+    frame.loc[0, 'depth'] = 9
+    assert store.frame.loc[0, 'nom_vulgarisé'] == 'Sophismes'
+    assert store.column('depth')[0] == 0 and fk_df.loc[0, 'depth'] == 0
+
+
+def test_columns_are_read_only(fk_df):
+    store = TaxonomyStore(fk_df)
+    values = store.column('nom_vulgarisé')
+    with pytest.raises(ValueError):
+        values[0] = 'modifié'
+    assert fk_df['nom_vulgarisé'].iloc[0] == 'Sophismes'
+    assert store.value(0, 'colonne_absente', 'défaut') == 'défaut'
+
+
+def test_famille_index_and_row_dict(fk_df):
+    store = TaxonomyStore(fk_df)
+    assert list(store.positions_by_famille) == ['Pertinence', 'Structure']
+    assert store.positions_by_famille['Pertinence'] == (1, 3)
+    row = store.row_dict(0)
+    assert 'Famille' not in row and 'FK_Parent' not in row
+    assert isinstance(row['depth'], int)
+    json.dumps(row)
+
+
+def test_registry_shares_store_per_fingerprint(fk_df):
+    assert get_registered_taxonomy_store("abc") is None
+    store = register_taxonomy_store(fk_df, "abc")
+    assert register_taxonomy_store(fk_df.copy(), "abc") is store
+    assert get_registered_taxonomy_store("abc") is store
+    assert register_taxonomy_store(fk_df, None) is not register_taxonomy_store(fk_df, None)
+
+
+def test_plugins_share_the_store_but_not_the_dataframe():
+    first = InformalAnalysisPlugin(taxonomy_file_path=str(SMALL_TAXONOMY))
+    second = InformalAnalysisPlugin(taxonomy_file_path=str(SMALL_TAXONOMY))
+    first_df = first._get_taxonomy_dataframe()
+    assert first._get_taxonomy_dataframe() is first_df
+    assert second._get_taxonomy_dataframe() is not first_df
+    assert first._get_taxonomy_store() is second._get_taxonomy_store()
+
+    first_df.drop(first_df.index, inplace=True)
+    assert len(second._get_taxonomy_dataframe()) > 0
+    assert len(first._get_taxonomy_store().frame) > 0
+
+
+def test_hierarchy_functions_use_store_without_mutating(fk_df):
+    plugin = InformalAnalysisPlugin()
+    snapshot = fk_df.copy()
+
+    hierarchy = plugin._internal_explore_hierarchy(0, fk_df, max_children=1)
+    assert hierarchy['current_node']['nom_vulgarisé'] == 'Sophismes'
+    assert [child['pk'] for child in hierarchy['children']] == [1]
+    assert hierarchy['children'][0]['has_children'] is True
+    assert hierarchy['children_truncated'] is True
+    assert hierarchy['total_children'] == 2
+
+    details = plugin._internal_get_node_details(3, fk_df)
+    assert details['parent']['pk'] == 1
+    assert 'children' not in details
+
+    pd.testing.assert_frame_equal(fk_df, snapshot)
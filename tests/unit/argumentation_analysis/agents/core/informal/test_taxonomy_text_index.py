@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de l'index textuel partagé de la taxonomie (`taxonomy_text_index`).
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from argumentation_analysis.agents.core.informal.informal_definitions import InformalAnalysisPlugin
+from argumentation_analysis.agents.core.informal.taxonomy_sophism_detector import TaxonomySophismDetector
+from argumentation_analysis.agents.core.informal.taxonomy_text_index import (
+    AhoCorasickAutomaton,
+    TaxonomyTextIndex,
+    clear_text_index_cache,
+    fold_text,
+    get_taxonomy_text_index,
+)
+
+DATA_DIR = Path(__file__).resolve().parents[6] / "argumentation_analysis" / "data"
+SMALL_TAXONOMY = DATA_DIR / "mock_taxonomy_small.csv"
+
+
+@pytest.fixture
+def taxonomy_df():
+    return pd.read_csv(SMALL_TAXONOMY, encoding='utf-8').set_index('PK')
+
+
+@pytest.fixture(autouse=True)
+def _reset_index_cache():
+    clear_text_index_cache()
+    yield
+    clear_text_index_cache()
+
+
+def test_fold_text_is_case_and_accent_insensitive():
+    assert fold_text("Généralisation HÂTIVE") == fold_text("generalisation hative")
+    assert fold_text("l’œuvre") == "l'oeuvre"
+    assert fold_text(float('nan')) == ''
+    assert fold_text(None) == ''
+
+
+def test_automaton_finds_all_patterns_in_one_scan():
+    automaton = AhoCorasickAutomaton(["he", "she", "his", "hers", ""])
+    assert automaton.find_patterns("ushers") == {0, 1, 3}
+    assert sorted(automaton.iter_matches("ushers")) == [(4, 0), (4, 1), (6, 3)]
+    assert automaton.find_patterns("") == set()
+
+
+def test_search_matches_naive_folded_substring(taxonomy_df):
+    index = TaxonomyTextIndex(taxonomy_df)
+    for query in ["riche", "RAISON", "preuve", "é", "a", "xyz"]:
+        folded_query = fold_text(query)
+        for column in index.columns:
+            expected = [
+                position for position, value in enumerate(taxonomy_df[column].tolist())
+                if folded_query in fold_text(value)
+            ]
+            assert index.search(query, column) == expected
+
+
+def test_long_queries_are_verified_against_full_values(taxonomy_df):
+    index = TaxonomyTextIndex(taxonomy_df)
+    description = taxonomy_df['text_fr'].dropna().iloc[0]
+    long_query = (description + " ") * 4
+    assert index.search(long_query, 'text_fr') == []
+    assert index.search(description.upper(), 'text_fr') == [taxonomy_df['text_fr'].tolist().index(description)]
+
+
+def test_scan_document_returns_rows_whose_value_appears(taxonomy_df):
+    index = TaxonomyTextIndex(taxonomy_df)
+    text = "Il a invoqué la RAISON DU PLUS RICHE puis a voulu renverser la charge de la preuve."
+    found = index.scan_document(text, ['text_fr'])['text_fr']
+    names = [taxonomy_df['text_fr'].iloc[position] for position in found]
+    assert "Raison du plus riche" in names
+    assert "Renverser la charge de la preuve" in names
+
+
+def test_index_is_shared_per_fingerprint(taxonomy_df):
+    assert get_taxonomy_text_index(taxonomy_df, "abc") is get_taxonomy_text_index(taxonomy_df, "abc")
+    assert get_taxonomy_text_index(taxonomy_df) is not get_taxonomy_text_index(taxonomy_df)
+
+
+def test_plugin_and_detector_share_the_index():
+    plugin = InformalAnalysisPlugin(taxonomy_file_path=str(SMALL_TAXONOMY))
+    detector = TaxonomySophismDetector(taxonomy_file_path=str(SMALL_TAXONOMY))
+    assert plugin._get_text_index() is detector.plugin._get_text_index()
+
+
+def test_find_fallacy_definition_ignores_accents_and_case():
+    plugin = InformalAnalysisPlugin(taxonomy_file_path=str(SMALL_TAXONOMY))
+    result = json.loads(plugin.find_fallacy_definition("definition PERSUASIVE"))
+    assert result["pk"] == 184
+    example = json.loads(plugin.get_fallacy_example("raison du plus riche"))
+    assert example["pk"] == 128
+
+
+def test_search_sophisms_by_pattern_scores_fields():
+    detector = TaxonomySophismDetector(taxonomy_file_path=str(SMALL_TAXONOMY))
+    results = detector.search_sophisms_by_pattern("influence")
+    assert results
+    assert all(result['famille'] == 'Influence' for result in results)
+    assert all(result['match_score'] == pytest.approx(0.3) for result in results)
@@ -39,7 +39,7 @@ class TestQueryCache:
         assert query_cache.max_size == 3
         assert query_cache.ttl_seconds == 2
         assert len(query_cache._cache) == 0
-        assert len(query_cache._access_times) == 0
+        assert len(query_cache._expiry_heap) == 0
     
     def test_cache_operations(self, query_cache):
         """Test les opérations du cache."""
@@ -72,7 +72,78 @@ class TestQueryCache:
         query_cache.clear()
         
         assert len(query_cache._cache) == 0
-        assert len(query_cache._access_times) == 0
+        assert len(query_cache._expiry_heap) == 0
+
+    
+    def test_cache_lru_eviction(self, query_cache):
+        """Test l'éviction de l'entrée la moins récemment utilisée."""
+        result = QueryResult(success=True, data={}, message="Test", query_type=QueryType.CARD_INQUIRY)
+        
+        for card in ["knife", "rope", "candlestick"]:
+            query_cache.put("Agent1", QueryType.CARD_INQUIRY, {"card": card}, result)
+        # "knife" devient la plus récemment utilisée
+        assert query_cache.get("Agent1", QueryType.CARD_INQUIRY, {"card": "knife"}) is not None
+        query_cache.put("Agent1", QueryType.CARD_INQUIRY, {"card": "revolver"}, result)
+        
+        assert query_cache.get("Agent1", QueryType.CARD_INQUIRY, {"card": "rope"}) is None
+        assert query_cache.get("Agent1", QueryType.CARD_INQUIRY, {"card": "knife"}) is not None
+        stats = query_cache.get_stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+    
+    def test_cache_ttl_expiration(self):
+        """Test l'expiration des entrées après leur durée de validité."""
+        query_cache = QueryCache(max_size=3, ttl_seconds=0.05)
+        result = QueryResult(success=True, data={}, message="Test", query_type=QueryType.CARD_INQUIRY)
+        query_cache.put("Agent1", QueryType.CARD_INQUIRY, {"card": "knife"}, result)
+        
+        time.sleep(0.1)
+        
+        assert query_cache.get("Agent1", QueryType.CARD_INQUIRY, {"card": "knife"}) is None
+        assert len(query_cache._cache) == 0
+        assert query_cache.get_stats()["expired_entries"] == 1
+    
+    def test_cache_keys_are_structural(self, query_cache):
+        """Test que l'ordre des clés des paramètres n'influe pas sur la clé de cache."""
+        result = QueryResult(success=True, data={}, message="Test", query_type=QueryType.SUGGESTION_VALIDATION)
+        params = {"suggestion": {"suspect": "Rose", "arme": "Corde", "lieu": "Salon"}, "tags": ["a", "b"]}
+        query_cache.put("Agent1", QueryType.SUGGESTION_VALIDATION, params, result)
+        
+        reordered = {"tags": ["a", "b"], "suggestion": {"lieu": "Salon", "arme": "Corde", "suspect": "Rose"}}
+        assert query_cache.get("Agent1", QueryType.SUGGESTION_VALIDATION, reordered) is not None
+        assert query_cache.get("Agent1", QueryType.SUGGESTION_VALIDATION, dict(params, tags=["b", "a"])) is None
+    
+    def test_cache_invalidation_by_agent(self, query_cache):
+        """Test l'invalidation ciblée des entrées d'un agent."""
+        result = QueryResult(success=True, data={}, message="Test", query_type=QueryType.CARD_INQUIRY)
+        query_cache.put("Agent1", QueryType.CARD_INQUIRY, {"card": "knife"}, result)
+        query_cache.put("Agent1", QueryType.CLUE_REQUEST, {}, result)
+        query_cache.put("Agent2", QueryType.CLUE_REQUEST, {}, result)
+        
+        assert query_cache.invalidate("Agent1", QueryType.CLUE_REQUEST) == 1
+        assert query_cache.invalidate("Agent1") == 1
+        assert query_cache.get("Agent2", QueryType.CLUE_REQUEST, {}) is not None
+        assert query_cache.get_stats()["invalidations"] == 2
+    
+    def test_reveal_card_invalidates_agent_entries(self):
+        """Test l'invalidation du cache d'un agent lorsqu'une carte lui est révélée."""
+        dataset = CluedoDataset(moriarty_cards=["Corde", "Salon"])
+        manager = CluedoDatasetManager(dataset)
+        agent = "SherlockEnqueteAgent"
+        
+        manager.execute_query(agent, QueryType.CLUE_REQUEST, {})
+        assert len(manager.query_cache._cache) == 1
+        
+        dataset.reveal_card("Corde", "AutreAgent", "Test", QueryType.CARD_INQUIRY)
+        assert len(manager.query_cache._cache) == 1
+        
+        dataset.reveal_card("Corde", agent, "Test", QueryType.CARD_INQUIRY)
+        assert len(manager.query_cache._cache) == 0
+        
+        manager.execute_query(agent, QueryType.CLUE_REQUEST, {})
+        dataset.reset_dataset()
+        assert len(manager.query_cache._cache) == 0
 
 
 class TestDatasetAccessManager:
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le module embedding_engine.py.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from argumentation_analysis.nlp.embedding_engine import (
+    EmbeddingEngine,
+    EmbeddingModelRegistry,
+    iter_micro_batches,
+)
+from argumentation_analysis.nlp.embedding_utils import get_embeddings_for_chunks
+
+SENTENCE_TRANSFORMER_PATH = "argumentation_analysis.nlp.embedding_utils.SentenceTransformer"
+
+
+def fake_encode(batch):
+    """Encodeur déterministe : (longueur du texte, code du premier caractère)."""
+    return [[float(len(text)), float(ord(text[0]) if text else 0)] for text in batch]
+
+
+def test_iter_micro_batches_respects_count_and_size_limits():
+    texts = ["a" * 10, "b" * 10, "c" * 10, "d" * 50, "e"]
+    assert list(iter_micro_batches(texts, max_batch_size=2, max_batch_chars=1000)) == [[0, 1], [2, 3], [4]]
+    assert list(iter_micro_batches(texts, max_batch_size=10, max_batch_chars=25)) == [[0, 1], [2], [3], [4]]
+
+
+def test_engine_deduplicates_and_preserves_order():
+    encode = MagicMock(side_effect=fake_encode)
+    engine = EmbeddingEngine("fake-model", encode)
+
+    embeddings = engine.embed(["abc", "de", "abc", "de", "f"])
+
+    assert embeddings.dtype == np.float32
+    assert embeddings.shape == (5, 2)
+    np.testing.assert_array_equal(embeddings[0], embeddings[2])
+    np.testing.assert_array_equal(embeddings[1], [2.0, ord("d")])
+    encode.assert_called_once_with(["abc", "de", "f"])
+
+
+def test_engine_disk_cache_avoids_reencoding(tmp_path):
+    encode = MagicMock(side_effect=fake_encode)
+    first = EmbeddingEngine("fake-model", encode, cache_dir=tmp_path).embed(["un", "deux"])
+
+    encode.reset_mock()
+    engine = EmbeddingEngine("fake-model", encode, cache_dir=tmp_path)
+    second = engine.embed(["deux", "un", "trois"])
+
+    encode.assert_called_once_with(["trois"])
+    np.testing.assert_array_equal(second[:2], first[::-1])
+    assert engine.stats["cache_hits"] == 2
+
+    other_model = MagicMock(side_effect=fake_encode)
+    EmbeddingEngine("other-model", other_model, cache_dir=tmp_path).embed(["un"])
+    other_model.assert_called_once_with(["un"])
+
+
+def test_engine_rejects_mismatched_backend_output():
+    engine = EmbeddingEngine("fake-model", lambda batch: [[0.0, 1.0]])
+    with pytest.raises(ValueError):
+        engine.embed(["a", "b"])
+
+
+def test_registry_is_bounded_lru():
+    registry = EmbeddingModelRegistry(max_models=2)
+    loader = MagicMock(side_effect=lambda: object())
+
+    first = registry.get("a", loader)
+    registry.get("b", loader)
+    assert registry.get("a", loader) is first
+    registry.get("c", loader)  # Libère "b", le moins récemment utilisé
+
+    assert len(registry) == 2
+    assert loader.call_count == 3
+    registry.get("b", loader)
+    assert loader.call_count == 4
+
+
+def test_sentence_transformer_model_is_loaded_once_across_calls():
+    model = MagicMock()
+    model.encode.side_effect = fake_encode
+    with patch(SENTENCE_TRANSFORMER_PATH, return_value=model) as constructor:
+        get_embeddings_for_chunks(["x"], "registry-test-model")
+        get_embeddings_for_chunks(["y", "z"], "registry-test-model", max_batch_size=1)
+
+    constructor.assert_called_once_with("registry-test-model")
+    assert model.encode.call_count == 3
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le module embedding_store.py.
+"""
+
+import numpy as np
+import pytest
+
+from argumentation_analysis.nlp.embedding_store import (
+    EmbeddingStore,
+    load_embedding_store,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((5, 4)).astype(np.float32)
+
+
+def test_append_and_reload_with_memmap(tmp_path, vectors):
+    store = EmbeddingStore(tmp_path / "store")
+    assert store.append("source-a", vectors[:2], metadata={"model_name": "m"}) == (0, 2)
+    assert store.append("source-b", vectors[2:]) == (2, 5)
+
+    reloaded = load_embedding_store(tmp_path / "store")
+    assert reloaded.ids() == ["source-a", "source-b"]
+    assert reloaded.dim == 4
+    np.testing.assert_array_equal(reloaded.get("source-b"), vectors[2:])
+    assert isinstance(reloaded.get("source-a").base, np.memmap) or isinstance(reloaded.get("source-a"), np.memmap)
+    assert reloaded.metadata("source-a") == {"model_name": "m"}
+    np.testing.assert_array_equal(reloaded.get_many(["source-b", "source-a"]), np.concatenate([vectors[2:], vectors[:2]]))
+
+
+def test_incremental_append_after_reopen_and_replacement(tmp_path, vectors):
+    EmbeddingStore(tmp_path).append("a", vectors[0])
+    store = EmbeddingStore(tmp_path)
+    store.append("b", vectors[1])
+    store.append("a", vectors[2])  # Nouvelle version de "a"
+
+    reloaded = load_embedding_store(tmp_path)
+    assert len(reloaded) == 2
+    np.testing.assert_array_equal(reloaded.get("a"), vectors[2:3])
+    np.testing.assert_array_equal(reloaded.get("b"), vectors[1:2])
+
+
+def test_float16_storage_and_dimension_check(tmp_path, vectors):
+    store = EmbeddingStore(tmp_path, dtype="float16")
+    store.append("a", vectors)
+    assert (tmp_path / "vectors.bin").stat().st_size == vectors.size * 2
+    assert load_embedding_store(tmp_path).get("a").dtype == np.float16
+
+    with pytest.raises(ValueError):
+        store.append("b", np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        EmbeddingStore(tmp_path / "other", dtype="float64")
+
+
+def test_interrupted_append_is_ignored_and_overwritten(tmp_path, vectors):
+    store = EmbeddingStore(tmp_path)
+    store.append("a", vectors[:2])
+    # Simule une interruption : vecteurs écrits sans entrée d'index, puis ligne d'index tronquée
+    with open(tmp_path / "vectors.bin", "ab") as vectors_file:
+        vectors_file.write(vectors[2:].tobytes())
+    with open(tmp_path / "index.jsonl", "a", encoding="utf-8") as index_file:
+        index_file.write('{"id": "b", "sta')
+
+    reopened = EmbeddingStore(tmp_path)
+    assert reopened.ids() == ["a"]
+    assert reopened.append("c", vectors[4]) == (2, 3)
+    np.testing.assert_array_equal(load_embedding_store(tmp_path).get("c"), vectors[4:5])
+
+
+def test_load_missing_store_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_embedding_store(tmp_path / "absent")
+
+
+def test_empty_vectors_are_rejected(tmp_path, vectors):
+    store = EmbeddingStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.append("vide", np.zeros((0, 4)))
+    with pytest.raises(ValueError):
+        store.append("vide", [])
+    assert not (tmp_path / "store.json").exists()
+
+    store.append("a", vectors[:1])
+    with pytest.raises(ValueError):
+        store.append("vide", np.zeros((0, 4)))
+    assert load_embedding_store(tmp_path).ids() == ["a"]
@@ -10,6 +10,7 @@ import json
 from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 import httpx # Ajout de l'import
+import numpy as np
 
 # Chemins pour le patching
 OPENAI_CLIENT_PATH = "argumentation_analysis.nlp.embedding_utils.OpenAI"
@@ -20,6 +21,7 @@ OPEN_BUILTIN_PATH = "builtins.open" # Pour mocker l'ouverture de fichier
 
 # Importation des fonctions à tester
 from argumentation_analysis.nlp.embedding_utils import get_embeddings_for_chunks, save_embeddings_data
+from argumentation_analysis.nlp.embedding_store import EmbeddingStore, load_embedding_store
 
 # Fixtures pour les données de test
 @pytest.fixture
@@ -63,7 +65,8 @@ def test_get_embeddings_openai_model(sample_text_chunks, mock_openai_response):
             input=sample_text_chunks,
             model=model_name
         )
-        assert embeddings == [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+        assert embeddings.dtype == np.float32
+        np.testing.assert_allclose(embeddings, [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], rtol=1e-6)
 
 def test_get_embeddings_sentence_transformer_model(sample_text_chunks, mock_sentence_transformer_model):
     """Teste la génération d'embeddings avec un modèle Sentence Transformer."""
@@ -74,7 +77,8 @@ def test_get_embeddings_sentence_transformer_model(sample_text_chunks, mock_sent
         
         mock_st_constructor.assert_called_once_with(model_name)
         mock_sentence_transformer_model.encode.assert_called_once_with(sample_text_chunks)
-        assert embeddings == [[0.7, 0.8, 0.9], [1.0, 1.1, 1.2]]
+        assert embeddings.dtype == np.float32
+        np.testing.assert_allclose(embeddings, [[0.7, 0.8, 0.9], [1.0, 1.1, 1.2]], rtol=1e-6)
 
 def test_get_embeddings_openai_import_error(sample_text_chunks):
     """Teste ImportError si OpenAI n'est pas installé et qu'un modèle OpenAI est demandé."""
@@ -149,33 +153,35 @@ def sample_embeddings_data():
     return {"model": "test-model", "texts": ["a", "b"], "embeddings": [[0.1], [0.2]]}
 
 def test_save_embeddings_data_success(tmp_path, sample_embeddings_data):
-    """Teste la sauvegarde réussie des données d'embeddings."""
-    output_file = tmp_path / "embeddings_output" / "test_embeddings.json"
-    
-    # Mocker Path.mkdir et open
-    with patch(MKDIR_PATH) as mock_mkdir, \
-         patch(OPEN_BUILTIN_PATH, mock_open()) as mock_file_open:
-        
-        success = save_embeddings_data(sample_embeddings_data, output_file)
-        
-        assert success is True
-        mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
-        mock_file_open.assert_called_once_with(output_file, 'w', encoding='utf-8')
-        
-        # Vérifier que json.dump a été appelé avec les bonnes données
-        # mock_file_open().write est ce que json.dump appelle indirectement.
-        # Pour vérifier le contenu exact, il faudrait inspecter les appels à handle.write()
-        # ou utiliser un mock plus sophistiqué pour json.dump.
-        # Ici, on vérifie au moins que le fichier a été ouvert en écriture.
-        # Pour une vérification plus poussée de json.dump:
-        with patch('json.dump') as mock_json_dump:
-            save_embeddings_data(sample_embeddings_data, output_file) # Appeler à nouveau avec le mock json.dump
-            mock_json_dump.assert_called_once_with(
-                sample_embeddings_data, 
-                mock_file_open(), # Le handle de fichier mocké
-                ensure_ascii=False, 
-                indent=4
-            )
+    """Teste la sauvegarde réussie des données d'embeddings dans le magasin binaire."""
+    output_dir = tmp_path / "embeddings_output" / "test_embeddings"
+
+    success = save_embeddings_data(sample_embeddings_data, output_dir, record_id="source-1")
+
+    assert success is True
+    store = load_embedding_store(output_dir)
+    assert store.ids() == ["source-1"]
+    np.testing.assert_allclose(store.get("source-1"), [[0.1], [0.2]], rtol=1e-6)
+    assert store.get("source-1").dtype == np.float32
+    assert store.metadata("source-1") == {"model": "test-model", "texts": ["a", "b"]}
+
+
+def test_save_embeddings_data_reuses_given_store(tmp_path, sample_embeddings_data):
+    """Teste la réutilisation d'un magasin ouvert : l'index n'est pas relu à chaque sauvegarde."""
+    output_dir = tmp_path / "store"
+    store = EmbeddingStore(output_dir)
+
+    with patch.object(EmbeddingStore, "_load") as mock_load:
+        assert save_embeddings_data(sample_embeddings_data, output_dir, record_id="s1", store=store) is True
+        assert save_embeddings_data(sample_embeddings_data, output_dir, record_id="s2", store=store) is True
+        mock_load.assert_not_called()
+    assert load_embedding_store(output_dir).ids() == ["s1", "s2"]
+
+
+def test_save_embeddings_data_rejects_empty_embeddings(tmp_path):
+    """Teste qu'une liste d'embeddings vide n'écrit pas de magasin invalide."""
+    assert save_embeddings_data({"embeddings": []}, tmp_path / "store") is False
+    assert not (tmp_path / "store" / "store.json").exists()
 
 
 def test_save_embeddings_data_io_error(tmp_path, sample_embeddings_data, caplog):
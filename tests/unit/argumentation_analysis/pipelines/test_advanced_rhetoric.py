@@ -8,7 +8,11 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock, call
 from typing import List, Dict, Any
 
-from argumentation_analysis.pipelines.advanced_rhetoric import run_advanced_rhetoric_pipeline
+from argumentation_analysis.pipelines.advanced_rhetoric import (
+    load_completed_extracts,
+    run_advanced_rhetoric_pipeline,
+    run_advanced_rhetoric_pipeline_parallel,
+)
 
 @pytest.fixture
 def sample_extract_definitions() -> List[Dict[str, Any]]:
@@ -199,4 +203,102 @@ def test_run_advanced_rhetoric_pipeline_empty_extract_definitions(
 
 # Test pour use_real_tools (nécessiterait de mocker les imports des outils réels)
 # Ce test est plus complexe car il dépend de la disponibilité des outils réels.
-# Pour l'instant, on se concentre sur le flux avec les mocks.
\ No newline at end of file
+# Pour l'instant, on se concentre sur le flux avec les mocks.
+
+def _make_extract_definitions(source_count: int, extracts_per_source: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "source_name": f"Source{s}",
+            "extracts": [
+                {"extract_name": f"Ext{s}.{e}", "extract_text": f"Texte de l'extrait {s}.{e}. Donc il faut agir."}
+                for e in range(extracts_per_source)
+            ]
+        }
+        for s in range(source_count)
+    ]
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_run_advanced_rhetoric_pipeline_parallel_streams_jsonl(tmp_path: Path):
+    """Teste le mode parallèle : un résultat par ligne pour chaque extrait."""
+    extract_definitions = _make_extract_definitions(3, 4)
+    output_file = tmp_path / "advanced_results.jsonl"
+
+    counts = run_advanced_rhetoric_pipeline_parallel(
+        extract_definitions, [], output_file, max_workers=2, shard_size=3
+    )
+
+    results = _read_jsonl(output_file)
+    assert counts == {"total": 12, "skipped": 0, "analyzed": 12, "errors": 0}
+    assert sorted((r["source_name"], r["extract_name"]) for r in results) == sorted(
+        (source["source_name"], extract["extract_name"])
+        for source in extract_definitions for extract in source["extracts"]
+    )
+
+
+def test_run_advanced_rhetoric_pipeline_parallel_resumes_partial_output(tmp_path: Path):
+    """Teste la reprise : les extraits terminés sont ignorés, les erreurs et la ligne tronquée sont refaites."""
+    extract_definitions = _make_extract_definitions(2, 3)
+    output_file = tmp_path / "advanced_results.jsonl"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"source_name": "Source0", "extract_name": "Ext0.0", "done": True}) + "\n")
+        f.write(json.dumps({"source_name": "Source0", "extract_name": "Ext0.1", "error": "échec"}) + "\n")
+        f.write('{"source_name": "Source1", "extract_na')
+
+    assert load_completed_extracts(output_file) == {"Source0:Ext0.0"}
+
+    counts = run_advanced_rhetoric_pipeline(
+        extract_definitions, [], output_file, max_workers=2, shard_size=2
+    )
+
+    assert counts is None
+    results = _read_jsonl(output_file)
+    assert len(results) == 6
+    assert results[0] == {"source_name": "Source0", "extract_name": "Ext0.0", "done": True}
+    analyzed = [(r["source_name"], r["extract_name"]) for r in results[1:]]
+    assert sorted(analyzed) == [
+        ("Source0", "Ext0.1"), ("Source0", "Ext0.2"),
+        ("Source1", "Ext1.0"), ("Source1", "Ext1.1"), ("Source1", "Ext1.2"),
+    ]
+    assert load_completed_extracts(output_file) == {
+        "Source0:Ext0.0", "Source0:Ext0.1", "Source0:Ext0.2", "Source1:Ext1.0", "Source1:Ext1.1", "Source1:Ext1.2"
+    }
+
+
+def test_load_completed_extracts_compacts_superseded_lines(tmp_path: Path):
+    """Teste que la reprise ne laisse qu'un résultat par extrait dans le fichier."""
+    output_file = tmp_path / "advanced_results.jsonl"
+    lines = [
+        {"source_name": "Source0", "extract_name": "Ext0.0", "error": "échec"},
+        {"source_name": "Source0", "extract_name": "Ext0.0", "done": True},
+        {"source_name": "Source0", "extract_name": "Ext0.1", "error": "échec"},
+        {"source_name": "Source0", "extract_name": "Ext0.1", "error": "nouvel échec"},
+        {"source_name": "Source0", "extract_name": "Ext0.0", "done": "doublon"},
+    ]
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for line in lines:
+            f.write(json.dumps(line) + "\n")
+
+    assert load_completed_extracts(output_file) == {"Source0:Ext0.0"}
+    assert _read_jsonl(output_file) == [{"source_name": "Source0", "extract_name": "Ext0.0", "done": True}]
+    assert not (tmp_path / "advanced_results.jsonl.tmp").exists()
+
+    # Un fichier déjà compact est laissé tel quel
+    assert load_completed_extracts(output_file) == {"Source0:Ext0.0"}
+    assert len(_read_jsonl(output_file)) == 1
+
+
+@patch("argumentation_analysis.pipelines.advanced_rhetoric.run_advanced_rhetoric_pipeline_parallel")
+def test_run_advanced_rhetoric_pipeline_zero_workers_is_sequential(mock_parallel, tmp_path: Path):
+    """Teste que max_workers=0 analyse les extraits séquentiellement (sortie JSON)."""
+    output_file = tmp_path / "advanced_results.json"
+
+    run_advanced_rhetoric_pipeline(_make_extract_definitions(1, 2), [], output_file, max_workers=0)
+
+    mock_parallel.assert_not_called()
+    with open(output_file, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
@@ -0,0 +1,198 @@
+# tests/unit/argumentation_analysis/pipelines/test_concurrent_sources.py
+"""
+Tests unitaires pour le traitement concurrent et reprenable des sources.
+
+Les récupérations visent un serveur HTTP local qui simule la latence réseau et
+mesure la concurrence effective par hôte.
+"""
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from argumentation_analysis.pipelines.concurrent_sources import (
+    HostConcurrencyLimiter,
+    SourceCheckpointJournal,
+    get_source_host,
+    process_sources_concurrently,
+)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            server.requests.append(self.path)
+        time.sleep(server.latency)
+        with server.lock:
+            server.active -= 1
+        body = f"texte de {self.path}".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    server.requests = []
+    server.latency = 0.05
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def http_fetch(source_info):
+    with urllib.request.urlopen(source_info["url"], timeout=10) as response:
+        return response.read().decode("utf-8")
+
+
+def make_sources(server, count):
+    host, port = server.server_address
+    return [{"id": f"s{i}", "fetch_method": "url", "url": f"http://{host}:{port}/doc/{i}"} for i in range(count)]
+
+
+def test_get_source_host():
+    assert get_source_host({"url": "https://Example.org:8080/a"}) == "example.org:8080"
+    assert get_source_host({"schema": "https:", "host_parts": ["www", "exemple", "fr"], "path": "/x"}) == "www.exemple.fr"
+    assert get_source_host({"fetch_method": "file", "path": "a.txt"}) == "<local>"
+
+
+def test_host_limiter_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        HostConcurrencyLimiter(0)
+
+
+def test_fetches_respect_per_host_limit(stand_in_server):
+    sources = make_sources(stand_in_server, 8)
+
+    stats = process_sources_concurrently(sources, http_fetch, max_workers=8, max_per_host=3)
+
+    assert stats["fetched"] == 8
+    assert stand_in_server.max_active <= 3
+    assert [s["full_text"] for s in sources] == [f"texte de /doc/{i}" for i in range(8)]
+
+
+def test_embeddings_overlap_fetches_on_single_worker(stand_in_server):
+    sources = make_sources(stand_in_server, 6)
+    sources.append({"id": "deja-la", "full_text": "texte existant"})
+    embed_threads = set()
+    embedded = []
+
+    def embed(source_id, source_info):
+        embed_threads.add(threading.current_thread().name)
+        embedded.append(source_id)
+        return True
+
+    stats = process_sources_concurrently(sources, http_fetch, embed, model_name="m", max_workers=6, max_per_host=6)
+
+    assert stats["embedded"] == 7
+    assert embedded[0] == "deja-la"  # Vectorisé pendant que les récupérations sont en cours
+    assert len(embed_threads) == 1
+
+
+def test_fetch_failures_are_counted_not_raised(stand_in_server):
+    sources = make_sources(stand_in_server, 2) + [{"id": "vide", "fetch_method": "url", "url": "http://127.0.0.1:1/none"}]
+
+    def fetch(source_info):
+        if source_info["id"] == "vide":
+            raise ConnectionError("hôte injoignable")
+        return http_fetch(source_info)
+
+    embed = lambda source_id, source_info: source_id != "s1"
+
+    stats = process_sources_concurrently(sources, fetch, embed, model_name="m")
+
+    assert stats["fetched"] == 2
+    assert stats["fetch_errors"] == 1
+    assert stats["embedded"] == 1
+    assert stats["embedding_errors"] == 1
+    assert "full_text" not in sources[2]
+
+
+def test_resume_skips_completed_fetches_and_embeddings(stand_in_server, tmp_path):
+    journal_dir = tmp_path / "checkpoint"
+    embed_calls = []
+
+    def embed(source_id, source_info):
+        embed_calls.append(source_id)
+        return True
+
+    process_sources_concurrently(
+        make_sources(stand_in_server, 4), http_fetch, embed, model_name="m",
+        journal=SourceCheckpointJournal(journal_dir)
+    )
+    assert len(stand_in_server.requests) == 4
+    stand_in_server.requests.clear()
+    embed_calls.clear()
+
+    sources = make_sources(stand_in_server, 5)
+    sources[0]["url"] += "?v=2"  # Définition modifiée : le point de reprise ne s'applique plus
+    stats = process_sources_concurrently(
+        sources, http_fetch, embed, model_name="m", journal=SourceCheckpointJournal(journal_dir)
+    )
+
+    assert sorted(stand_in_server.requests) == ["/doc/0?v=2", "/doc/4"]
+    assert stats["resumed_fetches"] == 3
+    assert stats["resumed_embeddings"] == 3
+    assert sorted(embed_calls) == ["s0", "s4"]
+    assert sources[1]["full_text"] == "texte de /doc/1"
+
+    # Un autre modèle doit recalculer les embeddings, sans nouvelle récupération
+    stand_in_server.requests.clear()
+    stats = process_sources_concurrently(
+        make_sources(stand_in_server, 5)[1:], http_fetch, embed, model_name="autre",
+        journal=SourceCheckpointJournal(journal_dir)
+    )
+    assert stand_in_server.requests == []
+    assert stats["embedded"] == 4
+
+
+def test_resume_requires_embeddings_in_store(stand_in_server, tmp_path):
+    journal = SourceCheckpointJournal(tmp_path)
+    embed = lambda source_id, source_info: True
+    process_sources_concurrently(make_sources(stand_in_server, 2), http_fetch, embed, model_name="m", journal=journal)
+
+    checked = []
+
+    def is_embedding_stored(source_id, text):
+        checked.append((source_id, text))
+        return source_id == "s0"
+
+    sources = make_sources(stand_in_server, 2)
+    stats = process_sources_concurrently(
+        sources, http_fetch, embed, model_name="m",
+        journal=SourceCheckpointJournal(tmp_path), is_embedding_stored=is_embedding_stored
+    )
+    assert stats["resumed_embeddings"] == 1
+    assert stats["embedded"] == 1
+    # Le magasin est interrogé avec le texte de la source, pour détecter un texte modifié
+    assert sorted(checked) == sorted((source["id"], source["full_text"]) for source in sources)
+
+
+def test_journal_tolerates_truncated_line(tmp_path):
+    source = {"id": "a", "url": "http://exemple/a"}
+    journal = SourceCheckpointJournal(tmp_path)
+    journal.record_fetched("a", source, "contenu")
+    with open(journal.journal_path, "a", encoding="utf-8") as journal_file:
+        journal_file.write('{"stage": "embedded", "id": "a"')
+
+    reopened = SourceCheckpointJournal(tmp_path)
+    assert reopened.get_fetched_text("a", source) == "contenu"
+    assert not reopened.is_embedded("a", source, "m", "contenu")
+    reopened.record_embedded("a", source, "m", "contenu")
+    assert SourceCheckpointJournal(tmp_path).is_embedded("a", source, "m", "contenu")
@@ -0,0 +1,95 @@
+# tests/unit/argumentation_analysis/pipelines/test_stage_scheduler.py
+"""
+Tests unitaires pour l'ordonnancement concurrent des étapes de pipeline.
+"""
+import asyncio
+import time
+
+import pytest
+
+from argumentation_analysis.pipelines.stage_scheduler import PipelineStage, StageScheduler
+
+
+def sleeping_stage(delay, value, events=None):
+    async def run(dependencies):
+        if events is not None:
+            events.append(("start", value, dict(dependencies)))
+        await asyncio.sleep(delay)
+        return value
+    return run
+
+
+@pytest.mark.asyncio
+async def test_independent_stages_run_concurrently():
+    scheduler = StageScheduler([
+        PipelineStage("a", sleeping_stage(0.2, "A")),
+        PipelineStage("b", sleeping_stage(0.2, "B")),
+        PipelineStage("c", sleeping_stage(0.2, "C")),
+    ])
+
+    start = time.perf_counter()
+    schedule = await scheduler.run()
+    elapsed = time.perf_counter() - start
+
+    assert schedule["results"] == {"a": "A", "b": "B", "c": "C"}
+    assert elapsed < 0.4
+    assert all(timing["status"] == "success" for timing in schedule["timings"].values())
+
+
+@pytest.mark.asyncio
+async def test_dependent_stage_waits_and_receives_results():
+    events = []
+    scheduler = StageScheduler([
+        PipelineStage("informal", sleeping_stage(0.01, "I", events), depends_on=["orchestration"]),
+        PipelineStage("orchestration", sleeping_stage(0.1, "O", events)),
+        PipelineStage("formal", sleeping_stage(0.01, "F", events)),
+    ])
+
+    schedule = await scheduler.run()
+
+    assert ("start", "I", {"orchestration": "O"}) in events
+    assert events.index(("start", "F", {})) < events.index(("start", "I", {"orchestration": "O"}))
+    assert schedule["timings"]["informal"]["waited_ms"] >= 100
+    assert list(schedule["results"]) == ["informal", "orchestration", "formal"]
+
+
+@pytest.mark.asyncio
+async def test_missing_dependencies_are_ignored():
+    schedule = await StageScheduler([
+        PipelineStage("informal", sleeping_stage(0, "I"), depends_on=["orchestration"]),
+    ]).run()
+
+    assert schedule["results"] == {"informal": "I"}
+    assert schedule["timings"]["informal"]["waited_ms"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_error_use_fallback_and_dependents_still_run():
+    async def failing(_):
+        raise RuntimeError("boom")
+
+    scheduler = StageScheduler([
+        PipelineStage("slow", sleeping_stage(5, "never"), timeout=0.05),
+        PipelineStage("failing", failing, fallback=lambda status, error: {"fallback": status, "error": str(error)}),
+        PipelineStage("after", sleeping_stage(0, "done"), depends_on=["slow", "failing"]),
+    ])
+
+    start = time.perf_counter()
+    schedule = await scheduler.run()
+
+    assert time.perf_counter() - start < 1
+    assert schedule["results"]["slow"]["status"] == "timeout"
+    assert schedule["results"]["failing"] == {"fallback": "error", "error": "boom"}
+    assert schedule["results"]["after"] == "done"
+    assert schedule["timings"]["slow"]["status"] == "timeout"
+    assert schedule["timings"]["failing"]["status"] == "error"
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError):
+        StageScheduler([PipelineStage("a", sleeping_stage(0, 1)), PipelineStage("a", sleeping_stage(0, 2))])
+    with pytest.raises(ValueError):
+        StageScheduler([
+            PipelineStage("a", sleeping_stage(0, 1), depends_on=["b"]),
+            PipelineStage("b", sleeping_stage(0, 2), depends_on=["a"]),
+        ])
@@ -9,7 +9,10 @@ qui est responsable de la gestion du cache de textes.
 """
 
 import pytest
+import hashlib
 import os
+import sqlite3
+import time
 import sys
 import shutil
 from pathlib import Path
@@ -64,8 +67,8 @@ class TestCacheService:
         """Test de génération du chemin de fichier cache."""
         filepath = cache_service.get_cache_filepath(sample_url)
         
-        # Vérifier que le chemin est correct
-        assert filepath.parent == cache_service.cache_dir
+        # Vérifier que le chemin est correct (sous-répertoire du préfixe du hachage)
+        assert filepath.parent == cache_service.cache_dir / filepath.stem[:2]
         assert filepath.suffix == ".txt"
         
         # Vérifier que le nom du fichier est un hash SHA-256
@@ -241,4 +244,106 @@ class TestCacheService:
         
         for size_bytes, expected in sizes.items():
             formatted = cache_service._format_size(size_bytes)
-            assert formatted == expected
\ No newline at end of file
+            assert formatted == expected
+
+class TestCacheServiceIndex:
+    """Tests pour l'index, l'éviction et le niveau mémoire du cache."""
+
+    def test_size_is_tracked_without_scanning(self, temp_cache_dir):
+        """La taille est maintenue par l'index et persiste entre deux instances."""
+        cache = CacheService(temp_cache_dir)
+        cache.save_to_cache("https://example.com/a", "aaaa")
+        cache.save_to_cache("https://example.com/b", "bb")
+        cache.save_to_cache("https://example.com/a", "a")  # Remplacement
+
+        with patch('pathlib.Path.glob') as mock_glob, patch('pathlib.Path.stat') as mock_stat:
+            assert cache.get_cache_size() == (2, 3)
+        mock_glob.assert_not_called()
+        mock_stat.assert_not_called()
+
+        cache.close()
+        assert CacheService(temp_cache_dir).get_cache_size() == (2, 3)
+
+    def test_lru_eviction_under_byte_budget(self, temp_cache_dir):
+        """Les entrées les moins récemment utilisées sont évincées au-delà du budget."""
+        cache = CacheService(temp_cache_dir, max_bytes=25)
+        for name in ("a", "b"):
+            cache.save_to_cache(f"https://example.com/{name}", name * 10)
+            time.sleep(0.01)
+        # "a" est rafraîchi : "b" devient le moins récemment utilisé
+        assert cache.load_from_cache("https://example.com/a") == "a" * 10
+        time.sleep(0.01)
+        cache.save_to_cache("https://example.com/c", "c" * 10)
+
+        assert cache.get_cache_size() == (2, 20)
+        assert cache.load_from_cache("https://example.com/b") is None
+        assert not cache.get_cache_filepath("https://example.com/b").exists()
+        assert cache.load_from_cache("https://example.com/c") == "c" * 10
+
+    def test_ttl_expiry(self, temp_cache_dir, sample_url, sample_text):
+        """Une entrée expirée est traitée comme absente et supprimée."""
+        cache = CacheService(temp_cache_dir, ttl_seconds=60)
+        cache.save_to_cache(sample_url, sample_text)
+        cache.save_to_cache("https://example.com/autre", sample_text)
+        assert cache.has_entry(sample_url)
+
+        with patch('argumentation_analysis.services.cache_service.time.time', return_value=time.time() + 120):
+            assert not cache.has_entry(sample_url)
+            assert cache.load_from_cache(sample_url) is None
+            assert cache.evict_expired() == 1
+
+        assert cache.get_cache_size() == (0, 0)
+
+    def test_memory_tier_serves_hot_entries(self, temp_cache_dir, sample_url, sample_text):
+        """Le niveau mémoire évite la lecture disque des entrées récentes."""
+        cache = CacheService(temp_cache_dir, memory_cache_bytes=1024)
+        cache.save_to_cache(sample_url, sample_text)
+
+        with patch('pathlib.Path.read_text', side_effect=AssertionError("lecture disque inattendue")):
+            assert cache.load_from_cache(sample_url) == sample_text
+
+        cache.clear_cache(sample_url)
+        assert cache.load_from_cache(sample_url) is None
+
+    def test_memory_hits_update_last_access_in_batches(self, temp_cache_dir, sample_url, sample_text):
+        """Les accès servis par le niveau mémoire ne sont écrits dans l'index qu'à la fermeture ou par lots."""
+        cache = CacheService(temp_cache_dir, memory_cache_bytes=1024)
+        cache.save_to_cache(sample_url, sample_text)
+        index_path = temp_cache_dir / "cache_index.sqlite3"
+
+        def stored_last_access():
+            with sqlite3.connect(str(index_path)) as connection:
+                return connection.execute("SELECT last_access FROM entries").fetchone()[0]
+
+        saved_at = stored_last_access()
+        time.sleep(0.01)
+        for _ in range(10):
+            assert cache.load_from_cache(sample_url) == sample_text
+        assert stored_last_access() == saved_at
+
+        cache.close()
+        assert stored_last_access() > saved_at
+
+    def test_lru_eviction_accounts_for_memory_hits(self, temp_cache_dir):
+        """L'éviction tient compte des accès servis par le niveau mémoire."""
+        cache = CacheService(temp_cache_dir, max_bytes=25, memory_cache_bytes=1024)
+        for name in ("a", "b"):
+            cache.save_to_cache(f"https://example.com/{name}", name * 10)
+            time.sleep(0.01)
+        assert cache.load_from_cache("https://example.com/a") == "a" * 10
+        time.sleep(0.01)
+        cache.save_to_cache("https://example.com/c", "c" * 10)
+
+        assert cache.load_from_cache("https://example.com/b") is None
+        assert cache.load_from_cache("https://example.com/a") == "a" * 10
+
+    def test_flat_legacy_files_are_indexed_and_migrated(self, temp_cache_dir, sample_url, sample_text):
+        """Un cache à plat existant est indexé puis migré au premier accès."""
+        legacy_path = temp_cache_dir / f"{hashlib.sha256(sample_url.encode()).hexdigest()}.txt"
+        legacy_path.write_text(sample_text, encoding='utf-8')
+
+        cache = CacheService(temp_cache_dir)
+        assert cache.get_cache_size() == (1, len(sample_text.encode('utf-8')))
+        assert cache.load_from_cache(sample_url) == sample_text
+        assert not legacy_path.exists()
+        assert cache.get_cache_filepath(sample_url).exists()
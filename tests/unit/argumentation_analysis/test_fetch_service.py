@@ -8,11 +8,14 @@ Ce module contient les tests unitaires pour le service de récupération (FetchS
 qui est responsable de la récupération de texte à partir d'URLs.
 """
 
+import asyncio
 import pytest
 import hashlib
 import os
 import sys
 import shutil
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 
@@ -90,11 +93,20 @@ def sample_source_info():
 class MockResponse:
     """Classe pour simuler une réponse HTTP."""
     
-    def __init__(self, text, content=None, status_code=200, raise_for_status=None):
+    def __init__(self, text, content=None, status_code=200, raise_for_status=None, headers=None):
         self.text = text
         self.content = content if content is not None else text.encode('utf-8')
         self.status_code = status_code
         self.raise_for_status = raise_for_status or (lambda: None)
+        self.headers = headers or {}
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
 
 
 class TestFetchService:
@@ -135,7 +147,7 @@ class TestFetchService:
         assert fetch_service.reconstruct_url("", [], "") is None
         assert fetch_service.reconstruct_url(None, None, None) is None
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_from_cache(self, mock_get, fetch_service, sample_source_info, sample_text):
         """Test de récupération de texte depuis le cache."""
         # Sauvegarder dans le cache
@@ -152,7 +164,7 @@ class TestFetchService:
         # Vérifier que requests.get n'a pas été appelé
         mock_get.assert_not_called()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_force_refresh(self, mock_get, fetch_service, sample_source_info, sample_text):
         """Test de récupération de texte avec force_refresh."""
         # Sauvegarder dans le cache
@@ -172,7 +184,7 @@ class TestFetchService:
         # Vérifier que requests.get a été appelé
         mock_get.assert_called_once()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_invalid_url(self, mock_get, fetch_service):
         """Test de récupération de texte avec une URL invalide."""
         # Source avec URL invalide
@@ -193,7 +205,7 @@ class TestFetchService:
         # Vérifier que requests.get n'a pas été appelé
         mock_get.assert_not_called()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_jina(self, mock_get, fetch_service, sample_source_info, sample_text):
         """Test de récupération de texte via Jina."""
         # Modifier le type de source
@@ -211,7 +223,7 @@ class TestFetchService:
         assert text == sample_text
         mock_fetch_jina.assert_called_once()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_tika(self, mock_get, fetch_service, sample_source_info, sample_text):
         """Test de récupération de texte via Tika."""
         # Modifier le type de source
@@ -230,7 +242,7 @@ class TestFetchService:
         assert text == sample_text
         mock_fetch_tika.assert_called_once()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_tika_plaintext(self, mock_get, fetch_service, sample_source_info, sample_text):
         """Test de récupération de texte via Tika pour un fichier texte."""
         # Modifier le type de source
@@ -249,7 +261,7 @@ class TestFetchService:
         assert text == sample_text
         mock_fetch_direct.assert_called_once()
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_text_exception(self, mock_get, fetch_service, sample_source_info):
         """Test de récupération de texte avec une exception."""
         # Simuler une exception
@@ -262,7 +274,7 @@ class TestFetchService:
         assert text is None
         assert "Erreur" in message
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_direct_text(self, mock_get, fetch_service, sample_url, sample_text):
         """Test de récupération directe de texte."""
         # Simuler une réponse HTTP
@@ -285,7 +297,7 @@ class TestFetchService:
         cached_text = fetch_service.cache_service.load_from_cache(sample_url)
         assert cached_text == sample_text
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_direct_text_error(self, mock_get, fetch_service, sample_url):
         """Test de récupération directe de texte avec une erreur."""
         # Simuler une erreur HTTP
@@ -297,7 +309,7 @@ class TestFetchService:
         # Vérifier que la récupération a échoué
         assert text is None
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_with_jina(self, mock_get, fetch_service, sample_url, sample_text):
         """Test de récupération de texte via Jina."""
         # Simuler une réponse HTTP
@@ -321,7 +333,7 @@ class TestFetchService:
         cached_text = fetch_service.cache_service.load_from_cache(sample_url)
         assert cached_text == sample_text
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_with_jina_no_marker(self, mock_get, fetch_service, sample_url, sample_text):
         """Test de récupération de texte via Jina sans marqueur."""
         # Simuler une réponse HTTP sans marqueur
@@ -333,7 +345,7 @@ class TestFetchService:
         # Vérifier que le texte est récupéré
         assert text == sample_text
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_with_jina_error(self, mock_get, fetch_service, sample_url):
         """Test de récupération de texte via Jina avec une erreur."""
         # Simuler une erreur HTTP
@@ -345,8 +357,8 @@ class TestFetchService:
         # Vérifier que la récupération a échoué
         assert text is None
 
-    @patch('requests.put')
-    @patch('requests.get')
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
     def test_fetch_with_tika_url(self, mock_get, mock_put, fetch_service, sample_url, sample_text):
         """Test de récupération de texte via Tika avec une URL."""
         # Simuler une réponse HTTP pour le téléchargement
@@ -381,7 +393,7 @@ class TestFetchService:
         file_name = "test.pdf"
         
         # Simuler une réponse HTTP pour Tika
-        with patch('requests.put', return_value=MockResponse(sample_text)) as mock_put:
+        with patch('requests.Session.put', return_value=MockResponse(sample_text)) as mock_put:
             # Récupérer le texte
             text = fetch_service.fetch_with_tika(
                 file_content=file_content,
@@ -414,8 +426,8 @@ class TestFetchService:
         # Vérifier que le texte est récupéré directement
         assert text == sample_text
 
-    @patch('requests.put')
-    @patch('requests.get')
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
     def test_fetch_with_tika_timeout(self, mock_get, mock_put, fetch_service, sample_url):
         """Test de récupération de texte via Tika avec un timeout."""
         # Simuler une réponse HTTP pour le téléchargement
@@ -433,8 +445,8 @@ class TestFetchService:
         # Vérifier que la récupération a échoué
         assert text is None
 
-    @patch('requests.put')
-    @patch('requests.get')
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
     def test_fetch_with_tika_error(self, mock_get, mock_put, fetch_service, sample_url):
         """Test de récupération de texte via Tika avec une erreur."""
         # Simuler une réponse HTTP pour le téléchargement
@@ -460,7 +472,7 @@ class TestFetchService:
         # Vérifier que la récupération a échoué
         assert text is None
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_fetch_with_tika_download_error(self, mock_get, fetch_service, sample_url):
         """Test de récupération de texte via Tika avec une erreur de téléchargement."""
         # Simuler une erreur de téléchargement
@@ -473,20 +485,22 @@ class TestFetchService:
         assert text is None
 
     @patch('pathlib.Path.read_bytes')
-    @patch('requests.put')
-    @patch('requests.get')
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
     def test_fetch_with_tika_raw_cache(self, mock_get, mock_put, mock_read_bytes, fetch_service, sample_url, sample_text, temp_download_dir):
-        """Test de récupération de texte via Tika avec cache brut."""
+        """Test de récupération de texte via Tika avec cache brut (envoyé en flux depuis le fichier)."""
         # Créer un fichier de cache brut
         url_hash = hashlib.sha256(sample_url.encode()).hexdigest()
         raw_cache_path = temp_download_dir / f"{url_hash}.download"
         raw_cache_path.write_bytes(b"cached binary content")
         
-        # Simuler la lecture du fichier de cache
-        mock_read_bytes.return_value = b"cached binary content"
-        
-        # Simuler une réponse HTTP pour Tika
-        mock_put.return_value = MockResponse(sample_text)
+        # Simuler une réponse HTTP pour Tika, en vérifiant que le fichier est transmis ouvert
+        sent = {}
+        def tika_put(url, data=None, **kwargs):
+            sent["name"] = data.name
+            sent["content"] = data.read()
+            return MockResponse(sample_text)
+        mock_put.side_effect = tika_put
         
         # Récupérer le texte
         text = fetch_service.fetch_with_tika(url=sample_url)
@@ -497,22 +511,21 @@ class TestFetchService:
         # Vérifier que requests.get n'a pas été appelé (utilisation du cache)
         mock_get.assert_not_called()
         
-        # Vérifier que requests.put a été appelé pour Tika
+        # Vérifier que requests.put a été appelé pour Tika, avec le fichier en cache et sans lecture complète en mémoire
         mock_put.assert_called_once()
-
-    @patch('pathlib.Path.read_bytes')
-    @patch('requests.put')
-    @patch('requests.get')
-    def test_fetch_with_tika_raw_cache_error(self, mock_get, mock_put, mock_read_bytes, fetch_service, sample_url, sample_text, temp_download_dir):
-        """Test de récupération de texte via Tika avec erreur de lecture du cache brut."""
+        assert sent == {"name": str(raw_cache_path), "content": b"cached binary content"}
+        mock_read_bytes.assert_not_called()
+
+    @patch('argumentation_analysis.services.fetch_service.os.access', return_value=False)
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
+    def test_fetch_with_tika_raw_cache_error(self, mock_get, mock_put, mock_access, fetch_service, sample_url, sample_text, temp_download_dir):
+        """Test de récupération de texte via Tika avec un cache brut illisible."""
         # Créer un fichier de cache brut
         url_hash = hashlib.sha256(sample_url.encode()).hexdigest()
         raw_cache_path = temp_download_dir / f"{url_hash}.download"
         raw_cache_path.write_bytes(b"cached binary content")
         
-        # Simuler une erreur de lecture du fichier de cache
-        mock_read_bytes.side_effect = Exception("Erreur de lecture")
-        
         # Simuler une réponse HTTP pour le téléchargement
         mock_get.return_value = MockResponse(
             text="binary content",
@@ -529,4 +542,109 @@ class TestFetchService:
         assert text == sample_text
         
         # Vérifier que requests.get a été appelé pour le téléchargement
-        mock_get.assert_called_once()
\ No newline at end of file
+        mock_get.assert_called_once()
+
+class TestFetchServiceHttp:
+    """Tests pour la session partagée, les requêtes conditionnelles et `fetch_many`."""
+
+    def test_session_pools_connections(self, cache_service):
+        """Le service possède une session dont le pool est configurable."""
+        with FetchService(cache_service=cache_service, pool_connections=3, pool_maxsize=16) as service:
+            adapter = service.session.get_adapter("https://example.com")
+            assert adapter._pool_connections == 3
+            assert adapter._pool_maxsize == 16
+            assert service.session.headers['User-Agent'] == 'ArgumentAnalysisApp/1.0'
+
+    @patch('requests.Session.get')
+    def test_validators_saved_and_revalidated(self, mock_get, fetch_service, sample_source_info, sample_text):
+        """Une entrée revalidée par une réponse 304 est servie depuis le cache."""
+        url = "https//example.com/test"
+        mock_get.return_value = MockResponse(sample_text, headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'})
+        assert fetch_service.fetch_text(sample_source_info) == (sample_text, url)
+        assert fetch_service.cache_service.load_cache_metadata(url) == {
+            'etag': '"v1"', 'last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        }
+
+        # Sans revalidation, le cache est servi sans requête
+        mock_get.reset_mock()
+        assert fetch_service.fetch_text(sample_source_info) == (sample_text, url)
+        mock_get.assert_not_called()
+
+        mock_get.return_value = MockResponse("", status_code=304)
+        text, _ = fetch_service.fetch_text(sample_source_info, revalidate=True)
+
+        assert text == sample_text
+        sent_headers = mock_get.call_args.kwargs['headers']
+        assert sent_headers['If-None-Match'] == '"v1"'
+        assert sent_headers['If-Modified-Since'] == 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+    @patch('requests.Session.get')
+    def test_revalidation_updates_modified_content(self, mock_get, fetch_service, sample_source_info):
+        """Une réponse 200 à une requête conditionnelle remplace l'entrée de cache."""
+        url = "https//example.com/test"
+        fetch_service.cache_service.save_to_cache(url, "ancien")
+        fetch_service.cache_service.save_cache_metadata(url, {'etag': '"v1"'})
+        mock_get.return_value = MockResponse("nouveau", headers={'ETag': '"v2"'})
+
+        text, _ = fetch_service.fetch_text(sample_source_info, revalidate=True)
+
+        assert text == "nouveau"
+        assert fetch_service.cache_service.load_from_cache(url) == "nouveau"
+        assert fetch_service.cache_service.load_cache_metadata(url) == {'etag': '"v2"'}
+
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
+    def test_fetch_with_tika_streams_to_raw_cache(self, mock_get, mock_put, fetch_service, sample_url, sample_text, temp_download_dir):
+        """Le document est écrit par blocs dans le cache brut puis envoyé à Tika depuis le fichier."""
+        document = b"%PDF" + b"x" * 5000
+        download = MockResponse(text="", content=document, headers={'ETag': '"doc"'})
+        mock_get.return_value = download
+        mock_put.return_value = MockResponse(sample_text)
+
+        with patch('argumentation_analysis.services.fetch_service.DOWNLOAD_CHUNK_SIZE', 1024):
+            text = fetch_service.fetch_with_tika(url=sample_url)
+
+        assert text == sample_text
+        assert mock_get.call_args.kwargs['stream'] is True
+        assert download.closed
+        raw_path = temp_download_dir / f"{hashlib.sha256(sample_url.encode()).hexdigest()}.download"
+        assert raw_path.read_bytes() == document
+        assert hasattr(mock_put.call_args.kwargs['data'], 'read')  # Envoi en flux depuis le fichier
+        assert fetch_service.cache_service.load_cache_metadata(sample_url) == {'etag': '"doc"'}
+
+    @patch('requests.Session.put')
+    @patch('requests.Session.get')
+    def test_fetch_with_tika_not_modified_skips_extraction(self, mock_get, mock_put, fetch_service, sample_url, sample_text):
+        """Un document inchangé (304) n'est ni retéléchargé ni renvoyé à Tika."""
+        fetch_service.cache_service.save_to_cache(sample_url, sample_text)
+        fetch_service.cache_service.save_cache_metadata(sample_url, {'etag': '"doc"'})
+        mock_get.return_value = MockResponse("", status_code=304)
+
+        assert fetch_service.fetch_with_tika(url=sample_url, conditional=True) == sample_text
+        assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"doc"'}
+        mock_put.assert_not_called()
+
+    def test_fetch_many_bounds_concurrency_and_preserves_order(self, fetch_service):
+        """`fetch_many` respecte la limite de parallélisme et l'ordre des sources."""
+        lock = threading.Lock()
+        state = {"active": 0, "max_active": 0}
+
+        def fake_fetch_text(source_info, force_refresh=False, revalidate=False):
+            with lock:
+                state["active"] += 1
+                state["max_active"] = max(state["max_active"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return f"texte {source_info['path']}", source_info['path']
+
+        sources = [{"path": f"/doc{i}"} for i in range(10)]
+        with patch.object(fetch_service, 'fetch_text', side_effect=fake_fetch_text):
+            results = asyncio.run(fetch_service.fetch_many(sources, max_concurrency=3))
+
+        assert [text for text, _ in results] == [f"texte /doc{i}" for i in range(10)]
+        assert state["max_active"] <= 3
+
+    def test_fetch_many_rejects_invalid_concurrency(self, fetch_service):
+        with pytest.raises(ValueError):
+            asyncio.run(fetch_service.fetch_many([], max_concurrency=0))
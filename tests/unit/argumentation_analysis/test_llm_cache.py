@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tests unitaires pour le cache local des réponses LLM (LLMResponseCache).
+"""
+
+import json
+import sqlite3
+import time
+
+import pytest
+
+from argumentation_analysis.core.llm_cache import (
+    ACCESS_FLUSH_BATCH_SIZE, INDEX_FILENAME, LLMResponseCache, make_request_key, normalize_request
+)
+
+
+def make_body(content="Analyse cet extrait.", **overrides):
+    payload = {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "system", "content": "Tu es un analyste."}, {"role": "user", "content": content}],
+        "temperature": 0.0,
+    }
+    payload.update(overrides)
+    return json.dumps(payload).encode("utf-8")
+
+
+@pytest.fixture
+def llm_cache(tmp_path):
+    """Fixture pour un cache de réponses LLM temporaire."""
+    cache = LLMResponseCache(tmp_path / "llm_cache")
+    yield cache
+    cache.close()
+
+
+def test_key_ignores_whitespace_and_irrelevant_fields():
+    url = "api.openai.com/v1/chat/completions"
+    key = make_request_key(url, make_body())
+
+    assert make_request_key(url, make_body("  Analyse   cet\nextrait. ", user="agent-1")) == key
+    assert make_request_key(url, make_body(temperature=0)) == key
+    assert make_request_key(url, make_body(temperature=0.7)) != key
+    assert make_request_key(url, make_body(tools=[{"type": "function", "function": {"name": "f"}}])) != key
+    assert make_request_key("autre.example.com/v1/chat/completions", make_body()) != key
+
+
+def test_streaming_and_non_json_requests_are_not_cacheable():
+    url = "api.openai.com/v1/chat/completions"
+    assert make_request_key(url, make_body(stream=True)) is None
+    assert make_request_key(url, b"pas du json") is None
+
+
+def test_normalize_request_handles_content_parts():
+    normalized = normalize_request({
+        "messages": [{"role": "user", "content": [{"type": "text", "text": " a  b "}, {"type": "image_url"}]}]
+    })
+    assert normalized["messages"][0]["content"] == [{"type": "text", "text": "a b"}, {"type": "image_url"}]
+
+
+def test_put_and_get_round_trip(llm_cache):
+    llm_cache.put("k1", 200, [["content-type", "application/json"]], b'{"id": "1"}', model="gpt-4o-mini")
+
+    cached = llm_cache.get("k1")
+
+    assert cached.status_code == 200
+    assert cached.headers == [["content-type", "application/json"]]
+    assert cached.body == b'{"id": "1"}'
+    assert llm_cache.get("absente") is None
+    assert llm_cache.get_stats()["hits"] == 1
+    assert llm_cache.get_stats()["misses"] == 1
+
+
+def test_entries_persist_across_instances(tmp_path):
+    cache = LLMResponseCache(tmp_path / "persist")
+    cache.put("k1", 200, [], b"reponse")
+    cache.close()
+
+    reopened = LLMResponseCache(tmp_path / "persist", mode="replay")
+    assert reopened.get("k1").body == b"reponse"
+    assert reopened.get("k2") is None
+    assert reopened.get_stats()["replay_misses"] == 1
+    assert reopened.get_stats()["entries"] == 1
+    reopened.close()
+
+
+def test_ttl_expires_entries(tmp_path):
+    cache = LLMResponseCache(tmp_path / "ttl", ttl_seconds=0.05)
+    cache.put("k1", 200, [], b"a")
+    cache.put("k2", 200, [], b"b")
+    time.sleep(0.1)
+
+    assert cache.get("k1") is None
+    assert cache.evict_expired() == 1
+    assert cache.get_stats()["entries"] == 0
+    cache.close()
+
+
+def test_byte_budget_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path / "budget", max_bytes=25)
+    cache.put("k1", 200, [], b"x" * 10)
+    cache.put("k2", 200, [], b"y" * 10)
+    cache.get("k1")
+    cache.put("k3", 200, [], b"z" * 10)
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None
+    assert cache.get_stats()["total_bytes"] == 20
+    assert cache.get_stats()["evictions"] == 1
+    cache.close()
+
+
+def test_access_times_are_written_in_batches(tmp_path):
+    cache = LLMResponseCache(tmp_path / "access")
+    cache.put("k1", 200, [], b"a")
+    index = sqlite3.connect(str(tmp_path / "access" / INDEX_FILENAME))
+    stored_access = index.execute("SELECT last_access FROM responses WHERE key = 'k1'").fetchone()[0]
+
+    cache.get("k1")
+    assert index.execute("SELECT last_access FROM responses WHERE key = 'k1'").fetchone()[0] == stored_access
+
+    for i in range(ACCESS_FLUSH_BATCH_SIZE - 1):
+        cache.put(f"n{i}", 200, [], b"b")
+        cache.get(f"n{i}")
+    assert index.execute("SELECT last_access FROM responses WHERE key = 'k1'").fetchone()[0] > stored_access
+    cache.close()
+    index.close()
+
+
+def test_close_flushes_pending_access_times(tmp_path):
+    cache = LLMResponseCache(tmp_path / "close")
+    cache.put("k1", 200, [], b"a")
+    time.sleep(0.01)
+    cache.get("k1")
+    cache.close()
+
+    index = sqlite3.connect(str(tmp_path / "close" / INDEX_FILENAME))
+    created_at, last_access = index.execute("SELECT created_at, last_access FROM responses").fetchone()
+    index.close()
+    assert last_access > created_at
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LLMResponseCache(tmp_path / "mode", mode="inconnu")
+
+
+def test_from_env_is_disabled_by_default(monkeypatch, tmp_path):
+    monkeypatch.delenv("LLM_CACHE_MODE", raising=False)
+    assert LLMResponseCache.from_env() is None
+
+    monkeypatch.setenv("LLM_CACHE_MODE", "replay")
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path / "env"))
+    cache = LLMResponseCache.from_env()
+    assert cache.replay
+    cache.close()
@@ -3,13 +3,29 @@
 Tests unitaires pour le module llm_service.
 """
 
+import asyncio
+import tempfile
+import threading
 import unittest
 from unittest.mock import patch, MagicMock
 import os
+import httpx
 import semantic_kernel as sk
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatCompletion
-from argumentation_analysis.core.llm_service import create_llm_service
-from openai import AsyncOpenAI
+from argumentation_analysis.core.llm_service import (
+    create_llm_service, get_llm_service_registry, LLMServiceRegistry, LoggingHttpTransport, CachingHttpTransport
+)
+from argumentation_analysis.core.llm_cache import LLMResponseCache
+from openai import AsyncAzureOpenAI, AsyncOpenAI
+
+# Configuration OpenAI standard des tests, indépendante de tout fichier .env local
+OPENAI_TEST_ENV = {"OPENAI_API_KEY": "sk-test", "OPENAI_CHAT_MODEL_ID": "gpt-4o-mini"}
+
+
+def with_openai_test_env(test):
+    """Exécute un test avec OPENAI_TEST_ENV pour seul environnement, sans charger de .env."""
+    test = patch.dict(os.environ, OPENAI_TEST_ENV, clear=True)(test)
+    return patch('argumentation_analysis.core.llm_service._ensure_environment_loaded', lambda *args, **kwargs: None)(test)
 
 
 class TestLLMService(unittest.TestCase):
@@ -28,12 +44,16 @@ class TestLLMService(unittest.TestCase):
         # Stocker la clé API pour les assertions
         self.api_key = os.environ.get("OPENAI_API_KEY", "")
         self.model_id = os.environ.get("OPENAI_CHAT_MODEL_ID", "gpt-4o-mini")
+        
+        # Les services sont partagés par processus : repartir d'un registre vide
+        get_llm_service_registry().clear()
 
     def tearDown(self):
         """Nettoyage après chaque test."""
         # Restaurer les variables d'environnement originales
         os.environ.clear()
         os.environ.update(self.original_env)
+        get_llm_service_registry().clear()
 
     @patch('argumentation_analysis.core.llm_service.OpenAIChatCompletion')
     def test_create_llm_service_openai(self, mock_openai_class):
@@ -143,13 +163,187 @@ class TestLLMService(unittest.TestCase):
         
         # Vérifier que le service a été créé correctement
         self.assertIsNotNone(service)
-        mock_azure_class.assert_called_once_with(
-            service_id="global_llm_service",
-            deployment_name="gpt-4o-mini",
-            endpoint="https://example.azure.com",
-            api_key=self.api_key
+        mock_azure_class.assert_called_once()
+        kwargs = mock_azure_class.call_args.kwargs
+        self.assertEqual(kwargs["service_id"], "global_llm_service")
+        self.assertEqual(kwargs["deployment_name"], "gpt-4o-mini")
+        self.assertEqual(kwargs["endpoint"], "https://example.azure.com")
+        self.assertEqual(kwargs["api_key"], self.api_key)
+        
+        # Le client Azure est adossé au client httpx partagé de l'endpoint
+        self.assertIsInstance(kwargs["async_client"], AsyncAzureOpenAI)
+        self.assertIs(
+            kwargs["async_client"]._client,
+            get_llm_service_registry().get_http_client("https://example.azure.com")
         )
 
 
+    @with_openai_test_env
+    @patch('argumentation_analysis.core.llm_service.OpenAIChatCompletion')
+    def test_create_llm_service_reuses_registered_service(self, mock_openai_class):
+        """Teste que les appels répétés partagent le service et le client HTTP."""
+        mock_openai_class.side_effect = lambda **kwargs: MagicMock(spec=OpenAIChatCompletion)
+        
+        first = create_llm_service()
+        second = create_llm_service()
+        other = create_llm_service(service_id="other_service")
+        
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(mock_openai_class.call_count, 2)
+        clients = [call.kwargs["async_client"] for call in mock_openai_class.call_args_list]
+        self.assertIs(clients[0], clients[1])
+        self.assertEqual(get_llm_service_registry().get_stats()["services"], 2)
+
+    @with_openai_test_env
+    @patch('argumentation_analysis.core.llm_service.OpenAIChatCompletion')
+    def test_api_key_change_recreates_registered_service(self, mock_openai_class):
+        """Teste qu'un changement de clé d'API ne réutilise pas le service enregistré."""
+        mock_openai_class.side_effect = lambda **kwargs: MagicMock(spec=OpenAIChatCompletion)
+        
+        os.environ["OPENAI_API_KEY"] = "sk-ancienne-cle"
+        first = create_llm_service()
+        os.environ["OPENAI_API_KEY"] = "sk-nouvelle-cle"
+        second = create_llm_service()
+        
+        self.assertIsNot(first, second)
+        self.assertIs(create_llm_service(), second)
+        self.assertEqual(mock_openai_class.call_args.kwargs["async_client"].api_key, "sk-nouvelle-cle")
+        self.assertEqual(get_llm_service_registry().get_stats()["services"], 1)
+
+    @with_openai_test_env
+    @patch('argumentation_analysis.core.llm_service.OpenAIChatCompletion')
+    def test_failed_creation_is_not_registered(self, mock_openai_class):
+        """Teste qu'un échec de création n'est pas mis en cache."""
+        mock_openai_class.side_effect = [Exception("Test exception"), MagicMock(spec=OpenAIChatCompletion)]
+        
+        with self.assertRaises(RuntimeError):
+            create_llm_service()
+        
+        self.assertIsNotNone(create_llm_service())
+        self.assertEqual(mock_openai_class.call_count, 2)
+
+
+class TestLLMServiceRegistry(unittest.TestCase):
+    """Tests pour le registre des services LLM et son transport instrumenté."""
+
+    def test_http_client_is_shared_per_endpoint(self):
+        """Teste qu'un seul client HTTP est créé par endpoint."""
+        registry = LLMServiceRegistry(max_connections=4, max_keepalive_connections=2, http2=False)
+        
+        client = registry.get_http_client("https://api.example.com/v1")
+        
+        self.assertIs(registry.get_http_client("https://api.example.com/v1"), client)
+        self.assertIsNot(registry.get_http_client("https://autre.example.com/v1"), client)
+        self.assertEqual(registry.limits.max_connections, 4)
+        self.assertFalse(registry.http2)
+        asyncio.run(registry.aclose())
+        self.assertEqual(registry.get_stats()["endpoints"], {})
+
+    def test_transport_counts_requests_without_reading_bodies(self):
+        """Teste les compteurs du transport instrumenté."""
+        def handler(request):
+            if request.url.path == "/error":
+                raise httpx.ConnectError("refusé", request=request)
+            return httpx.Response(200 if request.url.path == "/ok" else 429, json={"ok": True})
+        
+        transport = LoggingHttpTransport(logger=MagicMock(), wrapped_transport=httpx.MockTransport(handler))
+        
+        async def run_requests():
+            async with httpx.AsyncClient(transport=transport, base_url="https://api.example.com") as client:
+                await client.post("/ok", json={"prompt": "texte"})
+                await client.post("/ok", json={"prompt": "texte"})
+                await client.post("/limit", json={"prompt": "texte"})
+                with self.assertRaises(httpx.ConnectError):
+                    await client.post("/error", json={"prompt": "texte"})
+        
+        asyncio.run(run_requests())
+        stats = transport.get_stats()
+        
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["by_status"], {200: 2, 429: 1})
+        transport.logger.info.assert_not_called()
+
+    def test_caching_transport_serves_and_replays_chat_completions(self):
+        """Teste le cache des complétions de chat et le mode de rejeu sans réseau."""
+        network_calls = []
+        
+        def handler(request):
+            network_calls.append(request.url.path)
+            return httpx.Response(200, json={"model": "gpt-4o-mini", "choices": []})
+        
+        cache_dir = tempfile.mkdtemp()
+        cache = LLMResponseCache(cache_dir)
+        network = LoggingHttpTransport(logger=MagicMock(), wrapped_transport=httpx.MockTransport(handler))
+        
+        def chat(client, content):
+            return client.post("/v1/chat/completions", json={
+                "model": "gpt-4o-mini", "messages": [{"role": "user", "content": content}], "temperature": 0
+            })
+        
+        async def run_requests(transport):
+            async with httpx.AsyncClient(transport=transport, base_url="https://api.example.com") as client:
+                first = await chat(client, "Analyse cet extrait.")
+                second = await chat(client, "Analyse  cet extrait. ")
+                other = await chat(client, "Autre extrait.")
+                await client.get("/v1/models")
+                return first, second, other
+        
+        first, second, _ = asyncio.run(run_requests(CachingHttpTransport(cache, network)))
+        
+        self.assertEqual(first.headers["x-llm-cache"], "miss")
+        self.assertEqual(second.headers["x-llm-cache"], "hit")
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(network_calls, ["/v1/chat/completions", "/v1/chat/completions", "/v1/models"])
+        cache.close()
+        
+        # Rejeu : les requêtes enregistrées sont servies localement, les autres échouent sans réseau
+        network_calls.clear()
+        replay_cache = LLMResponseCache(cache_dir, mode="replay")
+        
+        async def replay():
+            async with httpx.AsyncClient(transport=CachingHttpTransport(replay_cache, network),
+                                         base_url="https://api.example.com") as client:
+                return await chat(client, "Analyse cet extrait."), await chat(client, "Jamais vu.")
+        
+        hit, miss = asyncio.run(replay())
+        
+        self.assertEqual(hit.status_code, 200)
+        self.assertEqual(miss.status_code, 404)
+        self.assertEqual(miss.headers["x-llm-cache"], "replay-miss")
+        self.assertEqual(network_calls, [])
+        replay_cache.close()
+
+    def test_caching_transport_accesses_index_outside_event_loop(self):
+        """Teste que les lectures et écritures du cache ne s'exécutent pas dans la boucle d'événements."""
+        cache = LLMResponseCache(tempfile.mkdtemp())
+        threads = []
+        
+        def record_thread(method):
+            def wrapper(*args, **kwargs):
+                threads.append(threading.get_ident())
+                return method(*args, **kwargs)
+            return wrapper
+        
+        cache.get = record_thread(cache.get)
+        cache.put = record_thread(cache.put)
+        network = httpx.MockTransport(lambda request: httpx.Response(200, json={"choices": []}))
+        
+        async def run_requests():
+            async with httpx.AsyncClient(transport=CachingHttpTransport(cache, network),
+                                         base_url="https://api.example.com") as client:
+                for _ in range(2):
+                    await client.post("/v1/chat/completions", json={"model": "m", "messages": []})
+            return threading.get_ident()
+        
+        loop_thread = asyncio.run(run_requests())
+        cache.close()
+        
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
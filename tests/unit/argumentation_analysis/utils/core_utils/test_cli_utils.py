@@ -53,6 +53,20 @@ def test_parse_advanced_analysis_arguments_verbose_true():
         args_v = parse_advanced_analysis_arguments()
     assert args_v.verbose is True
 
+def test_parse_advanced_analysis_arguments_workers():
+    """Teste l'argument --workers (mode parallèle)."""
+    with patch('sys.argv', ['script_name']):
+        assert parse_advanced_analysis_arguments().workers is None
+
+    with patch('sys.argv', ['script_name', '-w', '4']): # Test avec l'alias court
+        assert parse_advanced_analysis_arguments().workers == 4
+
+    with patch('sys.argv', ['script_name', '--workers', '0']): # 0 : mode séquentiel
+        assert parse_advanced_analysis_arguments().workers == 0
+
+    with patch('sys.argv', ['script_name', '--workers', '-1']), pytest.raises(SystemExit):
+        parse_advanced_analysis_arguments()
+
 def test_parse_advanced_analysis_arguments_all_provided():
     """Teste la fourniture de tous les arguments."""
     extracts_p = "data/extracts.enc"
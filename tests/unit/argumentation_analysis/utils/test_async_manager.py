@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests pour l'exécution concurrente bornée de argumentation_analysis.utils.async_manager.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from argumentation_analysis.utils.async_manager import AsyncManager
+
+
+@pytest.fixture
+def manager():
+    """Retourne un gestionnaire asynchrone arrêté en fin de test."""
+    async_manager = AsyncManager(max_workers=2)
+    yield async_manager
+    async_manager.shutdown()
+
+
+def make_tracker():
+    """Retourne une fonction lente qui mesure le nombre d'exécutions simultanées."""
+    state = {"running": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def tracked(value, delay=0.1):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(delay)
+        with lock:
+            state["running"] -= 1
+        return value
+
+    return tracked, state
+
+
+def test_sync_and_async_tasks_run_concurrently_in_input_order(manager):
+    async def async_double(value):
+        await asyncio.sleep(0.1)
+        return value * 2
+
+    def sync_square(value):
+        time.sleep(0.1)
+        return value ** 2
+
+    tasks = [{'func': async_double if i % 2 else sync_square, 'args': (i,)} for i in range(6)]
+
+    start = time.monotonic()
+    results = manager.run_multiple_hybrid(tasks, max_concurrent=6)
+
+    assert results == [0, 2, 4, 6, 16, 10]
+    assert time.monotonic() - start < 0.4
+
+
+def test_concurrency_is_bounded(manager):
+    tracked, state = make_tracker()
+    tasks = [{'func': tracked, 'args': (i,), 'kwargs': {'delay': 0.05}} for i in range(9)]
+
+    assert manager.run_multiple_hybrid(tasks, max_concurrent=3) == list(range(9))
+    assert state["peak"] == 3
+
+
+def test_task_timeout_and_errors_use_fallback(manager):
+    def failing():
+        raise ValueError("échec")
+
+    tasks = [
+        {'func': time.sleep, 'args': (1,), 'timeout': 0.05, 'fallback_result': 'timeout'},
+        {'func': failing, 'fallback_result': 'erreur'},
+        {'func': lambda: 'ok'},
+    ]
+
+    assert manager.run_multiple_hybrid(tasks) == ['timeout', 'erreur', 'ok']
+
+
+def test_global_timeout_cancels_stragglers(manager):
+    cancelled = []
+
+    async def straggler():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    tasks = [
+        {'func': straggler, 'fallback_result': 'annulée'},
+        {'func': straggler, 'fallback_result': 'annulée'},
+        {'func': straggler(), 'fallback_result': 'jamais démarrée'},
+    ]
+
+    start = time.monotonic()
+    results = manager.run_multiple_hybrid(tasks, max_concurrent=2, global_timeout=0.2)
+
+    assert results == ['annulée', 'annulée', 'jamais démarrée']
+    assert time.monotonic() - start < 1
+    assert cancelled == [True, True]
+
+
+def test_iter_multiple_hybrid_streams_in_completion_order(manager):
+    def delayed(value, delay):
+        time.sleep(delay)
+        return value
+
+    tasks = [{'func': delayed, 'args': (i, delay)} for i, delay in enumerate([0.3, 0.05, 0.15])]
+
+    assert list(manager.iter_multiple_hybrid(tasks, max_concurrent=3)) == [(1, 1), (2, 2), (0, 0)]
+
+
+def test_run_multiple_hybrid_inside_running_loop(manager):
+    async def caller():
+        return manager.run_multiple_hybrid([{'func': lambda: 1}, {'func': asyncio.sleep, 'args': (0, 2)}])
+
+    assert asyncio.run(caller()) == [1, 2]
+
+
+def test_run_multiple_hybrid_async(manager):
+    assert asyncio.run(manager.run_multiple_hybrid_async([{'func': lambda x: x + 1, 'args': (1,)}])) == [2]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests pour l'instantané binaire de la taxonomie (argumentation_analysis.utils.taxonomy_snapshot).
+"""
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from argumentation_analysis.utils import taxonomy_loader
+from argumentation_analysis.utils.taxonomy_snapshot import (
+    compute_taxonomy_fingerprint,
+    get_snapshot_path,
+    load_taxonomy_dataframe,
+    read_taxonomy_snapshot,
+)
+
+SMALL_TAXONOMY = Path(__file__).resolve().parents[4] / "argumentation_analysis" / "data" / "mock_taxonomy_small.csv"
+
+
+@pytest.fixture
+def taxonomy_csv(tmp_path: Path) -> Path:
+    """Copie la petite taxonomie de test dans un répertoire temporaire."""
+    csv_path = tmp_path / "taxonomy.csv"
+    shutil.copy(SMALL_TAXONOMY, csv_path)
+    return csv_path
+
+
+def test_first_load_writes_snapshot_identical_to_csv(taxonomy_csv: Path):
+    """Le premier chargement lit le CSV et écrit un instantané qui restitue le même DataFrame."""
+    df_csv, fingerprint = load_taxonomy_dataframe(taxonomy_csv)
+    snapshot_path = get_snapshot_path(taxonomy_csv)
+
+    assert snapshot_path.is_file()
+    assert fingerprint == compute_taxonomy_fingerprint(taxonomy_csv)
+    assert df_csv.index.name == 'PK'
+    assert pd.api.types.is_integer_dtype(df_csv.index)
+
+    df_snapshot = read_taxonomy_snapshot(snapshot_path, fingerprint)
+    pd.testing.assert_frame_equal(df_snapshot, df_csv)
+
+
+def test_snapshot_is_regenerated_when_csv_changes(taxonomy_csv: Path):
+    """Un instantané dont l'empreinte ne correspond plus au CSV est ignoré puis réécrit."""
+    load_taxonomy_dataframe(taxonomy_csv)
+    column_count = len(pd.read_csv(taxonomy_csv, nrows=0).columns)
+    with open(taxonomy_csv, 'a', encoding='utf-8') as f:
+        f.write("9999" + "," * (column_count - 1) + "\n")
+    new_fingerprint = compute_taxonomy_fingerprint(taxonomy_csv)
+
+    assert read_taxonomy_snapshot(get_snapshot_path(taxonomy_csv), new_fingerprint) is None
+    df, fingerprint = load_taxonomy_dataframe(taxonomy_csv)
+    assert fingerprint == new_fingerprint
+    assert 9999 in df.index
+    assert read_taxonomy_snapshot(get_snapshot_path(taxonomy_csv), new_fingerprint) is not None
+
+
+def test_corrupted_snapshot_falls_back_to_csv(taxonomy_csv: Path):
+    """Un instantané illisible n'empêche pas le chargement depuis le CSV."""
+    get_snapshot_path(taxonomy_csv).write_bytes(b"pas un paquet numpy")
+    df, _ = load_taxonomy_dataframe(taxonomy_csv)
+    assert df is not None and len(df) > 0
+
+
+def test_taxonomy_loader_real_mode_uses_snapshot(taxonomy_csv: Path, monkeypatch):
+    """En mode réel, TaxonomyLoader retourne les entrées de la taxonomie (valeurs manquantes à None)."""
+    monkeypatch.setattr(taxonomy_loader, "USE_MOCK", False)
+    monkeypatch.setattr(taxonomy_loader, "get_taxonomy_path", lambda: taxonomy_csv)
+
+    entries = taxonomy_loader.TaxonomyLoader().load_taxonomy()
+
+    assert get_snapshot_path(taxonomy_csv).is_file()
+    assert entries[0]['PK'] == pd.read_csv(taxonomy_csv)['PK'].iloc[0]
+    assert all(value is None or value == value for entry in entries for value in entry.values())
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Tests pour le pool de workers du gestionnaire opérationnel.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Le paquet hiérarchique dépend de networkx (optionnel)
+pytest.importorskip("networkx")
+
+from argumentation_analysis.orchestration.hierarchical.operational.manager import OperationalManager
+
+
+class FakeAgent:
+    """Agent factice dont la durée de traitement est paramétrable."""
+
+    def __init__(self, name, delay=0.05):
+        self.name = name
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.processed = []
+
+    async def process_task(self, task):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            self.processed.append(task["id"])
+            return {"task_id": task["id"], "status": "completed", "agent": self.name}
+        finally:
+            self.active -= 1
+
+
+class FakeRegistry:
+    """Registre factice routant les tâches selon le champ `agent`."""
+
+    def __init__(self, agents):
+        self.agents = agents
+
+    async def select_agent_for_task(self, task):
+        return self.agents.get(task.get("agent"))
+
+    async def process_task(self, task, agent=None):
+        agent = agent or await self.select_agent_for_task(task)
+        if agent is None:
+            return {"task_id": task["id"], "status": "failed"}
+        return await agent.process_task(task)
+
+
+def make_manager(agents, **kwargs):
+    manager = OperationalManager(middleware=MagicMock(), **kwargs)
+    manager.agent_registry = FakeRegistry(agents)
+    return manager
+
+
+async def submit(manager, task):
+    future = asyncio.get_running_loop().create_future()
+    manager.operational_state.add_result_future(task["id"], future)
+    await manager._enqueue_task(task)
+    return future
+
+
+@pytest.mark.asyncio
+async def test_tasks_for_different_agents_run_concurrently():
+    agents = {name: FakeAgent(name, delay=0.2) for name in ("extract", "informal", "pl")}
+    manager = make_manager(agents, num_workers=3)
+    await manager.start()
+    try:
+        start = time.perf_counter()
+        futures = [await submit(manager, {"id": f"t-{name}", "agent": name}) for name in agents]
+        results = await asyncio.gather(*futures)
+        elapsed = time.perf_counter() - start
+    finally:
+        await manager.stop()
+
+    assert [result["agent"] for result in results] == ["extract", "informal", "pl"]
+    assert elapsed < 0.4
+
+
+@pytest.mark.asyncio
+async def test_agent_concurrency_limit_does_not_block_other_agents():
+    informal = FakeAgent("informal", delay=0.1)
+    pl = FakeAgent("pl", delay=0.01)
+    manager = make_manager({"informal": informal, "pl": pl}, num_workers=4, agent_concurrency={"informal": 2})
+    await manager.start()
+    try:
+        informal_futures = [await submit(manager, {"id": f"i-{i}", "agent": "informal"}) for i in range(6)]
+        pl_future = await submit(manager, {"id": "p-0", "agent": "pl"})
+
+        await asyncio.wait_for(pl_future, timeout=0.08)
+        assert not all(future.done() for future in informal_futures)
+        await asyncio.gather(*informal_futures)
+    finally:
+        await manager.stop()
+
+    assert informal.max_active == 2
+    assert sorted(informal.processed) == [f"i-{i}" for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_dequeued_by_priority():
+    agent = FakeAgent("extract", delay=0)
+    manager = make_manager({"extract": agent}, num_workers=1)
+    futures = []
+    for task_id, priority in [("low", "low"), ("medium-1", "medium"), ("high", "high"),
+                              ("medium-2", "medium"), ("critical", "critical")]:
+        futures.append(await submit(manager, {"id": task_id, "agent": "extract", "priority": priority}))
+
+    await manager.start()
+    try:
+        await asyncio.gather(*futures)
+    finally:
+        await manager.stop()
+
+    assert agent.processed == ["critical", "high", "medium-1", "medium-2", "low"]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_applies_backpressure_when_queue_is_full():
+    manager = make_manager({"extract": FakeAgent("extract", delay=0)}, num_workers=1, max_queue_size=2)
+    futures = [await submit(manager, {"id": f"t-{i}", "agent": "extract"}) for i in range(2)]
+
+    blocked = asyncio.ensure_future(submit(manager, {"id": "t-2", "agent": "extract"}))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+    assert manager.get_task_pool_metrics()["queue_depth"] == 2
+
+    await manager.start()
+    try:
+        futures.append(await asyncio.wait_for(blocked, timeout=1))
+        await asyncio.gather(*futures)
+    finally:
+        await manager.stop()
+
+    assert manager.get_task_pool_metrics()["backpressure_waits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_are_exposed_through_operational_state():
+    manager = make_manager({"pl": FakeAgent("pl", delay=0.02)}, num_workers=2)
+    await manager.start()
+    try:
+        futures = [await submit(manager, {"id": f"t-{i}", "agent": "pl"}) for i in range(3)]
+        futures.append(await submit(manager, {"id": "unroutable", "agent": "unknown"}))
+        await asyncio.gather(*futures)
+    finally:
+        await manager.stop()
+
+    metrics = manager.get_operational_state().operational_metrics["task_pool"]
+    assert metrics["num_workers"] == 2
+    assert metrics["queue_depth"] == 0
+    assert metrics["tasks_enqueued"] == 4
+    assert metrics["tasks_completed"] == 4
+    assert metrics["tasks_failed"] == 1
+    assert metrics["wait_time_ms"]["count"] == 4
+    assert metrics["service_time_ms"]["max"] >= 20
+    assert metrics["agents"]["pl"]["completed"] == 3
+    assert metrics["agents"]["pl"]["limit"] == 1